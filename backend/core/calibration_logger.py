@@ -7,6 +7,7 @@ NON-NEGOTIABLE: This must run or you will keep getting embarrassed
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone, timedelta, date as date_type
 from db.mongo import db
+from db.write_behind import get_write_behind_sink
 import numpy as np
 import logging
 
@@ -51,7 +52,7 @@ class CalibrationLogger:
         Includes pick_state and complete reason codes for NO_PLAY/LEAN/PICK classification
         """
         try:
-            db.calibration_audit_log.insert_one({
+            get_write_behind_sink().submit(db.calibration_audit_log, {
                 "record_type": "pick_audit",
                 "game_id": game_id,
                 "sport": sport,
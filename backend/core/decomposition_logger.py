@@ -19,6 +19,7 @@ If pace OR efficiency exceeds baseline → auto dampen
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timezone, date as date_type
 from db.mongo import db
+from db.write_behind import get_write_behind_sink
 import logging
 import numpy as np
 
@@ -174,9 +175,9 @@ class DecompositionLogger:
             "flags": self._generate_flags(deviations, model_total - vegas_total)
         }
         
-        # Store in MongoDB
+        # Store in MongoDB (buffered, batched insert_many)
         try:
-            self.collection.insert_one(log_entry)
+            get_write_behind_sink().submit(self.collection, log_entry)
             logger.info(f"📊 Decomposition logged: {game_id} ({sport})")
         except Exception as e:
             logger.error(f"Failed to log decomposition: {e}")
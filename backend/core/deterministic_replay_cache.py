@@ -21,9 +21,17 @@ from datetime import datetime, timezone
 import hashlib
 import json
 import os
-from pymongo import MongoClient, ASCENDING
+import pymongo
+from pymongo import ASCENDING
 from pymongo.errors import PyMongoError
 
+from db.connection_registry import get_mongo_registry
+
+# Fail-fast budget per cache operation (server selection included). The
+# replay cache shares the process-wide pool, so the short timeout is applied
+# per operation instead of through a dedicated client.
+REPLAY_CACHE_OP_TIMEOUT_SECONDS = 2.0
+
 
 class DeterministicReplayCache:
     """
@@ -51,11 +59,14 @@ class DeterministicReplayCache:
         )
         self._memory_cache: Dict[str, Any] = {}
 
-        self.client = MongoClient(mongo_uri, serverSelectionTimeoutMS=2000)
-        self.db = self.client[os.getenv("DATABASE_NAME", "beatvegas")]
-        self.collection = self.db["deterministic_replay_cache"]
+        registry = get_mongo_registry()
+        database = os.getenv("DATABASE_NAME", "beatvegas")
+        self.client = registry.sync_client(mongo_uri)
+        self.db = self.client[database]
+        self.collection = registry.collection("deterministic_replay_cache", database=database, uri=mongo_uri)
 
-        self._ensure_indexes()
+        with pymongo.timeout(REPLAY_CACHE_OP_TIMEOUT_SECONDS):
+            self._ensure_indexes()
     
     def _ensure_indexes(self) -> None:
         """Create indexes for efficient cache lookups."""
@@ -127,13 +138,14 @@ class DeterministicReplayCache:
                 event_id, inputs_hash, market_type, decision_version
             )
             
-            cached = self.collection.find_one({
-                "cache_key": cache_key,
-                "event_id": event_id,
-                "inputs_hash": inputs_hash,
-                "market_type": market_type,
-                "decision_version": decision_version
-            })
+            with pymongo.timeout(REPLAY_CACHE_OP_TIMEOUT_SECONDS):
+                cached = self.collection.find_one({
+                    "cache_key": cache_key,
+                    "event_id": event_id,
+                    "inputs_hash": inputs_hash,
+                    "market_type": market_type,
+                    "decision_version": decision_version
+                })
             
             if cached:
                 # Return the cached decision payload
@@ -206,17 +218,18 @@ class DeterministicReplayCache:
             }
             
             # Upsert: insert if new, replace if exists
-            self.collection.replace_one(
-                {
-                    "cache_key": cache_key,
-                    "event_id": event_id,
-                    "inputs_hash": inputs_hash,
-                    "market_type": market_type,
-                    "decision_version": decision_version
-                },
-                cache_entry,
-                upsert=True
-            )
+            with pymongo.timeout(REPLAY_CACHE_OP_TIMEOUT_SECONDS):
+                self.collection.replace_one(
+                    {
+                        "cache_key": cache_key,
+                        "event_id": event_id,
+                        "inputs_hash": inputs_hash,
+                        "market_type": market_type,
+                        "decision_version": decision_version
+                    },
+                    cache_entry,
+                    upsert=True
+                )
             
             # Mirror to in-memory cache — test env only
             if self._allow_memory_fallback:
@@ -315,15 +328,16 @@ class DeterministicReplayCache:
             dict: Cache statistics (count, size, etc.)
         """
         try:
-            total_entries = self.collection.count_documents({})
+            with pymongo.timeout(REPLAY_CACHE_OP_TIMEOUT_SECONDS):
+                total_entries = self.collection.count_documents({})
             
-            # Count by market type
-            spread_count = self.collection.count_documents({"market_type": "spread"})
-            total_count = self.collection.count_documents({"market_type": "total"})
+                # Count by market type
+                spread_count = self.collection.count_documents({"market_type": "spread"})
+                total_count = self.collection.count_documents({"market_type": "total"})
             
-            # Get oldest and newest entries
-            oldest = self.collection.find_one(sort=[("cached_at", ASCENDING)])
-            newest = self.collection.find_one(sort=[("cached_at", -1)])
+                # Get oldest and newest entries
+                oldest = self.collection.find_one(sort=[("cached_at", ASCENDING)])
+                newest = self.collection.find_one(sort=[("cached_at", -1)])
             
             return {
                 "total_entries": total_entries,
@@ -367,7 +381,8 @@ class DeterministicReplayCache:
             return False
         
         try:
-            result = self.collection.delete_many({})
+            with pymongo.timeout(REPLAY_CACHE_OP_TIMEOUT_SECONDS):
+                result = self.collection.delete_many({})
             print(f"[CACHE] Cleared {result.deleted_count} entries")
             return True
         except PyMongoError as e:
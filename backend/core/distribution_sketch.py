@@ -0,0 +1,252 @@
+"""
+Distribution Sketch - Line-Move Re-Pricing Without Re-Simulating
+=================================================================
+
+Every simulation keeps a compact histogram of its margin (home - away) and
+total samples. Any new spread / total / moneyline price can then be re-priced
+straight from the stored sketch in microseconds instead of running a fresh
+Monte Carlo pass when odds tick.
+
+Binning:
+    Sportsbook lines live on a half-point grid, so samples are binned on that
+    grid: bin k holds ((k-1)/2, k/2]. Probabilities at any half-point line are
+    exact (same counts the engine computes from raw samples).
+    - discrete sketches (every sample on the grid - football, hockey,
+      baseball, rounded scores) keep exact push mass at integer lines
+    - continuous sketches have no pushes; off-grid lines interpolate inside
+      the bin
+
+Storage (JSON-safe, ~1-2KB per market for NBA-sized ranges):
+    {"version": 1, "n": 10000,
+     "margin": {"start": -80, "dtype": "<u2", "counts": "<base64>", "discrete": false},
+     "total":  {...}}
+
+Conventions match MonteCarloEngine:
+    - home covers spread s (home perspective) when margin + s > 0;
+      p_cover_away = 1 - p_cover_home (pushes count against home)
+    - over/under exclude pushes (OverUnderAnalysis)
+    - moneyline splits ties evenly
+"""
+
+import base64
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from core.numerical_accuracy import ExpectedValue
+
+SKETCH_VERSION = 1
+DEFAULT_ODDS = -110
+
+
+@dataclass
+class HalfPointHistogram:
+    """Sample counts on the half-point grid; bin index k covers ((k-1)/2, k/2]"""
+
+    start: int  # grid index of counts[0]
+    counts: np.ndarray
+    discrete: bool
+
+    @property
+    def n(self) -> int:
+        return int(self.counts.sum())
+
+    @classmethod
+    def from_samples(cls, samples) -> "HalfPointHistogram":
+        doubled = np.asarray(samples, dtype=float) * 2.0
+        if doubled.size == 0:
+            raise ValueError("Cannot sketch an empty sample")
+        # Round away float noise so exact grid values land in their own bin
+        doubled = np.round(doubled, 9)
+        index = np.ceil(doubled).astype(np.int64)
+        start = int(index.min())
+        counts = np.bincount(index - start)
+        return cls(start=start, counts=counts, discrete=bool(np.all(index == doubled)))
+
+    def _split(self, line: float) -> Tuple[float, float, float]:
+        """(above, at, below) sample counts relative to line"""
+        doubled = float(line) * 2.0
+        index = np.arange(self.start, self.start + self.counts.size)
+        total = float(self.counts.sum())
+        if self.discrete:
+            above = float(self.counts[index > doubled].sum())
+            at = float(self.counts[index == doubled].sum())
+        else:
+            edge = int(np.ceil(doubled))
+            above = float(self.counts[index > edge].sum())
+            if self.start <= edge < self.start + self.counts.size:
+                above += float(self.counts[edge - self.start]) * (edge - doubled)
+            at = 0.0
+        return above, at, total - above - at
+
+    def prob_above(self, line: float) -> float:
+        above, _, _ = self._split(line)
+        return above / self.n
+
+    def prob_at(self, line: float) -> float:
+        _, at, _ = self._split(line)
+        return at / self.n
+
+    def to_doc(self) -> Dict[str, Any]:
+        dtype = "<u2" if self.counts.max() < 2 ** 16 else "<u4"
+        return {
+            "start": self.start,
+            "dtype": dtype,
+            "counts": base64.b64encode(self.counts.astype(dtype).tobytes()).decode("ascii"),
+            "discrete": self.discrete
+        }
+
+    @classmethod
+    def from_doc(cls, doc: Dict[str, Any]) -> "HalfPointHistogram":
+        counts = np.frombuffer(base64.b64decode(doc["counts"]), dtype=doc["dtype"]).astype(np.int64)
+        return cls(start=int(doc["start"]), counts=counts, discrete=bool(doc["discrete"]))
+
+
+def _edge(model_prob: float, american_odds: Optional[int]) -> Dict[str, float]:
+    ev = ExpectedValue.calculate(model_prob, int(american_odds if american_odds is not None else DEFAULT_ODDS))
+    return {
+        "implied_probability": round(ev.implied_probability, 4),
+        "edge": round(ev.edge_percentage, 4),
+        "ev_per_dollar": round(ev.ev_per_dollar, 4)
+    }
+
+
+@dataclass
+class DistributionSketch:
+    """Margin + total histograms for one simulation"""
+
+    margin: HalfPointHistogram
+    total: HalfPointHistogram
+
+    @classmethod
+    def from_samples(cls, margins, totals) -> "DistributionSketch":
+        return cls(
+            margin=HalfPointHistogram.from_samples(margins),
+            total=HalfPointHistogram.from_samples(totals)
+        )
+
+    @classmethod
+    def from_simulation(cls, simulation: Dict[str, Any]) -> Optional["DistributionSketch"]:
+        """Sketch stored on a simulation document, or None for legacy docs"""
+        doc = simulation.get("distribution_sketch") if simulation else None
+        if not doc or doc.get("version") != SKETCH_VERSION:
+            return None
+        return cls(
+            margin=HalfPointHistogram.from_doc(doc["margin"]),
+            total=HalfPointHistogram.from_doc(doc["total"])
+        )
+
+    def to_doc(self) -> Dict[str, Any]:
+        return {
+            "version": SKETCH_VERSION,
+            "n": self.margin.n,
+            "margin": self.margin.to_doc(),
+            "total": self.total.to_doc()
+        }
+
+    # ------------------------------------------------------------------
+    # Re-pricing
+    # ------------------------------------------------------------------
+
+    def price_spread(
+        self,
+        spread_home: float,
+        home_odds: Optional[int] = None,
+        away_odds: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Cover probabilities at a home-perspective spread (negative = home favored)"""
+        p_cover_home = self.margin.prob_above(-spread_home)
+        p_cover_away = 1.0 - p_cover_home
+        return {
+            "line_home": spread_home,
+            "p_cover_home": round(p_cover_home, 4),
+            "p_cover_away": round(p_cover_away, 4),
+            "p_push": round(self.margin.prob_at(-spread_home), 4),
+            "home": _edge(p_cover_home, home_odds),
+            "away": _edge(p_cover_away, away_odds)
+        }
+
+    def price_total(
+        self,
+        total_line: float,
+        over_odds: Optional[int] = None,
+        under_odds: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Over/under probabilities at a total line (pushes excluded)"""
+        above, at, below = self.total._split(total_line)
+        if above + below == 0:
+            raise ValueError("All simulations resulted in push - cannot calculate O/U probabilities")
+        p_over = above / (above + below)
+        p_under = 1.0 - p_over
+        return {
+            "line": total_line,
+            "p_over": round(p_over, 4),
+            "p_under": round(p_under, 4),
+            "p_push": round(at / self.total.n, 4),
+            "over": _edge(p_over, over_odds),
+            "under": _edge(p_under, under_odds)
+        }
+
+    def price_moneyline(
+        self,
+        home_odds: Optional[int] = None,
+        away_odds: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Win probabilities (ties split evenly, as in the engine)"""
+        above, at, _ = self.margin._split(0.0)
+        p_win_home = (above + at / 2) / self.margin.n
+        p_win_away = 1.0 - p_win_home
+        priced = {
+            "p_win_home": round(p_win_home, 4),
+            "p_win_away": round(p_win_away, 4)
+        }
+        if home_odds is not None:
+            priced["home"] = _edge(p_win_home, home_odds)
+        if away_odds is not None:
+            priced["away"] = _edge(p_win_away, away_odds)
+        return priced
+
+    def reprice(
+        self,
+        spread_home: Optional[float] = None,
+        total_line: Optional[float] = None,
+        spread_odds: Tuple[Optional[int], Optional[int]] = (None, None),
+        total_odds: Tuple[Optional[int], Optional[int]] = (None, None),
+        moneyline_odds: Tuple[Optional[int], Optional[int]] = (None, None)
+    ) -> Dict[str, Any]:
+        """
+        Re-price every market at new lines/prices.
+
+        Args:
+            spread_home: Home-perspective spread (None = skip spread)
+            total_line: Game total line (None = skip total)
+            spread_odds: (home, away) American odds (default -110)
+            total_odds: (over, under) American odds (default -110)
+            moneyline_odds: (home, away) American odds (edge only when given)
+
+        Returns:
+            {"sims", "spread", "total", "moneyline"} probability + edge blocks
+        """
+        priced: Dict[str, Any] = {
+            "sims": self.margin.n,
+            "moneyline": self.price_moneyline(*moneyline_odds)
+        }
+        if spread_home is not None:
+            priced["spread"] = self.price_spread(spread_home, *spread_odds)
+        if total_line is not None:
+            priced["total"] = self.price_total(total_line, *total_odds)
+        return priced
+
+
+def reprice_simulation(simulation: Dict[str, Any], **lines) -> Optional[Dict[str, Any]]:
+    """
+    Re-price a stored simulation document at new lines.
+
+    Returns None when the document predates sketches (caller falls back to the
+    stored probabilities or a re-simulation).
+    """
+    sketch = DistributionSketch.from_simulation(simulation)
+    if sketch is None:
+        return None
+    return sketch.reprice(**lines)
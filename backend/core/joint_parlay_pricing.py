@@ -0,0 +1,255 @@
+"""
+Joint Parlay Pricing - Correlated Legs From Shared Monte Carlo Samples
+=======================================================================
+
+A parlay's hit probability is the probability that every leg wins on the
+SAME simulated game. Legs from one game (spread + total, ML + over, ...)
+are correlated through the shared (margin, total) outcome, so multiplying
+leg probabilities - or applying a fixed correlation constant - misprices
+them. Legs from different games come from independent simulations, so their
+joint probability is exactly the product of per-game joint probabilities.
+
+JointSampleSketch keeps each simulation's (margin, total) sample matrix in
+compressed form: rows are snapped to the half-point grid (as in
+core.distribution_sketch) and collapsed to unique (margin, total) pairs
+with counts. Every sportsbook line sits on that grid, so a leg evaluated on
+the compressed rows gives the same outcome as on the raw samples.
+
+Pricing evaluates all of a game's legs on its rows at once (a legs x rows
+boolean matrix, reduced with all()), weights by the row counts, and
+multiplies across games.
+
+Leg outcome conventions (half-point grid, doubled lines):
+    SPREAD    HOME covers when margin + line > 0, AWAY when line - margin > 0
+              (line is signed for the picked team, as in decision records)
+    TOTAL     OVER when total > line, UNDER when total < line
+    MONEYLINE HOME wins when margin > 0, AWAY when margin < 0
+    Exactly on the line (discrete sketches only) is a push. A parlay hits
+    when every leg wins; rows where no leg loses but one pushes are reported
+    separately as push_probability.
+"""
+
+import base64
+import math
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+JOINT_SKETCH_VERSION = 1
+
+_MARKET_ALIASES = {
+    "SPREAD": "SPREAD",
+    "TOTAL": "TOTAL",
+    "MONEYLINE": "MONEYLINE",
+    "MONEYLINE_2WAY": "MONEYLINE",
+    "MONEYLINE_3WAY": "MONEYLINE",
+    "ML": "MONEYLINE",
+    "H2H": "MONEYLINE",
+}
+_SIDES = {
+    "SPREAD": ("HOME", "AWAY"),
+    "TOTAL": ("OVER", "UNDER"),
+    "MONEYLINE": ("HOME", "AWAY"),
+}
+
+
+def _encode(array: np.ndarray) -> str:
+    return base64.b64encode(zlib.compress(np.ascontiguousarray(array, dtype="<i4").tobytes(), 6)).decode("ascii")
+
+
+def _decode(text: str) -> np.ndarray:
+    return np.frombuffer(zlib.decompress(base64.b64decode(text)), dtype="<i4").astype(np.int64)
+
+
+@dataclass
+class JointSampleSketch:
+    """Unique (margin, total) rows on the half-point grid with sample counts"""
+
+    margin_index: np.ndarray  # ceil(2 * margin) per row
+    total_index: np.ndarray   # ceil(2 * total) per row
+    counts: np.ndarray
+    discrete: bool
+
+    @property
+    def n(self) -> int:
+        return int(self.counts.sum())
+
+    @classmethod
+    def from_samples(cls, margins, totals) -> "JointSampleSketch":
+        doubled = np.round(np.column_stack([
+            np.asarray(margins, dtype=float),
+            np.asarray(totals, dtype=float)
+        ]) * 2.0, 9)
+        if doubled.size == 0:
+            raise ValueError("Cannot sketch an empty sample")
+        index = np.ceil(doubled).astype(np.int64)
+        rows, counts = np.unique(index, axis=0, return_counts=True)
+        return cls(
+            margin_index=rows[:, 0],
+            total_index=rows[:, 1],
+            counts=counts.astype(np.int64),
+            discrete=bool(np.all(index == doubled))
+        )
+
+    def to_doc(self) -> Dict[str, Any]:
+        return {
+            "version": JOINT_SKETCH_VERSION,
+            "n": self.n,
+            "rows": int(self.counts.size),
+            "discrete": self.discrete,
+            "margin_index": _encode(self.margin_index),
+            "total_index": _encode(self.total_index),
+            "counts": _encode(self.counts)
+        }
+
+    @classmethod
+    def from_doc(cls, doc: Optional[Dict[str, Any]]) -> Optional["JointSampleSketch"]:
+        """Sketch from its stored form, or None for a missing/unknown version"""
+        if not doc or doc.get("version") != JOINT_SKETCH_VERSION:
+            return None
+        return cls(
+            margin_index=_decode(doc["margin_index"]),
+            total_index=_decode(doc["total_index"]),
+            counts=_decode(doc["counts"]),
+            discrete=bool(doc["discrete"])
+        )
+
+    def _split(self, index: np.ndarray, line: float) -> Tuple[np.ndarray, np.ndarray]:
+        """(above, at) masks of index relative to a line"""
+        doubled = float(line) * 2.0
+        above = index > doubled
+        if self.discrete:
+            return above, index == doubled
+        return above, np.zeros_like(above)
+
+    def outcomes(self, leg: "ParlayLegSpec") -> Tuple[np.ndarray, np.ndarray]:
+        """(win, push) masks over the sketch rows for one leg"""
+        if leg.market == "TOTAL":
+            above, at = self._split(self.total_index, leg.line)
+            return (above, at) if leg.side == "OVER" else (~above & ~at, at)
+
+        if leg.market == "MONEYLINE":
+            above, at = self._split(self.margin_index, 0.0)
+            return (above, at) if leg.side == "HOME" else (~above & ~at, at)
+
+        if leg.side == "HOME":
+            # margin + line > 0  <=>  margin > -line
+            return self._split(self.margin_index, -leg.line)
+        # line - margin > 0  <=>  margin < line
+        above, at = self._split(self.margin_index, leg.line)
+        return ~above & ~at, at
+
+
+@dataclass(frozen=True)
+class ParlayLegSpec:
+    """One bettable leg, resolvable against a game's joint sketch"""
+
+    event_id: str
+    market: str  # SPREAD | TOTAL | MONEYLINE
+    side: str    # HOME | AWAY (spread, moneyline) or OVER | UNDER (total)
+    line: float = 0.0
+
+
+def leg_spec_from_pick(pick: Mapping[str, Any]) -> Optional[ParlayLegSpec]:
+    """
+    Structured leg from a pick/leg dict, or None when it lacks the market,
+    side or line needed to evaluate it on samples.
+
+    Reads market_type | pick_type | market, side (HOME/AWAY/OVER/UNDER) and
+    line; moneyline legs need no line.
+    """
+    raw_market = pick.get("market_type") or pick.get("pick_type") or pick.get("market")
+    market = _MARKET_ALIASES.get(str(getattr(raw_market, "value", raw_market) or "").upper())
+    side = str(pick.get("side") or "").upper()
+    if not pick.get("event_id") or market is None or side not in _SIDES[market]:
+        return None
+
+    line = pick.get("line")
+    if market == "MONEYLINE":
+        line = 0.0
+    elif line is None:
+        return None
+    try:
+        line = float(line)
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(line):
+        return None
+    return ParlayLegSpec(event_id=str(pick["event_id"]), market=market, side=side, line=line)
+
+
+@dataclass
+class JointParlayPrice:
+    """Joint pricing of the legs that could be evaluated on samples"""
+
+    joint_probability: float
+    independent_probability: float
+    push_probability: float
+    leg_probabilities: List[float] = field(default_factory=list)
+    same_game_events: List[str] = field(default_factory=list)
+    priced_legs: int = 0
+
+    @property
+    def correlation_factor(self) -> float:
+        """joint / independent: >1 legs hit together, <1 they work against each other"""
+        if self.independent_probability <= 0:
+            return 1.0
+        return self.joint_probability / self.independent_probability
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "joint_probability": round(self.joint_probability, 6),
+            "independent_probability": round(self.independent_probability, 6),
+            "push_probability": round(self.push_probability, 6),
+            "correlation_factor": round(self.correlation_factor, 4),
+            "leg_probabilities": [round(p, 4) for p in self.leg_probabilities],
+            "same_game_events": self.same_game_events,
+            "priced_legs": self.priced_legs
+        }
+
+
+def price_joint(
+    legs: Iterable[ParlayLegSpec],
+    sketches: Mapping[str, JointSampleSketch]
+) -> JointParlayPrice:
+    """
+    Joint hit probability of legs, each evaluated on its game's sketch rows.
+
+    Raises KeyError when a leg's event has no sketch; callers decide whether
+    to drop the leg or fall back to independence.
+    """
+    legs = list(legs)
+    by_event: Dict[str, List[int]] = {}
+    for position, leg in enumerate(legs):
+        by_event.setdefault(leg.event_id, []).append(position)
+
+    joint = 1.0
+    no_loss = 1.0
+    independent = 1.0
+    leg_probabilities = [0.0] * len(legs)
+    for event_id, positions in by_event.items():
+        sketch = sketches[event_id]
+        weights = sketch.counts / float(sketch.n)
+        outcomes = [sketch.outcomes(legs[i]) for i in positions]
+        wins = np.vstack([win for win, _ in outcomes])
+        pushes = np.vstack([push for _, push in outcomes])
+
+        marginals = wins.astype(float) @ weights
+        for i, p in zip(positions, marginals):
+            leg_probabilities[i] = float(p)
+        independent *= float(np.prod(marginals))
+        joint *= float(weights[wins.all(axis=0)].sum())
+        no_loss *= float(weights[(wins | pushes).all(axis=0)].sum())
+
+    if not legs:
+        return JointParlayPrice(joint_probability=0.0, independent_probability=0.0, push_probability=0.0)
+    return JointParlayPrice(
+        joint_probability=joint,
+        independent_probability=independent,
+        push_probability=max(0.0, no_loss - joint),
+        leg_probabilities=leg_probabilities,
+        same_game_events=[e for e, positions in by_event.items() if len(positions) > 1],
+        priced_legs=len(legs)
+    )
@@ -28,6 +28,36 @@ from config.integrity_config import (
 logger = logging.getLogger(__name__)
 
 
+def _parse_odds_time(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    return None
+
+
+def effective_odds_timestamp(market_context: Dict[str, Any]) -> Any:
+    """
+    Timestamp used for staleness: odds_timestamp, or odds_last_seen_at when later
+
+    Bookmaker last_update only advances when the stored snapshot is rewritten;
+    polls that confirm an unchanged line only bump odds_last_seen_at.
+    """
+    odds_timestamp = market_context.get("odds_timestamp")
+    last_seen = _parse_odds_time(market_context.get("odds_last_seen_at"))
+    odds_time = _parse_odds_time(odds_timestamp)
+    if last_seen is None or odds_time is None:
+        return odds_timestamp
+    try:
+        return market_context["odds_last_seen_at"] if last_seen > odds_time else odds_timestamp
+    except TypeError:
+        # naive vs aware - keep the bookmaker timestamp
+        return odds_timestamp
+
+
 class IntegrityStatus(Enum):
     """Market integrity status levels"""
     OK = "ok"                           # All checks passed, fresh data
@@ -76,6 +106,10 @@ class MarketLineIntegrityError(Exception):
         super().__init__(message)
         self.errors = errors
 
+    def __reduce__(self):
+        # Keep `errors` when raised inside a simulation worker process
+        return (self.__class__, (str(self), self.errors))
+
 
 class MarketLineIntegrityVerifier:
     """
@@ -160,7 +194,7 @@ class MarketLineIntegrityVerifier:
         # ===== STALENESS CHECKS (SOFT WARNINGS) =====
         
         # Check 6: Odds timestamp staleness (no longer a hard block)
-        odds_timestamp = market_context.get("odds_timestamp")
+        odds_timestamp = effective_odds_timestamp(market_context)
         if not odds_timestamp:
             staleness_warnings.append("MISSING_ODDS_TIMESTAMP: No timestamp for market line")
         else:
@@ -311,7 +345,7 @@ class MarketLineIntegrityVerifier:
             score -= 0.1
         
         # Penalize stale odds based on sport-specific thresholds
-        odds_timestamp = market_context.get("odds_timestamp")
+        odds_timestamp = effective_odds_timestamp(market_context)
         if odds_timestamp:
             try:
                 if isinstance(odds_timestamp, str):
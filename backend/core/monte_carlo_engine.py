@@ -8,14 +8,21 @@ NUMERICAL ACCURACY ENFORCEMENT:
 - NO placeholders, NO hard-coded fallbacks, NO safe defaults
 - If simulation fails → return error, NOT fake numbers
 """
+import os
 import random
 import numpy as np
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timezone
 from db.mongo import db
 from services.logger import log_stage
-from core.sport_strategies import SportStrategyFactory
+from core.sport_strategies import SportStrategyFactory, merge_strategy_results
+from core.simulation_engine import wilson_bounds
+from core.distribution_sketch import DistributionSketch
+from core.joint_parlay_pricing import JointSampleSketch
+from services.latency_histograms import STAGE_TIMINGS_RESULT_KEY, StageTimings
+from services.parlay_leg_pool import upsert_pool_leg
+from services.joint_sample_store import JOINT_SKETCH_RESULT_KEY, price_picks, store_joint_sketch
 from core.sport_constants import map_position_abbreviation
 from core.calibration_engine import CalibrationEngine
 from utils.mongo_helpers import sanitize_mongo_doc
@@ -319,6 +326,94 @@ def ensure_pick_state(simulation: Dict[str, Any]) -> Dict[str, Any]:
     return simulation
 
 
+CONVERGENCE_BATCH_SIZE = 2500
+
+
+def precision_target_for_budget(budget: int) -> float:
+    """
+    Worst-case (p = 0.5) 95% half-width the full tier budget guarantees, z·0.5/√N
+
+    Stopping at this target keeps the tier's published precision: a coin-flip
+    game runs the whole budget, only lopsided probabilities stop early.
+    """
+    return 1.96 * 0.5 / float(np.sqrt(max(1, budget)))
+
+
+def simulate_to_precision(
+    strategy,
+    team_a_rating: float,
+    team_b_rating: float,
+    budget: int,
+    market_context: Dict[str, Any],
+    rng: np.random.Generator,
+    adaptive: bool = True,
+    target_half_width: Optional[float] = None,
+    batch_size: int = CONVERGENCE_BATCH_SIZE
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Run the strategy in vectorized batches until every published probability
+    converges to the tier's half-width target (default: the worst case the
+    full budget guarantees, precision_target_for_budget) or the budget is spent.
+
+    Published probabilities: p_win_home (pushes split), p_cover_home at the
+    market spread, p_over at the market total (pushes excluded). Hit counts
+    are accumulated per batch, so each convergence check is O(batch).
+
+    Returns:
+        (merged strategy results, precision record for the stored simulation)
+    """
+    target = target_half_width if target_half_width is not None else precision_target_for_budget(budget)
+
+    spread = market_context.get('current_spread', 0.0) if market_context.get('has_spread_market', True) else None
+    total_line = market_context.get('total_line')
+
+    batch_size = min(batch_size, budget) if adaptive else budget
+    parts: List[Dict[str, Any]] = []
+    hits = {"p_win_home": 0.0, "p_cover_home": 0.0, "p_over": 0.0}
+    trials = {"p_win_home": 0, "p_cover_home": 0, "p_over": 0}
+    half_widths: Dict[str, float] = {}
+    n_run = 0
+    converged = False
+
+    while n_run < budget:
+        size = min(batch_size, budget - n_run)
+        part = strategy.simulate_game(team_a_rating, team_b_rating, size, market_context, rng=rng)
+        parts.append(part)
+        n_run += size
+
+        margins = np.asarray(part["margins"], dtype=float)
+        hits["p_win_home"] += part["team_a_wins"] + part.get("pushes", 0) / 2
+        trials["p_win_home"] += size
+        if spread is not None:
+            hits["p_cover_home"] += float(np.count_nonzero(margins + spread > 0))
+            trials["p_cover_home"] += size
+        if total_line is not None:
+            totals = np.asarray(part["totals"], dtype=float)
+            overs = np.count_nonzero(totals > total_line)
+            hits["p_over"] += float(overs)
+            trials["p_over"] += int(overs + np.count_nonzero(totals < total_line))
+
+        half_widths = {}
+        for key, n in trials.items():
+            if n:
+                lower, upper = wilson_bounds(np.asarray(hits[key] / n), n)
+                half_widths[key] = round(float(upper - lower) / 2.0, 5)
+        converged = all(width <= target for width in half_widths.values())
+        if converged and n_run < budget:
+            logger.info(f"Adaptive convergence at {n_run}/{budget} iterations (half-widths: {half_widths})")
+            break
+
+    precision = {
+        "adaptive": adaptive,
+        "converged": converged,
+        "target_half_width": round(target, 5),
+        "half_widths": half_widths,
+        "iterations_used": n_run,
+        "iteration_budget": budget
+    }
+    return merge_strategy_results(parts), precision
+
+
 class MonteCarloEngine:
     """
     Advanced Monte Carlo Simulation Engine for Beat Vegas
@@ -334,17 +429,35 @@ class MonteCarloEngine:
     This is the core of the "moat" - unique probabilistic fingerprints
     """
     
-    def __init__(self, num_iterations: Optional[int] = None):
+    def __init__(
+        self,
+        num_iterations: Optional[int] = None,
+        adaptive_iterations: Optional[bool] = None,
+        ci_target_half_width: Optional[float] = None
+    ):
         """
         Initialize Monte Carlo Engine
         
         Args:
             num_iterations: Default number of iterations (based on user tier)
                            If None, defaults to 10,000 (FREE tier baseline)
+            adaptive_iterations: Treat the tier count as a ceiling and stop once every
+                           published probability has converged (default: MC_ADAPTIVE_ITERATIONS, on)
+            ci_target_half_width: Wilson 95% CI half-width to converge to. None = the
+                           worst-case half-width of the full budget (precision_target_for_budget),
+                           so adaptive runs never publish looser numbers than fixed ones
         """
         self.default_iterations = num_iterations or 10000
         self.min_iterations = 10000
         self.max_iterations = 100000
+        if adaptive_iterations is None:
+            adaptive_iterations = os.getenv("MC_ADAPTIVE_ITERATIONS", "true").lower() not in ("false", "0", "no")
+        self.adaptive_iterations = adaptive_iterations
+        self.ci_target_half_width = ci_target_half_width
+        self.convergence_batch_size = CONVERGENCE_BATCH_SIZE
+        # Simulation workers return stage timings with the result instead of
+        # observing them in their own process (services.slate_simulation_runner)
+        self.defer_stage_timings = False
         self.strategy_factory = SportStrategyFactory()
         self.clv_predictions = []  # Store CLV predictions for validation
         
@@ -383,7 +496,9 @@ class MonteCarloEngine:
         team_b: Dict[str, Any],
         market_context: Dict[str, Any],
         iterations: Optional[int] = None,
-        mode: str = "full"
+        mode: str = "full",
+        seed: Optional[int] = None,
+        persist: bool = True
     ) -> Dict[str, Any]:
         """
         Run Monte Carlo simulation for a single game
@@ -395,6 +510,10 @@ class MonteCarloEngine:
             market_context: Current odds, line movement, public betting %, sport_key
             iterations: Number of simulations (default: 50,000)
             mode: "full" for comprehensive analysis with distribution curves, "basic" for quick results
+            seed: Optional RNG seed for a reproducible run (recorded as rng_seed)
+            persist: When False, skip the monte_carlo_simulations write so the caller
+                     can batch it (see services.slate_simulation_runner); the
+                     joint sample sketch is then returned under "joint_sketch"
         
         Returns:
             Simulation results with win probabilities, spread distribution, props
@@ -407,6 +526,7 @@ class MonteCarloEngine:
         
         # Get sport-specific strategy
         sport_key = market_context.get('sport_key', 'basketball_nba')
+        timings = StageTimings(sport_key)
         
         # ===== ROSTER AVAILABILITY GOVERNANCE (INSTITUTIONAL-GRADE) =====
         # Check roster availability for both teams BEFORE running simulation
@@ -478,16 +598,25 @@ class MonteCarloEngine:
         team_b_adj = self._apply_adjustments(team_b, market_context)
         
         # Run sport-specific simulations using Strategy Pattern
-        results = strategy.simulate_game(
-            team_a_rating + team_a_adj,
-            team_b_rating + team_b_adj,
-            iterations,
-            market_context
-        )
+        # (tier count is a ceiling when adaptive - see simulate_to_precision)
+        iteration_budget = iterations
+        with timings.span("strategy_simulate"):
+            results, precision = simulate_to_precision(
+                strategy,
+                team_a_rating + team_a_adj,
+                team_b_rating + team_b_adj,
+                iteration_budget,
+                market_context,
+                np.random.default_rng(seed),
+                adaptive=self.adaptive_iterations,
+                target_half_width=self.ci_target_half_width,
+                batch_size=self.convergence_batch_size
+            )
+        iterations = int(len(results["margins"]))
         
-        # Calculate output metrics
-        margins_array = results["margins"]
-        totals_array = results["totals"]
+        # Calculate output metrics (strategies return ndarrays)
+        margins_array = np.asarray(results["margins"], dtype=float)
+        totals_array = np.asarray(results["totals"], dtype=float)
         margin_std = np.std(margins_array)
         avg_margin = results["team_a_total"] - results["team_b_total"]
         
@@ -503,24 +632,23 @@ class MonteCarloEngine:
         
         # Generate spread distribution as array with PROPER BINNING
         spread_dist_array = []
-        margin_counts = {}
         
         # BIN_SIZE: 0.5 for smooth distribution (not stepped/flat)
         BIN_SIZE = 0.5
         
-        for m in margins_array:
-            # Round to nearest 0.5 increment for smooth distribution
-            binned = round(m / BIN_SIZE) * BIN_SIZE
-            margin_counts[binned] = margin_counts.get(binned, 0) + 1
+        # Round to nearest 0.5 increment for smooth distribution
+        binned_margins, margin_counts = np.unique(
+            np.round(margins_array / BIN_SIZE) * BIN_SIZE,
+            return_counts=True
+        )
         
         # NORMALIZE: Ensure probabilities sum to 1.0
-        total_count = sum(margin_counts.values())
+        total_count = int(margin_counts.sum())
         
-        for margin in sorted(margin_counts.keys()):
-            normalized_prob = margin_counts[margin] / total_count
+        for margin, count in zip(binned_margins.tolist(), margin_counts.tolist()):
             spread_dist_array.append({
                 "margin": float(margin),
-                "probability": float(normalized_prob)  # Normalized, sum = 1
+                "probability": float(count / total_count)  # Normalized, sum = 1
             })
         
         # Verify normalization (debugging)
@@ -579,47 +707,48 @@ class MonteCarloEngine:
         # ✅ NOW ENABLED: Fetching real props from DraftKings/FanDuel/BetMGM/Caesars
         top_props = []
         
-        try:
-            from integrations.props_api import fetch_event_props, normalize_props
+        with timings.span("props_fetch"):
+            try:
+                from integrations.props_api import fetch_event_props, normalize_props
             
-            # Fetch real sportsbook props
-            event_props = fetch_event_props(event_id, market_context.get("sport_key", "americanfootball_nfl"))
+                # Fetch real sportsbook props
+                event_props = fetch_event_props(event_id, market_context.get("sport_key", "americanfootball_nfl"))
             
-            if event_props.get("bookmakers"):
-                # Normalize props with multi-book validation
-                home_team_name = team_a.get("name") or ""
-                away_team_name = team_b.get("name") or ""
+                if event_props.get("bookmakers"):
+                    # Normalize props with multi-book validation
+                    home_team_name = team_a.get("name") or ""
+                    away_team_name = team_b.get("name") or ""
                 
-                if home_team_name and away_team_name:
-                    normalized_props = normalize_props(
-                        event_props,
-                        home_team_name,
-                        away_team_name
-                    )
-                else:
-                    normalized_props = []
+                    if home_team_name and away_team_name:
+                        normalized_props = normalize_props(
+                            event_props,
+                            home_team_name,
+                            away_team_name
+                        )
+                    else:
+                        normalized_props = []
                 
-                # Convert to frontend format (top 10 by book count)
-                for prop in sorted(normalized_props, key=lambda x: x.get("book_count", 0), reverse=True)[:10]:
-                    top_props.append({
-                        "player": prop["player_name"],
-                        "prop_type": prop["market_name"],
-                        "line": prop["line"],
-                        "probability": prop.get("fair_over_prob", 0.5),
-                        "ev": prop.get("ev_percent", 0.0),
-                        "edge": prop.get("edge", 0.0),
-                        "ai_projection": prop.get("model_projection", prop["line"]),
-                        "books": [b["book_name"] for b in prop["books"]],
-                        "book_count": prop["book_count"]
-                    })
+                    # Convert to frontend format (top 10 by book count)
+                    for prop in sorted(normalized_props, key=lambda x: x.get("book_count", 0), reverse=True)[:10]:
+                        top_props.append({
+                            "player": prop["player_name"],
+                            "prop_type": prop["market_name"],
+                            "line": prop["line"],
+                            "probability": prop.get("fair_over_prob", 0.5),
+                            "ev": prop.get("ev_percent", 0.0),
+                            "edge": prop.get("edge", 0.0),
+                            "ai_projection": prop.get("model_projection", prop["line"]),
+                            "books": [b["book_name"] for b in prop["books"]],
+                            "book_count": prop["book_count"]
+                        })
                 
-                logger.info(f"✅ Integrated {len(top_props)} REAL sportsbook props")
-            else:
-                logger.info("ℹ️  No sportsbook props available for this event")
+                    logger.info(f"✅ Integrated {len(top_props)} REAL sportsbook props")
+                else:
+                    logger.info("ℹ️  No sportsbook props available for this event")
         
-        except Exception as e:
-            logger.warning(f"⚠️  Props fetch failed: {e}")
-            # Don't fail simulation if props fail
+            except Exception as e:
+                logger.warning(f"⚠️  Props fetch failed: {e}")
+                # Don't fail simulation if props fail
         
         # Determine volatility label using sport-specific thresholds
         thresholds = strategy.get_volatility_thresholds()
@@ -679,24 +808,24 @@ class MonteCarloEngine:
             
             # Log decomposition
             simulation_id = f"sim_{event_id}_{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}"
-            self.decomposition_logger.log_decomposition(
-                game_id=event_id,
-                sport=sport_key,
-                simulation_id=simulation_id,
-                team_a_name=team_a.get("name", "Team A"),
-                team_b_name=team_b.get("name", "Team B"),
-                decomposition_data=decomposition_data,
-                model_total=float(np.median(totals_array)),
-                vegas_total=market_context.get('total_line', 0.0),
-                timestamp=datetime.now(timezone.utc)
-            )
+            with timings.span("decomposition_log"):
+                self.decomposition_logger.log_decomposition(
+                    game_id=event_id,
+                    sport=sport_key,
+                    simulation_id=simulation_id,
+                    team_a_name=team_a.get("name", "Team A"),
+                    team_b_name=team_b.get("name", "Team B"),
+                    decomposition_data=decomposition_data,
+                    model_total=float(np.median(totals_array)),
+                    vegas_total=market_context.get('total_line', 0.0),
+                    timestamp=datetime.now(timezone.utc)
+                )
             logger.info(f"✅ Decomposition logged: {event_id}")
         except Exception as e:
             logger.error(f"Failed to log decomposition: {e}")
             # Don't fail simulation if logging fails
         
         # Calculate projected totals from simulation data (NUMERICAL ACCURACY ENFORCED)
-        totals_array = np.array(results["totals"])
         median_total = float(np.median(totals_array))
         mean_total = float(np.mean(totals_array))
         variance_total = float(np.var(totals_array))
@@ -740,10 +869,11 @@ class MonteCarloEngine:
         # home_win_probability and away_win_probability are already set
         
         # Calculate tier-aware confidence score (NUMERICAL ACCURACY)
-        tier_config = SimulationTierConfig.get_tier_config(iterations)
+        # Tier = iteration budget; adaptive runs stop only once they match its precision
+        tier_config = SimulationTierConfig.get_tier_config(iteration_budget)
         confidence_result = ConfidenceCalculator.calculate(
             variance=variance_total,
-            sim_count=iterations,
+            sim_count=iteration_budget,
             volatility=volatility_label,
             median_value=median_total
         )
@@ -905,7 +1035,6 @@ class MonteCarloEngine:
         #   - Example 2: HOME -7.5, margin = +5  → 5 + (-7.5) = -2.5 < 0 ❌ Doesn't cover
         #   - Example 3: HOME +3.5, margin = -2  → -2 + 3.5 = 1.5 > 0 ✅ Covers
         # 
-        margins_array = np.array(results["margins"])
         if spread_market_available:
             home_covers_count = np.sum(margins_array + vegas_spread_home_perspective > 0)
             p_cover_home = float(home_covers_count / iterations)
@@ -1207,23 +1336,24 @@ class MonteCarloEngine:
             game_id=event_id,
             odds_event_id=event_id,
         )
-        spread_decision = computer.compute_spread(
-            odds_snapshot=market_context,
-            sim_result={
-                "model_spread_home_perspective": model_spread_home_perspective,
-                "home_cover_probability": p_cover_home,
-                "away_cover_probability": p_cover_away,
-                "computed_at": datetime.now(timezone.utc).isoformat(),
-                "volatility": volatility_label,
-                "total_injury_impact": sum(abs(inj.get("impact_points", 0)) for inj in injury_impact),
-                "simulation_id": simulation_id,
-                "rcl_total": rcl_total,
-                "over_probability": over_probability,
-                "under_probability": under_probability,
-            },
-            config={"profile": tier_config.get("label", "balanced")},
-            game_competitors={home_team_name: home_team_name, away_team_name: away_team_name},
-        )
+        with timings.span("market_decision"):
+            spread_decision = computer.compute_spread(
+                odds_snapshot=market_context,
+                sim_result={
+                    "model_spread_home_perspective": model_spread_home_perspective,
+                    "home_cover_probability": p_cover_home,
+                    "away_cover_probability": p_cover_away,
+                    "computed_at": datetime.now(timezone.utc).isoformat(),
+                    "volatility": volatility_label,
+                    "total_injury_impact": sum(abs(inj.get("impact_points", 0)) for inj in injury_impact),
+                    "simulation_id": simulation_id,
+                    "rcl_total": rcl_total,
+                    "over_probability": over_probability,
+                    "under_probability": under_probability,
+                },
+                config={"profile": tier_config.get("label", "balanced")},
+                game_competitors={home_team_name: home_team_name, away_team_name: away_team_name},
+            )
         spread_edge_class = "INVALID" if spread_integrity_errors else (spread_decision.classification.value if spread_decision.classification else "MARKET_ALIGNED")
         spread_ui_mode = "SAFE" if spread_integrity_errors else "FULL"
 
@@ -1277,20 +1407,21 @@ class MonteCarloEngine:
         total_selections["over"]["model_fair_line_for_selection"] = rcl_total
         total_selections["under"]["model_fair_line_for_selection"] = rcl_total
         total_prob_valid = abs((over_probability or 0) + (under_probability or 0) - 1.0) <= probability_tolerance
-        total_decision = computer.compute_total(
-            odds_snapshot=market_context,
-            sim_result={
-                "rcl_total": rcl_total,
-                "over_probability": over_probability,
-                "under_probability": under_probability,
-                "computed_at": datetime.now(timezone.utc).isoformat(),
-                "volatility": volatility_label,
-                "total_injury_impact": sum(abs(inj.get("impact_points", 0)) for inj in injury_impact),
-                "simulation_id": simulation_id,
-            },
-            config={"profile": tier_config.get("label", "balanced")},
-            game_competitors={home_team_name: home_team_name, away_team_name: away_team_name},
-        )
+        with timings.span("market_decision"):
+            total_decision = computer.compute_total(
+                odds_snapshot=market_context,
+                sim_result={
+                    "rcl_total": rcl_total,
+                    "over_probability": over_probability,
+                    "under_probability": under_probability,
+                    "computed_at": datetime.now(timezone.utc).isoformat(),
+                    "volatility": volatility_label,
+                    "total_injury_impact": sum(abs(inj.get("impact_points", 0)) for inj in injury_impact),
+                    "simulation_id": simulation_id,
+                },
+                config={"profile": tier_config.get("label", "balanced")},
+                game_competitors={home_team_name: home_team_name, away_team_name: away_team_name},
+            )
         # Canonical write-path source of truth for total market:
         # edge_class and selection IDs must be derived from the SAME decision object.
         total_integrity_errors = []
@@ -1531,7 +1662,7 @@ class MonteCarloEngine:
             away_win_probability=away_win_probability,
             h1_median_total=None,  # Set separately if 1H simulation exists
             h1_variance=None,
-            sim_count=iterations,
+            sim_count=iteration_budget,
             timestamp=datetime.now(timezone.utc),
             source="monte_carlo_engine"
         )
@@ -1542,7 +1673,9 @@ class MonteCarloEngine:
         simulation_result = {
             "simulation_id": simulation_id,
             "event_id": event_id,
-            "iterations": iterations,
+            "iterations": iterations,  # Actually run (<= iteration_budget when adaptive)
+            "iteration_budget": iteration_budget,
+            "precision": precision,
             "mode": mode,
             "sport_key": market_context.get("sport_key", "basketball_nba"),
             "team_a": team_a.get("name"),
@@ -1631,6 +1764,8 @@ class MonteCarloEngine:
             "distribution_curve": spread_dist_array,  # For graphing score margins
             "spread_distribution": spread_dist_array,  # Array format for charts (legacy)
             "total_distribution": self._calculate_total_distribution(results["totals"]),
+            # Compact margin/total histograms: re-price any line move without re-simulating
+            "distribution_sketch": DistributionSketch.from_samples(margins_array, totals_array).to_doc(),
             
             # Confidence score (tier-aware, formula-based)
             "confidence_score": confidence_score,
@@ -1879,7 +2014,10 @@ class MonteCarloEngine:
             "status": "pending",  # Will be updated to WIN/LOSS/PUSH after game completes
             
             # Debug label (dev mode only)
-            "debug_label": get_debug_label("monte_carlo_engine", iterations, median_total, variance_total)
+            "debug_label": get_debug_label("monte_carlo_engine", iterations, median_total, variance_total),
+            
+            # Reproducibility: seed used for the strategy's RNG (None = OS entropy)
+            "rng_seed": seed
         }
         
         # Enforce canonical contract before persisting so contradictory states
@@ -1889,19 +2027,40 @@ class MonteCarloEngine:
         # Sanitize numpy types before saving to MongoDB
         simulation_result = sanitize_mongo_doc(simulation_result)
 
-        # TASK 2 INTEGRITY GUARD (fail-closed): never persist a simulation
-        # unless a canonical event record exists for this event_id.
-        event_exists = db["events"].find_one({"event_id": event_id}, {"_id": 1}) is not None
-        if not event_exists:
-            raise ValueError(f"SIMULATION_ORPHAN_BLOCKED: missing event record for event_id={event_id}")
-        
-        # Store simulation in database - use update_one with upsert to avoid duplicate key errors
-        # This handles regeneration cases where simulation_id might already exist
-        db["monte_carlo_simulations"].update_one(
-            {"simulation_id": simulation_result["simulation_id"]},
-            {"$set": simulation_result},
-            upsert=True
-        )
+        if persist:
+            # TASK 2 INTEGRITY GUARD (fail-closed): never persist a simulation
+            # unless a canonical event record exists for this event_id.
+            with timings.span("persistence"):
+                event_record = db["events"].find_one(
+                    {"event_id": event_id},
+                    {"_id": 0, "event_id": 1, "sport_key": 1, "home_team": 1, "away_team": 1, "commence_time": 1}
+                )
+                if event_record is None:
+                    raise ValueError(f"SIMULATION_ORPHAN_BLOCKED: missing event record for event_id={event_id}")
+            
+                # Store simulation in database - use update_one with upsert to avoid duplicate key errors
+                # This handles regeneration cases where simulation_id might already exist
+                db["monte_carlo_simulations"].update_one(
+                    {"simulation_id": simulation_result["simulation_id"]},
+                    {"$set": simulation_result},
+                    upsert=True
+                )
+                
+                # Keep the pre-scored parlay leg pool in step with the stored simulation
+                try:
+                    upsert_pool_leg(simulation_result, event_record)
+                except Exception as e:
+                    logger.warning(f"Parlay leg pool upsert failed for {event_id}: {e}")
+                
+                # Compressed (margin, total) sample matrix for joint parlay pricing
+                try:
+                    store_joint_sketch(simulation_result["simulation_id"], event_record, margins_array, totals_array)
+                except Exception as e:
+                    logger.warning(f"Joint sample store failed for {event_id}: {e}")
+        else:
+            # The raw samples do not leave this process; hand back the encoded
+            # sketch so the batching caller can store it (slate_simulation_runner)
+            simulation_result[JOINT_SKETCH_RESULT_KEY] = JointSampleSketch.from_samples(margins_array, totals_array).to_doc()
         
         # ===== FEEDBACK LOOP: Store predictions for future grading =====
         try:
@@ -1927,7 +2086,7 @@ class MonteCarloEngine:
                         "bookmaker": market_context.get("bookmaker_source", "Consensus"),
                         "timestamp": market_context.get("odds_timestamp", datetime.now(timezone.utc).isoformat())
                     },
-                    sim_count=iterations
+                    sim_count=iteration_budget
                 )
             
             # Store total prediction if there's an edge
@@ -1960,7 +2119,7 @@ class MonteCarloEngine:
                         "bookmaker": market_context.get("bookmaker_source", "Consensus"),
                         "timestamp": market_context.get("odds_timestamp", datetime.now(timezone.utc).isoformat())
                     },
-                    sim_count=iterations
+                    sim_count=iteration_budget
                 )
         except Exception as e:
             logger.warning(f"Failed to store prediction for feedback loop: {str(e)}")
@@ -2009,6 +2168,10 @@ class MonteCarloEngine:
         # ===== ENFORCE NO UNKNOWN STATES =====
         # CRITICAL: Every simulation MUST have explicit pick_state (spec #8)
         simulation_result = ensure_pick_state(simulation_result)
+        if self.defer_stage_timings:
+            simulation_result[STAGE_TIMINGS_RESULT_KEY] = timings.finish()
+        else:
+            timings.record()
         
         return simulation_result
     
@@ -2120,7 +2283,7 @@ class MonteCarloEngine:
         
         # Results are already scaled - no need to multiply again
         # Calculate period-specific metrics (NUMERICAL ACCURACY ENFORCED)
-        totals_array = np.array(results["totals"])
+        totals_array = np.asarray(results["totals"], dtype=float)
         h1_median_total = float(np.median(totals_array))
         h1_mean_total = float(np.mean(totals_array))
         h1_variance = float(np.var(totals_array))
@@ -2230,6 +2393,7 @@ class MonteCarloEngine:
             # O/U probabilities (None if no bookmaker line)
             "over_probability": round(over_probability, 4) if over_probability is not None else None,
             "under_probability": round(under_probability, 4) if under_probability is not None else None,
+            "distribution_sketch": DistributionSketch.from_samples(results["margins"], totals_array).to_doc(),
             
             # Confidence and tier info
             "confidence": confidence_score,
@@ -2510,9 +2674,11 @@ class MonteCarloEngine:
         spreads = [-10.5, -7.5, -4.5, -3.5, -2.5, -1.5, 0, 1.5, 2.5, 3.5, 4.5, 7.5, 10.5]
         distribution = {}
         
+        margins = np.asarray(margins, dtype=float)
+        
         for spread in spreads:
             # Count how often team A covers this spread
-            covers = sum(1 for m in margins if m > spread)
+            covers = int(np.count_nonzero(margins > spread))
             distribution[f"spread_{spread:+.1f}"] = round(covers / len(margins), 4)
         
         return distribution
@@ -2524,9 +2690,11 @@ class MonteCarloEngine:
         total_lines = [180.5, 190.5, 200.5, 210.5, 220.5, 230.5, 240.5]
         distribution = {}
         
+        totals = np.asarray(totals, dtype=float)
+        
         for total_line in total_lines:
             # Count how often game goes over this total
-            overs = sum(1 for t in totals if t > total_line)
+            overs = int(np.count_nonzero(totals > total_line))
             distribution[f"total_o{total_line:.1f}"] = round(overs / len(totals), 4)
             distribution[f"total_u{total_line:.1f}"] = round(1 - (overs / len(totals)), 4)
         
@@ -2701,8 +2869,15 @@ class MonteCarloEngine:
         """
         Calculate correlation between parlay legs
         
-        Correlated picks reduce true parlay value
+        Correlated picks change true parlay value
         Example: Same game spread + total are correlated
+        
+        Legs are evaluated jointly on each game's stored (margin, total)
+        samples (core.joint_parlay_pricing), so same-game correlation is
+        measured rather than assumed; legs from different games multiply.
+        The measured joint/independent ratio scales the product of the
+        picks' own win_probability values. Picks without a market/side/line
+        or a stored sample matrix are treated as independent.
         """
         if len(picks) < 2:
             return {"correlation": 0.0, "adjusted_probability": 1.0}
@@ -2710,27 +2885,28 @@ class MonteCarloEngine:
         # Detect same-game parlays
         same_game = len(set(p["event_id"] for p in picks)) < len(picks)
         
-        if same_game:
-            # High correlation penalty
-            correlation = 0.7
-        else:
-            # Low correlation for different games
-            correlation = 0.1
-        
         # Calculate naive parlay probability
         naive_prob = 1.0
         for pick in picks:
             naive_prob *= pick.get("win_probability", 0.5)
         
-        # Adjust for correlation
-        adjusted_prob = naive_prob * (1 - correlation * 0.3)
+        priced = None
+        try:
+            priced = price_picks(picks)
+        except Exception as e:
+            logger.warning(f"Joint parlay pricing failed, assuming independence: {e}")
+        
+        factor = priced.correlation_factor if priced else 1.0
+        adjusted_prob = min(1.0, naive_prob * factor)
         
         return {
-            "correlation": round(correlation, 3),
+            # Relative lift of the joint hit probability over independence
+            "correlation": round(factor - 1.0, 3),
             "naive_probability": round(naive_prob, 4),
             "adjusted_probability": round(adjusted_prob, 4),
             "same_game_parlay": same_game,
-            "edge_impact": round((naive_prob - adjusted_prob) * 100, 2)
+            "edge_impact": round((naive_prob - adjusted_prob) * 100, 2),
+            "joint_pricing": priced.to_dict() if priced else None
         }
 
 
@@ -3,8 +3,9 @@ NFL-Specific Simulation Strategy with Anti-Over Bias Corrections
 Implements drive-based simulation with proper clock management, defensive regression, and market anchoring
 """
 import numpy as np
-from typing import Dict, Any
-import random
+from typing import Dict, Any, Optional
+
+from core.sport_strategies import simulate_drive_scores, summarize_scores
 
 
 class NFLDriveBasedStrategy:
@@ -51,7 +52,8 @@ class NFLDriveBasedStrategy:
         team_a_rating: float,
         team_b_rating: float,
         iterations: int,
-        context: Dict[str, Any]
+        context: Dict[str, Any],
+        rng: Optional[np.random.Generator] = None
     ) -> Dict[str, Any]:
         """
         Simulate NFL game using drive-based model
@@ -61,6 +63,7 @@ class NFLDriveBasedStrategy:
             team_b_rating: Away team offensive efficiency (pts/drive expected)
             iterations: Number of Monte Carlo simulations
             context: Game context (market total, injuries, weather, etc.)
+            rng: Optional numpy Generator (seeded for reproducible runs)
         
         Returns:
             Simulation results with anti-over bias corrections applied
@@ -86,41 +89,22 @@ class NFLDriveBasedStrategy:
         team_a_rating_adjusted *= (1.0 - weather_impact)
         team_b_rating_adjusted *= (1.0 - weather_impact)
         
-        # Run simulations
-        team_a_wins = 0
-        team_b_wins = 0
-        pushes = 0
-        team_a_total_points = 0.0
-        team_b_total_points = 0.0
-        margins = []
-        totals = []
-        
-        for i in range(iterations):
-            # Simulate single game
-            team_a_score, team_b_score = self._simulate_single_game(
-                team_a_rating_adjusted,
-                team_b_rating_adjusted,
-                context
-            )
-            
-            margin = team_a_score - team_b_score
-            total = team_a_score + team_b_score
-            
-            margins.append(margin)
-            totals.append(total)
-            team_a_total_points += team_a_score
-            team_b_total_points += team_b_score
-            
-            # Determine winner
-            if abs(margin) < 0.5:
-                pushes += 1
-            elif margin > 0:
-                team_a_wins += 1
-            else:
-                team_b_wins += 1
+        # Simulate all games' drives in one batch
+        team_a_scores, team_b_scores = simulate_drive_scores(
+            team_a_rating_adjusted,
+            team_b_rating_adjusted,
+            iterations,
+            rng if rng is not None else np.random.default_rng(),
+            avg_drives=self.LEAGUE_AVG_DRIVES_PER_TEAM,
+            league_ppd=self.LEAGUE_AVG_POINTS_PER_DRIVE,
+            td_prob=self.DRIVE_OUTCOMES['touchdown'],
+            fg_prob=self.DRIVE_OUTCOMES['field_goal'],
+            blowout_reduction=(0.0, 0.15)
+        )
+        results = summarize_scores(team_a_scores, team_b_scores, push_tolerance=0.5)
         
         # Calculate divergence from market (for confidence penalty)
-        median_total = np.median(totals)
+        median_total = np.median(results['totals'])
         divergence_penalty = 0.0
         if market_total:
             divergence = abs(median_total - market_total)
@@ -128,107 +112,12 @@ class NFLDriveBasedStrategy:
                 excess_divergence = divergence - self.MAX_DIVERGENCE_NO_PENALTY
                 divergence_penalty = excess_divergence * self.DIVERGENCE_PENALTY_RATE
         
-        return {
-            'team_a_wins': team_a_wins,
-            'team_b_wins': team_b_wins,
-            'pushes': pushes,
-            'team_a_total': team_a_total_points,
-            'team_b_total': team_b_total_points,
-            'margins': margins,
-            'totals': totals,
+        results.update({
             'divergence_penalty': divergence_penalty,  # NEW: Confidence reduction
             'weather_impact': weather_impact,
             'market_anchor_applied': market_total is not None
-        }
-    
-    def _simulate_single_game(
-        self,
-        team_a_ppd: float,
-        team_b_ppd: float,
-        context: Dict[str, Any]
-    ) -> tuple:
-        """
-        Simulate a single NFL game using drive-based physics
-        
-        Returns:
-            (team_a_score, team_b_score) tuple
-        """
-        team_a_score = 0
-        team_b_score = 0
-        
-        # Determine number of drives (with variance)
-        base_drives = self.LEAGUE_AVG_DRIVES_PER_TEAM
-        drive_variance = random.gauss(0, 1.2)  # ±1.2 drives std dev
-        num_drives_per_team = max(8, min(14, int(base_drives + drive_variance)))
-        
-        # Simulate drives for each team
-        for _ in range(num_drives_per_team):
-            team_a_score += self._simulate_drive(team_a_ppd, 'offense')
-            team_b_score += self._simulate_drive(team_b_ppd, 'offense')
-        
-        # Apply defensive regression (pull toward league average)
-        team_a_score = self._apply_defensive_regression(team_a_score, num_drives_per_team)
-        team_b_score = self._apply_defensive_regression(team_b_score, num_drives_per_team)
-        
-        # Apply clock management (late-game bleed)
-        if abs(team_a_score - team_b_score) > 14:
-            # Blowout: fewer late possessions
-            reduction = random.uniform(0.0, 0.15)
-            team_a_score *= (1.0 - reduction)
-            team_b_score *= (1.0 - reduction)
-        
-        return (round(team_a_score), round(team_b_score))
-    
-    def _simulate_drive(self, ppd_expected: float, drive_type: str) -> float:
-        """
-        Simulate a single drive outcome
-        
-        Args:
-            ppd_expected: Expected points per drive for this team
-            drive_type: 'offense' or 'defense'
-        
-        Returns:
-            Points scored on this drive (0, 3, or 7 typically)
-        """
-        # Determine drive outcome based on league probabilities + team efficiency
-        # Higher ppd_expected → more likely to score
-        
-        # Adjust outcome probabilities based on team efficiency
-        efficiency_factor = ppd_expected / self.LEAGUE_AVG_POINTS_PER_DRIVE
-        
-        # Boost scoring outcomes, reduce punt outcomes
-        touchdown_prob = self.DRIVE_OUTCOMES['touchdown'] * min(1.5, efficiency_factor)
-        field_goal_prob = self.DRIVE_OUTCOMES['field_goal'] * min(1.3, efficiency_factor)
-        no_score_prob = 1.0 - touchdown_prob - field_goal_prob
-        
-        # Roll for outcome
-        rand = random.random()
-        
-        if rand < touchdown_prob:
-            return 7.0  # Touchdown + PAT
-        elif rand < (touchdown_prob + field_goal_prob):
-            return 3.0  # Field goal
-        else:
-            return 0.0  # No score (punt/turnover/downs)
-    
-    def _apply_defensive_regression(self, raw_score: float, num_drives: int) -> float:
-        """
-        Apply defensive mean reversion
-        Pulls extreme scores back toward league average
-        
-        This prevents unrealistic 45+ point games from a hot offensive run
-        """
-        league_avg_total_points = self.LEAGUE_AVG_POINTS_PER_DRIVE * num_drives
-        
-        # Calculate regression strength (stronger for larger deviations)
-        deviation = abs(raw_score - league_avg_total_points)
-        regression_strength = min(0.25, deviation / 20.0)  # Max 25% regression
-        
-        # Pull score toward league average
-        regressed_score = raw_score * (1.0 - regression_strength) + \
-                          league_avg_total_points * regression_strength
-        
-        return regressed_score
+        })
+        return results
     
     def _apply_market_anchor(
         self,
@@ -15,7 +15,7 @@ Key Features:
 from __future__ import annotations
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Dict, Tuple, Optional, Iterable, Any
+from typing import List, Dict, Tuple, Optional, Iterable, Any, Callable
 import random
 import math
 from datetime import datetime, timezone
@@ -73,6 +73,10 @@ class Leg:
     true_probability: Optional[float] = None
     american_odds: Optional[int] = None
 
+    # structured pick for joint pricing on simulation samples
+    side: Optional[str] = None  # HOME/AWAY (spread, moneyline) or OVER/UNDER (total)
+    line: Optional[float] = None  # signed for the picked team (spread) / total line
+
 
 @dataclass
 class ParlayRequest:
@@ -96,6 +100,7 @@ class ParlayResult:
     legs_requested: int
     legs_selected: List[Leg] = field(default_factory=list)
     parlay_weight: float = 0.0
+    correlation_factor: float = 1.0  # joint / independent hit probability of legs_selected
     reason_code: Optional[str] = None
     reason_detail: Optional[Dict[str, Any]] = None
 
@@ -224,10 +229,15 @@ def compute_leg_weight(leg: Leg) -> float:
     return max(0.0, weight)
 
 
-def compute_parlay_weight(legs: List[Leg]) -> float:
+def compute_parlay_weight(legs: List[Leg], correlation_factor: float = 1.0) -> float:
     """
     Parlay weight is the product-ish of leg weights, but keep it stable:
     sum of log weights with floor to avoid zeroing out.
+    
+    correlation_factor is the legs' joint / independent hit probability
+    (1.0 = independent); its log is added so legs that work against each
+    other on the same simulated games weigh less, and legs that hit
+    together weigh more.
     """
     if not legs:
         return 0.0
@@ -235,7 +245,7 @@ def compute_parlay_weight(legs: List[Leg]) -> float:
     for leg in legs:
         lw = max(1e-6, compute_leg_weight(leg))
         w += math.log(lw + 1.0)  # log(1+w) keeps sane scale
-    return w
+    return w + math.log(max(1e-6, correlation_factor))
 
 
 # -----------------------------
@@ -363,6 +373,7 @@ def apply_fallback(base: ProfileRules, step: Dict) -> ProfileRules:
 def build_parlay(
     all_legs: Iterable[Leg],
     req: ParlayRequest,
+    correlation_fn: Optional[Callable[[List[Leg]], float]] = None,
 ) -> ParlayResult:
     """
     Main parlay generation function.
@@ -373,6 +384,10 @@ def build_parlay(
     
     Never returns None or silently fails.
     
+    correlation_fn, when given, returns the joint / independent hit
+    probability of the selected legs (e.g. measured on shared simulation
+    samples); without it legs are treated as independent.
+    
     Tier Inventory Logging (Production-Safe Addendum):
     Every attempt logs:
     - eligible_by_tier: counts of EDGE/PICK/LEAN legs in the eligible pool
@@ -468,7 +483,7 @@ def build_parlay(
     # Try normal + fallbacks
     for step_i, step in enumerate(FALLBACK_STEPS):
         rules = apply_fallback(base_rules, step)
-        attempt = _attempt_build(pool, req, rules, rng)
+        attempt = _attempt_build(pool, req, rules, rng, correlation_fn)
         if attempt.status == "PARLAY":
             attempt.reason_detail = (attempt.reason_detail or {}) | {
                 "fallback_step": step_i,
@@ -500,6 +515,7 @@ def _attempt_build(
     req: ParlayRequest,
     rules: ProfileRules,
     rng: random.Random,
+    correlation_fn: Optional[Callable[[List[Leg]], float]] = None,
 ) -> ParlayResult:
     """
     Greedy + constrained selection:
@@ -628,7 +644,8 @@ def _attempt_build(
         }
     
     # Parlay weight check
-    pw = compute_parlay_weight(selected)
+    correlation_factor = correlation_fn(selected) if correlation_fn else 1.0
+    pw = compute_parlay_weight(selected, correlation_factor)
     if pw < rules.min_parlay_weight:
         return ParlayResult(
             status="FAIL",
@@ -638,6 +655,7 @@ def _attempt_build(
             reason_detail={
                 "parlay_weight": round(pw, 4),
                 "min_required": rules.min_parlay_weight,
+                "correlation_factor": round(correlation_factor, 4),
                 "counts": {k.value: v for k, v in counts.items()},
                 "tier_warnings": tier_warnings if tier_warnings else None,
             },
@@ -658,5 +676,6 @@ def _attempt_build(
         legs_requested=req.legs,
         legs_selected=selected,
         parlay_weight=pw,
+        correlation_factor=correlation_factor,
         reason_detail=result_detail,
     )
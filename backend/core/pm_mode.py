@@ -236,7 +236,7 @@ def pm_mode_workflow_example():
     # result = engine.run_simulation(context, simulation_fn)
     
     # 2. Run stability test
-    # stability = engine.run_perturbation_test(context, simulation_fn)
+    # stability = engine.run_batched_perturbation_test(context, batched_simulation_fn)
     
     # 3. Evaluate for PM Mode
     pm = PMMode()
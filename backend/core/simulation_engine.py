@@ -11,7 +11,8 @@ Key Features:
 """
 
 from __future__ import annotations
-from typing import Dict, List, Optional, Tuple, Callable
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Callable, Union
 import numpy as np
 from datetime import datetime, timezone
 import logging
@@ -26,6 +27,42 @@ from .simulation_context import (
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class PerturbationBatch:
+    """
+    Per-row inputs for a batched stability test.
+    
+    Row 0 is the unperturbed context; rows 1..k are perturbations.
+    """
+    pace_projection: Optional[np.ndarray]  # (rows,), None when context has no pace
+    minutes_projections: np.ndarray  # (rows, n_injuries), NaN where no projection
+    player_ids: Tuple[str, ...]
+    
+    @property
+    def size(self) -> int:
+        return int(self.minutes_projections.shape[0])
+
+
+# (rng, n, batch) -> (batch.size, n) binary outcomes
+BatchedSimulationFn = Callable[[np.random.Generator, int, PerturbationBatch], np.ndarray]
+
+
+def wilson_bounds(
+    p_hat: np.ndarray,
+    n: Union[int, np.ndarray],
+    confidence_level: float = 0.95,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized Wilson score bounds for one or many proportions at sample size(s) n"""
+    # Z-score for confidence level (1.96 for 95%)
+    z = 1.96 if confidence_level == 0.95 else 2.576  # 99%
+    
+    denominator = 1 + (z**2 / n)
+    center = (p_hat + (z**2 / (2 * n))) / denominator
+    margin = (z / denominator) * np.sqrt((p_hat * (1 - p_hat) / n) + (z**2 / (4 * n**2)))
+    
+    return np.maximum(0.0, center - margin), np.minimum(1.0, center + margin)
+
+
 class SimulationEngine:
     """
     Deterministic Monte Carlo simulation engine.
@@ -79,29 +116,31 @@ class SimulationEngine:
         converged = False
         
         if context.n_simulations > self.convergence_check_interval:
-            # Progressive convergence check
-            results = []
+            # Progressive convergence check from running sums (O(batch) per check)
+            hits = 0.0
+            n_done = 0
             for batch_start in range(0, context.n_simulations, self.convergence_check_interval):
                 batch_size = min(self.convergence_check_interval, context.n_simulations - batch_start)
                 batch_results = simulation_fn(rng, batch_size)
-                results.extend(batch_results)
+                hits += float(np.sum(batch_results))
+                n_done += len(batch_results)
                 
                 # Check convergence
-                ci = self._calculate_confidence_interval(np.array(results))
+                ci = self._wilson_interval(hits, n_done)
                 if ci.half_width <= self.ci_target_half_width:
-                    n_run = len(results)
                     converged = True
-                    logger.info(f"Convergence achieved at {n_run} simulations (CI half-width: {ci.half_width:.4f})")
+                    logger.info(f"Convergence achieved at {n_done} simulations (CI half-width: {ci.half_width:.4f})")
                     break
-            
-            results = np.array(results)
+            n_run = n_done
         else:
             # Run all at once
             results = simulation_fn(rng, context.n_simulations)
+            hits = float(np.sum(results))
+            n_run = len(results)
         
         # Calculate probability and confidence interval
-        model_prob = float(np.mean(results))
-        ci = self._calculate_confidence_interval(results)
+        model_prob = hits / n_run
+        ci = self._wilson_interval(hits, n_run)
         
         # Edge calculation
         devig_prob = context.market.devig_prob
@@ -165,28 +204,25 @@ class SimulationEngine:
         
         Uses Wilson score interval (more accurate than normal approximation).
         """
-        n = len(results)
+        return self._wilson_interval(float(np.sum(results)), len(results), confidence_level)
+    
+    def _wilson_interval(
+        self,
+        hits: float,
+        n: int,
+        confidence_level: float = 0.95,
+    ) -> ConfidenceInterval:
+        """Wilson score interval from running sums (hit count, sample count)"""
         if n == 0:
             return ConfidenceInterval(0.0, 1.0, 0.5, confidence_level)
         
-        p_hat = float(np.mean(results))
-        
-        # Z-score for confidence level (1.96 for 95%)
-        z = 1.96 if confidence_level == 0.95 else 2.576  # 99%
-        
-        # Wilson score interval
-        denominator = 1 + (z**2 / n)
-        center = (p_hat + (z**2 / (2 * n))) / denominator
-        margin = (z / denominator) * np.sqrt((p_hat * (1 - p_hat) / n) + (z**2 / (4 * n**2)))
-        
-        lower = max(0.0, center - margin)
-        upper = min(1.0, center + margin)
-        half_width = (upper - lower) / 2.0
+        lower, upper = wilson_bounds(np.asarray(hits / n), n, confidence_level)
+        lower, upper = float(lower), float(upper)
         
         return ConfidenceInterval(
             lower=lower,
             upper=upper,
-            half_width=half_width,
+            half_width=(upper - lower) / 2.0,
             confidence_level=confidence_level,
         )
     
@@ -247,6 +283,10 @@ class SimulationEngine:
         
         A stable play maintains edge >= threshold across most perturbations.
         Priority plays should have stability >= 0.70.
+        
+        Runs one full simulation per perturbation with independent draws;
+        prefer run_batched_perturbation_test when the model can take
+        per-row inputs.
         """
         base_result = self.run_simulation(context, simulation_fn)
         
@@ -284,6 +324,124 @@ class SimulationEngine:
             "base_edge_percent": base_result.edge_percent,
         }
     
+    def run_batched_perturbation_test(
+        self,
+        context: SimulationContext,
+        batched_simulation_fn: BatchedSimulationFn,
+        n_perturbations: int = 100,
+        perturbation_magnitude: float = 0.05,  # 5% variation
+    ) -> Dict[str, float]:
+        """
+        Stability test with every perturbation evaluated in one batched pass.
+        
+        batched_simulation_fn(rng, n, batch) returns a (batch.size, n) array of
+        binary outcomes. It should draw its base random numbers once per call
+        (shape (n,)) and apply each row's inputs to those same draws (common
+        random numbers), so row differences come from the perturbation rather
+        than resampling noise.
+        
+        Row 0 is the base context, seeded exactly like run_simulation. Hit
+        counts and Wilson CIs are kept as running sums per row, and each row
+        stops counting at its own convergence check, as run_simulation does
+        (so the base row's edge matches run_simulation). Batches stop once
+        every row has converged. Total cost is ~one simulation.
+        """
+        seed = context.deterministic_seed()
+        rng = np.random.default_rng(seed)
+        batch = self._perturbation_batch(
+            context,
+            np.random.default_rng(seed + 999999),
+            n_perturbations,
+            perturbation_magnitude,
+        )
+        
+        hits = np.zeros(batch.size)
+        row_n = np.zeros(batch.size)
+        active = np.ones(batch.size, dtype=bool)
+        n_run = 0
+        while n_run < context.n_simulations:
+            batch_size = min(self.convergence_check_interval, context.n_simulations - n_run)
+            outcomes = np.asarray(batched_simulation_fn(rng, batch_size, batch))
+            if outcomes.shape != (batch.size, batch_size):
+                raise ValueError(
+                    f"Batched simulation returned shape {outcomes.shape}, "
+                    f"expected {(batch.size, batch_size)}"
+                )
+            # Converged rows keep their counts from the check they stopped at
+            hits[active] += outcomes[active].sum(axis=1)
+            row_n[active] += batch_size
+            n_run += batch_size
+            
+            lower, upper = wilson_bounds(hits / row_n, row_n)
+            half_width = (upper - lower) / 2.0
+            if context.n_simulations > self.convergence_check_interval:
+                active &= half_width > self.ci_target_half_width
+            if not active.any():
+                break
+        converged = not active.any()
+        
+        raw_edge = hits / row_n - context.market.devig_prob
+        edge_percent = raw_edge * 100.0
+        is_valid = (edge_percent >= self.edge_threshold_percent) & (np.abs(raw_edge) >= 2.0 * half_width)
+        
+        if not is_valid[0]:
+            # Already fails validation, no need to test stability
+            return {
+                "stability_score": 0.0,
+                "survival_rate": 0.0,
+                "n_perturbations": 0,
+                "base_edge_percent": float(edge_percent[0]),
+            }
+        
+        survival_count = int(is_valid[1:].sum())
+        survival_rate = survival_count / n_perturbations if n_perturbations > 0 else 0.0
+        
+        logger.info(
+            f"Batched stability test: {survival_count}/{n_perturbations} survived "
+            f"(score: {survival_rate:.2f}, {n_run} simulations, converged={converged})"
+        )
+        
+        return {
+            "stability_score": survival_rate,
+            "survival_rate": survival_rate,
+            "n_perturbations": n_perturbations,
+            "base_edge_percent": float(edge_percent[0]),
+            "n_simulations_run": n_run,
+            "convergence_achieved": converged,
+        }
+    
+    def _perturbation_batch(
+        self,
+        context: SimulationContext,
+        rng: np.random.Generator,
+        n_perturbations: int,
+        magnitude: float,
+    ) -> PerturbationBatch:
+        """
+        Base inputs plus n_perturbations perturbed rows (same rules as
+        _perturb_context: pace and minutes projections by ±magnitude).
+        """
+        rows = n_perturbations + 1
+        
+        pace = None
+        if context.pace_projection is not None:
+            scale = 1.0 + rng.uniform(-magnitude, magnitude, size=rows)
+            scale[0] = 1.0
+            pace = context.pace_projection * scale
+        
+        base_minutes = np.array(
+            [inj.minutes_projection if inj.minutes_projection is not None else np.nan for inj in context.injuries],
+            dtype=float,
+        )
+        scale = 1.0 + rng.uniform(-magnitude, magnitude, size=(rows, base_minutes.size))
+        scale[0] = 1.0
+        
+        return PerturbationBatch(
+            pace_projection=pace,
+            minutes_projections=base_minutes * scale,
+            player_ids=tuple(inj.player_id for inj in context.injuries),
+        )
+    
     def _perturb_context(
         self,
         context: SimulationContext,
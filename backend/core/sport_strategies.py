@@ -10,8 +10,119 @@ Handles different scoring distributions across sports
 """
 from abc import ABC, abstractmethod
 import numpy as np
-from typing import Dict, Any, List
-import random
+from typing import Dict, Any, List, Optional, Tuple
+
+
+def _resolve_rng(rng: Optional[np.random.Generator]) -> np.random.Generator:
+    """Use the caller's Generator when given (reproducible runs), else a fresh one"""
+    return rng if rng is not None else np.random.default_rng()
+
+
+def summarize_scores(
+    team_a_scores: np.ndarray,
+    team_b_scores: np.ndarray,
+    push_tolerance: float
+) -> Dict[str, Any]:
+    """
+    Reduce per-iteration score arrays to the standard strategy result dict.
+
+    A game is a push when |margin| < push_tolerance; pass 0.0 for discrete
+    (Poisson) scores so only exact ties count.
+    """
+    margins = team_a_scores - team_b_scores
+    totals = team_a_scores + team_b_scores
+
+    if push_tolerance > 0:
+        push_mask = np.abs(margins) < push_tolerance
+    else:
+        push_mask = margins == 0
+
+    pushes = int(np.count_nonzero(push_mask))
+    team_a_wins = int(np.count_nonzero((margins > 0) & ~push_mask))
+    team_b_wins = int(margins.size - pushes - team_a_wins)
+
+    return {
+        'team_a_wins': team_a_wins,
+        'team_b_wins': team_b_wins,
+        'pushes': pushes,
+        'team_a_total': float(team_a_scores.sum()),
+        'team_b_total': float(team_b_scores.sum()),
+        'margins': margins,
+        'totals': totals
+    }
+
+
+def merge_strategy_results(parts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine strategy result dicts from consecutive batches into one.
+
+    Counts and score totals are summed, per-iteration arrays concatenated;
+    any other keys (per-game constants such as weather_impact) come from
+    the first batch.
+    """
+    if len(parts) == 1:
+        return parts[0]
+    merged = dict(parts[0])
+    for key in ('team_a_wins', 'team_b_wins', 'pushes', 'team_a_total', 'team_b_total'):
+        merged[key] = sum(part[key] for part in parts)
+    for key in ('margins', 'totals'):
+        merged[key] = np.concatenate([part[key] for part in parts])
+    return merged
+
+
+def simulate_drive_scores(
+    team_a_ppd: float,
+    team_b_ppd: float,
+    iterations: int,
+    rng: np.random.Generator,
+    avg_drives: float = 11.5,
+    drive_std: float = 1.2,
+    min_drives: int = 8,
+    max_drives: int = 14,
+    league_ppd: float = 1.85,
+    td_prob: float = 0.22,
+    fg_prob: float = 0.17,
+    blowout_margin: float = 14.0,
+    blowout_reduction: Tuple[float, float] = (0.05, 0.15)
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batched drive-based football engine (all iterations at once).
+
+    Per game: a shared drive count N ~ int(Normal(avg_drives, drive_std))
+    clamped to [min_drives, max_drives]; each team's TD/FG/no-score split over
+    its N drives is one multinomial draw (identical in law to N independent
+    categorical drives). Defensive regression toward league_ppd * N and the
+    blowout clock-bleed are then applied as array ops.
+
+    Returns:
+        (team_a_scores, team_b_scores) rounded float arrays of length iterations
+    """
+    num_drives = np.clip(
+        np.trunc(rng.normal(avg_drives, drive_std, size=iterations)),
+        min_drives, max_drives
+    ).astype(np.int64)
+    
+    raw_scores = np.empty((iterations, 2))
+    for col, ppd in enumerate((team_a_ppd, team_b_ppd)):
+        # Efficiency-scaled drive outcome probabilities (relative to league avg)
+        efficiency_factor = ppd / league_ppd
+        p_td = float(np.clip(td_prob * min(1.5, efficiency_factor), 0.0, 1.0))
+        p_fg = float(np.clip(p_td + fg_prob * min(1.3, efficiency_factor), 0.0, 1.0)) - p_td
+        outcomes = rng.multinomial(num_drives, [p_td, p_fg, 1.0 - p_td - p_fg])
+        raw_scores[:, col] = 7.0 * outcomes[:, 0] + 3.0 * outcomes[:, 1]
+    
+    # Defensive regression: pull extreme scores toward league average
+    league_avg = (league_ppd * num_drives)[:, None]
+    regression_strength = np.minimum(0.25, np.abs(raw_scores - league_avg) / 20.0)
+    scores = raw_scores * (1.0 - regression_strength) + league_avg * regression_strength
+    
+    # Clock management: blowouts bleed late possessions from both sides
+    blowout = np.abs(scores[:, 0] - scores[:, 1]) > blowout_margin
+    reduction = rng.uniform(blowout_reduction[0], blowout_reduction[1], size=iterations)
+    scores *= np.where(blowout, 1.0 - reduction, 1.0)[:, None]
+    
+    np.round(scores, out=scores)
+    return scores[:, 0], scores[:, 1]
 
 
 class SportStrategy(ABC):
@@ -26,9 +137,15 @@ class SportStrategy(ABC):
         team_a_rating: float,
         team_b_rating: float,
         iterations: int,
-        context: Dict[str, Any]
+        context: Dict[str, Any],
+        rng: Optional[np.random.Generator] = None
     ) -> Dict[str, Any]:
-        """Run sport-specific simulation"""
+        """
+        Run sport-specific simulation
+
+        All iterations are drawn in a single batch from `rng`; 'margins' and
+        'totals' are returned as ndarrays of length `iterations`.
+        """
         pass
     
     @abstractmethod
@@ -50,7 +167,8 @@ class HighScoringStrategy(SportStrategy):
         team_a_rating: float,
         team_b_rating: float,
         iterations: int,
-        context: Dict[str, Any]
+        context: Dict[str, Any],
+        rng: Optional[np.random.Generator] = None
     ) -> Dict[str, Any]:
         """
         NBA/NFL simulation with sport-specific physics
@@ -63,13 +181,13 @@ class HighScoringStrategy(SportStrategy):
         # 🏈 NFL: Use drive-based simulation (ANTI-OVER BIAS)
         if 'football' in sport_key:
             return self._simulate_nfl_drive_based(
-                team_a_rating, team_b_rating, iterations, context
+                team_a_rating, team_b_rating, iterations, context, rng
             )
         
         # 🏀 NBA: Normal distribution (valid for high possession count)
         else:
             return self._simulate_nba_normal_dist(
-                team_a_rating, team_b_rating, iterations, context
+                team_a_rating, team_b_rating, iterations, context, rng
             )
     
     def _simulate_nba_normal_dist(
@@ -77,7 +195,8 @@ class HighScoringStrategy(SportStrategy):
         team_a_rating: float,
         team_b_rating: float,
         iterations: int,
-        context: Dict[str, Any]
+        context: Dict[str, Any],
+        rng: Optional[np.random.Generator] = None
     ) -> Dict[str, Any]:
         """NBA simulation using Normal Distribution (unchanged - works well)"""
         base_variance = 10.0
@@ -90,56 +209,26 @@ class HighScoringStrategy(SportStrategy):
         else:
             team_b_rating += home_advantage
         
-        # Run simulations
-        team_a_wins = 0
-        team_b_wins = 0
-        pushes = 0
-        team_a_total = 0.0
-        team_b_total = 0.0
-        margins = []
-        totals = []
-        
-        for _ in range(iterations):
-            # Generate scores using normal distribution
-            team_a_score = np.random.normal(team_a_rating, base_variance)
-            team_b_score = np.random.normal(team_b_rating, base_variance)
-            
-            # Ensure non-negative scores
-            team_a_score = max(0, team_a_score)
-            team_b_score = max(0, team_b_score)
-            
-            margin = team_a_score - team_b_score
-            total = team_a_score + team_b_score
-            
-            margins.append(margin)
-            totals.append(total)
-            team_a_total += team_a_score
-            team_b_total += team_b_score
-            
-            # Determine winner (handle ties)
-            if abs(margin) < 0.5:
-                pushes += 1
-            elif margin > 0:
-                team_a_wins += 1
-            else:
-                team_b_wins += 1
+        # Draw every iteration at once: column 0 = team A, column 1 = team B
+        rng = _resolve_rng(rng)
+        scores = rng.normal(
+            loc=(team_a_rating, team_b_rating),
+            scale=base_variance,
+            size=(iterations, 2)
+        )
         
-        return {
-            'team_a_wins': team_a_wins,
-            'team_b_wins': team_b_wins,
-            'pushes': pushes,
-            'team_a_total': team_a_total,
-            'team_b_total': team_b_total,
-            'margins': margins,
-            'totals': totals
-        }
+        # Ensure non-negative scores
+        np.maximum(scores, 0.0, out=scores)
+        
+        return summarize_scores(scores[:, 0], scores[:, 1], push_tolerance=0.5)
     
     def _simulate_nfl_drive_based(
         self,
         team_a_rating: float,
         team_b_rating: float,
         iterations: int,
-        context: Dict[str, Any]
+        context: Dict[str, Any],
+        rng: Optional[np.random.Generator] = None
     ) -> Dict[str, Any]:
         """
         🏈 NFL DRIVE-BASED SIMULATION (Anti-Over Bias)
@@ -185,97 +274,22 @@ class HighScoringStrategy(SportStrategy):
         else:
             team_b_rating += home_advantage_ppd
         
-        # Run simulations
-        team_a_wins = 0
-        team_b_wins = 0
-        pushes = 0
-        team_a_total = 0.0
-        team_b_total = 0.0
-        margins = []
-        totals = []
-        
-        for _ in range(iterations):
-            # Simulate single game with drive-based physics
-            team_a_score, team_b_score = self._simulate_nfl_single_game(
-                team_a_rating, team_b_rating, LEAGUE_AVG_DRIVES_PER_TEAM
-            )
-            
-            margin = team_a_score - team_b_score
-            total = team_a_score + team_b_score
-            
-            margins.append(margin)
-            totals.append(total)
-            team_a_total += team_a_score
-            team_b_total += team_b_score
-            
-            # Determine winner
-            if abs(margin) < 0.5:
-                pushes += 1
-            elif margin > 0:
-                team_a_wins += 1
-            else:
-                team_b_wins += 1
-        
-        return {
-            'team_a_wins': team_a_wins,
-            'team_b_wins': team_b_wins,
-            'pushes': pushes,
-            'team_a_total': team_a_total,
-            'team_b_total': team_b_total,
-            'margins': margins,
-            'totals': totals,
-            'market_anchor_applied': market_total is not None,
-            'weather_impact': weather_impact
-        }
-    
-    def _simulate_nfl_single_game(self, team_a_ppd: float, team_b_ppd: float, avg_drives: float) -> tuple:
-        """Simulate single NFL game with drive outcomes"""
-        # Determine drive count (with variance)
-        num_drives = max(8, min(14, int(np.random.normal(avg_drives, 1.2))))
-        
-        team_a_score = 0
-        team_b_score = 0
-        
-        # Simulate drives
-        for _ in range(num_drives):
-            team_a_score += self._simulate_nfl_drive(team_a_ppd)
-            team_b_score += self._simulate_nfl_drive(team_b_ppd)
-        
-        # Apply defensive regression (prevent extreme outliers)
-        team_a_score = self._apply_defensive_regression(team_a_score, num_drives)
-        team_b_score = self._apply_defensive_regression(team_b_score, num_drives)
-        
-        # Apply clock management (blowout reduction)
-        if abs(team_a_score - team_b_score) > 14:
-            reduction = random.uniform(0.05, 0.15)
-            team_a_score *= (1.0 - reduction)
-            team_b_score *= (1.0 - reduction)
-        
-        return (round(team_a_score), round(team_b_score))
-    
-    def _simulate_nfl_drive(self, ppd_expected: float) -> float:
-        """Simulate single drive outcome (0, 3, or 7 pts)"""
-        # Adjust probabilities based on team efficiency
-        efficiency_factor = ppd_expected / 1.85  # Relative to league avg
-        
-        td_prob = 0.22 * min(1.5, efficiency_factor)
-        fg_prob = 0.17 * min(1.3, efficiency_factor)
-        
-        rand = random.random()
-        if rand < td_prob:
-            return 7.0
-        elif rand < (td_prob + fg_prob):
-            return 3.0
-        else:
-            return 0.0
-    
-    def _apply_defensive_regression(self, raw_score: float, num_drives: int) -> float:
-        """Pull extreme scores toward league average"""
-        league_avg = 1.85 * num_drives
-        deviation = abs(raw_score - league_avg)
-        regression_strength = min(0.25, deviation / 20.0)
-        
-        return raw_score * (1.0 - regression_strength) + league_avg * regression_strength
+        # Simulate every game's drives in one batch
+        team_a_scores, team_b_scores = simulate_drive_scores(
+            team_a_rating,
+            team_b_rating,
+            iterations,
+            _resolve_rng(rng),
+            avg_drives=LEAGUE_AVG_DRIVES_PER_TEAM,
+            league_ppd=LEAGUE_AVG_POINTS_PER_DRIVE,
+            td_prob=DRIVE_TD_PROB,
+            fg_prob=DRIVE_FG_PROB
+        )
+        
+        results = summarize_scores(team_a_scores, team_b_scores, push_tolerance=0.5)
+        results['market_anchor_applied'] = market_total is not None
+        results['weather_impact'] = weather_impact
+        return results
     
     def _calculate_weather_impact(self, weather: Dict[str, Any]) -> float:
         """Calculate scoring reduction from weather"""
@@ -319,7 +333,8 @@ class MediumScoringStrategy(SportStrategy):
         team_a_rating: float,
         team_b_rating: float,
         iterations: int,
-        context: Dict[str, Any]
+        context: Dict[str, Any],
+        rng: Optional[np.random.Generator] = None
     ) -> Dict[str, Any]:
         """
         NCAAB simulation using Normal Distribution
@@ -356,49 +371,18 @@ class MediumScoringStrategy(SportStrategy):
         else:
             team_b_rating += home_advantage
         
-        # Run simulations
-        team_a_wins = 0
-        team_b_wins = 0
-        pushes = 0
-        team_a_total = 0.0
-        team_b_total = 0.0
-        margins = []
-        totals = []
-        
-        for _ in range(iterations):
-            # Generate scores using normal distribution
-            team_a_score = np.random.normal(team_a_rating, base_variance)
-            team_b_score = np.random.normal(team_b_rating, base_variance)
-            
-            # Ensure non-negative scores
-            team_a_score = max(0, team_a_score)
-            team_b_score = max(0, team_b_score)
-            
-            margin = team_a_score - team_b_score
-            total = team_a_score + team_b_score
-            
-            margins.append(margin)
-            totals.append(total)
-            team_a_total += team_a_score
-            team_b_total += team_b_score
-            
-            # Determine winner (handle ties)
-            if abs(margin) < 0.5:
-                pushes += 1
-            elif margin > 0:
-                team_a_wins += 1
-            else:
-                team_b_wins += 1
+        # Draw every iteration at once: column 0 = team A, column 1 = team B
+        rng = _resolve_rng(rng)
+        scores = rng.normal(
+            loc=(team_a_rating, team_b_rating),
+            scale=base_variance,
+            size=(iterations, 2)
+        )
         
-        return {
-            'team_a_wins': team_a_wins,
-            'team_b_wins': team_b_wins,
-            'pushes': pushes,
-            'team_a_total': team_a_total,
-            'team_b_total': team_b_total,
-            'margins': margins,
-            'totals': totals
-        }
+        # Ensure non-negative scores
+        np.maximum(scores, 0.0, out=scores)
+        
+        return summarize_scores(scores[:, 0], scores[:, 1], push_tolerance=0.5)
     
     def get_volatility_thresholds(self) -> Dict[str, float]:
         """NCAAB volatility thresholds (higher than NBA due to possession variance + inconsistent efficiency)"""
@@ -419,7 +403,8 @@ class LowScoringStrategy(SportStrategy):
         team_a_rating: float,
         team_b_rating: float,
         iterations: int,
-        context: Dict[str, Any]
+        context: Dict[str, Any],
+        rng: Optional[np.random.Generator] = None
     ) -> Dict[str, Any]:
         """
         MLB/NHL simulation using Poisson Distribution
@@ -455,45 +440,15 @@ class LowScoringStrategy(SportStrategy):
         else:
             team_b_rating += home_advantage
         
-        # Run simulations
-        team_a_wins = 0
-        team_b_wins = 0
-        pushes = 0
-        team_a_total = 0.0
-        team_b_total = 0.0
-        margins = []
-        totals = []
-        
-        for _ in range(iterations):
-            # Generate scores using Poisson distribution
-            team_a_score = np.random.poisson(team_a_rating)
-            team_b_score = np.random.poisson(team_b_rating)
-            
-            margin = team_a_score - team_b_score
-            total = team_a_score + team_b_score
-            
-            margins.append(float(margin))
-            totals.append(float(total))
-            team_a_total += team_a_score
-            team_b_total += team_b_score
-            
-            # Determine winner (ties are rare in baseball/hockey but possible)
-            if margin == 0:
-                pushes += 1
-            elif margin > 0:
-                team_a_wins += 1
-            else:
-                team_b_wins += 1
+        # Draw every iteration at once: column 0 = team A, column 1 = team B
+        # (ties are rare in baseball/hockey but possible -> exact-zero push)
+        rng = _resolve_rng(rng)
+        scores = rng.poisson(
+            lam=(team_a_rating, team_b_rating),
+            size=(iterations, 2)
+        ).astype(np.float64)
         
-        return {
-            'team_a_wins': team_a_wins,
-            'team_b_wins': team_b_wins,
-            'pushes': pushes,
-            'team_a_total': team_a_total,
-            'team_b_total': team_b_total,
-            'margins': margins,
-            'totals': totals
-        }
+        return summarize_scores(scores[:, 0], scores[:, 1], push_tolerance=0.0)
     
     def get_volatility_thresholds(self) -> Dict[str, float]:
         """MLB/NHL volatility thresholds (lower than NBA/NFL due to discrete scoring)"""
@@ -34,6 +34,8 @@ from datetime import datetime, timezone, timedelta
 import logging
 from pymongo.database import Database
 
+from db.write_behind import get_write_behind_sink
+
 logger = logging.getLogger(__name__)
 
 # 7-year retention period (in days)
@@ -127,8 +129,8 @@ class AuditLogger:
                 'immutable': True  # Audit log immutability flag
             }
             
-            # Insert (immutable append-only)
-            self.sim_audit.insert_one(audit_record)
+            # Insert (immutable append-only, synchronous - never buffered)
+            get_write_behind_sink().submit(self.sim_audit, audit_record, fail_closed=True)
             logger.debug(f"✅ Logged simulation audit: {game_id} ({sport})")
             return True
             
@@ -273,8 +275,8 @@ class AuditLogger:
                 'immutable': True  # Audit log immutability flag
             }
             
-            # Insert (immutable append-only)
-            self.rcl_log.insert_one(rcl_record)
+            # Insert (immutable append-only, synchronous - never buffered)
+            get_write_behind_sink().submit(self.rcl_log, rcl_record, fail_closed=True)
             logger.debug(f"✅ Logged RCL: {game_id} ({'PASS' if rcl_passed else 'FAIL'})")
             return True
             
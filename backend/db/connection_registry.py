@@ -0,0 +1,314 @@
+"""
+Mongo Connection Registry
+=========================
+One pooled MongoClient and one Motor client per process (per uvicorn worker),
+shared by every module that talks to Mongo.
+
+Before this registry, about a dozen modules built their own MongoClient or
+AsyncIOMotorClient (several of them per request), each with its own
+connection pool and server-monitoring threads. Everything now goes through:
+
+- get_mongo_registry().sync_client(uri=None)     -> shared pymongo client
+- get_mongo_registry().async_client(uri=None)    -> shared Motor client
+- get_mongo_registry().database(name=None)       -> sync Database
+- get_mongo_registry().async_database(name=None) -> Motor Database
+- get_mongo_registry().collection(name, ...)     -> sync Collection with
+  the per-collection read/write concern from COLLECTION_CONCERNS applied
+- get_mongo_registry().pool_stats()              -> pool utilization
+
+Clients are keyed by URI, so a module pointed at a different cluster still
+gets its own (single) pool. Clients are recreated after fork, and the Motor
+client is recreated if the event loop it was bound to has been closed.
+
+Per-operation fail-fast budgets (e.g. the 2s replay-cache lookups) are
+expressed with `pymongo.timeout(...)` at the call site rather than with a
+dedicated client, so they do not cost a separate pool.
+
+Configuration:
+- MONGO_URI / DATABASE_NAME / MONGO_MAX_POOL_SIZE (shared with db.mongo)
+- MONGO_MIN_POOL_SIZE: warm connections kept per server (default 0)
+- MONGO_MAX_IDLE_TIME_MS: idle connection reaping (default 300000)
+"""
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+from pymongo import MongoClient, ReadPreference
+from pymongo import monitoring
+from pymongo.read_concern import ReadConcern
+from pymongo.write_concern import WriteConcern
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
+DB_NAME = os.getenv("DATABASE_NAME", "beatvegas")
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+
+CLIENT_OPTIONS: Dict[str, Any] = {
+    "serverSelectionTimeoutMS": 15000,
+    "connectTimeoutMS": 15000,
+    "socketTimeoutMS": 30000,
+    "maxPoolSize": MONGO_MAX_POOL_SIZE,
+    "minPoolSize": MONGO_MIN_POOL_SIZE,
+    "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+}
+
+# Per-collection concerns, applied only to handles obtained through
+# collection()/async_collection() - list a collection here only once its call
+# sites use the registry. Audit/ledger collections are acknowledged by a
+# majority and journaled; high-volume append-only logs only need the primary;
+# anything not listed inherits the client defaults.
+_DURABLE = {
+    "write_concern": WriteConcern(w="majority", j=True),
+    "read_concern": ReadConcern("majority"),
+}
+_FAST_LOG = {"write_concern": WriteConcern(w=1)}
+_READ_MOSTLY = {"read_preference": ReadPreference.PRIMARY_PREFERRED}
+
+COLLECTION_CONCERNS: Dict[str, Dict[str, Any]] = {
+    "decision_audit_logs": _DURABLE,          # db.decision_audit_logger
+    "prediction_tracking": _FAST_LOG,         # utils.calibration_logger
+    "deterministic_replay_cache": _READ_MOSTLY,  # core.deterministic_replay_cache
+}
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """
+    Tracks connection-pool activity for one client (sync or Motor).
+
+    Motor wraps pymongo, so the same listener type works for both.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pools = 0
+        self.open = 0
+        self.checked_out = 0
+        self.max_checked_out = 0
+        self.created = 0
+        self.closed = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.pool_clears = 0
+
+    def pool_created(self, event):
+        with self._lock:
+            self.pools += 1
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pool_clears += 1
+
+    def pool_closed(self, event):
+        with self._lock:
+            self.pools = max(0, self.pools - 1)
+
+    def connection_created(self, event):
+        with self._lock:
+            self.created += 1
+            self.open += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.closed += 1
+            self.open = max(0, self.open - 1)
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures += 1
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            if self.checked_out > self.max_checked_out:
+                self.max_checked_out = self.checked_out
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out = max(0, self.checked_out - 1)
+
+    def snapshot(self, max_pool_size: int) -> Dict[str, Any]:
+        with self._lock:
+            # maxPoolSize applies per server; utilization is against one pool
+            capacity = max_pool_size * max(1, self.pools)
+            return {
+                "pools": self.pools,
+                "open_connections": self.open,
+                "checked_out": self.checked_out,
+                "max_checked_out": self.max_checked_out,
+                "connections_created": self.created,
+                "connections_closed": self.closed,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "pool_clears": self.pool_clears,
+                "max_pool_size": max_pool_size,
+                "utilization": round(self.checked_out / capacity, 4) if capacity else 0.0,
+            }
+
+
+class MongoConnectionRegistry:
+    """
+    Process-wide registry of shared Mongo clients
+    """
+
+    def __init__(self, default_uri: str = MONGO_URI, default_db: str = DB_NAME, client_options: Optional[Dict[str, Any]] = None):
+        self.default_uri = default_uri
+        self.default_db = default_db
+        self.client_options = dict(CLIENT_OPTIONS if client_options is None else client_options)
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._sync: Dict[str, Tuple[MongoClient, PoolStatsListener]] = {}
+        self._async: Dict[str, Tuple[Any, PoolStatsListener, Any]] = {}
+
+    def _check_fork(self) -> None:
+        # Clients (and their monitor threads) must not be shared across fork
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._sync = {}
+            self._async = {}
+
+    # ------------------------------------------------------------------
+    # Clients
+    # ------------------------------------------------------------------
+
+    def sync_client(self, uri: Optional[str] = None) -> MongoClient:
+        """Shared pymongo client for `uri` (default MONGO_URI)"""
+        uri = _normalize_uri(uri or self.default_uri)
+        with self._lock:
+            self._check_fork()
+            entry = self._sync.get(uri)
+            if entry is None:
+                listener = PoolStatsListener()
+                client = MongoClient(uri, event_listeners=[listener], **self.client_options)
+                entry = self._sync[uri] = (client, listener)
+                logger.info(
+                    "MongoDB shared client created (lazy connection, maxPoolSize=%s)",
+                    self.client_options.get("maxPoolSize"),
+                )
+            return entry[0]
+
+    def async_client(self, uri: Optional[str] = None):
+        """Shared Motor client for `uri`, bound to the current event loop"""
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        uri = _normalize_uri(uri or self.default_uri)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        with self._lock:
+            self._check_fork()
+            entry = self._async.get(uri)
+            if entry is not None:
+                client, listener, bound_loop = entry
+                # A Motor client is tied to the loop it first ran on; only
+                # replace it once that loop is gone (e.g. between asyncio.run calls)
+                if bound_loop is None or not bound_loop.is_closed():
+                    if bound_loop is None and loop is not None:
+                        self._async[uri] = (client, listener, loop)
+                    return client
+                client.close()
+
+            listener = PoolStatsListener()
+            client = AsyncIOMotorClient(uri, event_listeners=[listener], **self.client_options)
+            self._async[uri] = (client, listener, loop)
+            return client
+
+    # ------------------------------------------------------------------
+    # Databases / collections
+    # ------------------------------------------------------------------
+
+    def database(self, name: Optional[str] = None, uri: Optional[str] = None):
+        return self.sync_client(uri)[name or self.default_db]
+
+    def async_database(self, name: Optional[str] = None, uri: Optional[str] = None):
+        return self.async_client(uri)[name or self.default_db]
+
+    def collection(self, name: str, database: Optional[str] = None, uri: Optional[str] = None):
+        """Sync collection with its configured read/write concern applied"""
+        coll = self.database(database, uri)[name]
+        concerns = COLLECTION_CONCERNS.get(name)
+        return coll.with_options(**concerns) if concerns else coll
+
+    def async_collection(self, name: str, database: Optional[str] = None, uri: Optional[str] = None):
+        """Motor collection with its configured read/write concern applied"""
+        coll = self.async_database(database, uri)[name]
+        concerns = COLLECTION_CONCERNS.get(name)
+        return coll.with_options(**concerns) if concerns else coll
+
+    # ------------------------------------------------------------------
+    # Observability / lifecycle
+    # ------------------------------------------------------------------
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connection-pool utilization for every client this process holds"""
+        max_pool = int(self.client_options.get("maxPoolSize") or 100)
+        with self._lock:
+            sync = {uri: listener.snapshot(max_pool) for uri, (_, listener) in self._sync.items()}
+            motor = {uri: listener.snapshot(max_pool) for uri, (_, listener, _) in self._async.items()}
+        return {
+            "pid": os.getpid(),
+            "sync_clients": len(sync),
+            "async_clients": len(motor),
+            "sync": {_redact(uri): s for uri, s in sync.items()},
+            "async": {_redact(uri): s for uri, s in motor.items()},
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            for client, _ in self._sync.values():
+                client.close()
+            for client, _, _ in self._async.values():
+                client.close()
+            self._sync = {}
+            self._async = {}
+
+
+def _normalize_uri(uri: str) -> str:
+    """"mongodb://host:27017/" and "mongodb://host:27017" share one client"""
+    return uri.rstrip("/")
+
+
+def _redact(uri: str) -> str:
+    """Strip credentials before a URI goes into a stats payload"""
+    scheme, sep, rest = uri.partition("://")
+    if "@" in rest:
+        rest = rest.split("@", 1)[1]
+    return f"{scheme}{sep}{rest}"
+
+
+_mongo_registry: Optional[MongoConnectionRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_mongo_registry() -> MongoConnectionRegistry:
+    """Get the per-process Mongo connection registry"""
+    global _mongo_registry
+    if _mongo_registry is None:
+        with _registry_lock:
+            if _mongo_registry is None:
+                _mongo_registry = MongoConnectionRegistry()
+    return _mongo_registry
+
+
+def close_mongo_registry() -> None:
+    if _mongo_registry is not None:
+        _mongo_registry.close()
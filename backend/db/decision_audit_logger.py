@@ -20,10 +20,18 @@ This is infrastructure hardening, not engine patching.
 
 from datetime import datetime, timezone
 from typing import Optional, Dict, Any
-from pymongo import MongoClient, ASCENDING
+import pymongo
+from pymongo import ASCENDING
 from pymongo.errors import PyMongoError
 import os
 
+from db.connection_registry import get_mongo_registry
+from db.write_behind import get_write_behind_sink
+
+# Fail-fast budget for audit operations (server selection included), so an
+# unreachable primary surfaces as HTTP 500 within seconds
+AUDIT_OP_TIMEOUT_SECONDS = 5.0
+
 
 class DecisionAuditLogger:
     """
@@ -43,14 +51,16 @@ class DecisionAuditLogger:
             mongo_uri: MongoDB connection string
             database: Database name (default: beatvegas_prod)
         """
-        self.client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)
+        registry = get_mongo_registry()
+        self.client = registry.sync_client(mongo_uri)
         self.db = self.client[database]
-        self.collection = self.db["decision_audit_logs"]
+        self.collection = registry.collection("decision_audit_logs", database=database, uri=mongo_uri)
         
         # Ensure collection exists with proper indexes
         # Wrap in try-except to allow instantiation even with invalid connections
         try:
-            self._ensure_collection_setup()
+            with pymongo.timeout(AUDIT_OP_TIMEOUT_SECONDS):
+                self._ensure_collection_setup()
         except Exception:
             # Collection setup failed (likely connection issue)
             # Logger can still be instantiated, but write operations will fail gracefully
@@ -152,11 +162,10 @@ class DecisionAuditLogger:
             if additional_metadata:
                 log_entry["metadata"] = additional_metadata
             
-            # CRITICAL: Write to append-only collection
-            result = self.collection.insert_one(log_entry)
-            
-            # Verify write succeeded
-            return result.inserted_id is not None
+            # CRITICAL: Write to append-only collection. Fail-closed: never
+            # buffered, written synchronously and errors propagate here
+            with pymongo.timeout(AUDIT_OP_TIMEOUT_SECONDS):
+                return get_write_behind_sink().submit(self.collection, log_entry, fail_closed=True)
             
         except PyMongoError as e:
             # Log error but don't raise - caller will trigger HTTP 500
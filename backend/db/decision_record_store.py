@@ -45,6 +45,7 @@ class DecisionRecordStore:
         self.collection.create_index("identity_key", unique=True)
         self.collection.create_index("record_id", unique=True)
         self.collection.create_index([("game_id", 1), ("created_at", -1)])
+        self.collection.create_index([("event_id", 1), ("created_at", -1)])
         self.collection.create_index(
             [("event_id", 1), ("inputs_hash", 1), ("decision_version", 1)],
             unique=True,
@@ -140,6 +141,11 @@ class DecisionRecordStore:
                 returned_id,
             )
             self._log_duplicate_attempt(identity_key, returned_id)
+        else:
+            # New canonical record → drop this event's cached list classification
+            from services.decision_classification_cache import get_decision_classification_cache
+
+            get_decision_classification_cache().bump_version(game_id)
 
         return returned_id
 
@@ -139,6 +139,21 @@ def get_grading_indexes() -> List[IndexModel]:
     ]
 
 
+def get_scoreboard_scores_indexes() -> List[IndexModel]:
+    """Ingested final scores (services.scoreboard_ingestion)"""
+    return [
+        IndexModel(
+            [("oddsapi_event_id", ASCENDING)],
+            unique=True,
+            name="scoreboard_oddsapi_event_id_unique"
+        ),
+        IndexModel(
+            [("sport_key", ASCENDING), ("commence_time", DESCENDING)],
+            name="scoreboard_sport_commence"
+        )
+    ]
+
+
 def get_users_indexes() -> List[IndexModel]:
     """Users collection indexes"""
     return [
@@ -237,6 +252,14 @@ def get_decision_records_indexes() -> List[IndexModel]:
             unique=True,
             name="decision_records_event_inputs_version_unique",
         ),
+        IndexModel(
+            [("event_id", ASCENDING), ("created_at", DESCENDING)],
+            name="decision_records_event_created",
+        ),
+        IndexModel(
+            [("game_id", ASCENDING), ("created_at", DESCENDING)],
+            name="decision_records_game_created",
+        ),
     ]
 
 
@@ -248,6 +271,7 @@ INDEX_DEFINITIONS = {
     "events": get_events_indexes(),
     "ai_picks": get_ai_picks_indexes(),
     "grading": get_grading_indexes(),
+    "scoreboard_scores": get_scoreboard_scores_indexes(),
     "users": get_users_indexes(),
     "monte_carlo_simulations": get_simulations_indexes(),
     "billing_ledger": get_billing_ledger_indexes(),
@@ -1,6 +1,8 @@
 import os
 import sys
-from pymongo import MongoClient, UpdateOne
+import hashlib
+import json
+from pymongo import UpdateOne
 from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional, Tuple
 from dotenv import load_dotenv
@@ -24,13 +26,11 @@ MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
 # triggers the connection. The blocking `admin.command('ping')` has been removed
 # from module-level code to prevent hanging the FastAPI event loop at startup.
 # Connection health is verified in the async startup handler via run_in_executor.
-client = MongoClient(
-    MONGO_URI,
-    serverSelectionTimeoutMS=15000,
-    connectTimeoutMS=15000,
-    socketTimeoutMS=30000,
-    maxPoolSize=MONGO_MAX_POOL_SIZE,
-)
+# The client comes from the process-wide connection registry so every module
+# (sync and Motor) shares one pool per worker.
+from db.connection_registry import get_mongo_registry
+
+client = get_mongo_registry().sync_client(MONGO_URI)
 db = client[DB_NAME]
 logger.info(
     "MongoDB client initialised (lazy connection — not yet pinged, maxPoolSize=%s)",
@@ -130,6 +130,15 @@ def ensure_indexes() -> None:
         db["monte_carlo_simulations"].create_index([("created_at", -1)])
         db["monte_carlo_simulations"].create_index([("confidence_score", -1)])
         
+        # Pre-scored parlay leg pool (services.parlay_leg_pool): one row per event
+        db["parlay_leg_pool"].create_index("event_id", unique=True)
+        db["parlay_leg_pool"].create_index([("pool_day", 1), ("sport_key", 1), ("commence_time", 1)])
+        db["parlay_leg_pool"].create_index("expires_at", expireAfterSeconds=0)
+
+        # Joint (margin, total) sample sketches for parlay pricing (services.joint_sample_store)
+        db["simulation_joint_samples"].create_index("event_id", unique=True)
+        db["simulation_joint_samples"].create_index("expires_at", expireAfterSeconds=0)
+        
         # NEW: Multi-Agent System indexes
         db["agent_events"].create_index([("event_id", 1)])
         db["agent_events"].create_index([("event_type", 1), ("timestamp", -1)])
@@ -188,6 +197,7 @@ def ensure_indexes() -> None:
         db["decision_records"].create_index("identity_key", unique=True)
         db["decision_records"].create_index("record_id", unique=True)
         db["decision_records"].create_index([("game_id", 1), ("created_at", -1)])
+        db["decision_records"].create_index([("event_id", 1), ("created_at", -1)])  # latest-per-event lookups
 
         # Distribution Governance indexes (Operational Architecture v1.0.0)
         db["distribution_decision_log"].create_index("distribution_id", unique=True)
@@ -218,6 +228,20 @@ def ensure_indexes() -> None:
         db["decision_settlement_metrics"].create_index([("trace_id", 1), ("timestamp", -1)])
         db["decision_settlement_metrics"].create_index([("snapshot_hash", 1), ("timestamp", -1)])
 
+        # Phase 8 metric counter reconciliation (count + time-bounded window reads)
+        db["sentinel_event_log"].create_index([("event_type", 1), ("timestamp", -1)])
+        db["sentinel_event_log"].create_index([("agent_id", 1), ("timestamp", -1)])
+        db["distribution_audit_log"].create_index(
+            [("validation_check", 1), ("validation_result", 1), ("sent_at_utc", -1)]
+        )
+        db["distribution_audit_log"].create_index([("delivered", 1), ("sent_at_utc", -1)])
+        db["distribution_audit_log"].create_index([("agent_id", 1), ("sent_at_utc", -1)])
+        db["response_action_log"].create_index([("agent_id", 1), ("timestamp_utc", -1)])
+        db["recovery_action_log"].create_index([("agent_id", 1), ("created_at_utc", -1)])
+        db["decision_settlement_metrics"].create_index([("graded_by", 1), ("graded_at", -1)])
+        db["outbound_communication_log"].create_index([("agent_id", 1), ("sent_at_utc", -1)])
+        db["odds_cache"].create_index([("fetched_at", -1)])
+
         # Opened event telemetry (append-only) for user outcome projection
         db["opened_event_log"].create_index([("opened_event_id", 1)], unique=True)
         db["opened_event_log"].create_index([("user_id", 1), ("opened_at", -1)])
@@ -319,6 +343,15 @@ def ensure_indexes() -> None:
 
         db["affiliate_payout_batches"].create_index([("batch_id", 1)], unique=True)
         db["affiliate_payout_batches"].create_index([("run_date_utc", -1)])
+
+        # Cycle metering: one entitlement row per user, so the metering upsert
+        # can never bootstrap a duplicate under concurrent first views. Kept
+        # separate so legacy duplicate rows only skip this index.
+        try:
+            db["user_entitlements"].create_index([("user_id", 1)], unique=True)
+        except Exception as e:
+            logger.warning(f"⚠️ user_entitlements.user_id unique index not created: {e}")
+            db["user_entitlements"].create_index([("user_id", 1)])
         
         logger.info("✅ Database indexes created successfully")
         
@@ -388,15 +421,69 @@ def _choose_richer_event_snapshot(left: Dict[str, Any], right: Dict[str, Any]) -
     return merged
 
 
-def upsert_events(collection: str, events: List[Dict[str, Any]]):
-    """Upsert events using event_id while protecting richer market snapshots.
+# Top-level fields that, when changed, must be written even if no price moved
+_EVENT_HASH_FIELDS = ("sport_key", "home_team", "away_team", "commence_time")
+
+
+def _bookmaker_snapshot_hash(bookmaker: Dict[str, Any]) -> str:
+    """Hash one bookmaker's prices/lines (ignores last_update so an unchanged book hashes equal)."""
+    markets = sorted(
+        (
+            market.get("key") or "",
+            sorted(
+                (str(o.get("name")), o.get("price"), o.get("point"))
+                for o in (market.get("outcomes") or [])
+            ),
+        )
+        for market in (bookmaker.get("markets") or [])
+    )
+    payload = json.dumps(markets, default=str, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def event_market_hashes(event_doc: Dict[str, Any]) -> Tuple[str, Dict[str, str]]:
+    """Return (event market_hash, {bookmaker_key: bookmaker hash}) for an event snapshot."""
+    bookmaker_hashes = {
+        str(b.get("key") or b.get("title") or i): _bookmaker_snapshot_hash(b)
+        for i, b in enumerate(event_doc.get("bookmakers") or [])
+    }
+    payload = json.dumps(
+        {
+            "fields": [event_doc.get(k) for k in _EVENT_HASH_FIELDS],
+            "bookmakers": sorted(bookmaker_hashes.items()),
+        },
+        default=str,
+        separators=(",", ":"),
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest(), bookmaker_hashes
+
+
+def upsert_events_diff(collection: str, events: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Upsert only events whose markets/lines changed since the last stored snapshot.
 
     The same event_id can appear multiple times in a polling batch (multi-region/API
     responses). We collapse duplicates first and keep the richer canonical snapshot
     so sparse payloads cannot overwrite complete spreads/totals data.
+
+    Each snapshot is hashed per bookmaker (see event_market_hashes) and compared
+    with the market_hash stored on the event; unchanged events are not rewritten,
+    only their odds_last_seen_at is bumped (one update_many for the whole batch)
+    so staleness checks still see that the line was confirmed by this poll.
+
+    Returns per-poll counts: received, changed, unchanged, changed_bookmakers,
+    inserted, modified, written.
     """
+    stats = {
+        "received": len(events or []),
+        "changed": 0,
+        "unchanged": 0,
+        "changed_bookmakers": 0,
+        "inserted": 0,
+        "modified": 0,
+        "written": 0,
+    }
     if not events:
-        return 0
+        return stats
 
     deduped: Dict[str, Dict[str, Any]] = {}
     for ev in events:
@@ -416,15 +503,61 @@ def upsert_events(collection: str, events: List[Dict[str, Any]]):
             deduped[event_id] = _choose_richer_event_snapshot(existing, ev_copy)
 
     if not deduped:
-        return 0
+        return stats
+
+    # One round trip for the stored hashes of the whole batch
+    stored = {
+        doc["event_id"]: doc
+        for doc in db[collection].find(
+            {"event_id": {"$in": list(deduped.keys())}},
+            {"event_id": 1, "market_hash": 1, "market_hashes": 1, "_id": 0},
+        )
+    }
+
+    seen_at = now_utc().isoformat()
+    ops = []
+    unchanged_ids = []
+    for event_id, event_doc in deduped.items():
+        market_hash, bookmaker_hashes = event_market_hashes(event_doc)
+        previous = stored.get(event_id) or {}
+        if previous.get("market_hash") == market_hash:
+            stats["unchanged"] += 1
+            unchanged_ids.append(event_id)
+            continue
+
+        previous_books = previous.get("market_hashes") or {}
+        stats["changed"] += 1
+        stats["changed_bookmakers"] += sum(
+            1 for key, h in bookmaker_hashes.items() if previous_books.get(key) != h
+        )
+        event_doc["market_hash"] = market_hash
+        event_doc["market_hashes"] = bookmaker_hashes
+        event_doc["market_hash_updated_at"] = seen_at
+        event_doc["odds_last_seen_at"] = seen_at
+        ops.append(UpdateOne({"event_id": event_id}, {"$set": event_doc}, upsert=True))
+
+    if ops:
+        result = db[collection].bulk_write(ops, ordered=False)
+        stats["inserted"] = result.upserted_count or 0
+        stats["modified"] = result.modified_count or 0
+        stats["written"] = stats["inserted"] + stats["modified"]
 
-    ops = [
-        UpdateOne({"event_id": event_id}, {"$set": event_doc}, upsert=True)
-        for event_id, event_doc in deduped.items()
-    ]
+    if unchanged_ids:
+        db[collection].update_many(
+            {"event_id": {"$in": unchanged_ids}},
+            {"$set": {"odds_last_seen_at": seen_at}},
+        )
 
-    result = db[collection].bulk_write(ops, ordered=False)
-    return (result.upserted_count or 0) + (result.modified_count or 0)
+    return stats
+
+
+def upsert_events(collection: str, events: List[Dict[str, Any]]):
+    """Upsert events using event_id, writing only changed snapshots.
+
+    Returns the number of documents inserted or modified (see upsert_events_diff
+    for the full per-poll counts).
+    """
+    return upsert_events_diff(collection, events)["written"]
 
 
 def find_events(collection: str, filter: Optional[Dict[str, Any]] = None, limit: int = 50):
@@ -584,7 +717,9 @@ def _to_polarized_two_way_american(probability_a: float, probability_b: float) -
 
 
 def insert_log_entry(entry: Dict[str, Any]):
-    return db["logs_core_ai"].insert_one(entry)
+    """Append a log entry via the write-behind sink (batched insert_many)."""
+    from db.write_behind import get_write_behind_sink
+    return get_write_behind_sink().submit(db["logs_core_ai"], entry)
 
 
 def find_logs(module: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
@@ -13,7 +13,8 @@ Core Principles:
 
 Collections:
 - events: canonical game records
-- odds_snapshots: immutable market snapshots (raw + normalized)
+- odds_snapshots: immutable market snapshots (compact normalized rows)
+- odds_snapshot_payloads: raw provider payloads, content-addressed by hash
 - injury_snapshots: injury report captures
 - sim_runs: immutable simulation execution records
 - sim_run_inputs: lineage tracking (joins snapshots to sim_runs)
@@ -175,7 +176,9 @@ class OddsSnapshot(BaseModel):
     is_close_candidate: bool = Field(False, description="Is this a closing line?")
     
     # Integrity
-    raw_payload: Dict[str, Any] = Field(default_factory=dict, description="Store to survive provider schema changes")
+    raw_payload: Dict[str, Any] = Field(default_factory=dict, description="Inline raw payload (legacy rows only)")
+    raw_payload_ref: Optional[str] = Field(None, description="FK to odds_snapshot_payloads (sha256)")
+    raw_payload_path: Optional[Dict[str, Any]] = Field(None, description="Market/outcome position inside a bookmaker payload")
     integrity_flags: Dict[str, Any] = Field(default_factory=dict, description="stale, missing, outlier, etc.")
     
     class Config:
@@ -189,6 +192,17 @@ class OddsSnapshot(BaseModel):
         }
 
 
+class OddsSnapshotPayload(BaseModel):
+    """
+    Raw provider payload stored once per distinct content.
+    Odds snapshot rows reference it by raw_payload_ref.
+    """
+    payload_hash: str = Field(..., description="sha256 of canonical JSON; also the _id")
+    payload: Dict[str, Any]
+    first_seen_utc: datetime
+    last_seen_utc: datetime
+
+
 # ============================================================================
 # INJURY SNAPSHOTS
 # ============================================================================
@@ -216,6 +230,7 @@ class InjurySnapshot(BaseModel):
             "indexes": [
                 {"keys": [("injury_snapshot_id", 1)], "unique": True},
                 {"keys": [("league", 1), ("team", 1), ("timestamp_utc", -1)]},
+                {"keys": [("team", 1), ("timestamp_utc", -1)]},
             ]
         }
 
@@ -676,10 +691,12 @@ def create_all_indexes(db):
     db.odds_snapshots.create_index([("event_id", 1), ("market_key", 1), ("book", 1), ("timestamp_utc", -1)])
     db.odds_snapshots.create_index([("event_id", 1), ("timestamp_utc", -1)])
     db.odds_snapshots.create_index([("is_close_candidate", 1)])
+    db.odds_snapshot_payloads.create_index([("last_seen_utc", 1)])
     
     # Injury Snapshots
     db.injury_snapshots.create_index("injury_snapshot_id", unique=True)
     db.injury_snapshots.create_index([("league", 1), ("team", 1), ("timestamp_utc", -1)])
+    db.injury_snapshots.create_index([("team", 1), ("timestamp_utc", -1)])  # re-sim scheduler baseline
     
     # Sim Runs
     db.sim_runs.create_index("sim_run_id", unique=True)
@@ -0,0 +1,250 @@
+"""
+Write-Behind Log Sink
+=====================
+Shared buffered sink for append-only telemetry inserts on the hot paths
+(log_stage, DecompositionLogger, CalibrationLogger, ...).
+
+Instead of one synchronous insert_one per log call, documents go into a
+bounded in-memory queue and a background thread writes them with
+insert_many(ordered=False), grouped per collection, whenever
+WRITE_BEHIND_BATCH_SIZE documents are waiting or WRITE_BEHIND_FLUSH_INTERVAL_MS
+has passed.
+
+Guarantees:
+- Backpressure: when the queue is full the caller writes synchronously
+  (nothing is dropped silently); every such event is counted
+- Fail-closed collections (WRITE_BEHIND_FAIL_CLOSED_COLLECTIONS, default
+  decision_audit_logs,sim_audit,rcl_log) are NEVER buffered: submit() inserts synchronously and
+  raises on failure, so callers keep their HTTP 500 semantics
+- flush() drains synchronously; shutdown() stops the worker and flushes
+  (also registered with atexit)
+
+Configuration:
+- WRITE_BEHIND_ENABLED: "false" writes everything synchronously
+- WRITE_BEHIND_MAX_QUEUE: max buffered documents (default 10000)
+- WRITE_BEHIND_BATCH_SIZE: flush threshold in documents (default 500)
+- WRITE_BEHIND_FLUSH_INTERVAL_MS: max buffering delay (default 500)
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+WRITE_BEHIND_ENABLED = os.getenv("WRITE_BEHIND_ENABLED", "true").lower() in ("1", "true", "yes")
+WRITE_BEHIND_MAX_QUEUE = int(os.getenv("WRITE_BEHIND_MAX_QUEUE", "10000"))
+WRITE_BEHIND_BATCH_SIZE = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "500"))
+WRITE_BEHIND_FLUSH_INTERVAL_MS = int(os.getenv("WRITE_BEHIND_FLUSH_INTERVAL_MS", "500"))
+WRITE_BEHIND_FAIL_CLOSED_COLLECTIONS = frozenset(
+    c.strip()
+    for c in os.getenv("WRITE_BEHIND_FAIL_CLOSED_COLLECTIONS", "decision_audit_logs,sim_audit,rcl_log").split(",")
+    if c.strip()
+)
+
+
+class WriteBehindSink:
+    """
+    Bounded write-behind queue flushed by a background thread
+    """
+
+    def __init__(
+        self,
+        max_queue: int = WRITE_BEHIND_MAX_QUEUE,
+        batch_size: int = WRITE_BEHIND_BATCH_SIZE,
+        flush_interval_ms: int = WRITE_BEHIND_FLUSH_INTERVAL_MS,
+        fail_closed_collections=WRITE_BEHIND_FAIL_CLOSED_COLLECTIONS,
+        enabled: bool = WRITE_BEHIND_ENABLED,
+    ):
+        self.max_queue = max(1, max_queue)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(1, flush_interval_ms) / 1000.0
+        self.fail_closed_collections = frozenset(fail_closed_collections)
+        self.enabled = enabled
+
+        self._queue: Deque[Tuple[Any, Dict[str, Any]]] = deque()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()  # one writer at a time (worker or flush())
+        self._worker: Optional[threading.Thread] = None
+        self._worker_pid: Optional[int] = None
+        self._stopping = False
+        self._stats = {
+            "submitted": 0,
+            "written": 0,
+            "batches": 0,
+            "write_errors": 0,
+            "dropped": 0,
+            "sync_writes": 0,
+            "backpressure_events": 0,
+            "max_queue_depth": 0,
+            "last_flush_ms": 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def submit(self, collection, document: Dict[str, Any], fail_closed: bool = False) -> bool:
+        """
+        Queue `document` for insertion into `collection` (a pymongo Collection).
+
+        Fail-closed (explicit or configured by collection name) inserts
+        synchronously and lets the error propagate.
+
+        Returns:
+            True once the document is queued or written
+        """
+        self._stats["submitted"] += 1
+
+        if fail_closed or not self.enabled or collection.name in self.fail_closed_collections:
+            self._stats["sync_writes"] += 1
+            collection.insert_one(document)
+            return True
+
+        with self._cond:
+            if len(self._queue) >= self.max_queue:
+                backpressure = True
+            else:
+                backpressure = False
+                self._queue.append((collection, document))
+                depth = len(self._queue)
+                if depth > self._stats["max_queue_depth"]:
+                    self._stats["max_queue_depth"] = depth
+                if depth >= self.batch_size:
+                    self._cond.notify()
+
+        if backpressure:
+            # Queue full: the caller pays for its own write instead of losing it
+            self._stats["backpressure_events"] += 1
+            self._stats["sync_writes"] += 1
+            if self._stats["backpressure_events"] % 1000 == 1:
+                logger.warning(
+                    f"Write-behind queue full ({self.max_queue}); writing synchronously "
+                    f"({self._stats['backpressure_events']} backpressure events)"
+                )
+            collection.insert_one(document)
+            return True
+
+        self._ensure_worker()
+        return True
+
+    # ------------------------------------------------------------------
+    # Worker side
+    # ------------------------------------------------------------------
+
+    def _ensure_worker(self) -> None:
+        # (Re)start after fork: threads do not survive into a child process
+        if self._worker is not None and self._worker_pid == os.getpid() and self._worker.is_alive():
+            return
+        with self._cond:
+            if self._worker is not None and self._worker_pid == os.getpid() and self._worker.is_alive():
+                return
+            self._stopping = False
+            self._worker_pid = os.getpid()
+            self._worker = threading.Thread(target=self._run, name="write-behind-sink", daemon=True)
+            self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._stopping and len(self._queue) < self.batch_size:
+                    self._cond.wait(timeout=self.flush_interval)
+                stopping = self._stopping
+            self.flush()
+            if stopping:
+                return
+
+    def _drain(self, limit: int) -> List[Tuple[Any, Dict[str, Any]]]:
+        with self._cond:
+            batch = []
+            while self._queue and len(batch) < limit:
+                batch.append(self._queue.popleft())
+            return batch
+
+    def flush(self) -> int:
+        """Write everything queued so far. Returns documents written."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = self._drain(self.batch_size)
+                if not batch:
+                    return written
+                written += self._write_batch(batch)
+
+    def _write_batch(self, batch: List[Tuple[Any, Dict[str, Any]]]) -> int:
+        started = time.perf_counter()
+        grouped: Dict[str, Tuple[Any, List[Dict[str, Any]]]] = {}
+        for collection, document in batch:
+            grouped.setdefault(collection.full_name, (collection, []))[1].append(document)
+
+        written = 0
+        for full_name, (collection, documents) in grouped.items():
+            try:
+                collection.insert_many(documents, ordered=False)
+                written += len(documents)
+            except BulkWriteError as e:
+                # ordered=False: everything except the reported errors was written
+                failed = len(e.details.get("writeErrors", []))
+                written += len(documents) - failed
+                self._stats["write_errors"] += failed
+                self._stats["dropped"] += failed
+                logger.error(f"Write-behind insert_many partially failed on {full_name}: {failed} docs")
+            except Exception as e:
+                self._stats["write_errors"] += 1
+                self._stats["dropped"] += len(documents)
+                logger.error(f"Write-behind insert_many failed on {full_name} ({len(documents)} docs): {e}")
+
+        self._stats["written"] += written
+        self._stats["batches"] += 1
+        self._stats["last_flush_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return written
+
+    # ------------------------------------------------------------------
+    # Lifecycle / observability
+    # ------------------------------------------------------------------
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop the worker and flush whatever is still queued."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            worker = self._worker
+        if worker is not None and worker.is_alive() and self._worker_pid == os.getpid():
+            worker.join(timeout=timeout)
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            depth = len(self._queue)
+        return {
+            **self._stats,
+            "queue_depth": depth,
+            "queue_capacity": self.max_queue,
+            "queue_utilization": round(depth / self.max_queue, 4),
+            "enabled": self.enabled,
+        }
+
+
+_write_behind_sink: Optional[WriteBehindSink] = None
+_sink_lock = threading.Lock()
+
+
+def get_write_behind_sink() -> WriteBehindSink:
+    """Get the per-process write-behind sink"""
+    global _write_behind_sink
+    if _write_behind_sink is None:
+        with _sink_lock:
+            if _write_behind_sink is None:
+                _write_behind_sink = WriteBehindSink()
+                atexit.register(_write_behind_sink.shutdown)
+    return _write_behind_sink
+
+
+def shutdown_write_behind_sink() -> None:
+    if _write_behind_sink is not None:
+        _write_behind_sink.shutdown()
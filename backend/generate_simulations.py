@@ -7,8 +7,10 @@ import asyncio
 import sys
 sys.path.insert(0, '.')
 
+from pymongo import ReplaceOne
 from db.mongo import db
-from core.monte_carlo_engine import MonteCarloEngine
+from services.joint_sample_store import JOINT_SKETCH_RESULT_KEY, store_joint_sketch_doc
+from services.slate_simulation_runner import SlateGame, SlateSimulationRunner
 from integrations.odds_api import extract_market_lines
 from integrations.player_api import get_team_data_with_roster
 from datetime import datetime, timezone
@@ -80,10 +82,10 @@ async def generate_simulations_for_all_events():
         print("❌ No upcoming events found!")
         return
     
-    engine = MonteCarloEngine()
-    
     success_count = 0
     error_count = 0
+    slate: list = []
+    sport_keys: dict = {}
     
     for i, event in enumerate(events, 1):
         event_id = event.get('event_id')
@@ -110,41 +112,73 @@ async def generate_simulations_for_all_events():
             # Extract market lines
             market_context = extract_market_lines(event)
             
-            # Run simulation with 10k iterations (free tier)
-            print(f"  🔄 Running simulation...")
-            result = engine.run_simulation(
+            # Queue simulation with 10k iterations (free tier)
+            slate.append(SlateGame(
                 event_id=event_id,
                 team_a=team_a_data,
                 team_b=team_b_data,
                 market_context=market_context,
                 iterations=10000
-            )
-            
-            # Store in database
-            result['game_id'] = event_id
-            result['sport_key'] = sport_key
-            result['created_at'] = datetime.now(timezone.utc)
-            
-            db.simulations.replace_one(
-                {'game_id': event_id},
-                result,
-                upsert=True
-            )
-            
-            print(f"  ✅ Simulation complete")
-            
-            # Create market states from result
-            print(f"  🏷️  Creating market states...")
-            _create_market_states_from_simulation(event_id, result)
-            
-            success_count += 1
-            print(f"  ✅ Market states created\n")
+            ))
+            sport_keys[event_id] = sport_key
+            print(f"  🔄 Queued for slate simulation")
             
         except Exception as e:
             error_count += 1
             print(f"  ❌ Error: {str(e)}\n")
             continue
     
+    # Simulate the whole slate in parallel (one warm engine per worker process)
+    if slate:
+        print(f"\n🔄 Running {len(slate)} simulations across worker processes...")
+        slate_run = SlateSimulationRunner().run(slate)
+        print(f"  ⏱️  Slate finished in {slate_run.duration_seconds:.1f}s")
+        
+        for event_id, error in slate_run.errors.items():
+            error_count += 1
+            print(f"  ❌ {event_id}: {error}")
+        
+        # Store all simulations with one bulk write (the joint sketch is stored separately)
+        stored = []
+        sketches = {}
+        for event_id, result in slate_run.simulations.items():
+            sketch_doc = result.pop(JOINT_SKETCH_RESULT_KEY, None)
+            if sketch_doc:
+                sketches[event_id] = sketch_doc
+            result['game_id'] = event_id
+            result['sport_key'] = sport_keys[event_id]
+            result['created_at'] = datetime.now(timezone.utc)
+            stored.append(ReplaceOne({'game_id': event_id}, result, upsert=True))
+        if stored:
+            db.simulations.bulk_write(stored, ordered=False)
+        
+        events_by_id = {event.get('event_id'): event for event in events}
+        for event_id, sketch_doc in sketches.items():
+            try:
+                store_joint_sketch_doc(slate_run.simulations[event_id]['simulation_id'], events_by_id[event_id], sketch_doc)
+            except Exception as e:
+                print(f"  ⚠️ {event_id}: joint sample store failed: {str(e)}")
+        
+        for event_id, result in slate_run.simulations.items():
+            try:
+                # Create market states from result
+                _create_market_states_from_simulation(event_id, result)
+                success_count += 1
+                print(f"  ✅ {event_id}: simulation stored, market states created")
+            except Exception as e:
+                error_count += 1
+                print(f"  ❌ {event_id}: {str(e)}")
+
+        # Pre-warm AI Analyzer explanations for the published games
+        try:
+            from services.ai_analyzer_service import prewarm_slate_explanations
+            warm = await prewarm_slate_explanations(slate_run.simulations.keys())
+            if not warm.get("skipped"):
+                print(f"  🧠 Analyzer pre-warm: {warm['generated']} generated, "
+                      f"{warm['cached']} cached, {warm['failed']} failed")
+        except Exception as e:
+            print(f"  ⚠️ Analyzer pre-warm failed: {str(e)}")
+
     print("="*60)
     print(f"✅ Complete: {success_count} simulations generated")
     if error_count > 0:
@@ -1,5 +1,8 @@
 import os
+import json
+import threading
 import requests
+import aiohttp
 import logging
 from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
@@ -36,6 +39,16 @@ _last_working_key = ALL_API_KEYS[0] if ALL_API_KEYS else None
 
 BASE_URL = os.getenv("ODDS_BASE_URL", "https://api.the-odds-api.com/v4")
 
+# Connection pooling: keep-alive sessions so repeated calls reuse the TLS connection
+ODDS_HTTP_TIMEOUT_SECONDS = float(os.getenv("ODDS_HTTP_TIMEOUT_SECONDS", "20"))
+ODDS_POLL_CONCURRENCY = int(os.getenv("ODDS_POLL_CONCURRENCY", "8"))
+
+_http = requests.Session()
+_http.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=ODDS_POLL_CONCURRENCY))
+
+# Concurrent callers must not rotate past a key another caller already rotated away from
+_key_lock = threading.Lock()
+
 
 class OddsApiError(Exception):
     pass
@@ -59,25 +72,34 @@ def _rotate_api_key():
     return _last_working_key
 
 
-def _check_response(res: requests.Response, is_retry=False):
+def _check_response(res: requests.Response, is_retry=False, used_key=None):
     """Check API response and handle quota exhaustion with key rotation"""
     try:
         data = res.json()
     except ValueError:
         raise OddsApiError(f"Invalid JSON response: {res.text[:200]}")
+    return _check_payload(res.status_code, data, res.text, is_retry=is_retry, used_key=used_key)
+
 
-    if res.status_code == 401:
+def _check_payload(status_code: int, data, text: str, is_retry=False, used_key=None):
+    """Validate a decoded Odds API response (shared by the sync and async clients)"""
+    if status_code == 401:
         # Check if it's a quota error
         error_data = data if isinstance(data, dict) else {}
         error_code = error_data.get("error_code", "")
         
         if error_code == "OUT_OF_USAGE_CREDITS" and not is_retry:
-            # Try rotating to next key
-            current_key = _get_current_api_key()
-            key_preview = current_key[:8] + "..." if current_key else "None"
-            print(f"⚠️ API key {key_preview} quota exhausted - attempting failover")
-            
-            new_key = _rotate_api_key()
+            with _key_lock:
+                current_key = _get_current_api_key()
+                if used_key is not None and used_key != current_key:
+                    # A concurrent request already failed over - just retry on the new key
+                    raise OddsApiError(f"QUOTA_EXHAUSTED_RETRY_AVAILABLE")
+                
+                # Try rotating to next key
+                key_preview = current_key[:8] + "..." if current_key else "None"
+                print(f"⚠️ API key {key_preview} quota exhausted - attempting failover")
+                
+                new_key = _rotate_api_key()
             if new_key != current_key:
                 # Successfully rotated to a different key
                 print(f"✅ Failover to new API key - retry pending")
@@ -88,12 +110,12 @@ def _check_response(res: requests.Response, is_retry=False):
                 raise OddsApiError(f"All API keys exhausted: {error_data}")
         else:
             # Other 401 error
-            raise OddsApiError(f"Authentication error ({res.status_code}): {data}")
+            raise OddsApiError(f"Authentication error ({status_code}): {data}")
     
-    if res.status_code != 200:
+    if status_code != 200:
         # Odds API returns error message in JSON sometimes
-        msg = data if isinstance(data, dict) else res.text
-        raise OddsApiError(f"Odds API error ({res.status_code}): {msg}")
+        msg = data if isinstance(data, dict) else text
+        raise OddsApiError(f"Odds API error ({status_code}): {msg}")
     
     return data
 
@@ -110,15 +132,15 @@ def fetch_sports():
         raise OddsApiError("No API keys available")
     
     # Try with current key
-    res = requests.get(f"{BASE_URL}/sports", params={"apiKey": api_key})
+    res = _http.get(f"{BASE_URL}/sports", params={"apiKey": api_key}, timeout=ODDS_HTTP_TIMEOUT_SECONDS)
     
     try:
-        return _check_response(res, is_retry=False)
+        return _check_response(res, is_retry=False, used_key=api_key)
     except OddsApiError as e:
         if "QUOTA_EXHAUSTED_RETRY_AVAILABLE" in str(e):
             # Retry with rotated key
             new_key = _get_current_api_key()
-            res = requests.get(f"{BASE_URL}/sports", params={"apiKey": new_key})
+            res = _http.get(f"{BASE_URL}/sports", params={"apiKey": new_key}, timeout=ODDS_HTTP_TIMEOUT_SECONDS)
             return _check_response(res, is_retry=True)
         raise
 
@@ -152,23 +174,53 @@ def fetch_odds(sport="basketball_nba", region="us", markets="h2h,spreads,totals"
     }
     
     # Try with current key
-    res = requests.get(url, params=params, timeout=20)
+    res = _http.get(url, params=params, timeout=ODDS_HTTP_TIMEOUT_SECONDS)
     
     try:
-        return _check_response(res, is_retry=False)
+        return _check_response(res, is_retry=False, used_key=api_key)
     except OddsApiError as e:
         if "QUOTA_EXHAUSTED_RETRY_AVAILABLE" in str(e):
             # Retry with rotated key
             new_key = _get_current_api_key()
             params["apiKey"] = new_key
-            res = requests.get(url, params=params, timeout=20)
+            res = _http.get(url, params=params, timeout=ODDS_HTTP_TIMEOUT_SECONDS)
             return _check_response(res, is_retry=True)
         raise
 
 
-def fetch_scores(sport="basketball_nba"):
+def create_odds_session(limit: int = ODDS_POLL_CONCURRENCY) -> aiohttp.ClientSession:
+    """Pooled aiohttp session for concurrent Odds API polling (one per poll cycle)"""
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=limit, ttl_dns_cache=300),
+        timeout=aiohttp.ClientTimeout(total=ODDS_HTTP_TIMEOUT_SECONDS),
+    )
+
+
+async def fetch_odds_async(
+    session: aiohttp.ClientSession,
+    sport="basketball_nba",
+    region="us",
+    markets="h2h,spreads,totals",
+    odds_format="decimal",
+):
+    """Async fetch_odds on a shared pooled session.
+
+    Same contract and API-key failover as fetch_odds; safe to run many of
+    these concurrently (only the first quota failure rotates the key).
+    """
+    url = f"{BASE_URL}/sports/{sport}/odds/"
+    params = {
+        "regions": region,
+        "markets": markets,
+        "oddsFormat": odds_format,
+    }
+    return await _get_json_async(session, url, params)
+
+
+def fetch_scores(sport="basketball_nba", days_from=None):
     """Fetch scores for completed games.
     
+    days_from (1-3) also returns games completed in the last N days.
     Includes automatic failover to backup API keys if quota exhausted.
     """
     api_key = _get_current_api_key()
@@ -176,21 +228,53 @@ def fetch_scores(sport="basketball_nba"):
         raise OddsApiError("No API keys available")
     
     url = f"{BASE_URL}/sports/{sport}/scores/"
+    params = {"daysFrom": days_from} if days_from else {}
     
     # Try with current key
-    res = requests.get(url, params={"apiKey": api_key})
+    res = _http.get(url, params={**params, "apiKey": api_key}, timeout=ODDS_HTTP_TIMEOUT_SECONDS)
     
     try:
-        return _check_response(res, is_retry=False)
+        return _check_response(res, is_retry=False, used_key=api_key)
     except OddsApiError as e:
         if "QUOTA_EXHAUSTED_RETRY_AVAILABLE" in str(e):
             # Retry with rotated key
             new_key = _get_current_api_key()
-            res = requests.get(url, params={"apiKey": new_key})
+            res = _http.get(url, params={**params, "apiKey": new_key}, timeout=ODDS_HTTP_TIMEOUT_SECONDS)
             return _check_response(res, is_retry=True)
         raise
 
 
+async def fetch_scores_async(session: aiohttp.ClientSession, sport="basketball_nba", days_from=None):
+    """Async fetch_scores on a shared pooled session (whole scoreboard for one sport)"""
+    url = f"{BASE_URL}/sports/{sport}/scores/"
+    params = {"daysFrom": days_from} if days_from else {}
+    return await _get_json_async(session, url, params)
+
+
+async def _get_json_async(session: aiohttp.ClientSession, url: str, params: dict):
+    """GET + decode + _check_payload with one key-rotation retry"""
+    for is_retry in (False, True):
+        api_key = _get_current_api_key()
+        if not api_key:
+            raise OddsApiError("No API keys available")
+        
+        async with session.get(url, params={**params, "apiKey": api_key}) as res:
+            text = await res.text()
+            status_code = res.status
+        try:
+            data = json.loads(text)
+        except ValueError:
+            raise OddsApiError(f"Invalid JSON response: {text[:200]}")
+        
+        try:
+            return _check_payload(status_code, data, text, is_retry=is_retry, used_key=api_key)
+        except OddsApiError as e:
+            if not is_retry and "QUOTA_EXHAUSTED_RETRY_AVAILABLE" in str(e):
+                # Retry with rotated key
+                continue
+            raise
+
+
 def normalize_event(event: dict) -> dict:
     """Normalize an Odds API event object into our DB event structure.
 
@@ -274,7 +358,7 @@ def extract_market_lines(event: dict) -> dict:
         event: Event document with bookmakers array
     
     Returns:
-        dict with current_spread, total_line, odds_timestamp, bookmaker_source, and public_betting_pct
+        dict with current_spread, total_line, odds_timestamp, odds_last_seen_at, bookmaker_source, and public_betting_pct
     """
     bookmakers = event.get("bookmakers", [])
     
@@ -362,6 +446,7 @@ def extract_market_lines(event: dict) -> dict:
         "has_total_market": total_line is not None,
         "bookmaker_source": bookmaker_name or "Consensus",
         "odds_timestamp": odds_timestamp,
+        "odds_last_seen_at": event.get("odds_last_seen_at"),  # last poll that confirmed these lines
         "public_betting_pct": 0.50,  # Default 50/50, would need separate API for real data
         "sport_key": sport_key
     }
@@ -35,6 +35,11 @@ app.add_middleware(APIVersioningMiddleware)
 from middleware.api_response_language_guard import APIResponseLanguageGuardMiddleware
 app.add_middleware(APIResponseLanguageGuardMiddleware)
 
+# ── Request-scoped principal memo (user/subscription/entitlement/tenant) ──────
+# Added after the middlewares above so it wraps them (rate limiter included).
+from services.principal_cache import PrincipalScopeMiddleware
+app.add_middleware(PrincipalScopeMiddleware)
+
 # Read CORS configuration from environment
 # Example values in backend/.env.example
 cors_origins = os.getenv("CORS_ALLOW_ORIGINS", "*")
@@ -104,6 +109,11 @@ try:
 except ImportError:
     print("Warning: ab_testing service not available")
 
+# ── Per-route latency histograms (exported via /api/phase8/metrics) ──────────
+# Added last so it is the outermost middleware and times the whole stack.
+from services.latency_histograms import RouteLatencyMiddleware
+app.add_middleware(RouteLatencyMiddleware)
+
 # Import routers
 from routes.auth_routes import router as auth_router, router_v1 as auth_router_v1
 from routes.whoami_routes import router as whoami_router
@@ -456,6 +466,22 @@ async def startup_event():
         print(f"⚠️ Autonomous Edge Scheduler startup error: {e}")
         print("   Manual simulation triggers still available")
     
+    # Start input-change-driven re-simulation scheduler
+    try:
+        from services.resimulation_scheduler import start_resimulation_scheduler
+        await start_resimulation_scheduler()
+        print("✓ Re-simulation Scheduler active (odds/injury input changes)")
+    except Exception as e:
+        print(f"⚠️ Re-simulation Scheduler startup error: {e}")
+    
+    # Start Phase 8 metric counter reconciler (Prometheus exporter)
+    try:
+        from services.phase8_metric_counters import start_metrics_reconciler
+        await start_metrics_reconciler()
+        print("✓ Metric counter reconciler active")
+    except Exception as e:
+        print(f"⚠️ Metric counter reconciler startup error: {e}")
+    
     # Start Calibration Scheduler
     try:
         from services.calibration_scheduler import start_calibration_scheduler
@@ -509,6 +535,21 @@ async def shutdown_event():
     except Exception:
         pass
     
+    # Shutdown re-simulation scheduler
+    try:
+        from services.resimulation_scheduler import stop_resimulation_scheduler
+        await stop_resimulation_scheduler()
+        print("✓ Re-simulation Scheduler shutdown complete")
+    except Exception:
+        pass
+    
+    # Shutdown metric counter reconciler
+    try:
+        from services.phase8_metric_counters import stop_metrics_reconciler
+        await stop_metrics_reconciler()
+    except Exception:
+        pass
+    
     # Shutdown calibration scheduler
     try:
         from services.calibration_scheduler import stop_calibration_scheduler
@@ -525,6 +566,22 @@ async def shutdown_event():
     except Exception:
         pass
 
+    # Flush buffered log/audit writes
+    try:
+        from db.write_behind import shutdown_write_behind_sink
+        shutdown_write_behind_sink()
+        print("✓ Write-behind log sink flushed")
+    except Exception:
+        pass
+
+    # Shutdown simulation executor (process + I/O pools)
+    try:
+        from services.simulation_executor import shutdown_simulation_executor
+        shutdown_simulation_executor()
+        print("✓ Simulation Executor shutdown complete")
+    except Exception:
+        pass
+
     # Phase 4D: Stop calibration change-stream watcher
     try:
         from db.migrations.phase4_002_calibration_immutability import stop_watcher
@@ -533,6 +590,14 @@ async def shutdown_event():
     except Exception:
         pass
 
+    # Close shared Mongo pools last (after buffered writes are flushed)
+    try:
+        from db.connection_registry import close_mongo_registry
+        close_mongo_registry()
+        print("✓ Mongo connection pools closed")
+    except Exception:
+        pass
+
 
 @app.get("/")
 def root():
@@ -568,6 +633,20 @@ def health_check():
     try:
         # Test MongoDB connection
         db.command("ping")
-        return {"status": "healthy", "database": "connected", "geoip": geoip_status}
+        from db.connection_registry import get_mongo_registry
+        from middleware.rate_limiter import get_rate_limit_stats
+        from services.principal_cache import get_principal_cache
+        from services.resimulation_scheduler import get_resimulation_scheduler
+        from services.phase8_metric_counters import get_metric_counters
+        return {
+            "status": "healthy",
+            "database": "connected",
+            "geoip": geoip_status,
+            "mongo_pools": get_mongo_registry().pool_stats(),
+            "rate_limiter": get_rate_limit_stats(),
+            "principal_cache": get_principal_cache().stats(),
+            "resimulation": get_resimulation_scheduler().stats(),
+            "metric_counters": get_metric_counters().stats(),
+        }
     except Exception as e:
         return {"status": "unhealthy", "database": "disconnected", "geoip": geoip_status, "error": str(e)}
\ No newline at end of file
@@ -7,34 +7,62 @@ CRITICAL sentinel events when detected.
 
 from __future__ import annotations
 
-import json
 from datetime import datetime, timezone
-from typing import Iterable
 
 from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
 
 from config.agent_config import AGENT_CONFIG
 from db.mongo import db
+from db.write_behind import get_write_behind_sink
+from utils.phrase_matcher import PhraseMatcher
 
 
 def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def _iter_response_chunks(response: Response) -> Iterable[bytes]:
-    async def _empty():
-        if False:
-            yield b""
-
-    iterator = getattr(response, "body_iterator", None)
-    if iterator is None:
-        body = getattr(response, "body", b"") or b""
-        return [body]
-    return iterator
+# Negation exception for sportsbook references.
+_SPORTSBOOK_NEGATIONS = ("not a sportsbook", "not the sportsbook", "no sportsbook")
+
+
+def _violations(matched: set, phrases: list[str]) -> list[str]:
+    violations = []
+    for phrase in phrases:
+        if phrase not in matched:
+            continue
+        if phrase == "sportsbook" and any(n in matched for n in _SPORTSBOOK_NEGATIONS):
+            continue
+        violations.append(phrase)
+    return violations
+
+
+def _log_violations(request, violations: list[str]) -> None:
+    try:
+        get_write_behind_sink().submit(
+            db["sentinel_event_log"],
+            {
+                "event_type": "PROHIBITED_LANGUAGE_API_RESPONSE",
+                "severity": "CRITICAL",
+                "path": request.url.path,
+                "method": request.method,
+                "violations": sorted(list(set(violations))),
+                "timestamp": _utc_now_iso(),
+            },
+        )
+    except Exception:
+        pass
 
 
 class APIResponseLanguageGuardMiddleware(BaseHTTPMiddleware):
+    """
+    Scans JSON bodies as they stream to the client.
+
+    The body is never buffered: each chunk is fed to a compiled phrase
+    scanner (with overlap across chunk boundaries) and passed straight
+    through, so the response bytes and Content-Length are untouched.
+    Violations are logged once the stream completes.
+    """
+
     def __init__(self, app):
         super().__init__(app)
         self.phrases = [
@@ -42,60 +70,41 @@ class APIResponseLanguageGuardMiddleware(BaseHTTPMiddleware):
             for p in AGENT_CONFIG.get("phase7", {}).get("prohibited_phrases", [])
             if isinstance(p, str)
         ]
+        negations = _SPORTSBOOK_NEGATIONS if "sportsbook" in self.phrases else ()
+        self.matcher = PhraseMatcher([*self.phrases, *negations])
 
     async def dispatch(self, request, call_next):
         response = await call_next(request)
 
+        if not self.matcher:
+            return response
+
         content_type = (response.headers.get("content-type") or "").lower()
         if "application/json" not in content_type:
             return response
 
-        body = b""
-        chunks = _iter_response_chunks(response)
-        if hasattr(chunks, "__aiter__"):
-            async for chunk in chunks:
-                body += chunk
+        scanner = self.matcher.scanner()
+        iterator = getattr(response, "body_iterator", None)
+        if iterator is None:
+            scanner.feed_bytes(getattr(response, "body", b"") or b"")
+            violations = _violations(scanner.finish(), self.phrases)
+            if violations:
+                _log_violations(request, violations)
+            return response
+
+        response.body_iterator = self._scan_stream(iterator, scanner, request)
+        return response
+
+    async def _scan_stream(self, iterator, scanner, request):
+        if hasattr(iterator, "__aiter__"):
+            async for chunk in iterator:
+                scanner.feed_bytes(chunk if isinstance(chunk, bytes) else chunk.encode("utf-8"))
+                yield chunk
         else:
-            for chunk in chunks:
-                body += chunk
-
-        text = body.decode("utf-8", errors="ignore")
-        lower = text.lower()
-
-        violations = []
-        for phrase in self.phrases:
-            if phrase in lower:
-                # Negation exception for sportsbook references.
-                if phrase == "sportsbook" and (
-                    "not a sportsbook" in lower
-                    or "not the sportsbook" in lower
-                    or "no sportsbook" in lower
-                ):
-                    continue
-                violations.append(phrase)
+            for chunk in iterator:
+                scanner.feed_bytes(chunk if isinstance(chunk, bytes) else chunk.encode("utf-8"))
+                yield chunk
 
+        violations = _violations(scanner.finish(), self.phrases)
         if violations:
-            try:
-                db["sentinel_event_log"].insert_one(
-                    {
-                        "event_type": "PROHIBITED_LANGUAGE_API_RESPONSE",
-                        "severity": "CRITICAL",
-                        "path": request.url.path,
-                        "method": request.method,
-                        "violations": sorted(list(set(violations))),
-                        "timestamp": _utc_now_iso(),
-                    }
-                )
-            except Exception:
-                pass
-
-        headers = dict(response.headers)
-        if "content-length" in headers:
-            headers.pop("content-length")
-
-        return Response(
-            content=body,
-            status_code=response.status_code,
-            headers=headers,
-            media_type=response.media_type,
-        )
+            _log_violations(request, violations)
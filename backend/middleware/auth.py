@@ -14,10 +14,10 @@ import os
 from typing import Optional, Dict, Any
 from datetime import datetime, timezone
 
-from bson import ObjectId
 from fastapi import Depends, Header, HTTPException, status
 
 from db.mongo import db
+from services.principal_cache import get_principal_cache
 
 logger = logging.getLogger(__name__)
 
@@ -57,7 +57,7 @@ def _validate_jwt(token: str) -> Dict[str, Any]:
 
 def _resolve_user_from_id(user_id: str) -> Dict[str, Any]:
     try:
-        user = db.users.find_one({"_id": ObjectId(user_id)})
+        user = get_principal_cache().get_user(user_id)
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -191,10 +191,8 @@ def get_user_tier(user: Dict[str, Any]) -> str:
     if isinstance(token_tier, str) and token_tier.strip():
         return token_tier.strip().lower()
 
-    subscription = db.subscriptions.find_one(
-        {"user_id": user.get("email")},
-        sort=[("created_at", -1)],
-    )
+    email = user.get("email")
+    subscription = get_principal_cache().get_subscription(email) if email else None
 
     if subscription and subscription.get("status") == "active":
         return subscription.get("tier", "free").lower()
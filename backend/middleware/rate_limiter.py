@@ -7,8 +7,13 @@ All thresholds live in agent_config — zero hardcoded values here.
 Strategy:
   - Per-user:   sliding window based on authenticated user_id from JWT
   - Per-tenant: sliding window based on API key or IP for unauthenticated requests
-  - Storage:    Redis (distributed, survives restarts); falls back to in-memory
-                (single-process only — warns on startup)
+  - Storage:    Redis (distributed, survives restarts) via redis.asyncio, with
+                check-and-record done atomically in one Lua script (one round
+                trip); falls back to in-memory deque windows (single-process
+                only — warns on startup)
+  - Tenants:    tenant documents are cached with a TTL (positive and negative
+                entries); misses are resolved off the event loop and coalesced
+                per tenant, so the hot path never blocks on Mongo
 
 On breach:
   - Returns HTTP 429 with Retry-After header
@@ -16,13 +21,14 @@ On breach:
 """
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 import time
 import uuid
-from collections import defaultdict
+from collections import OrderedDict, deque
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Deque, Dict, Optional, Tuple
 
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -38,6 +44,10 @@ _DEFAULT_CONFIG = {
     "rate_limit_window_seconds": 60,
 }
 
+RATE_LIMIT_TENANT_CACHE_TTL_SECONDS = float(os.getenv("RATE_LIMIT_TENANT_CACHE_TTL_SECONDS", "30"))
+RATE_LIMIT_TENANT_CACHE_MAX_ENTRIES = int(os.getenv("RATE_LIMIT_TENANT_CACHE_MAX_ENTRIES", "10000"))
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
 
 def _get_config() -> dict:
     try:
@@ -50,7 +60,8 @@ def _get_config() -> dict:
 def _log_rate_breach(identifier: str, identifier_type: str, path: str, trace_id: str) -> None:
     try:
         from db.mongo import db
-        db["sentinel_event_log"].insert_one({
+        from db.write_behind import get_write_behind_sink
+        get_write_behind_sink().submit(db["sentinel_event_log"], {
             "event_type": "RATE_LIMIT_BREACH",
             "identifier": identifier,
             "identifier_type": identifier_type,
@@ -87,23 +98,116 @@ def _extract_user_id_from_token(authorization: Optional[str]) -> Optional[str]:
     return None
 
 
-def _resolve_tenant(request: Request, user_id: Optional[str]) -> tuple[Optional[str], Optional[dict]]:
+def _load_tenant(tenant_id: str) -> Optional[dict]:
+    """Blocking tenant lookup — only ever called off the event loop."""
+    from services.principal_cache import get_principal_cache
+    return get_principal_cache().get_tenant(tenant_id)
+
+
+class _TenantCache:
+    """
+    TTL cache of tenant documents keyed by tenant_id.
+
+    Misses (including "no such tenant") are cached too, so an unknown
+    X-Tenant-ID does not cost a DB round trip per request. Concurrent misses
+    for the same tenant share one lookup.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = RATE_LIMIT_TENANT_CACHE_TTL_SECONDS,
+        max_entries: int = RATE_LIMIT_TENANT_CACHE_MAX_ENTRIES,
+        loader=_load_tenant,
+        clock=time.monotonic,
+    ):
+        self.ttl = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._loader = loader
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Optional[dict]]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def peek(self, tenant_id: str) -> Tuple[bool, Optional[dict]]:
+        entry = self._entries.get(tenant_id)
+        if entry is None or entry[0] <= self._clock():
+            return False, None
+        return True, entry[1]
+
+    async def get(self, tenant_id: str) -> Optional[dict]:
+        found, doc = self.peek(tenant_id)
+        if found:
+            self.hits += 1
+            return doc
+        self.misses += 1
+
+        pending = self._inflight.get(tenant_id)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[tenant_id] = future
+        doc = None
+        try:
+            doc = await asyncio.to_thread(self._loader, tenant_id)
+            self._store(tenant_id, doc)
+        except Exception as exc:
+            # Fail open to the default limits; retry on the next request
+            self.errors += 1
+            logger.debug("[RateLimit] tenant lookup failed for %s: %s", tenant_id, exc)
+        finally:
+            self._inflight.pop(tenant_id, None)
+            if not future.done():
+                future.set_result(doc)
+        return doc
+
+    def _store(self, tenant_id: str, doc: Optional[dict]) -> None:
+        self._entries[tenant_id] = (self._clock() + self.ttl, doc)
+        self._entries.move_to_end(tenant_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, tenant_id: Optional[str] = None) -> None:
+        if tenant_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(tenant_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "ttl_seconds": self.ttl,
+        }
+
+
+_tenant_cache = _TenantCache()
+
+
+async def _resolve_tenant(
+    request: Request, user_id: Optional[str], cache: Optional[_TenantCache] = None
+) -> tuple[Optional[str], Optional[dict]]:
+    cache = cache or _tenant_cache
     tenant_id = request.headers.get("X-Tenant-ID")
-    try:
-        from db.mongo import db
-        if tenant_id:
-            tenant = db["tenants"].find_one({"tenant_id": tenant_id})
-            return tenant_id, tenant
+    if tenant_id:
+        return tenant_id, await cache.get(tenant_id)
 
-        if user_id:
-            tenant = db["tenants"].find_one({"tenant_id": user_id})
-            if tenant:
-                return user_id, tenant
-    except Exception:
-        pass
+    if user_id:
+        tenant = await cache.get(user_id)
+        if tenant:
+            return user_id, tenant
     return None, None
 
 
+def invalidate_tenant_cache(tenant_id: Optional[str] = None) -> None:
+    """Drop cached tenant limits (call after changing custom_thresholds)."""
+    _tenant_cache.invalidate(tenant_id)
+
+
 def _resolve_tenant_limit(tenant_doc: Optional[dict], fallback_limit: int) -> int:
     if not tenant_doc:
         return fallback_limit
@@ -116,22 +220,39 @@ def _resolve_tenant_limit(tenant_doc: Optional[dict], fallback_limit: int) -> in
 
 
 class _InMemoryStore:
-    """Single-process sliding-window store. Thread-safe for asyncio (GIL)."""
+    """
+    Single-process sliding-window store. Safe for asyncio (no awaits inside).
 
-    def __init__(self):
-        self._windows: dict[str, list[float]] = defaultdict(list)
+    Each key holds a deque of request timestamps, so pruning expired entries
+    is popleft() — O(1) per expired request instead of list.pop(0). Keys that
+    have gone idle are evicted LRU-first once RATE_LIMIT_MAX_KEYS is reached.
+    """
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS, clock=time.time):
+        self.max_keys = max(1, max_keys)
+        self._clock = clock
+        self._windows: "OrderedDict[str, Deque[float]]" = OrderedDict()
 
-    def check_and_record(self, key: str, limit: int, window_seconds: int) -> tuple[bool, int]:
+    async def check_and_record(self, key: str, limit: int, window_seconds: int) -> tuple[bool, int]:
+        return self.check_and_record_sync(key, limit, window_seconds)
+
+    def check_and_record_sync(self, key: str, limit: int, window_seconds: int) -> tuple[bool, int]:
         """
         Returns (allowed, current_count).
         Prunes old timestamps and adds current if within limit.
         """
-        now = time.time()
+        now = self._clock()
         cutoff = now - window_seconds
-        timestamps = self._windows[key]
+        timestamps = self._windows.get(key)
+        if timestamps is None:
+            timestamps = self._windows[key] = deque()
+            if len(self._windows) > self.max_keys:
+                self._windows.popitem(last=False)
+        else:
+            self._windows.move_to_end(key)
         # Prune outside window
         while timestamps and timestamps[0] < cutoff:
-            timestamps.pop(0)
+            timestamps.popleft()
         count = len(timestamps)
         if count >= limit:
             return False, count
@@ -139,24 +260,86 @@ class _InMemoryStore:
         return True, count + 1
 
 
+# Atomic sliding-window check-and-record: prune, count, and only add the new
+# request when under the limit — one round trip, nothing to roll back.
+_SLIDING_WINDOW_LUA = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+local count = redis.call('ZCARD', key)
+if count >= limit then
+    return {0, count}
+end
+redis.call('ZADD', key, now, ARGV[4])
+redis.call('PEXPIRE', key, math.ceil((window + 1) * 1000))
+return {1, count + 1}
+"""
+
+
 class _RedisStore:
-    def __init__(self, redis_client):
+    """
+    Distributed sliding-window store on redis.asyncio.
+
+    Check-and-record runs as one server-side Lua script (EVALSHA, one round
+    trip). If Redis errors, the request is decided by the in-process fallback
+    store instead of failing the request.
+    """
+
+    def __init__(self, redis_client, fallback: Optional[_InMemoryStore] = None):
         self._r = redis_client
+        self._script = redis_client.register_script(_SLIDING_WINDOW_LUA)
+        self._fallback = fallback or _InMemoryStore()
+        self.errors = 0
 
-    def check_and_record(self, key: str, limit: int, window_seconds: int) -> tuple[bool, int]:
+    async def check_and_record(self, key: str, limit: int, window_seconds: int) -> tuple[bool, int]:
         now = time.time()
-        pipe = self._r.pipeline()
-        pipe.zremrangebyscore(key, 0, now - window_seconds)
-        pipe.zcard(key)
-        pipe.zadd(key, {str(uuid.uuid4()): now})
-        pipe.expire(key, window_seconds + 1)
-        results = pipe.execute()
-        count_before = results[1]
-        if count_before >= limit:
-            # Roll back the add — we already wrote it, remove the newest
-            self._r.zpopmax(key)
-            return False, count_before
-        return True, count_before + 1
+        try:
+            allowed, count = await self._script(
+                keys=[key], args=[now, window_seconds, limit, f"{now}:{uuid.uuid4().hex}"]
+            )
+            return bool(int(allowed)), int(count)
+        except Exception as exc:
+            self.errors += 1
+            if self.errors % 1000 == 1:
+                logger.warning("[RateLimit] Redis check failed (%s); using in-memory window", exc)
+            return self._fallback.check_and_record_sync(key, limit, window_seconds)
+
+
+class _OverheadStats:
+    """Rolling limiter overhead (everything except call_next), in microseconds."""
+
+    def __init__(self):
+        self.checks = 0
+        self.blocked = 0
+        self.total_us = 0.0
+        self.max_us = 0.0
+
+    def record(self, elapsed_ns: int, allowed: bool) -> None:
+        us = elapsed_ns / 1000.0
+        self.checks += 1
+        self.total_us += us
+        if us > self.max_us:
+            self.max_us = us
+        if not allowed:
+            self.blocked += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "checks": self.checks,
+            "blocked": self.blocked,
+            "avg_overhead_us": round(self.total_us / self.checks, 2) if self.checks else 0.0,
+            "max_overhead_us": round(self.max_us, 2),
+        }
+
+
+_overhead = _OverheadStats()
+
+
+def get_rate_limit_stats() -> Dict[str, Any]:
+    """Limiter overhead and tenant-cache effectiveness for ops endpoints."""
+    return {"overhead": _overhead.snapshot(), "tenant_cache": _tenant_cache.stats()}
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
@@ -171,8 +354,11 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         if redis_url:
             try:
                 import redis  # type: ignore
-                client = redis.from_url(redis_url, decode_responses=True)
-                client.ping()
+                import redis.asyncio as aioredis  # type: ignore
+                # Blocking ping once at startup to pick the backend; requests
+                # use the asyncio client
+                redis.from_url(redis_url, socket_connect_timeout=2).ping()
+                client = aioredis.from_url(redis_url, decode_responses=True)
                 logger.info("[RateLimit] Using Redis store: %s", redis_url)
                 return _RedisStore(client)
             except Exception as exc:
@@ -185,12 +371,13 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         return _InMemoryStore()
 
     async def dispatch(self, request: Request, call_next):
+        started = time.perf_counter_ns()
         config = _get_config()
         window = int(config["rate_limit_window_seconds"])
 
         auth_header = request.headers.get("Authorization")
         user_id = _extract_user_id_from_token(auth_header)
-        tenant_id, tenant_doc = _resolve_tenant(request, user_id)
+        tenant_id, tenant_doc = await _resolve_tenant(request, user_id)
 
         if user_id:
             limit = int(config["rate_limit_per_user_rpm"])
@@ -212,7 +399,8 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 identifier = ip
                 identifier_type = "ip"
 
-        allowed, count = self._store.check_and_record(rate_key, limit, window)
+        allowed, count = await self._store.check_and_record(rate_key, limit, window)
+        _overhead.record(time.perf_counter_ns() - started, allowed)
 
         if not allowed:
             trace_id = str(uuid.uuid4())
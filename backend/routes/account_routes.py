@@ -7,6 +7,7 @@ import bcrypt
 import secrets
 import base64
 from db.mongo import db
+from services.principal_cache import get_principal_cache
 
 router = APIRouter(prefix="/api/account", tags=["account"])
 
@@ -391,6 +392,7 @@ def delete_account(payload: DeleteAccountRequest, Authorization: Optional[str] =
         db['telegram_integrations'].delete_many({"user_id": user_id})
         db['telegram_subscriptions'].delete_many({"user_id": user_id})
         db['notifications'].delete_many({"user_id": user_id})
+        get_principal_cache().invalidate_user(user_id, user.get("email"))
         
         return {
             "status": "success",
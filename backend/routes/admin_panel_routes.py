@@ -12,6 +12,7 @@ import stripe
 
 from db.mongo import db
 from middleware.auth import require_admin, get_current_user
+from services.principal_cache import get_principal_cache
 
 router = APIRouter(prefix="/api/admin/panel", tags=["admin-panel"])
 
@@ -444,6 +445,7 @@ async def cancel_subscription(
             {"_id": ObjectId(update.user_id)},
             {"$set": {"tier": "free"}}
         )
+        get_principal_cache().invalidate_user(update.user_id)
         
         # Log the action
         db.activity_logs.insert_one({
@@ -594,6 +596,7 @@ async def update_user_tier(
         
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="User not found")
+        get_principal_cache().invalidate_user(user_id)
         
         # Log the action
         db.activity_logs.insert_one({
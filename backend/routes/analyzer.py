@@ -9,39 +9,16 @@ import os
 
 from services.ai_analyzer_schemas import AnalyzerRequest, AnalyzerResponse
 from services.ai_analyzer_service import AnalyzerService
-from services.ai_analyzer_llm import AnalyzerLLMClient
-from services.ai_analyzer_audit import AnalyzerAuditLogger
-from db.mongo import db
+from services.ai_analyzer_service import get_analyzer_service as get_shared_analyzer_service
 
 
 router = APIRouter(prefix="/api/analyzer", tags=["AI Analyzer"])
 
 
 # Dependency injection for analyzer service
-def get_analyzer_service():
-    """Get analyzer service instance"""
-    from db.mongo import db
-    
-    # Initialize components
-    llm_client = AnalyzerLLMClient(
-        api_key=os.getenv("OPENAI_API_KEY"),
-        model=os.getenv("ANALYZER_LLM_MODEL", "gpt-4o-mini"),
-        timeout_seconds=int(os.getenv("ANALYZER_TIMEOUT_SECONDS", "10")),
-        max_tokens=int(os.getenv("ANALYZER_MAX_TOKENS", "800"))
-    )
-    
-    audit_logger = AnalyzerAuditLogger(db)
-    
-    service = AnalyzerService(
-        db=db,
-        llm_client=llm_client,
-        audit_logger=audit_logger,
-        cache_ttl_seconds=int(os.getenv("ANALYZER_CACHE_TTL", "300")),
-        rate_limit_per_user=int(os.getenv("ANALYZER_RATE_LIMIT", "20")),
-        rate_limit_window_seconds=int(os.getenv("ANALYZER_RATE_WINDOW", "3600"))
-    )
-    
-    return service
+def get_analyzer_service() -> AnalyzerService:
+    """Get the process-wide analyzer service (shared explanation cache)"""
+    return get_shared_analyzer_service()
 
 
 @router.post("/explain", response_model=AnalyzerResponse)
@@ -76,8 +53,9 @@ async def explain_game(
     - Pass X-User-ID header for per-user rate limiting
     
     **Caching**:
-    - Responses cached for 5 minutes (configurable)
-    - Same input returns cached result
+    - Responses cached for 5 minutes (configurable), shared across workers
+    - Same input returns cached result; concurrent misses share one LLM call
+    - Published games are pre-warmed after each slate simulation
     
     **Safety**:
     - All outputs validated for banned terms
@@ -85,7 +63,7 @@ async def explain_game(
     - Fallback returned on any safety violation
     """
     try:
-        response = service.explain(request, user_id=user_id)
+        response = await service.explain(request, user_id=user_id)
         return response
     
     except Exception as e:
@@ -105,7 +83,8 @@ async def get_analyzer_stats(
     Get analyzer service statistics.
     
     **Returns**:
-    - cache_size: Number of cached responses
+    - cache_size: Number of cached responses in this worker
+    - cache: Hit/miss/coalescing counters
     - llm_stats: LLM client statistics
     """
     return service.get_stats()
@@ -8,10 +8,11 @@ from typing import Optional, List, Dict, Any
 from datetime import datetime, timezone
 from uuid import uuid4
 from db.mongo import db
-from core.parlay_architect import ParlayRequest, build_parlay, derive_tier, MarketType, Leg
+from core.parlay_architect import ParlayRequest, build_parlay
 from services.stake_intelligence import stake_intelligence_service
 from services.parlay_calculator import parlay_calculator_service
-from services.canonical_parlay_service import canonical_parlay_service
+from services.canonical_parlay_service import candidates_to_core_legs, canonical_parlay_service
+from services.joint_sample_store import leg_correlation_factor
 from services.parlay_execution_agent import parlay_execution_agent, BillingWriteFailure
 from middleware.auth import get_current_user, get_user_tier
 from utils.mongo_helpers import sanitize_mongo_doc
@@ -69,52 +70,6 @@ class AnalyzeStakeRequest(BaseModel):
     ev_percent: float = Field(..., description="Expected value percentage")
 
 
-def _convert_candidates_to_core_legs(candidates: List[Dict[str, Any]]) -> List[Leg]:
-    legs: List[Leg] = []
-    market_type_map = {
-        "spread": MarketType.SPREAD,
-        "total": MarketType.TOTAL,
-        "moneyline": MarketType.MONEYLINE,
-    }
-
-    for cand in candidates:
-        confidence_pct = float(cand["true_probability"]) * 100.0
-        tier = derive_tier(
-            canonical_state=str(cand["canonical_state"]),
-            confidence=confidence_pct,
-            ev=0.0,
-            sport=str(cand.get("sport") or ""),
-        )
-        legs.append(
-            Leg(
-                event_id=str(cand["event_id"]),
-                sport=str(cand.get("sport") or "UNKNOWN"),
-                league=str(cand.get("league") or cand.get("sport") or "UNKNOWN"),
-                start_time_utc=datetime.now(timezone.utc),
-                market_type=market_type_map.get(str(cand.get("pick_type", "spread")).lower(), MarketType.SPREAD),
-                selection=str(cand.get("selection") or ""),
-                tier=tier,
-                confidence=confidence_pct,
-                clv=0.0,
-                total_deviation=0.0,
-                volatility="MEDIUM",
-                ev=0.0,
-                di_pass=True,
-                mv_pass=True,
-                is_locked=False,
-                injury_stable=True,
-                team_key=None,
-                canonical_state=str(cand["canonical_state"]),
-                decision_id=str(cand["decision_id"]),
-                snapshot_hash=str(cand["snapshot_hash"]),
-                true_probability=float(cand["true_probability"]),
-                american_odds=int(cand["american_odds"]),
-            )
-        )
-
-    return legs
-
-
 def _american_to_decimal(american: int) -> float:
     if american < 0:
         return 1 + (100.0 / abs(american))
@@ -247,7 +202,7 @@ async def generate_parlay(
 
         core_profile = RISK_PROFILE_TO_CORE_PROFILE[request.risk_profile]
         result = build_parlay(
-            _convert_candidates_to_core_legs(candidates),
+            candidates_to_core_legs(candidates),
             ParlayRequest(
                 profile=core_profile,
                 legs=request.leg_count,
@@ -256,6 +211,7 @@ async def generate_parlay(
                 seed=None,
                 include_props=False,
             ),
+            correlation_fn=leg_correlation_factor,
         )
 
         if result.status != "PARLAY":
@@ -278,6 +234,7 @@ async def generate_parlay(
         combined_probability = 1.0
         for leg in result.legs_selected:
             combined_probability *= float(leg.true_probability or 0.0)
+        combined_probability = min(1.0, combined_probability * result.correlation_factor)
         expected_value = parlay_calculator_service.calculate_parlay_ev(
             parlay_probability=combined_probability,
             decimal_odds=parlay_decimal_odds,
@@ -708,12 +665,17 @@ async def calculate_parlay_probability_and_ev(
                 "true_probability": leg["true_probability"],
                 "american_odds": leg["american_odds"],
                 "sport": leg["sport"],
+                "side": leg.get("side"),
+                "line": leg.get("line"),
             }
             for leg in resolved_legs
         ]
         
-        # 1. Calculate parlay probability
-        prob_result = parlay_calculator_service.calculate_parlay_probability(legs_data)
+        # 1. Calculate parlay probability (joint over shared simulation samples when stored)
+        prob_result = parlay_calculator_service.calculate_parlay_probability(
+            legs_data,
+            correlation_factor=correlation_factor(legs_data, default=None),
+        )
         
         combined_prob = prob_result["combined_probability"]
         combined_prob_pct = combined_prob * 100
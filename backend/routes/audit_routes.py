@@ -193,12 +193,16 @@ async def audit_system_health():
         # Get kill switch status
         kill_switch_status = KillSwitch.get_status()
         
+        # Write-behind sink backpressure (buffered Mongo log/audit writes)
+        from db.write_behind import get_write_behind_sink
+        
         return {
             "audit_logging": "operational",
             "kill_switch": kill_switch_status,
             "log_file_accessible": True,
             "total_audit_records": stats.get("total_records", 0),
-            "log_size_mb": stats.get("file_size_mb", 0)
+            "log_size_mb": stats.get("file_size_mb", 0),
+            "write_behind": get_write_behind_sink().stats()
         }
     except Exception as e:
         logger.error(f"Health check failed: {e}")
@@ -15,6 +15,7 @@ from core.market_decision import (
     MarketSpread, MarketTotal, Risk, Debug, Edge, Probabilities
 )
 from core.compute_market_decision import MarketDecisionComputer
+from core.distribution_sketch import reprice_simulation
 from datetime import datetime
 from db.mongo import db
 from db.decision_audit_logger import get_decision_audit_logger
@@ -490,7 +491,27 @@ async def get_game_decisions(
         # Timestamp for freshness check
         'computed_at': sim_doc.get("created_at") or sim_doc.get("computed_at")
     }
-    
+
+    # Re-price at the CURRENT lines from the stored distribution sketch, so a
+    # line move since the simulation needs no re-simulation (legacy docs keep
+    # the stored probabilities and the odds-alignment gate)
+    current_spread_home = spread_lines.get(home_id, {}).get('line') if home_id in spread_lines else None
+    current_total = over_outcome.get("point") if over_outcome else None
+    repriced = reprice_simulation(
+        sim_doc,
+        spread_home=current_spread_home,
+        total_line=current_total,
+        spread_odds=(spread_lines.get(home_id, {}).get('odds'), spread_lines.get(away_id, {}).get('odds')),
+    )
+    if repriced:
+        if "spread" in repriced:
+            sim_result['home_cover_probability'] = repriced["spread"]["p_cover_home"]
+            sim_result['simulation_market_spread_home'] = current_spread_home
+        if "total" in repriced:
+            sim_result['over_probability'] = repriced["total"]["p_over"]
+            sim_result['simulation_market_total'] = current_total
+        sim_result['repriced_from_sketch'] = True
+
     config = {
         'profile': 'balanced',
         'edge_threshold': 2.0,
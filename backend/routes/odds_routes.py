@@ -9,6 +9,7 @@ from utils.timezone import now_est, now_utc, parse_iso_to_est, format_est_date,
 from db.mongo import db
 from integrations.odds_api import fetch_sports, fetch_odds, normalize_event, OddsApiError
 from db.mongo import upsert_events, find_events
+from services.decision_classification_cache import get_decision_classification_cache
 
 router = APIRouter(prefix="/api/odds", tags=["odds"])
 
@@ -139,6 +140,12 @@ def list_events(
     docs = find_events("events", filter=mongo_filter, limit=limit)
     now_utc_dt = now_utc()
 
+    # CRITICAL FIX: Canonical classification from decision_records, resolved for
+    # the whole page in one aggregation (cached per decision record version)
+    classifications = get_decision_classification_cache().get_many(
+        ev.get("id") or ev.get("event_id") for ev in docs
+    )
+
     out = []
     for ev in docs:
         commence_iso = ev.get("commence_time")
@@ -164,30 +171,9 @@ def list_events(
             except Exception:
                 continue
         
-        # CRITICAL FIX: Enrich with canonical classification from decision_records
+        # Fail closed: BLOCKED if no event_id, decision record or classification found
         event_id = ev.get("id") or ev.get("event_id")
-        if event_id:
-            decision_record = db["decision_records"].find_one(
-                {"$or": [{"event_id": event_id}, {"game_id": event_id}]},
-                sort=[("created_at", -1)]
-            )
-            if decision_record and "payload" in decision_record:
-                # Extract canonical spread classification (preferred) or total classification
-                payload = decision_record["payload"]
-                spread = payload.get("spread", {})
-                total = payload.get("total", {})
-                canonical_classification = spread.get("classification") or total.get("classification")
-                if canonical_classification:
-                    ev["classification"] = canonical_classification
-                else:
-                    # Fail closed: set to BLOCKED if no classification found
-                    ev["classification"] = "BLOCKED"
-            else:
-                # Fail closed: set to BLOCKED if no decision record found
-                ev["classification"] = "BLOCKED"
-        else:
-            # Fail closed: set to BLOCKED if no event_id found
-            ev["classification"] = "BLOCKED"
+        ev["classification"] = classifications.get(event_id, "BLOCKED") if event_id else "BLOCKED"
         
         out.append(_serialize_teaser_event(ev))
     
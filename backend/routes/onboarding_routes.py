@@ -19,6 +19,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 
 from db.mongo import db
 from middleware.auth import get_current_user
+from services.principal_cache import get_principal_cache
 
 logger = logging.getLogger(__name__)
 
@@ -84,6 +85,7 @@ def complete_onboarding(current_user: Dict[str, Any] = Depends(get_current_user)
             }
         },
     )
+    get_principal_cache().invalidate_user(str(user_id))
     logger.info(f"[onboarding] onboarding_complete=True set for user_id={user_id}")
 
     return {
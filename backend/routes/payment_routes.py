@@ -11,6 +11,7 @@ import stripe
 import hmac
 import hashlib
 from db.mongo import db
+from services.principal_cache import get_principal_cache
 
 
 router = APIRouter(prefix="/api/payment", tags=["Payment"])
@@ -336,6 +337,7 @@ async def stripe_webhook(request: Request, stripe_signature: Optional[str] = Hea
             },
             upsert=True
         )
+        get_principal_cache().invalidate_user(user_id)
         
         print(f"✓ User {user_id} upgraded to {tier_id}")
         
@@ -369,6 +371,8 @@ async def stripe_webhook(request: Request, stripe_signature: Optional[str] = Hea
                     }
                 }
             )
+            get_principal_cache().invalidate_user(str(user["_id"]), user.get("email"))
+            get_principal_cache().invalidate_user(user["user_id"])
             print(f"✓ User {user['user_id']} downgraded to starter (subscription canceled)")
             
             # Log event
@@ -30,6 +30,7 @@ from pydantic import BaseModel, EmailStr
 from config.agent_config import AGENT_CONFIG
 from db.mongo import db
 from services.phase11_affiliate_engine import affiliate_engine as _aff_engine
+from services.principal_cache import get_principal_cache
 from services.time_service import get_now_utc
 from services.phase13_affiliate_trial import (
     cancel_trial,
@@ -301,6 +302,7 @@ async def start_affiliate_trial(
                 {"$or": [{"_id": user_id}, {"user_id": user_id}]},
                 {"$set": {"stripe_customer_id": stripe_customer_id}},
             )
+            get_principal_cache().invalidate_user(user_id)
         except Exception as exc:
             logger.error("[Trial] Stripe customer creation failed: %s", exc)
             raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Unable to create customer record.")
@@ -528,6 +530,7 @@ async def start_affiliate_trial(
         },
         upsert=True,
     )
+    get_principal_cache().invalidate_user(user_id)
 
     # ── 10. Initialise token balance (1,500 platform allocation) ───────────
     initialise_trial_tokens(user_id)
@@ -30,6 +30,7 @@ import stripe
 
 from config.agent_config import AGENT_CONFIG
 from db.mongo import db
+from services.principal_cache import get_principal_cache
 from services.phase13_affiliate_trial import (
     cancel_trial,
     carry_forward_trial_tokens_on_conversion,
@@ -302,6 +303,7 @@ def handle_trial_payment_failed(event: Dict[str, Any]) -> None:
             }
         },
     )
+    get_principal_cache().invalidate_user(user_id)
 
     # Zero token balance
     zero_trial_tokens(user_id, reason="TRIAL_CHARGE_FAILED")
@@ -26,6 +26,7 @@ from fastapi import APIRouter, HTTPException, Request, status
 
 from db.mongo import db
 from services.billing_ledger_service import billing_ledger
+from services.principal_cache import get_principal_cache
 from services.phase3_tiers import TIERS
 
 logger = logging.getLogger(__name__)
@@ -154,6 +155,7 @@ def _handle_payment_succeeded(event: Dict[str, Any]) -> None:
         }},
         upsert=True,
     )
+    get_principal_cache().invalidate_user(user_id)
 
     billing_ledger.log_state_change(
         user_id=user_id,
@@ -244,6 +246,7 @@ def _handle_subscription_updated(event: Dict[str, Any]) -> None:
         }},
         upsert=True,
     )
+    get_principal_cache().invalidate_user(user_id)
 
     billing_ledger.log_state_change(
         user_id=user_id,
@@ -278,6 +281,7 @@ def _handle_subscription_deleted(event: Dict[str, Any]) -> None:
             "revoke_reason": "SUBSCRIPTION_DELETED",
         }},
     )
+    get_principal_cache().invalidate_user(user_id)
 
     # Invalidate all active sessions for this user
     db["user_sessions"].update_many(
@@ -392,6 +396,7 @@ def _handle_charge_dispute_created(event: Dict[str, Any]) -> None:
                 "dispute_id": dispute_id,
             }},
         )
+        get_principal_cache().invalidate_user(user_id)
 
         # 2. Invalidate all active sessions
         db["user_sessions"].update_many(
@@ -12,6 +12,7 @@ from bson import ObjectId
 
 from db.mongo import db
 from middleware.auth import get_current_user
+from services.principal_cache import get_principal_cache
 
 
 router = APIRouter(prefix="/api/compliance", tags=["phase9-compliance"])
@@ -95,6 +96,7 @@ def request_self_exclusion(
             }
         },
     )
+    get_principal_cache().invalidate_user(user_id, current_user.get("email"))
 
     # Suspend billing/entitlement surface immediately.
     db["billing_state"].update_one(
@@ -308,6 +310,7 @@ def process_data_deletion(request_id: str):
             }
         },
     )
+    get_principal_cache().invalidate_user(user_id, user_email)
     processed += int(user_update.modified_count)
     collection_report.append(
         {
@@ -7,7 +7,7 @@ from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from pymongo.database import Database
-from pymongo import MongoClient
+from db.connection_registry import get_mongo_registry
 from dotenv import load_dotenv
 import os
 
@@ -38,8 +38,7 @@ async def get_db() -> Database:
     """Get MongoDB database connection"""
     mongodb_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017")
     database_name = os.getenv("DATABASE_NAME", "beatvegas")
-    client = MongoClient(mongodb_uri)
-    return client[database_name]
+    return get_mongo_registry().database(database_name, uri=mongodb_uri)
 
 
 # ============================================================================
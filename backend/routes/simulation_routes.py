@@ -3,12 +3,12 @@ from fastapi.responses import JSONResponse
 from typing import Dict, Any, Optional
 from datetime import datetime, timezone, timedelta
 from pydantic import BaseModel
-from bson import ObjectId
+import asyncio
 import logging
 
 from core.monte_carlo_engine import MonteCarloEngine
 from core.safety_engine import SafetyEngine, PublicCopyFormatter
-from core.ncaaf_championship_regime import detect_ncaaf_context, NCAAFChampionshipRegimeController
+from core.ncaaf_championship_regime import detect_ncaaf_context
 from core.truth_mode import truth_mode_validator, BlockReason
 from core.market_line_integrity import MarketLineIntegrityError
 from core.sport_config import MarketType, MarketSettlement, validate_market_contract, get_sport_config
@@ -18,6 +18,9 @@ from services.post_game_grader import post_game_grader
 from utils.mongo_helpers import sanitize_mongo_doc
 from core.canonical_contract_enforcer import enforce_canonical_contract, validate_canonical_contract
 from services.simulation_entitlement_filter import apply_simulation_entitlement_filter
+from services.simulation_executor import get_simulation_executor
+from services.principal_cache import get_principal_cache
+from services.cycle_metering import meter_cycle
 from legacy_config import (
     SIMULATION_TIERS, 
     PRECISION_LABELS, 
@@ -127,37 +130,14 @@ def _deduct_simulation_cycle(user_id: str, tier: str):
     warn_pct = cfg.get("depletion_warn_pct", 80)
     block_pct = cfg.get("depletion_block_pct", 100)
 
-    # Bootstrap entitlement row if absent (first simulation view after signup)
-    db["user_entitlements"].update_one(
-        {"user_id": user_id},
-        {
-            "$setOnInsert": {
-                "user_id": user_id,
-                "tier": tier,
-                "tokens_allocated_current_period": tier_max,
-                "tokens_used_current_period": 0,
-                "active": True,
-                "created_at": datetime.now(timezone.utc).isoformat(),
-            }
-        },
-        upsert=True,
-    )
-
-    ent = db["user_entitlements"].find_one({"user_id": user_id}, {"_id": 0})
-    alloc = int(ent.get("tokens_allocated_current_period") or 0)
-    if alloc <= 0:
-        # Allocation not yet set — seed it now
-        db["user_entitlements"].update_one(
-            {"user_id": user_id},
-            {"$set": {"tokens_allocated_current_period": tier_max}},
-        )
-        alloc = tier_max
-
-    used = int(ent.get("tokens_used_current_period") or 0)
-    pct_used = (used / alloc) * 100
+    # Bootstrap, allocation seed, budget check and deduction in one atomic
+    # conditional write (see services.cycle_metering)
+    charge = meter_cycle(user_id, tier, tier_max, cost, block_pct)
+    get_principal_cache().invalidate_entitlement(user_id)
+    used, alloc = charge.used, charge.allocated
 
-    # Hard gate — user already exhausted their budget
-    if pct_used >= block_pct:
+    # Hard gate — user already exhausted their budget (nothing was charged)
+    if not charge.charged:
         upgrade_message = _exhaustion_upgrade_message(user_id)
         is_syndicate = tier in ("syndicate", "telegram_syndicate", "beatvegas_syndicate")
         if is_syndicate:
@@ -188,21 +168,7 @@ def _deduct_simulation_cycle(user_id: str, tier: str):
             }
         return HTTPException(status_code=status.HTTP_402_PAYMENT_REQUIRED, detail=gate_detail)
 
-    # Deduct
-    db["user_entitlements"].update_one(
-        {"user_id": user_id},
-        {"$inc": {"tokens_used_current_period": cost}},
-    )
-
-    # Addendum 2: Track lifetime Preview cycles used — never decrements, never resets.
-    # Used on Syndicate cancellation to compute remaining Preview allocation.
-    if tier in ("intelligence_preview", "preview"):
-        db["user_entitlements"].update_one(
-            {"user_id": user_id},
-            {"$inc": {"preview_cycles_used_lifetime": cost}},
-        )
-    new_used = used + cost
-    new_pct = (new_used / alloc) * 100
+    new_pct = charge.pct_used
 
     # Fire upgrade prompt when crossing 80% — tier-aware, idempotent in GrowthAgent
     # Preview: show BOTH Syndicate + Platform CTAs
@@ -219,11 +185,11 @@ def _deduct_simulation_cycle(user_id: str, tier: str):
             logger.warning("[cycle_deduct] upgrade prompt failed user=%s err=%s", user_id, _exc)
 
     return None, {
-        "cycles_used": new_used,
-        "cycles_remaining": max(0, alloc - new_used),
+        "cycles_used": used,
+        "cycles_remaining": charge.remaining,
         "cycles_allocated": alloc,
-        "analyses_completed": new_used // cost,
-        "analyses_remaining": max(0, (alloc - new_used) // cost),
+        "analyses_completed": used // cost,
+        "analyses_remaining": charge.remaining // cost,
         "warn_active": new_pct >= warn_pct,
     }
 
@@ -315,15 +281,15 @@ def _get_user_tier_from_auth(authorization: Optional[str]) -> str:
         
         user_id = token.split(':', 1)[1]
         
-        # Fetch user from database
+        # Fetch user (request-scoped / TTL principal cache)
         try:
-            oid = ObjectId(user_id)
-            user = db["users"].find_one({"_id": oid})
+            principals = get_principal_cache()
+            user = principals.get_user(user_id)
             if not user:
                 return "free"
             
             # Get subscription tier
-            subscription = db["subscriptions"].find_one({"user_id": user_id})
+            subscription = principals.get_subscription(user_id)
             if subscription:
                 tier = subscription.get("tier", "free")
                 return tier.lower()
@@ -380,6 +346,78 @@ class SimulationRequest(BaseModel):
     market_settlement: MarketSettlement = MarketSettlement.FULL_GAME  # Default per spec
 
 
+async def _generate_simulation(
+    event: Dict[str, Any],
+    event_id: str,
+    mode: str,
+    assigned_iterations: int
+) -> tuple:
+    """
+    Cold path of get_simulation: roster fetch on the I/O thread pool, engine
+    run on a simulation worker process. Never blocks the event loop.
+
+    Returns:
+        (simulation, market_context, event_context)
+    """
+    from integrations.player_api import get_team_data_with_roster
+    from integrations.odds_api import extract_market_lines
+    
+    executor = get_simulation_executor()
+    sport_key = event.get("sport_key", "basketball_nba")
+    
+    # Try to get team rosters (both ESPN fetches in parallel)
+    try:
+        team_a_data, team_b_data = await asyncio.gather(
+            executor.run_io(get_team_data_with_roster, event.get("home_team", "Team A"), sport_key, is_home=True),
+            executor.run_io(get_team_data_with_roster, event.get("away_team", "Team B"), sport_key, is_home=False),
+        )
+        
+        # DEFENSIVE: Ensure roster fetch didn't return None
+        if team_a_data is None:
+            team_a_data = {"name": event.get("home_team", "Team A"), "team": event.get("home_team")}
+        if team_b_data is None:
+            team_b_data = {"name": event.get("away_team", "Team B"), "team": event.get("away_team")}
+            
+    except (ValueError, Exception) as roster_error:
+        # Log roster unavailability but DON'T immediately fail
+        # Let monte_carlo_engine handle it with roster governance
+        error_msg = str(roster_error)
+        logger.warning(f"Roster fetch failed for {event_id}: {error_msg}")
+        
+        # Create minimal team data - monte_carlo_engine will check roster governance
+        team_a_data = {"name": event.get("home_team", "Team A"), "team": event.get("home_team")}
+        team_b_data = {"name": event.get("away_team", "Team B"), "team": event.get("away_team")}
+    
+    # Extract real market lines from bookmakers
+    market_context = extract_market_lines(event)
+    
+    # Detect championship/postseason context for NCAAF
+    event_context = {}
+    if "americanfootball_ncaaf" in sport_key or "americanfootball_college" in sport_key:
+        event_context = detect_ncaaf_context(
+            event_name=f"{event.get('away_team', '')} @ {event.get('home_team', '')}",
+            **event
+        )
+        print(f"🏈 NCAAF Context: {event_context}")
+        
+        # Apply NCAAF championship regime if needed
+        if event_context.get("is_championship") or event_context.get("is_postseason"):
+            # Note: Full regime integration would require deeper engine changes
+            # For now, we flag the context for safety evaluation
+            print(f"⚠️ Championship/postseason regime detected")
+    
+    # Run simulation with real player rosters and real market lines (CPU → process pool)
+    simulation = await executor.run_simulation(
+        event_id=event_id,
+        team_a=team_a_data,
+        team_b=team_b_data,
+        market_context=market_context,
+        iterations=assigned_iterations,  # TIERED COMPUTE
+        mode=mode
+    )
+    return simulation, market_context, event_context
+
+
 @router.get("/{event_id}")
 async def get_simulation(
     event_id: str, 
@@ -405,9 +443,12 @@ async def get_simulation(
         Simulation with metadata: iterations_run, precision_level, confidence_interval
     """
     try:
+        # Blocking pymongo / HTTP work goes through the executor's I/O pool
+        executor = get_simulation_executor()
+        
         # Determine user's tier and assigned iterations using centralized auth
         if current_user:
-            user_tier = get_user_tier(current_user)
+            user_tier = await executor.run_io(get_user_tier, current_user)
         else:
             user_tier = "free"
 
@@ -417,7 +458,7 @@ async def get_simulation(
         _cycle_balance = None
         if current_user:
             _user_id = str(current_user.get("_id", current_user.get("id", "")))
-            _gate, _cycle_balance = _deduct_simulation_cycle(_user_id, user_tier)
+            _gate, _cycle_balance = await executor.run_io(_deduct_simulation_cycle, _user_id, user_tier)
             if _gate:
                 raise _gate
 
@@ -427,7 +468,7 @@ async def get_simulation(
         confidence_interval = CONFIDENCE_INTERVALS.get(assigned_iterations, 0.15)
         
         # Fetch event data (needed for Truth Mode validation)
-        event = db.events.find_one({"event_id": event_id})
+        event = await executor.run_io(db.events.find_one, {"event_id": event_id})
         if not event:
             raise HTTPException(status_code=404, detail=f"Event not found: {event_id}")
         
@@ -476,7 +517,8 @@ async def get_simulation(
                 # Continue with existing odds
         
         # Find most recent FULL-GAME simulation for this event (exclude period simulations like 1H/2H)
-        simulation = db.monte_carlo_simulations.find_one(
+        simulation = await executor.run_io(
+            db.monte_carlo_simulations.find_one,
             {
                 "event_id": event_id,
                 "period": {"$exists": False}  # Exclude 1H, 2H, Q1, etc.
@@ -549,79 +591,14 @@ async def get_simulation(
             # Auto-generate simulation if it doesn't exist
             print(f"⚡ Auto-generating simulation for event {event_id} (Tier: {user_tier}, Iterations: {assigned_iterations})")
             
-            # Initialize Monte Carlo engine
-            from core.monte_carlo_engine import MonteCarloEngine
-            from integrations.player_api import get_team_data_with_roster
-            from integrations.odds_api import extract_market_lines
-            engine = MonteCarloEngine(num_iterations=assigned_iterations)
-            
-            # Get team rosters with real player data
             sport_key = event.get("sport_key", "basketball_nba")
             
-            # Initialize Monte Carlo engine
-            from core.monte_carlo_engine import MonteCarloEngine
-            engine = MonteCarloEngine(num_iterations=assigned_iterations)
-            
-            # Try to get team rosters
-            from integrations.player_api import get_team_data_with_roster
-            try:
-                team_a_data = get_team_data_with_roster(
-                    event.get("home_team", "Team A"),
-                    sport_key,
-                    is_home=True
-                )
-                team_b_data = get_team_data_with_roster(
-                    event.get("away_team", "Team B"),
-                    sport_key,
-                    is_home=False
-                )
-                
-                # DEFENSIVE: Ensure roster fetch didn't return None
-                if team_a_data is None:
-                    team_a_data = {"name": event.get("home_team", "Team A"), "team": event.get("home_team")}
-                if team_b_data is None:
-                    team_b_data = {"name": event.get("away_team", "Team B"), "team": event.get("away_team")}
-                    
-            except (ValueError, Exception) as roster_error:
-                # Log roster unavailability but DON'T immediately fail
-                # Let monte_carlo_engine handle it with roster governance
-                error_msg = str(roster_error)
-                logger.warning(f"Roster fetch failed for {event_id}: {error_msg}")
-                
-                # Create minimal team data - monte_carlo_engine will check roster governance
-                team_a_data = {"name": event.get("home_team", "Team A"), "team": event.get("home_team")}
-                team_b_data = {"name": event.get("away_team", "Team B"), "team": event.get("away_team")}
-            
-            # Extract real market lines from bookmakers
-            from integrations.odds_api import extract_market_lines
-            market_context = extract_market_lines(event)
-            
-            # Detect championship/postseason context for NCAAF
-            event_context = {}
-            regime_adjustments = {}
-            if "americanfootball_ncaaf" in sport_key or "americanfootball_college" in sport_key:
-                event_context = detect_ncaaf_context(
-                    event_name=f"{event.get('away_team', '')} @ {event.get('home_team', '')}",
-                    **event
-                )
-                print(f"🏈 NCAAF Context: {event_context}")
-                
-                # Apply NCAAF championship regime if needed
-                if event_context.get("is_championship") or event_context.get("is_postseason"):
-                    regime_controller = NCAAFChampionshipRegimeController()
-                    # Note: Full regime integration would require deeper engine changes
-                    # For now, we flag the context for safety evaluation
-                    print(f"⚠️ Championship/postseason regime detected")
-            
             try:
-                # Run simulation with real player rosters and real market lines
-                simulation = engine.run_simulation(
-                    event_id=event_id,
-                    team_a=team_a_data,
-                    team_b=team_b_data,
-                    market_context=market_context,
-                    iterations=assigned_iterations,  # TIERED COMPUTE
-                    mode=mode
+                # Single-flight: a burst of users opening the same game (same
+                # mode/iteration tier) shares one in-flight simulation
+                simulation, market_context, event_context = await executor.coalesce(
+                    f"{event_id}:{mode}:{assigned_iterations}",
+                    lambda: _generate_simulation(event, event_id, mode, assigned_iterations)
                 )
                 
                 # ===== HANDLE BLOCKED STATUS =====
@@ -684,7 +661,7 @@ async def get_simulation(
                 simulation["metadata"] = {
                     "user_tier": user_tier,
                     "iterations_run": assigned_iterations,
-                    "sim_count_used": assigned_iterations,  # Actual simulations executed
+                    "sim_count_used": simulation.get("iterations", assigned_iterations),  # Actual simulations executed (adaptive may stop early)
                     "precision_level": precision_level,
                     "confidence_interval_width": confidence_interval,
                     "variance": simulation.get("variance", 0),
@@ -762,7 +739,7 @@ async def get_simulation(
             
             simulation["metadata"] = {
                 "user_tier": user_tier,
-                "iterations_run": simulation.get("iterations", assigned_iterations),
+                "iterations_run": simulation.get("iteration_budget", simulation.get("iterations", assigned_iterations)),
                 "sim_count_used": simulation.get("iterations", assigned_iterations),
                 "precision_level": precision_level,
                 "confidence_interval_width": confidence_interval,
@@ -6,13 +6,15 @@ from fastapi import APIRouter, Request, HTTPException
 import stripe
 import os
 from datetime import datetime, timezone
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from db.connection_registry import get_mongo_registry
 from dotenv import load_dotenv
 
 load_dotenv()
 
 from services.entitlements_service import EntitlementsEngine, EntitlementNotifier
 from services.telegram_bot_service import TelegramBotService
+from services.principal_cache import get_principal_cache
 from db.schemas.telegram_schemas import COLLECTIONS
 
 
@@ -27,8 +29,7 @@ async def get_db() -> AsyncIOMotorDatabase:
     """Get async MongoDB database connection"""
     mongodb_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017")
     database_name = os.getenv("DATABASE_NAME", "beatvegas")
-    client = AsyncIOMotorClient(mongodb_uri)
-    return client[database_name]
+    return get_mongo_registry().async_database(database_name, uri=mongodb_uri)
 
 
 @router.post("/stripe")
@@ -198,6 +199,7 @@ async def handle_platform_subscription_event(
             },
             upsert=True
         )
+    get_principal_cache().invalidate_user(user_id)
 
 
 async def handle_telegram_subscription_event(
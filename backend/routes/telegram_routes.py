@@ -6,7 +6,8 @@ from typing import Optional, List, Dict
 from datetime import datetime, timezone
 from pydantic import BaseModel, Field
 import os
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from db.connection_registry import get_mongo_registry
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -26,8 +27,7 @@ async def get_db() -> AsyncIOMotorDatabase:
     """Get async MongoDB database connection"""
     mongodb_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017")
     database_name = os.getenv("DATABASE_NAME", "beatvegas")
-    client = AsyncIOMotorClient(mongodb_uri)
-    return client[database_name]
+    return get_mongo_registry().async_database(database_name, uri=mongodb_uri)
 
 
 # ============================================================================
@@ -9,7 +9,8 @@ from pydantic import BaseModel, Field
 import uuid
 import os
 from db.mongo import db
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from db.connection_registry import get_mongo_registry
 from services.war_room_service import WarRoomService, RankEngine, LeaderboardEngine
 from middleware.auth import get_current_user
 from dotenv import load_dotenv
@@ -24,8 +25,7 @@ async def get_db() -> AsyncIOMotorDatabase:
     """Get async MongoDB database connection"""
     mongodb_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017")
     database_name = os.getenv("DATABASE_NAME", "beatvegas")
-    client = AsyncIOMotorClient(mongodb_uri)
-    return client[database_name]
+    return get_mongo_registry().async_database(database_name, uri=mongodb_uri)
 
 
 # ============================================================================
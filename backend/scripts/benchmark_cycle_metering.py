@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Cycle Metering Benchmark
+========================
+
+Compares the legacy read-check-increment cycle deduction (the flow
+routes/simulation_routes._deduct_simulation_cycle used before
+services.cycle_metering) with the atomic meter_cycle primitive:
+
+1. Round trips per simulation view, counted with a pymongo CommandListener
+   (first view of a fresh user, then a steady-state view).
+2. Correctness under concurrent views from one user: N threads each try to
+   view once against an allocation that covers only K views. The atomic
+   primitive must charge exactly K; the legacy flow typically overspends.
+3. Wall time per view for each flow.
+
+Runs against a scratch collection (bench_user_entitlements) that is dropped
+before and after, so it is safe to point at a dev database.
+
+Usage:
+    python backend/scripts/benchmark_cycle_metering.py [threads] [allowed_views]
+
+Examples:
+    python backend/scripts/benchmark_cycle_metering.py          # 32 threads, 5 allowed views
+    python backend/scripts/benchmark_cycle_metering.py 64 10
+"""
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pymongo import MongoClient, monitoring
+
+from services.cycle_metering import meter_cycle
+
+COLLECTION = "bench_user_entitlements"
+COST = 1000
+TIER = "intelligence_preview"
+
+
+class RoundTripCounter(monitoring.CommandListener):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def started(self, event):
+        if event.command_name in ("find", "update", "findAndModify", "insert"):
+            with self._lock:
+                self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+def legacy_deduct(col, user_id: str, tier: str, tier_max: int, cost: int, block_pct: float = 100) -> bool:
+    """The pre-metering flow: bootstrap, read, optional seed, check, $inc, $inc."""
+    col.update_one(
+        {"user_id": user_id},
+        {"$setOnInsert": {
+            "user_id": user_id,
+            "tier": tier,
+            "tokens_allocated_current_period": tier_max,
+            "tokens_used_current_period": 0,
+            "active": True,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }},
+        upsert=True,
+    )
+    ent = col.find_one({"user_id": user_id}, {"_id": 0})
+    alloc = int(ent.get("tokens_allocated_current_period") or 0)
+    if alloc <= 0:
+        col.update_one({"user_id": user_id}, {"$set": {"tokens_allocated_current_period": tier_max}})
+        alloc = tier_max
+    used = int(ent.get("tokens_used_current_period") or 0)
+    if (used / alloc) * 100 >= block_pct:
+        return False
+    col.update_one({"user_id": user_id}, {"$inc": {"tokens_used_current_period": cost}})
+    if tier in ("intelligence_preview", "preview"):
+        col.update_one({"user_id": user_id}, {"$inc": {"preview_cycles_used_lifetime": cost}})
+    return True
+
+
+def atomic_deduct(col, user_id: str, tier: str, tier_max: int, cost: int, block_pct: float = 100) -> bool:
+    return meter_cycle(user_id, tier, tier_max, cost, block_pct, collection=col).charged
+
+
+def round_trips(col, counter, deduct, user_id: str, tier_max: int):
+    before = counter.count
+    deduct(col, user_id, TIER, tier_max, COST)
+    first = counter.count - before
+    before = counter.count
+    deduct(col, user_id, TIER, tier_max, COST)
+    return first, counter.count - before
+
+
+def concurrent_views(col, deduct, user_id: str, threads: int, allowed: int):
+    # Existing row with a budget for `allowed` views; every thread views at once
+    col.insert_one({"user_id": user_id, "tier": TIER, "active": True,
+                    "tokens_allocated_current_period": allowed * COST,
+                    "tokens_used_current_period": 0})
+    barrier = threading.Barrier(threads)
+
+    def view(_):
+        barrier.wait()
+        return deduct(col, user_id, TIER, allowed * COST, COST)
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        charged = sum(pool.map(view, range(threads)))
+    row = col.find_one({"user_id": user_id}, {"_id": 0})
+    return charged, int(row.get("tokens_used_current_period") or 0)
+
+
+def latency_ms(col, deduct, user_id: str, views: int = 200):
+    start = time.perf_counter()
+    for _ in range(views):
+        deduct(col, user_id, TIER, views * COST * 2, COST)
+    return (time.perf_counter() - start) * 1000.0 / views
+
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    allowed = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    counter = RoundTripCounter()
+    client = MongoClient(os.getenv("MONGO_URI", "mongodb://localhost:27017"), event_listeners=[counter])
+    col = client[os.getenv("DATABASE_NAME", "beatvegas")][COLLECTION]
+    col.drop()
+    col.create_index([("user_id", 1)], unique=True)
+
+    flows = (("legacy", legacy_deduct), ("atomic", atomic_deduct))
+    try:
+        print(f"{'flow':<8} {'rt first':>9} {'rt steady':>10} {'ms/view':>8} "
+              f"{'charged':>8} {'allowed':>8} {'used':>8}")
+        for name, deduct in flows:
+            first, steady = round_trips(col, counter, deduct, f"{name}-rt", tier_max=10 * COST)
+            per_view = latency_ms(col, deduct, f"{name}-latency")
+            charged, used = concurrent_views(col, deduct, f"{name}-race", threads, allowed)
+            print(f"{name:<8} {first:>9} {steady:>10} {per_view:>8.2f} "
+                  f"{charged:>8} {allowed:>8} {used:>8}")
+    finally:
+        col.drop()
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+Backfill the parlay leg pool from the latest stored simulation of every
+upcoming event. New simulations keep the pool current on their own; run this
+once after deploying the pool, or after clearing the collection.
+
+Usage:
+    python backend/scripts/rebuild_parlay_leg_pool.py [horizon_days]
+"""
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.parlay_leg_pool import LEG_POOL_HORIZON_DAYS, rebuild_leg_pool
+
+horizon_days = int(sys.argv[1]) if len(sys.argv) > 1 else LEG_POOL_HORIZON_DAYS
+written = rebuild_leg_pool(horizon_days)
+print(f"✅ Parlay leg pool rebuilt: {written} legs for the next {horizon_days} days")
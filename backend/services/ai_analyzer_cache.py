@@ -0,0 +1,308 @@
+"""
+AI Analyzer - Explanation Cache
+Bounded, shared, coalescing cache for LLM explanations keyed on
+AnalyzerLLMClient.compute_input_hash.
+
+Layers:
+- Local: per-process LRU + TTL (bounded by max_entries, expired entries are
+  dropped on read and evicted first when full). Guarded by a threading lock:
+  it is read and written both on the event loop and in to_thread workers.
+- Shared: Mongo collection `analyzer_explanation_cache` so every uvicorn
+  worker (and the slate pre-warm job) reuses the same explanation instead of
+  calling OpenAI once per process. A TTL index on expires_at removes stale
+  rows. With no collection the cache is local-only (tests, scripts).
+
+Single-flight:
+- Concurrent misses for the same hash inside one process await ONE compute.
+- Across processes a short lease row (`lease:<hash>`) marks an in-flight
+  compute; other workers poll the shared layer for up to lease_seconds
+  before computing themselves (a crashed holder never blocks for longer).
+
+TTL:
+- ttl_seconds applies to explanations computed for user traffic. Pre-warm
+  passes a longer per-call TTL so slate explanations survive until games
+  start; the key is the input hash, so changed game inputs miss anyway.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from pymongo.errors import DuplicateKeyError
+
+CACHE_COLLECTION = "analyzer_explanation_cache"
+LEASE_PREFIX = "lease:"
+
+
+class ExplanationCache:
+    """
+    LRU + TTL explanation cache with an optional shared Mongo layer.
+    Values are JSON-compatible dicts (AnalyzerOutput.model_dump(mode="json")).
+    """
+
+    def __init__(
+        self,
+        collection=None,
+        ttl_seconds: int = 300,
+        max_entries: int = 1000,
+        lease_seconds: float = 15.0,
+        poll_interval_seconds: float = 0.2,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize explanation cache.
+
+        Args:
+            collection: Shared Mongo collection (None = local only)
+            ttl_seconds: Entry time-to-live
+            max_entries: Local LRU bound
+            lease_seconds: Max wait for another worker's in-flight compute
+            poll_interval_seconds: Shared-layer poll interval while waiting
+            clock: Time source (epoch seconds)
+        """
+        self.collection = collection
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.lease_seconds = lease_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self._clock = clock
+
+        self._local: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._local_lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._stats = {
+            "local_hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "lease_waits": 0,
+            "evictions": 0,
+            "shared_errors": 0
+        }
+        self._indexes_ready = False
+
+    # ------------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------------
+
+    def get(self, input_hash: str) -> Optional[Dict[str, Any]]:
+        """Cached value or None (local layer first, then shared)"""
+        value = self._get_local(input_hash)
+        if value is not None:
+            self._stats["local_hits"] += 1
+            return value
+
+        value = self._get_shared(input_hash)
+        if value is not None:
+            self._stats["shared_hits"] += 1
+            self._put_local(input_hash, value)
+        return value
+
+    def put(self, input_hash: str, value: Dict[str, Any], ttl_seconds: Optional[int] = None):
+        """Store in both layers (ttl_seconds overrides the default TTL)"""
+        ttl_seconds = ttl_seconds or self.ttl_seconds
+        self._put_local(input_hash, value, ttl_seconds)
+        if self.collection is None:
+            return
+        self._ensure_indexes()
+        try:
+            self.collection.update_one(
+                {"_id": input_hash},
+                {"$set": {
+                    "value": value,
+                    "expires_at": self._now_dt() + timedelta(seconds=ttl_seconds)
+                }},
+                upsert=True
+            )
+        except Exception:
+            self._stats["shared_errors"] += 1
+
+    async def get_or_compute(
+        self,
+        input_hash: str,
+        compute: Callable[[], Awaitable[Tuple[Dict[str, Any], bool]]],
+        ttl_seconds: Optional[int] = None
+    ) -> Tuple[Dict[str, Any], bool, bool]:
+        """
+        Return the cached value or compute it once.
+
+        Args:
+            input_hash: Cache key
+            compute: Coroutine factory returning (value, cacheable)
+            ttl_seconds: TTL for a value stored by this call; a longer TTL
+                also extends an existing entry (pre-warm)
+
+        Returns:
+            (value, ok, computed_here). ok is False only when the compute that
+            produced value was not cacheable (a fallback). computed_here is
+            True only for the caller that actually ran `compute` - it owns
+            audit logging; everyone else was served from cache.
+        """
+        value = await asyncio.to_thread(self.get, input_hash)
+        if value is not None:
+            if ttl_seconds and ttl_seconds > self.ttl_seconds:
+                await asyncio.to_thread(self.put, input_hash, value, ttl_seconds)
+            return value, True, False
+
+        inflight = self._inflight.get(input_hash)
+        if inflight is not None:
+            self._stats["coalesced"] += 1
+            value, ok = await asyncio.shield(inflight)
+            return value, ok, False
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[input_hash] = future
+        try:
+            value, ok, served_from_cache = await self._compute_with_lease(input_hash, compute, ttl_seconds)
+            future.set_result((value, ok))
+            return value, ok, not served_from_cache
+        except BaseException as e:
+            future.set_exception(e)
+            # Nobody may be waiting; don't leave "exception never retrieved" noise
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(input_hash, None)
+
+    async def _compute_with_lease(
+        self,
+        input_hash: str,
+        compute: Callable[[], Awaitable[Tuple[Dict[str, Any], bool]]],
+        ttl_seconds: Optional[int] = None
+    ) -> Tuple[Dict[str, Any], bool, bool]:
+        """(value, cacheable, served_from_cache)"""
+        leased = await asyncio.to_thread(self._acquire_lease, input_hash)
+        if not leased:
+            # Another worker is generating this explanation - wait for it
+            self._stats["lease_waits"] += 1
+            deadline = self._clock() + self.lease_seconds
+            while self._clock() < deadline:
+                await asyncio.sleep(self.poll_interval_seconds)
+                value = await asyncio.to_thread(self._get_shared, input_hash)
+                if value is not None:
+                    self._put_local(input_hash, value)
+                    return value, True, True
+
+        self._stats["misses"] += 1
+        try:
+            value, cacheable = await compute()
+            if cacheable:
+                await asyncio.to_thread(self.put, input_hash, value, ttl_seconds)
+            return value, cacheable, False
+        finally:
+            if leased:
+                await asyncio.to_thread(self._release_lease, input_hash)
+
+    # ------------------------------------------------------------------
+    # Local layer
+    # ------------------------------------------------------------------
+
+    def _get_local(self, input_hash: str) -> Optional[Dict[str, Any]]:
+        with self._local_lock:
+            entry = self._local.get(input_hash)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= self._clock():
+                del self._local[input_hash]
+                return None
+            self._local.move_to_end(input_hash)
+            return value
+
+    def _put_local(self, input_hash: str, value: Dict[str, Any], ttl_seconds: Optional[int] = None):
+        now = self._clock()
+        with self._local_lock:
+            self._local[input_hash] = (value, now + (ttl_seconds or self.ttl_seconds))
+            self._local.move_to_end(input_hash)
+            if len(self._local) <= self.max_entries:
+                return
+            for key in [k for k, (_, expires_at) in self._local.items() if expires_at <= now]:
+                del self._local[key]
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    # ------------------------------------------------------------------
+    # Shared layer
+    # ------------------------------------------------------------------
+
+    def _get_shared(self, input_hash: str) -> Optional[Dict[str, Any]]:
+        if self.collection is None:
+            return None
+        try:
+            doc = self.collection.find_one(
+                {"_id": input_hash, "expires_at": {"$gt": self._now_dt()}},
+                {"value": 1}
+            )
+        except Exception:
+            self._stats["shared_errors"] += 1
+            return None
+        return doc.get("value") if doc else None
+
+    def _acquire_lease(self, input_hash: str) -> bool:
+        """True if this process should compute (lease taken or no shared layer)"""
+        if self.collection is None:
+            return True
+        self._ensure_indexes()
+        lease_id = LEASE_PREFIX + input_hash
+        now = self._now_dt()
+        try:
+            # Reclaim a lease whose holder died, then try to take it
+            self.collection.delete_one({"_id": lease_id, "expires_at": {"$lte": now}})
+            self.collection.insert_one({
+                "_id": lease_id,
+                "expires_at": now + timedelta(seconds=self.lease_seconds)
+            })
+            return True
+        except DuplicateKeyError:
+            return False
+        except Exception:
+            self._stats["shared_errors"] += 1
+            return True
+
+    def _release_lease(self, input_hash: str):
+        try:
+            self.collection.delete_one({"_id": LEASE_PREFIX + input_hash})
+        except Exception:
+            self._stats["shared_errors"] += 1
+
+    def _ensure_indexes(self):
+        if self._indexes_ready or self.collection is None:
+            return
+        self._indexes_ready = True
+        try:
+            self.collection.create_index("expires_at", expireAfterSeconds=0)
+        except Exception:
+            self._stats["shared_errors"] += 1
+
+    def _now_dt(self) -> datetime:
+        return datetime.fromtimestamp(self._clock(), tz=timezone.utc)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def clear(self):
+        """Drop all cached explanations (both layers)"""
+        with self._local_lock:
+            self._local.clear()
+        if self.collection is not None:
+            try:
+                self.collection.delete_many({"_id": {"$not": {"$regex": f"^{LEASE_PREFIX}"}}})
+            except Exception:
+                self._stats["shared_errors"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._local_lock:
+            local_size = len(self._local)
+        return {
+            **self._stats,
+            "local_size": local_size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "shared": self.collection is not None,
+            "inflight": len(self._inflight)
+        }
@@ -303,7 +303,7 @@ class AnalyzerLLMClient:
             SHA256 hex digest
         """
         # Serialize to JSON with sorted keys for determinism
-        json_str = analyzer_input.json(sort_keys=True)
+        json_str = json.dumps(analyzer_input.model_dump(mode="json"), sort_keys=True)
         return hashlib.sha256(json_str.encode()).hexdigest()
     
     @staticmethod
@@ -317,5 +317,5 @@ class AnalyzerLLMClient:
         Returns:
             SHA256 hex digest
         """
-        json_str = analyzer_output.json(sort_keys=True)
+        json_str = json.dumps(analyzer_output.model_dump(mode="json"), sort_keys=True)
         return hashlib.sha256(json_str.encode()).hexdigest()
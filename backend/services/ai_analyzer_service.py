@@ -3,9 +3,11 @@ AI Analyzer Service
 Main service orchestrating AI explanations with caching and audit logging.
 """
 
+import asyncio
+import os
 import time
 import hashlib
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List
 from datetime import datetime, timedelta
 from pymongo.database import Database
 
@@ -25,6 +27,7 @@ from .ai_analyzer_schemas import (
 from .ai_analyzer_context import get_context_builder
 from .ai_analyzer_llm import AnalyzerLLMClient
 from .ai_analyzer_audit import AnalyzerAuditLogger
+from .ai_analyzer_cache import ExplanationCache, CACHE_COLLECTION
 
 
 class AnalyzerService:
@@ -34,7 +37,7 @@ class AnalyzerService:
     Responsibilities:
     - Fetch game data from database
     - Build analyzer input with sport-specific context
-    - Manage LLM calls with caching
+    - Manage LLM calls through the shared, single-flight ExplanationCache
     - Log all operations to audit trail
     - Enforce rate limits per user/session
     """
@@ -46,7 +49,9 @@ class AnalyzerService:
         audit_logger: AnalyzerAuditLogger,
         cache_ttl_seconds: int = 300,  # 5 minutes
         rate_limit_per_user: int = 20,  # 20 requests per hour
-        rate_limit_window_seconds: int = 3600
+        rate_limit_window_seconds: int = 3600,
+        explanation_cache: Optional[ExplanationCache] = None,
+        prewarm_ttl_seconds: int = 21600  # 6 hours
     ):
         """
         Initialize analyzer service.
@@ -58,6 +63,8 @@ class AnalyzerService:
             cache_ttl_seconds: Cache time-to-live
             rate_limit_per_user: Max requests per user per window
             rate_limit_window_seconds: Rate limit window
+            explanation_cache: Shared cache (default: local-only LRU + TTL)
+            prewarm_ttl_seconds: Cache TTL for pre-warmed explanations
         """
         self.db = db
         self.llm_client = llm_client
@@ -65,14 +72,16 @@ class AnalyzerService:
         self.cache_ttl_seconds = cache_ttl_seconds
         self.rate_limit_per_user = rate_limit_per_user
         self.rate_limit_window_seconds = rate_limit_window_seconds
+        self.prewarm_ttl_seconds = prewarm_ttl_seconds
         
-        # In-memory cache {input_hash: (output, timestamp)}
-        self.cache: Dict[str, tuple] = {}
+        # Bounded LRU + TTL, optionally backed by a shared Mongo layer
+        self.cache = explanation_cache or ExplanationCache(ttl_seconds=cache_ttl_seconds)
     
-    def explain(
+    async def explain(
         self,
         request: AnalyzerRequest,
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        cache_ttl_seconds: Optional[int] = None
     ) -> AnalyzerResponse:
         """
         Generate explanation for a game.
@@ -80,6 +89,7 @@ class AnalyzerService:
         Args:
             request: Analyzer request with game_id and sport
             user_id: Optional user identifier for rate limiting
+            cache_ttl_seconds: Cache TTL override (default: the cache's TTL)
         
         Returns:
             AnalyzerResponse with explanation or fallback
@@ -87,7 +97,7 @@ class AnalyzerService:
         start_time = time.time()
         
         # Step 1: Rate limit check
-        if user_id and not self._check_rate_limit(user_id):
+        if user_id and not await asyncio.to_thread(self._check_rate_limit, user_id):
             return AnalyzerResponse(
                 success=False,
                 game_id=request.game_id,
@@ -100,7 +110,7 @@ class AnalyzerService:
         
         try:
             # Step 2: Fetch game data
-            game_data = self._fetch_game_data(request.game_id, request.sport)
+            game_data = await asyncio.to_thread(self._fetch_game_data, request.game_id, request.sport)
             
             if not game_data:
                 return AnalyzerResponse(
@@ -120,31 +130,37 @@ class AnalyzerService:
                 request.market_focus
             )
             
-            # Step 4: Check cache
+            # Step 4: Cache lookup; concurrent misses share one LLM call
             input_hash = AnalyzerLLMClient.compute_input_hash(analyzer_input)
-            cached_output = self._get_from_cache(input_hash)
+            llm_result: Dict[str, Any] = {}
             
-            if cached_output:
+            async def compute():
+                # Step 5: Call LLM (blocking client, off the event loop)
+                llm_result.update(await asyncio.to_thread(self.llm_client.explain, analyzer_input))
+                # Step 6: Only successful explanations are cached
+                return llm_result["output"].model_dump(mode="json"), bool(llm_result["success"])
+            
+            output_data, ok, computed_here = await self.cache.get_or_compute(
+                input_hash, compute, ttl_seconds=cache_ttl_seconds
+            )
+            
+            if not computed_here:
+                # Served from cache, or shared an in-flight call that fell back
                 return AnalyzerResponse(
-                    success=True,
+                    success=ok,
                     game_id=request.game_id,
                     sport=request.sport,
                     state=analyzer_input.state,
-                    explanation=cached_output,
-                    cached=True
+                    explanation=AnalyzerOutput(**output_data),
+                    fallback_triggered=not ok,
+                    cached=ok
                 )
             
-            # Step 5: Call LLM
-            llm_result = self.llm_client.explain(analyzer_input)
-            
             response_time_ms = int((time.time() - start_time) * 1000)
             
-            # Step 6: Store in cache
-            if llm_result["success"]:
-                self._store_in_cache(input_hash, llm_result["output"])
-            
             # Step 7: Audit log
-            audit_id = self.audit_logger.log(
+            audit_id = await asyncio.to_thread(
+                self.audit_logger.log,
                 game_id=request.game_id,
                 sport=request.sport,
                 state=analyzer_input.state,
@@ -320,49 +336,6 @@ class AnalyzerService:
         
         return recent_count < self.rate_limit_per_user
     
-    def _get_from_cache(self, input_hash: str) -> Optional[AnalyzerOutput]:
-        """
-        Get output from cache if not expired.
-        
-        Args:
-            input_hash: Input hash
-        
-        Returns:
-            Cached AnalyzerOutput or None
-        """
-        if input_hash in self.cache:
-            output, timestamp = self.cache[input_hash]
-            
-            # Check if expired
-            age_seconds = time.time() - timestamp
-            if age_seconds < self.cache_ttl_seconds:
-                return output
-            else:
-                # Expired - remove from cache
-                del self.cache[input_hash]
-        
-        return None
-    
-    def _store_in_cache(self, input_hash: str, output: AnalyzerOutput):
-        """
-        Store output in cache.
-        
-        Args:
-            input_hash: Input hash
-            output: Output to cache
-        """
-        self.cache[input_hash] = (output, time.time())
-        
-        # Simple cache cleanup - remove oldest entries if cache too large
-        if len(self.cache) > 1000:
-            # Sort by timestamp and keep most recent 500
-            sorted_items = sorted(
-                self.cache.items(),
-                key=lambda x: x[1][1],
-                reverse=True
-            )
-            self.cache = dict(sorted_items[:500])
-    
     def clear_cache(self):
         """Clear all cached outputs"""
         self.cache.clear()
@@ -374,7 +347,113 @@ class AnalyzerService:
         Returns:
             Dict with cache stats and LLM stats
         """
+        cache_stats = self.cache.stats()
         return {
-            "cache_size": len(self.cache),
+            "cache_size": cache_stats["local_size"],
+            "cache": cache_stats,
             "llm_stats": self.llm_client.get_stats()
         }
+    
+    async def prewarm(
+        self,
+        games: Iterable[Dict[str, Any]],
+        concurrency: int = 4
+    ) -> Dict[str, int]:
+        """
+        Generate explanations for published games ahead of user traffic.
+        Stored with prewarm_ttl_seconds so they outlive the request TTL.
+        
+        Args:
+            games: Dicts with game_id and sport
+            concurrency: Max LLM calls in flight
+        
+        Returns:
+            Dict with requested / generated / cached / failed counts
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        summary = {"requested": 0, "generated": 0, "cached": 0, "failed": 0}
+        
+        async def warm(game: Dict[str, Any]):
+            async with semaphore:
+                response = await self.explain(
+                    AnalyzerRequest(game_id=game["game_id"], sport=game["sport"]),
+                    cache_ttl_seconds=self.prewarm_ttl_seconds
+                )
+            if response.cached:
+                summary["cached"] += 1
+            elif response.success:
+                summary["generated"] += 1
+            else:
+                summary["failed"] += 1
+        
+        games = list(games)
+        summary["requested"] = len(games)
+        await asyncio.gather(*(warm(game) for game in games))
+        return summary
+
+
+_analyzer_service: Optional[AnalyzerService] = None
+
+
+def get_analyzer_service() -> AnalyzerService:
+    """Process-wide analyzer service (one LLM client, one shared cache)"""
+    global _analyzer_service
+    if _analyzer_service is None:
+        from db.mongo import db
+        
+        llm_client = AnalyzerLLMClient(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            model=os.getenv("ANALYZER_LLM_MODEL", "gpt-4o-mini"),
+            timeout_seconds=int(os.getenv("ANALYZER_TIMEOUT_SECONDS", "10")),
+            max_tokens=int(os.getenv("ANALYZER_MAX_TOKENS", "800"))
+        )
+        cache_ttl_seconds = int(os.getenv("ANALYZER_CACHE_TTL", "300"))
+        _analyzer_service = AnalyzerService(
+            db=db,
+            llm_client=llm_client,
+            audit_logger=AnalyzerAuditLogger(db),
+            cache_ttl_seconds=cache_ttl_seconds,
+            rate_limit_per_user=int(os.getenv("ANALYZER_RATE_LIMIT", "20")),
+            rate_limit_window_seconds=int(os.getenv("ANALYZER_RATE_WINDOW", "3600")),
+            prewarm_ttl_seconds=int(os.getenv("ANALYZER_PREWARM_TTL", "21600")),
+            explanation_cache=ExplanationCache(
+                collection=db[CACHE_COLLECTION],
+                ttl_seconds=cache_ttl_seconds,
+                max_entries=int(os.getenv("ANALYZER_CACHE_MAX_ENTRIES", "1000"))
+            )
+        )
+    return _analyzer_service
+
+
+async def prewarm_slate_explanations(
+    game_ids: Iterable[str],
+    service: Optional[AnalyzerService] = None,
+    concurrency: int = 4
+) -> Dict[str, int]:
+    """
+    Pre-warm explanations for every published game of a finished slate.
+    
+    Args:
+        game_ids: Game ids from the slate run
+        service: Analyzer service (default: process singleton)
+        concurrency: Max LLM calls in flight
+    
+    Returns:
+        prewarm summary (skipped=True when no LLM is configured)
+    """
+    if service is None:
+        if not os.getenv("OPENAI_API_KEY"):
+            return {"requested": 0, "generated": 0, "cached": 0, "failed": 0, "skipped": True}
+        service = get_analyzer_service()
+    
+    game_ids = list(game_ids)
+    if not game_ids:
+        return {"requested": 0, "generated": 0, "cached": 0, "failed": 0}
+    
+    games: List[Dict[str, Any]] = await asyncio.to_thread(
+        lambda: list(service.db.autonomous_edge_waves.find(
+            {"game_id": {"$in": game_ids}},
+            {"_id": 0, "game_id": 1, "sport": 1}
+        ))
+    )
+    return await service.prewarm(games, concurrency=concurrency)
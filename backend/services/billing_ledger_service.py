@@ -25,6 +25,7 @@ from typing import Any, Dict, Generator, Optional
 from uuid import uuid4
 
 from db.mongo import db
+from services.phase8_metric_counters import record_write as record_metric_write
 
 logger = logging.getLogger(__name__)
 
@@ -40,14 +41,16 @@ def _now_iso() -> str:
 def _fire_billing_write_fail_alert(trace_id: str, user_id: str, action_type: str, error: str) -> None:
     """Write BILLING_WRITE_FAIL to sentinel_event_log immediately."""
     try:
-        db["sentinel_event_log"].insert_one({
+        event = {
             "event_type": "BILLING_WRITE_FAIL",
             "trace_id": trace_id,
             "user_id": str(user_id),
             "action_type": action_type,
             "error": str(error)[:500],
             "timestamp": _now_iso(),
-        })
+        }
+        db["sentinel_event_log"].insert_one(event)
+        record_metric_write("sentinel_event_log", event)
     except Exception as exc:
         logger.error("[BillingLedger] BILLING_WRITE_FAIL alert could not be persisted: %s", exc)
 
@@ -115,14 +118,16 @@ class BillingLedgerService:
         except Exception as exc:
             # Write BILLING_WRITE_FAIL alert using the injected sentinel collection
             try:
-                self._sentinel.insert_one({
+                event = {
                     "event_type": "BILLING_WRITE_FAIL",
                     "trace_id": trace_id,
                     "user_id": str(user_id),
                     "action_type": action_type,
                     "error": str(exc)[:500],
                     "timestamp": _now_iso(),
-                })
+                }
+                self._sentinel.insert_one(event)
+                record_metric_write("sentinel_event_log", event)
             except Exception as alert_exc:
                 logger.error("[BillingLedger] BILLING_WRITE_FAIL alert could not be persisted: %s", alert_exc)
             raise BillingLedgerWriteError(
@@ -6,8 +6,10 @@ No signals collection or client-provided probabilities/odds are used.
 
 from __future__ import annotations
 
+from datetime import datetime, timezone
 from typing import Any, Dict, Iterable, List, Optional
 
+from core.parlay_architect import Leg, MarketType, derive_tier
 from db.mongo import db
 
 
@@ -38,6 +40,35 @@ class CanonicalParlayService:
         line = market.get("line")
         return f"{team_name} {line}" if line is not None else str(team_name)
 
+    def _home_team_id(self, record: Dict[str, Any], decision: Dict[str, Any]) -> Optional[str]:
+        """Home team id of the record: explicit field, else the selection named as the home team."""
+        payload = record.get("payload") or {}
+        home_team_id = record.get("home_team_id") or payload.get("home_team_id")
+        if home_team_id:
+            return str(home_team_id)
+        home_team_name = payload.get("home_team_name")
+        for selection in decision.get("market_selections") or []:
+            if home_team_name and selection.get("team_name") == home_team_name and selection.get("team_id"):
+                return str(selection["team_id"])
+        return None
+
+    def _pick_side(self, record: Dict[str, Any], market_key: str, decision: Dict[str, Any]) -> Optional[str]:
+        """HOME/AWAY (spread, moneyline) or OVER/UNDER (total); None when it cannot be derived."""
+        pick = decision.get("pick") or {}
+        side = str(pick.get("side") or "").upper()
+        if market_key == "total" or side in ("HOME", "AWAY"):
+            return side or None
+
+        # Spread/ML picks carry team_id only (PickSpread.side is left unset)
+        team_id = pick.get("team_id")
+        home_team_id = self._home_team_id(record, decision)
+        if not team_id or not home_team_id:
+            return None
+        if str(team_id) == home_team_id:
+            return "HOME"
+        selection_team_ids = {str(s.get("team_id")) for s in decision.get("market_selections") or []}
+        return "AWAY" if str(team_id) in selection_team_ids else None
+
     def _to_candidate(self, record: Dict[str, Any], market_key: str, decision: Dict[str, Any]) -> Dict[str, Any]:
         snapshot_hash = (record.get("payload") or {}).get("inputs_hash")
         if not snapshot_hash:
@@ -82,6 +113,10 @@ class CanonicalParlayService:
         if not event_id:
             raise ValueError("missing event_id")
 
+        # Structured pick for joint pricing on simulation samples (optional)
+        side = self._pick_side(record, market_key, decision)
+        line = market.get("line") if pick_type != "moneyline" else None
+
         return {
             "decision_id": str(decision_id),
             "snapshot_hash": str(snapshot_hash),
@@ -93,6 +128,8 @@ class CanonicalParlayService:
             "selection": self._selection_label(market_key, decision, record),
             "true_probability": float(canonical_probability),
             "american_odds": int(canonical_odds),
+            "side": side,
+            "line": float(line) if line is not None else None,
         }
 
     def _iter_market_decisions(self, record: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
@@ -190,4 +227,53 @@ class CanonicalParlayService:
         return resolved
 
 
+def candidates_to_core_legs(candidates: List[Dict[str, Any]]) -> List[Leg]:
+    """Canonical parlay candidates as core.parlay_architect legs"""
+    legs: List[Leg] = []
+    market_type_map = {
+        "spread": MarketType.SPREAD,
+        "total": MarketType.TOTAL,
+        "moneyline": MarketType.MONEYLINE,
+    }
+
+    for cand in candidates:
+        confidence_pct = float(cand["true_probability"]) * 100.0
+        tier = derive_tier(
+            canonical_state=str(cand["canonical_state"]),
+            confidence=confidence_pct,
+            ev=0.0,
+            sport=str(cand.get("sport") or ""),
+        )
+        legs.append(
+            Leg(
+                event_id=str(cand["event_id"]),
+                sport=str(cand.get("sport") or "UNKNOWN"),
+                league=str(cand.get("league") or cand.get("sport") or "UNKNOWN"),
+                start_time_utc=datetime.now(timezone.utc),
+                market_type=market_type_map.get(str(cand.get("pick_type", "spread")).lower(), MarketType.SPREAD),
+                selection=str(cand.get("selection") or ""),
+                tier=tier,
+                confidence=confidence_pct,
+                clv=0.0,
+                total_deviation=0.0,
+                volatility="MEDIUM",
+                ev=0.0,
+                di_pass=True,
+                mv_pass=True,
+                is_locked=False,
+                injury_stable=True,
+                team_key=None,
+                canonical_state=str(cand["canonical_state"]),
+                decision_id=str(cand["decision_id"]),
+                snapshot_hash=str(cand["snapshot_hash"]),
+                true_probability=float(cand["true_probability"]),
+                american_odds=int(cand["american_odds"]),
+                side=cand.get("side"),
+                line=cand.get("line"),
+            )
+        )
+
+    return legs
+
+
 canonical_parlay_service = CanonicalParlayService()
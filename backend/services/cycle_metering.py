@@ -0,0 +1,160 @@
+"""
+Cycle Metering
+==============
+Atomic, single-round-trip Intelligence Cycle metering on user_entitlements.
+
+A simulation view used to cost up to five sequential Mongo calls: a
+$setOnInsert bootstrap upsert, a find_one, an optional allocation seed, an
+$inc of tokens_used_current_period and a second $inc of
+preview_cycles_used_lifetime. Because the budget check ran in Python between
+the read and the increment, concurrent views from one user could all pass
+the check and overspend the allocation.
+
+meter_cycle() does bootstrap, allocation seed, budget check and increment in
+one find_one_and_update with an update pipeline (MongoDB 4.2+):
+
+    stage 1  _alloc = allocation, or tier_max when missing/<= 0
+             _used  = tokens used (0 when missing)
+    stage 2  _ok    = _used * 100 < _alloc * block_pct
+    stage 3  fill bootstrap fields that are missing, write _alloc back and
+             add `cost` to the used (and lifetime preview) counters when _ok
+    stage 4  drop the scratch fields
+
+The server applies the whole pipeline to the document atomically, so two
+concurrent views can never both pass the check on the same balance. The
+pre-image (ReturnDocument.BEFORE, None for a fresh row) is enough to decide
+whether this call charged and to return the exact post-update balance.
+"""
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+PREVIEW_TIERS = ("intelligence_preview", "preview")
+
+
+@dataclass(frozen=True)
+class CycleCharge:
+    """Outcome of one metering call; balances are post-update."""
+    charged: bool
+    used: int
+    allocated: int
+    cost: int
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.allocated - self.used)
+
+    @property
+    def pct_used(self) -> float:
+        return (self.used / self.allocated) * 100 if self.allocated > 0 else 0.0
+
+
+def build_metering_pipeline(
+    user_id: str,
+    tier: str,
+    tier_max: int,
+    cost: int,
+    block_pct: float,
+    now_iso: str,
+) -> List[Dict[str, Any]]:
+    """Update pipeline that bootstraps, checks and charges in one write."""
+    def keep_or(field: str, default: Any) -> Dict[str, Any]:
+        return {"$ifNull": [f"${field}", default]}
+
+    charged_fields: Dict[str, Any] = {
+        "tokens_used_current_period": {"$cond": ["$_ok", {"$add": ["$_used", cost]}, "$_used"]},
+    }
+    if tier in PREVIEW_TIERS:
+        # Addendum 2: lifetime Preview usage - never decrements, never resets.
+        lifetime = keep_or("preview_cycles_used_lifetime", 0)
+        charged_fields["preview_cycles_used_lifetime"] = {
+            "$cond": ["$_ok", {"$add": [lifetime, cost]}, lifetime]
+        }
+
+    return [
+        {"$set": {
+            "_alloc": {"$cond": [
+                {"$gt": [keep_or("tokens_allocated_current_period", 0), 0]},
+                "$tokens_allocated_current_period",
+                tier_max,
+            ]},
+            "_used": keep_or("tokens_used_current_period", 0),
+        }},
+        {"$set": {
+            "_ok": {"$lt": [{"$multiply": ["$_used", 100]}, {"$multiply": ["$_alloc", block_pct]}]},
+        }},
+        {"$set": {
+            "user_id": user_id,
+            "tier": keep_or("tier", tier),
+            "active": keep_or("active", True),
+            "created_at": keep_or("created_at", now_iso),
+            "tokens_allocated_current_period": "$_alloc",
+            **charged_fields,
+        }},
+        {"$unset": ["_alloc", "_used", "_ok"]},
+    ]
+
+
+def charge_from_pre_image(
+    before: Optional[Dict[str, Any]],
+    tier_max: int,
+    cost: int,
+    block_pct: float,
+) -> CycleCharge:
+    """Replay the pipeline's decision on the pre-image to get the post-update balance."""
+    before = before or {}
+    alloc = int(before.get("tokens_allocated_current_period") or 0)
+    if alloc <= 0:
+        alloc = tier_max
+    used = int(before.get("tokens_used_current_period") or 0)
+    charged = used * 100 < alloc * block_pct
+    return CycleCharge(
+        charged=charged,
+        used=used + cost if charged else used,
+        allocated=alloc,
+        cost=cost,
+    )
+
+
+def meter_cycle(
+    user_id: str,
+    tier: str,
+    tier_max: int,
+    cost: int,
+    block_pct: float = 100,
+    collection=None,
+) -> CycleCharge:
+    """
+    Charge `cost` cycles to user_id if the budget allows, in one round trip.
+
+    Returns a CycleCharge with charged=False (and the unchanged balance)
+    when the user has already used block_pct of the allocation.
+    """
+    if collection is None:
+        from db.mongo import db
+        collection = db["user_entitlements"]
+
+    pipeline = build_metering_pipeline(
+        user_id, tier, tier_max, cost, block_pct,
+        datetime.now(timezone.utc).isoformat(),
+    )
+    projection = {"_id": 0, "tokens_allocated_current_period": 1, "tokens_used_current_period": 1}
+    try:
+        before = collection.find_one_and_update(
+            {"user_id": user_id}, pipeline, projection=projection,
+            upsert=True, return_document=ReturnDocument.BEFORE,
+        )
+    except DuplicateKeyError:
+        # A concurrent first view inserted the row between our match and
+        # insert (unique user_id index); the retry matches it.
+        before = collection.find_one_and_update(
+            {"user_id": user_id}, pipeline, projection=projection,
+            upsert=True, return_document=ReturnDocument.BEFORE,
+        )
+    return charge_from_pre_image(before, tier_max, cost, block_pct)
@@ -0,0 +1,157 @@
+"""
+Decision Classification Cache
+=============================
+Batched, cached lookup of the canonical classification for a list of events.
+
+/api/odds/list used to run one decision_records.find_one per event (N+1).
+This resolves the latest decision record for the whole page with ONE
+aggregation ($in + $sort + $group), and keeps the result in a short-TTL
+in-process cache keyed on the event's decision record version.
+
+Versioning:
+- DecisionRecordStore bumps the event's version whenever it inserts a new
+  record, so a fresh decision invalidates the cached classification
+  immediately in this process
+- Other workers pick the new record up when their entry expires
+  (DECISION_CLASSIFICATION_CACHE_TTL_SECONDS, default 15s)
+
+Fail-closed: events without a record, or whose latest record has no
+spread/total classification, resolve to BLOCKED.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DECISION_CLASSIFICATION_CACHE_TTL_SECONDS = float(os.getenv("DECISION_CLASSIFICATION_CACHE_TTL_SECONDS", "15"))
+DECISION_CLASSIFICATION_CACHE_MAX_ENTRIES = int(os.getenv("DECISION_CLASSIFICATION_CACHE_MAX_ENTRIES", "20000"))
+
+BLOCKED = "BLOCKED"
+
+
+def latest_classifications_pipeline(event_ids: List[str]) -> List[Dict]:
+    """Aggregation: latest decision record per requested id (event_id or legacy game_id)"""
+    return [
+        {"$match": {"$or": [{"event_id": {"$in": event_ids}}, {"game_id": {"$in": event_ids}}]}},
+        {"$sort": {"created_at": -1}},
+        {"$group": {
+            "_id": {"$cond": [{"$in": ["$event_id", event_ids]}, "$event_id", "$game_id"]},
+            "record_id": {"$first": "$record_id"},
+            "spread_classification": {"$first": "$payload.spread.classification"},
+            "total_classification": {"$first": "$payload.total.classification"},
+        }},
+    ]
+
+
+def fetch_latest_classifications(event_ids: List[str], collection=None) -> Dict[str, str]:
+    """
+    Resolve the canonical classification for many events in one round trip.
+
+    Prefers the spread classification, then total; BLOCKED when neither exists
+    or the event has no decision record.
+    """
+    if not event_ids:
+        return {}
+    if collection is None:
+        from db.mongo import db
+        collection = db["decision_records"]
+
+    classifications = {event_id: BLOCKED for event_id in event_ids}
+    for row in collection.aggregate(latest_classifications_pipeline(event_ids)):
+        event_id = row.get("_id")
+        if event_id in classifications:
+            classifications[event_id] = (
+                row.get("spread_classification") or row.get("total_classification") or BLOCKED
+            )
+    return classifications
+
+
+class DecisionClassificationCache:
+    """
+    event_id → classification, valid while the event's decision record
+    version is unchanged and the entry is younger than the TTL
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = DECISION_CLASSIFICATION_CACHE_TTL_SECONDS,
+        max_entries: int = DECISION_CLASSIFICATION_CACHE_MAX_ENTRIES,
+        clock=time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        # event_id → (classification, version, expires_at)
+        self._entries: Dict[str, Tuple[str, int, float]] = {}
+        self._versions: Dict[str, int] = {}
+        self._stats = {"hits": 0, "misses": 0, "queries": 0}
+
+    def bump_version(self, event_id: str) -> None:
+        """A new decision record was written for event_id"""
+        with self._lock:
+            self._versions[event_id] = self._versions.get(event_id, 0) + 1
+            self._entries.pop(event_id, None)
+
+    def get_many(self, event_ids: Iterable[str], collection=None) -> Dict[str, str]:
+        """Classifications for every event_id; misses are resolved with one aggregation"""
+        event_ids = list(dict.fromkeys(e for e in event_ids if e))
+        now = self._clock()
+        result: Dict[str, str] = {}
+        misses: List[str] = []
+
+        with self._lock:
+            for event_id in event_ids:
+                entry = self._entries.get(event_id)
+                if entry and entry[1] == self._versions.get(event_id, 0) and entry[2] > now:
+                    result[event_id] = entry[0]
+                else:
+                    misses.append(event_id)
+            self._stats["hits"] += len(result)
+            self._stats["misses"] += len(misses)
+            # Versions as of the read: a record written while we query is not masked
+            versions = {event_id: self._versions.get(event_id, 0) for event_id in misses}
+
+        if not misses:
+            return result
+
+        fetched = fetch_latest_classifications(misses, collection=collection)
+
+        with self._lock:
+            self._stats["queries"] += 1
+            if len(self._entries) + len(fetched) > self.max_entries:
+                self._evict(now)
+            expires_at = now + self.ttl_seconds
+            for event_id, classification in fetched.items():
+                self._entries[event_id] = (classification, versions[event_id], expires_at)
+
+        result.update(fetched)
+        return result
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries; if still full, start over (entries are cheap to rebuild)"""
+        self._entries = {k: v for k, v in self._entries.items() if v[2] > now}
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries)}
+
+
+_decision_classification_cache: Optional[DecisionClassificationCache] = None
+
+
+def get_decision_classification_cache() -> DecisionClassificationCache:
+    """Get the per-process classification cache"""
+    global _decision_classification_cache
+    if _decision_classification_cache is None:
+        _decision_classification_cache = DecisionClassificationCache()
+    return _decision_classification_cache
@@ -23,6 +23,7 @@ from uuid import uuid4
 
 from db.mongo import db
 from config.agent_config import AGENT_CONFIG
+from services.phase8_metric_counters import record_write as record_metric_write
 
 logger = logging.getLogger(__name__)
 
@@ -153,7 +154,7 @@ def _validate_post_candidate(candidate: Dict[str, Any]) -> Dict[str, Any]:
 
 def _fire_sentinel_critical(decision_id: str, violations: List[str], post_content: str) -> None:
     """Log CRITICAL sentinel event for regulatory filter breach."""
-    _sentinel_col.insert_one({
+    event = {
         "severity": "CRITICAL",
         "event_type": "REGULATORY_FILTER_BLOCK",
         "agent_id": AGENT_ID,
@@ -161,7 +162,9 @@ def _fire_sentinel_critical(decision_id: str, violations: List[str], post_conten
         "violations": violations,
         "post_content_hash": _hash_content(post_content),
         "timestamp": _now_iso(),
-    })
+    }
+    _sentinel_col.insert_one(event)
+    record_metric_write("sentinel_event_log", event)
     logger.critical(
         "[%s] REGULATORY FILTER BREACH — decision_id=%s violations=%s",
         AGENT_ID, decision_id, violations,
@@ -183,7 +186,7 @@ def _write_audit_entry(
     sent_at_utc: str,
 ) -> str:
     attempt_id = str(uuid4())
-    _audit_col.insert_one({
+    entry = {
         "attempt_id": attempt_id,
         "decision_id": decision_id,
         "post_content_hash": _hash_content(post_content),
@@ -195,7 +198,9 @@ def _write_audit_entry(
         "delivered": delivered,
         "agent_id": AGENT_ID,
         "trace_id": trace_id,
-    })
+    }
+    _audit_col.insert_one(entry)
+    record_metric_write("distribution_audit_log", entry)
     return attempt_id
 
 
@@ -42,8 +42,8 @@ logger = logging.getLogger(__name__)
 def _get_entitlement(user_id: str) -> Optional[Dict[str, Any]]:
     """Return the user's entitlement document or None."""
     try:
-        from db.mongo import db
-        return db["user_entitlements"].find_one({"user_id": str(user_id)}, {"_id": 0})
+        from services.principal_cache import get_principal_cache
+        return get_principal_cache().get_entitlement(str(user_id))
     except Exception as exc:
         logger.error("[Entitlement] DB lookup failed for user=%s: %s", user_id, exc)
         return None
@@ -105,6 +105,8 @@ def require_active_subscription(
                     {"user_id": user_id},
                     {"$set": {"active": False, "revoked_at": datetime.now(timezone.utc).isoformat(), "revoke_reason": "SUBSCRIPTION_EXPIRED"}},
                 )
+                from services.principal_cache import get_principal_cache
+                get_principal_cache().invalidate_user(user_id)
                 _log_entitlement_violation(user_id, "subscription_check", "SUBSCRIPTION_EXPIRED")
                 from services.billing_ledger_service import billing_ledger
                 billing_ledger.log_state_change(
@@ -20,6 +20,8 @@ from enum import Enum
 from dataclasses import dataclass
 import re
 
+from utils.phrase_matcher import PhraseMatcher, alnum_word_boundary, compiled_matcher
+
 
 class ViolationType(str, Enum):
     """Types of phrase violations"""
@@ -229,11 +231,12 @@ class ForbiddenPhrasesChecker:
                 - context: Context that made it forbidden (if context-dependent)
         """
         violations = []
-        text_lower = text.lower()
+        # One pass over the text for every phrase group
+        matched = self._matcher().find(text)
         
         # Check absolute forbidden phrases
         for forbidden in self.absolute_forbidden:
-            if self._phrase_matches(forbidden.phrase, text_lower):
+            if forbidden.phrase.lower() in matched:
                 violations.append({
                     'phrase': forbidden.phrase,
                     'violation_type': forbidden.violation_type.value,
@@ -246,7 +249,7 @@ class ForbiddenPhrasesChecker:
             if self._should_check_context_dependent(
                 forbidden, classification, has_execution_constraints
             ):
-                if self._phrase_matches(forbidden.phrase, text_lower):
+                if forbidden.phrase.lower() in matched:
                     # Check for allowed exceptions
                     if self._is_allowed_exception(forbidden.phrase, box_name, classification, has_execution_constraints):
                         continue
@@ -260,7 +263,7 @@ class ForbiddenPhrasesChecker:
         
         # Check tone violations
         for forbidden in self.tone_violations:
-            if self._phrase_matches(forbidden.phrase, text_lower):
+            if forbidden.phrase.lower() in matched:
                 violations.append({
                     'phrase': forbidden.phrase,
                     'violation_type': forbidden.violation_type.value,
@@ -271,6 +274,15 @@ class ForbiddenPhrasesChecker:
         is_valid = len(violations) == 0
         return is_valid, violations
     
+    def _matcher(self) -> PhraseMatcher:
+        """Compiled matcher for all phrase groups (same rules as _phrase_matches)"""
+        phrases = [
+            f.phrase
+            for group in (self.absolute_forbidden, self.context_dependent, self.tone_violations)
+            for f in group
+        ]
+        return compiled_matcher(phrases, word_boundary=alnum_word_boundary)
+    
     def _phrase_matches(self, phrase: str, text: str) -> bool:
         """
         Check if phrase matches text (case-insensitive substring match).
@@ -98,10 +98,10 @@ class GradingService:
         event_status = event_result.get("status", EventStatus.SCHEDULED.value)
         
         if event_status == EventStatus.CANCELLED.value:
-            return self._grade_as_void(publish_id, published, prediction, "CANCELLED")
+            return self._grade_as_void(publish_id, published, prediction, "CANCELLED", existing)
         
         if event_status == EventStatus.POSTPONED.value:
-            return self._grade_as_void(publish_id, published, prediction, "POSTPONED")
+            return self._grade_as_void(publish_id, published, prediction, "POSTPONED", existing)
         
         if event_status != EventStatus.FINAL.value:
             logger.info(f"Event {published['event_id']} not final yet (status={event_status})")
@@ -213,13 +213,16 @@ class GradingService:
         grading_doc.setdefault("service_authority", "agent.grading.v1")
 
         if existing and force_regrade:
+            # Keep the graded_id stable so the regrade replaces its trust metrics contribution
+            graded_id = existing["graded_id"]
+            grading_doc["graded_id"] = graded_id
             self.grading_collection.update_one(
-                {"graded_id": existing["graded_id"]},
+                {"graded_id": graded_id},
                 {"$set": grading_doc}
             )
-            graded_id = existing["graded_id"]
         else:
             self.grading_collection.insert_one(grading_doc)
+        self._record_trust_metrics(grading_doc)
 
         # Append-only observability records for settlement
         trace_id = (
@@ -375,10 +378,14 @@ class GradingService:
         publish_id: str,
         published: Dict[str, Any],
         prediction: Dict[str, Any],
-        reason: str
+        reason: str,
+        existing: Optional[Dict[str, Any]] = None
     ) -> str:
         """
         Grade a prediction as void
+        
+        `existing` is a previous grading row for the same publish (force
+        regrade); its trust metrics contribution is reversed.
         """
         graded_id = str(uuid.uuid4())
         
@@ -403,6 +410,9 @@ class GradingService:
         grading_doc = grading.model_dump()
         grading_doc.setdefault("service_authority", "agent.grading.v1")
         self.grading_collection.insert_one(grading_doc)
+        self._record_trust_metrics(grading_doc)
+        if existing and existing.get("graded_id") != graded_id:
+            self._record_trust_metrics({**existing, "bet_status": BetStatus.VOID.value})
 
         trace_id = published.get("trace_id") or prediction.get("trace_id") or f"trace_grade_{publish_id}"
         snapshot_hash = (
@@ -446,6 +456,18 @@ class GradingService:
         
         return graded_id
     
+    def _record_trust_metrics(self, grading_doc: Dict[str, Any]):
+        """
+        Apply a written grading row to the Trust Loop counters.
+        
+        Failures never block grading (TrustMetricsStore.rebuild repairs drift).
+        """
+        try:
+            from services.trust_metrics_store import get_trust_metrics_store
+            get_trust_metrics_store().record_grading_row(grading_doc)
+        except Exception as e:
+            logger.error(f"Failed to update trust metrics for {grading_doc.get('graded_id')}: {e}")
+    
     def _determine_result(
         self,
         prediction: Dict[str, Any],
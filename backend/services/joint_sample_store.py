@@ -0,0 +1,128 @@
+"""
+Joint Sample Store
+==================
+Latest compressed (margin, total) sample matrix per game (collection:
+simulation_joint_samples, one row per event_id), written by
+MonteCarloEngine.run_simulation next to the simulation document and read
+back for correlated parlay pricing (core.joint_parlay_pricing).
+
+The sketch lives in its own collection rather than on the simulation
+document so the many readers of monte_carlo_simulations do not pay for
+it; pricing a parlay is one indexed $in read over its events.
+"""
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from core.joint_parlay_pricing import (
+    JointParlayPrice,
+    JointSampleSketch,
+    leg_spec_from_pick,
+    price_joint,
+)
+
+logger = logging.getLogger(__name__)
+
+JOINT_SAMPLES_COLLECTION = "simulation_joint_samples"
+
+# Key under which MonteCarloEngine.run_simulation(persist=False) returns the
+# encoded sketch for the caller's batched write; never stored on the simulation
+JOINT_SKETCH_RESULT_KEY = "joint_sketch"
+
+
+def _collection():
+    from db.mongo import db
+    return db[JOINT_SAMPLES_COLLECTION]
+
+
+def store_joint_sketch(
+    simulation_id: str,
+    event: Dict[str, Any],
+    margins,
+    totals,
+) -> Dict[str, Any]:
+    """Sketch a full-game run's samples and replace the event's stored matrix."""
+    return store_joint_sketch_doc(simulation_id, event, JointSampleSketch.from_samples(margins, totals).to_doc())
+
+
+def store_joint_sketch_doc(
+    simulation_id: str,
+    event: Dict[str, Any],
+    sketch_doc: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Replace the event's stored matrix with an already-encoded sketch (JointSampleSketch.to_doc)."""
+    row: Dict[str, Any] = {
+        "event_id": event["event_id"],
+        "simulation_id": simulation_id,
+        "sport_key": event.get("sport_key"),
+        "joint_sketch": sketch_doc,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+    if event.get("commence_time"):
+        commence = datetime.fromisoformat(event["commence_time"].replace("Z", "+00:00"))
+        row["expires_at"] = commence + timedelta(days=1)
+    _collection().update_one({"event_id": row["event_id"]}, {"$set": row}, upsert=True)
+    return row
+
+
+def load_joint_sketches(event_ids: Iterable[str]) -> Dict[str, JointSampleSketch]:
+    """Stored sketches for the given events (missing events are absent)."""
+    ids = sorted({str(e) for e in event_ids if e})
+    if not ids:
+        return {}
+    sketches: Dict[str, JointSampleSketch] = {}
+    for row in _collection().find({"event_id": {"$in": ids}}, {"_id": 0, "event_id": 1, "joint_sketch": 1}):
+        sketch = JointSampleSketch.from_doc(row.get("joint_sketch"))
+        if sketch is not None:
+            sketches[row["event_id"]] = sketch
+    return sketches
+
+
+def price_picks(
+    picks: List[Mapping[str, Any]],
+    sketches: Optional[Mapping[str, JointSampleSketch]] = None,
+) -> Optional[JointParlayPrice]:
+    """
+    Joint-price the picks that can be evaluated on stored samples.
+
+    Picks without a structured market/side/line, or whose game has no stored
+    sketch, are left out (callers treat them as independent). Returns None
+    when no pick could be priced.
+    """
+    specs = [leg_spec_from_pick(pick) for pick in picks]
+    if sketches is None:
+        sketches = load_joint_sketches(spec.event_id for spec in specs if spec)
+    priceable = [spec for spec in specs if spec and spec.event_id in sketches]
+    if not priceable:
+        return None
+    return price_joint(priceable, sketches)
+
+
+def correlation_factor(picks: List[Mapping[str, Any]], default: Optional[float] = 1.0) -> Optional[float]:
+    """
+    joint / independent hit probability of the priceable picks; `default`
+    when nothing can be priced or the lookup fails. Multiplying a product of
+    leg probabilities by this factor applies the sampled correlation without
+    replacing the legs' own (canonical) probabilities.
+    """
+    try:
+        priced = price_picks(picks)
+    except Exception as e:
+        logger.warning(f"Joint parlay pricing unavailable: {e}")
+        return default
+    return priced.correlation_factor if priced else default
+
+
+def leg_correlation_factor(legs: Iterable[Any]) -> float:
+    """
+    correlation_factor for core.parlay_architect legs (build_parlay's correlation_fn)
+    """
+    return correlation_factor([
+        {
+            "event_id": leg.event_id,
+            "market_type": getattr(leg.market_type, "value", leg.market_type),
+            "side": leg.side,
+            "line": leg.line,
+        }
+        for leg in legs
+    ])
@@ -0,0 +1,247 @@
+"""
+Latency Histograms
+==================
+Low-overhead, in-process latency histograms exported in Prometheus format
+through the Phase 8 scrape endpoint (/api/phase8/metrics).
+
+Families:
+- api_request_latency_ms{method, route, status}: every HTTP request,
+  labelled by the FastAPI route *template* (/api/simulations/{event_id}), so
+  path parameters never add series. Recorded by RouteLatencyMiddleware.
+- simulation_stage_latency_ms{sport, stage}: named spans inside
+  MonteCarloEngine.run_simulation (strategy_simulate, props_fetch,
+  decomposition_log, market_decision, persistence, plus the whole run as
+  total), recorded through StageTimings.
+
+An observation is one bisect over fixed bucket bounds and three adds under a
+lock; buckets are only made cumulative when rendered. Values are per
+process - Prometheus sums them across workers with sum by (le).
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Milliseconds; covers cached reads through cold full-tier simulations
+DEFAULT_LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+UNMATCHED_ROUTE = "__unmatched__"
+
+
+def quantile_from_counts(bounds: Sequence[float], counts: Sequence[int], q: float) -> float:
+    """
+    Estimate quantile q from per-bucket (non-cumulative) counts the way
+    Prometheus histogram_quantile does: linear interpolation inside the
+    bucket holding the rank. The +Inf bucket reports the highest bound.
+    """
+    total = sum(counts)
+    if total <= 0:
+        return 0.0
+    rank = q * total
+    seen = 0
+    for i, count in enumerate(counts):
+        if count and seen + count >= rank:
+            if i >= len(bounds):
+                return float(bounds[-1])
+            lower = float(bounds[i - 1]) if i > 0 else 0.0
+            return lower + (float(bounds[i]) - lower) * ((rank - seen) / count)
+        seen += count
+    return float(bounds[-1])
+
+
+class HistogramFamily:
+    """One Prometheus histogram metric with a fixed label set."""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Tuple[str, ...],
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS_MS,
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.bounds = tuple(float(b) for b in buckets)
+        self._lock = threading.Lock()
+        # label values -> [bucket counts (len(bounds) + 1 for +Inf), sum, count]
+        self._series: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, value_ms: float, *label_values: str) -> None:
+        index = bisect.bisect_left(self.bounds, value_ms)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.bounds) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value_ms
+            series[2] += 1
+
+    def merged_counts(self, **label_filter: str) -> List[int]:
+        """Per-bucket counts summed over every series matching label_filter."""
+        positions = {self.label_names.index(k): v for k, v in label_filter.items()}
+        merged = [0] * (len(self.bounds) + 1)
+        with self._lock:
+            for labels, (counts, _, _) in self._series.items():
+                if all(labels[i] == v for i, v in positions.items()):
+                    for i, c in enumerate(counts):
+                        merged[i] += c
+        return merged
+
+    def quantile(self, q: float, **label_filter: str) -> float:
+        return quantile_from_counts(self.bounds, self.merged_counts(**label_filter), q)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, list(s[0]), s[1], s[2]) for labels, s in self._series.items())
+        for labels, counts, total_sum, total_count in series:
+            label_text = ",".join(
+                f'{k}="{_escape(v)}"' for k, v in zip(self.label_names, labels)
+            )
+            cumulative = 0
+            for bound, count in zip(self.bounds, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label_text},le="{bound:g}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{label_text},le="+Inf"}} {total_count}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {total_sum:.3f}")
+            lines.append(f"{self.name}_count{{{label_text}}} {total_count}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+ROUTE_LATENCY = HistogramFamily(
+    "api_request_latency_ms",
+    "HTTP request latency by route template in milliseconds",
+    ("method", "route", "status"),
+)
+
+SIMULATION_STAGE_LATENCY = HistogramFamily(
+    "simulation_stage_latency_ms",
+    "MonteCarloEngine.run_simulation stage latency in milliseconds",
+    ("sport", "stage"),
+)
+
+
+# Key under which a simulation worker returns its stage timings with the
+# result, for the parent (API) process to observe (see observe_stage_timings)
+STAGE_TIMINGS_RESULT_KEY = "stage_timings_ms"
+
+
+def _observe_stages(sport: str, elapsed_ms: Dict[str, float]) -> None:
+    for stage, value in elapsed_ms.items():
+        SIMULATION_STAGE_LATENCY.observe(value, sport, stage)
+
+
+class StageTimings:
+    """
+    Named timing spans for one simulation run. Time spent in the same stage
+    is accumulated, and record() emits one observation per stage, so
+    a stage entered twice (e.g. spread + total market decisions) still
+    counts as one sample per run.
+
+    Runs in a process-pool worker use finish() instead and ship the result
+    back to the parent: observations made in a worker would land in that
+    worker's registry, which /api/phase8/metrics never reads.
+    """
+
+    def __init__(self, sport: str):
+        self.sport = sport
+        self.started = time.perf_counter()
+        self.elapsed_ms: Dict[str, float] = {}
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.elapsed_ms[stage] = self.elapsed_ms.get(stage, 0.0) + (time.perf_counter() - start) * 1000.0
+
+    def finish(self) -> Dict[str, Any]:
+        """Close the run; the payload observe_stage_timings expects"""
+        self.elapsed_ms["total"] = (time.perf_counter() - self.started) * 1000.0
+        return {"sport": self.sport, "elapsed_ms": dict(self.elapsed_ms)}
+
+    def record(self) -> Dict[str, float]:
+        """Close the run and observe it in this process"""
+        elapsed_ms = self.finish()["elapsed_ms"]
+        _observe_stages(self.sport, elapsed_ms)
+        return elapsed_ms
+
+
+def observe_stage_timings(result: Optional[Dict[str, Any]]) -> None:
+    """Pop the stage timings a simulation worker returned with `result` and observe them here"""
+    payload = result.pop(STAGE_TIMINGS_RESULT_KEY, None) if isinstance(result, dict) else None
+    if payload:
+        _observe_stages(payload["sport"], payload["elapsed_ms"])
+
+
+def _route_template(scope) -> str:
+    route = scope.get("route")
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    return template or UNMATCHED_ROUTE
+
+
+class RouteLatencyMiddleware:
+    """
+    Pure ASGI middleware timing each HTTP request until its response has been
+    sent. The router stores the matched route in the shared scope, so the
+    template is read after the app returns; requests answered before routing
+    (404s, rate-limit rejections) fall under __unmatched__.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_holder = {"status": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder["status"] = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            ROUTE_LATENCY.observe(
+                (time.perf_counter() - start) * 1000.0,
+                scope.get("method", "GET"),
+                _route_template(scope),
+                f"{status_holder['status'] // 100}xx",
+            )
+
+
+class _WindowedQuantile:
+    """Quantile over the observations made since the previous call."""
+
+    def __init__(self, family: HistogramFamily):
+        self.family = family
+        self._lock = threading.Lock()
+        self._last: Optional[List[int]] = None
+
+    def __call__(self, q: float) -> float:
+        current = self.family.merged_counts()
+        with self._lock:
+            last, self._last = self._last, current
+        if last is None:
+            return quantile_from_counts(self.family.bounds, current, q)
+        delta = [max(c - p, 0) for c, p in zip(current, last)]
+        return quantile_from_counts(self.family.bounds, delta, q)
+
+
+api_latency_quantile_since_last_scrape = _WindowedQuantile(ROUTE_LATENCY)
+
+
+def render_latency_histograms() -> List[str]:
+    return ROUTE_LATENCY.render() + SIMULATION_STAGE_LATENCY.render()
@@ -7,7 +7,8 @@ from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
 import logging
 
-from integrations.odds_api import fetch_odds, normalize_event, OddsApiError
+from integrations.odds_api import fetch_odds, normalize_event, extract_market_lines, OddsApiError
+from core.distribution_sketch import reprice_simulation
 from db.mongo import db
 
 logger = logging.getLogger(__name__)
@@ -101,6 +102,11 @@ async def attempt_odds_refresh(
         
         logger.info(f"✅ Successfully refreshed odds for {event_id}: {current_timestamp} → {new_timestamp}")
         
+        # Re-price the latest simulation at the new lines (no re-simulation)
+        repriced = reprice_latest_simulation(event_id, updated_event)
+        if repriced:
+            updated_event["repriced"] = repriced
+        
         # Track refresh in observability
         db["odds_refresh_log"].insert_one({
             "event_id": event_id,
@@ -134,6 +140,56 @@ async def attempt_odds_refresh(
         return False, None, error_msg
 
 
+def reprice_latest_simulation(
+    event_id: str,
+    event: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    Re-price the latest full-game simulation from its stored distribution
+    sketch at the event's current lines and store the result on the
+    simulation as `repriced`.
+    
+    Args:
+        event_id: Event identifier
+        event: Event with fresh bookmakers
+    
+    Returns:
+        Re-priced probabilities/edges, or None (legacy simulation without a
+        sketch, no lines, or any failure - callers keep the stored values)
+    """
+    try:
+        simulation = db["monte_carlo_simulations"].find_one(
+            {"event_id": event_id, "period": {"$exists": False}},
+            {"_id": 1, "distribution_sketch": 1},
+            sort=[("created_at", -1)]
+        )
+        if not simulation or not simulation.get("distribution_sketch"):
+            return None
+        
+        lines = extract_market_lines(event)
+        spread_home = lines["current_spread"] if lines.get("has_spread_market") else None
+        total_line = lines["total_line"] if lines.get("has_total_market") else None
+        if spread_home is None and total_line is None:
+            return None
+        
+        repriced = reprice_simulation(simulation, spread_home=spread_home, total_line=total_line)
+        if repriced is None:
+            return None
+        repriced["odds_timestamp"] = event.get("odds_timestamp")
+        repriced["repriced_at"] = datetime.now(timezone.utc).isoformat()
+        
+        db["monte_carlo_simulations"].update_one(
+            {"_id": simulation["_id"]},
+            {"$set": {"repriced": repriced}}
+        )
+        logger.info(f"💱 Re-priced {event_id} at spread {spread_home}, total {total_line}")
+        return repriced
+    
+    except Exception as e:
+        logger.error(f"Failed to re-price simulation for {event_id}: {e}")
+        return None
+
+
 def log_stale_odds_occurrence(
     event_id: str,
     sport_key: str,
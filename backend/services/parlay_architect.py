@@ -8,9 +8,9 @@ import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timezone, timedelta
 from db.mongo import db
-from core.monte_carlo_engine import monte_carlo_engine
 from core.truth_mode import truth_mode_validator
 from utils.mongo_helpers import sanitize_mongo_doc
+from services.parlay_leg_pool import count_pool_legs_by_sport, load_pool_legs
 
 logger = logging.getLogger(__name__)
 
@@ -19,8 +19,9 @@ class ParlayArchitectService:
     """
     AI-driven parlay generation engine
     
-    Scans all available games, runs simulations, evaluates EV and correlation,
-    then chains together the optimal 3-6 leg parlay based on user preferences.
+    Reads pre-scored legs from the parlay leg pool (maintained on every
+    simulation write), evaluates EV and correlation, then chains together the
+    optimal 3-6 leg parlay based on user preferences.
     """
     
     def __init__(self):
@@ -75,34 +76,29 @@ class ParlayArchitectService:
             Cross-sport correlation = 0.0 (independent events)
         """
         
-        # Step 1: Get all available games (SAME DAY ONLY for parlays)
-        now = datetime.now(timezone.utc)
+        # Step 1: Get pre-scored legs from the leg pool (SAME DAY ONLY for parlays)
+        legs_by_day = self._get_pool_legs_by_day(sport_key, multi_sport)
         
-        # Get events grouped by calendar day
-        events_by_day = self._get_events_by_day(sport_key, multi_sport)
-        
-        if not events_by_day:
+        if not legs_by_day:
             raise ValueError(
                 f"No games available in the next 7 days for {sport_key}. "
                 f"Try a different sport or check back later."
             )
         
-        # Find the first day with enough games
-        selected_day = None
-        events = []
+        # Step 2: Find the first day with enough scored legs
+        scored_legs = []
         
-        for day_date, day_events in sorted(events_by_day.items()):
-            if len(day_events) >= leg_count:
-                selected_day = day_date
-                events = day_events
-                print(f"📅 [Parlay Architect] Using games from {day_date}: {len(events)} available")
+        for day_date, day_legs in sorted(legs_by_day.items()):
+            if len(day_legs) >= leg_count:
+                scored_legs = day_legs
+                print(f"📅 [Parlay Architect] Using games from {day_date}: {len(scored_legs)} available")
                 break
         
-        if not events or len(events) < leg_count:
+        if len(scored_legs) < leg_count:
             # Show what's available each day
             day_breakdown = "\n".join([
-                f"   • {date}: {len(evts)} games"
-                for date, evts in sorted(events_by_day.items())[:5]
+                f"   • {date}: {len(day_legs)} games"
+                for date, day_legs in sorted(legs_by_day.items())[:5]
             ])
             raise ValueError(
                 f"Insufficient games on any single day for {sport_key}. "
@@ -114,126 +110,6 @@ class ParlayArchitectService:
                 f"   • Try a different sport"
             )
         
-        # Step 2: Score all potential legs using simulations
-        scored_legs = []
-        for event in events:
-            try:
-                # Get or generate simulation
-                simulation = db.monte_carlo_simulations.find_one(
-                    {"event_id": event["event_id"]},
-                    sort=[("created_at", -1)]
-                )
-                
-                if not simulation:
-                    # Auto-generate simulation if missing
-                    from integrations.player_api import get_team_data_with_roster
-                    from integrations.odds_api import extract_market_lines
-                    team_a = get_team_data_with_roster(event["home_team"], sport_key, True)
-                    team_b = get_team_data_with_roster(event["away_team"], sport_key, False)
-                    
-                    # Extract real market lines from bookmakers
-                    market_context = extract_market_lines(event)
-                    
-                    simulation = monte_carlo_engine.run_simulation(
-                        event_id=event["event_id"],
-                        team_a=team_a,
-                        team_b=team_b,
-                        market_context=market_context,
-                        iterations=10000
-                    )
-            except Exception as e:
-                # Skip events with stale odds, integrity failures, or other issues
-                error_msg = str(e)
-                if "STALE_LINE" in error_msg or "MARKET LINE INTEGRITY FAILURE" in error_msg:
-                    print(f"⏭️  Skipping {event['event_id']}: Stale or invalid market data")
-                else:
-                    print(f"⚠️ Error processing {event['event_id']}: {error_msg}")
-                continue
-            
-            # Calculate EV for each bet type
-            win_prob = simulation.get("team_a_win_probability", 0.5) or 0.5
-            spread_edge = abs(win_prob - 0.5)
-            over_prob = simulation.get("over_probability", 0.5) or 0.5
-            total_edge = abs(over_prob - 0.5)
-            
-            # Extract confidence from outcome or root level, with fallback
-            outcome = simulation.get("outcome", {})
-            raw_confidence = outcome.get("confidence", simulation.get("confidence_score", 65))
-            
-            # Normalize confidence to 0-1 range (backend stores as 0-100 integer)
-            if raw_confidence > 1:
-                # confidence_score is 0-100 integer (e.g., 65) - convert to 0-1 float
-                confidence = raw_confidence / 100.0
-            elif raw_confidence < 0.30:
-                # Already 0-1 float but very low - boost slightly
-                confidence = 0.40 + (raw_confidence / 0.30) * 0.15  # Map 0-0.30 to 0.40-0.55
-            else:
-                # Already 0-1 float
-                confidence = raw_confidence
-            
-            # Validate confidence is in valid range
-            if confidence > 1.0:
-                logger.error(f"Invalid confidence {confidence} for {event['event_id']} - clamping to 1.0")
-                confidence = 1.0
-            elif confidence < 0:
-                logger.error(f"Invalid confidence {confidence} for {event['event_id']} - clamping to 0.0")
-                confidence = 0.0
-            
-            # CRITICAL: Extract edge_state from simulation
-            edge_state = simulation.get("edge_state", simulation.get("pick_state", "NO_PLAY"))
-            
-            # Extract edge points for scoring
-            sharp_analysis = simulation.get("sharp_analysis", {})
-            spread_data = sharp_analysis.get("spread", {})
-            total_data = sharp_analysis.get("total", {})
-            spread_edge_pts = abs(spread_data.get("edge_points", 0.0))
-            total_edge_pts = abs(total_data.get("edge_points", 0.0))
-            
-            volatility = simulation.get("volatility", simulation.get("volatility_index", "MODERATE"))
-            stability = confidence * 100  # Convert to stability score
-            
-            # Determine best bet type FIRST to get probability
-            if spread_edge_pts > total_edge_pts or (spread_edge_pts == total_edge_pts and spread_edge > total_edge):
-                bet_type = "spread"
-                probability = win_prob
-                line = f"{event['home_team']} -5.5" if win_prob > 0.5 else f"{event['away_team']} +5.5"
-                edge_pts = spread_edge_pts
-            else:
-                bet_type = "total"
-                probability = over_prob
-                avg_total = simulation.get("avg_total_score", 220)
-                line = f"Over {avg_total:.1f}" if over_prob > 0.5 else f"Under {avg_total:.1f}"
-                edge_pts = total_edge_pts
-            
-            # Calculate EV percentage
-            # Ensure probability is not None
-            if probability is None:
-                probability = 0.5
-            ev = (probability - 0.5) * 100
-            
-            # Classify leg into quality tier
-            tier = self._classify_leg_tier(confidence, ev, stability)
-            
-            scored_legs.append({
-                "event_id": event["event_id"],
-                "event": f"{event['away_team']} @ {event['home_team']}",
-                "sport": event["sport_key"],
-                "sport_key": event["sport_key"],
-                "commence_time": event["commence_time"],
-                "bet_type": bet_type,
-                "line": line,
-                "probability": probability,
-                "confidence": confidence,
-                "ev": ev,
-                "stability": stability,
-                "tier": tier,
-                "score": confidence * 60 + ev * 40,  # Combined scoring
-                "volatility": volatility,
-                "edge_state": edge_state,  # CRITICAL for Truth Mode scoring
-                "edge_pts": edge_pts,  # Edge points from sharp analysis
-                "simulation": simulation  # Include full simulation for Truth Mode
-            })
-        
         # Step 3: Use tiered fallback system to select legs
         selected_legs = self._select_legs_with_tiered_fallback(
             scored_legs=scored_legs,
@@ -246,7 +122,7 @@ class ParlayArchitectService:
             raise ValueError(
                 f"⚠️ Unable to generate parlay - insufficient quality legs.\n\n"
                 f"📊 Results:\n"
-                f"   • Total events scanned: {len(events)}\n"
+                f"   • Total events scanned: {len(scored_legs)}\n"
                 f"   • Tier A (Premium): {len([l for l in scored_legs if l['tier'] == 'A'])}\n"
                 f"   • Tier B (Medium): {len([l for l in scored_legs if l['tier'] == 'B'])}\n"
                 f"   • Tier C (Value): {len([l for l in scored_legs if l['tier'] == 'C'])}\n\n"
@@ -588,6 +464,96 @@ class ParlayArchitectService:
         
         return parlay_data
     
+    def score_leg(self, event: Dict[str, Any], simulation: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Score one event's latest simulation as a parlay leg candidate.
+
+        Called by services.parlay_leg_pool whenever a simulation is stored,
+        so the scored leg is ready before any parlay request.
+        """
+        # Calculate EV for each bet type
+        win_prob = simulation.get("team_a_win_probability", 0.5) or 0.5
+        spread_edge = abs(win_prob - 0.5)
+        over_prob = simulation.get("over_probability", 0.5) or 0.5
+        total_edge = abs(over_prob - 0.5)
+        
+        # Extract confidence from outcome or root level, with fallback
+        outcome = simulation.get("outcome", {})
+        raw_confidence = outcome.get("confidence", simulation.get("confidence_score", 65))
+        
+        # Normalize confidence to 0-1 range (backend stores as 0-100 integer)
+        if raw_confidence > 1:
+            # confidence_score is 0-100 integer (e.g., 65) - convert to 0-1 float
+            confidence = raw_confidence / 100.0
+        elif raw_confidence < 0.30:
+            # Already 0-1 float but very low - boost slightly
+            confidence = 0.40 + (raw_confidence / 0.30) * 0.15  # Map 0-0.30 to 0.40-0.55
+        else:
+            # Already 0-1 float
+            confidence = raw_confidence
+        
+        # Validate confidence is in valid range
+        if confidence > 1.0:
+            logger.error(f"Invalid confidence {confidence} for {event['event_id']} - clamping to 1.0")
+            confidence = 1.0
+        elif confidence < 0:
+            logger.error(f"Invalid confidence {confidence} for {event['event_id']} - clamping to 0.0")
+            confidence = 0.0
+        
+        # CRITICAL: Extract edge_state from simulation
+        edge_state = simulation.get("edge_state", simulation.get("pick_state", "NO_PLAY"))
+        
+        # Extract edge points for scoring
+        sharp_analysis = simulation.get("sharp_analysis", {})
+        spread_data = sharp_analysis.get("spread", {})
+        total_data = sharp_analysis.get("total", {})
+        spread_edge_pts = abs(spread_data.get("edge_points", 0.0))
+        total_edge_pts = abs(total_data.get("edge_points", 0.0))
+        
+        volatility = simulation.get("volatility", simulation.get("volatility_index", "MODERATE"))
+        stability = confidence * 100  # Convert to stability score
+        
+        # Determine best bet type FIRST to get probability
+        if spread_edge_pts > total_edge_pts or (spread_edge_pts == total_edge_pts and spread_edge > total_edge):
+            bet_type = "spread"
+            probability = win_prob
+            line = f"{event['home_team']} -5.5" if win_prob > 0.5 else f"{event['away_team']} +5.5"
+            edge_pts = spread_edge_pts
+        else:
+            bet_type = "total"
+            probability = over_prob
+            avg_total = simulation.get("avg_total_score", 220)
+            line = f"Over {avg_total:.1f}" if over_prob > 0.5 else f"Under {avg_total:.1f}"
+            edge_pts = total_edge_pts
+        
+        # Calculate EV percentage
+        # Ensure probability is not None
+        if probability is None:
+            probability = 0.5
+        ev = (probability - 0.5) * 100
+        
+        # Classify leg into quality tier
+        tier = self._classify_leg_tier(confidence, ev, stability)
+        
+        return {
+            "event_id": event["event_id"],
+            "event": f"{event['away_team']} @ {event['home_team']}",
+            "sport": event["sport_key"],
+            "sport_key": event["sport_key"],
+            "commence_time": event["commence_time"],
+            "bet_type": bet_type,
+            "line": line,
+            "probability": probability,
+            "confidence": confidence,
+            "ev": ev,
+            "stability": stability,
+            "tier": tier,
+            "score": confidence * 60 + ev * 40,  # Combined scoring
+            "volatility": volatility,
+            "edge_state": edge_state,  # CRITICAL for Truth Mode scoring
+            "edge_pts": edge_pts,  # Edge points from sharp analysis
+        }
+    
     def _build_correlated_chain(
         self,
         candidates: List[Dict[str, Any]],
@@ -934,85 +900,39 @@ class ParlayArchitectService:
             "tier_breakdown": tiers_used
         }
     
-    def _get_events_by_day(
+    def _get_pool_legs_by_day(
         self, 
         sport_key: str, 
         multi_sport: bool = False
     ) -> Dict[str, List[Dict[str, Any]]]:
         """
-        Get events grouped by calendar day (UTC)
+        Get pre-scored legs from the leg pool grouped by calendar day (UTC)
         All parlay legs MUST be on the same day
         
         Returns:
-            Dict mapping date string (YYYY-MM-DD) to list of events
+            Dict mapping date string (YYYY-MM-DD) to list of scored legs
         """
-        now = datetime.now(timezone.utc)
-        week_end = now + timedelta(days=7)
-        
-        # Build query
-        query: Dict[str, Any] = {
-            "commence_time": {
-                "$gt": now.isoformat(),
-                "$lt": week_end.isoformat()
-            }
-        }
-        
-        # Single sport or multi-sport
-        if not multi_sport and sport_key != "all":
-            query["sport_key"] = sport_key
-        
-        events = list(db.events.find(query).limit(200))
+        pool_sport = None if multi_sport or sport_key == "all" else sport_key
+        legs = load_pool_legs(pool_sport)
         
         # Group by calendar day (UTC date)
-        events_by_day: Dict[str, List[Dict[str, Any]]] = {}
-        for event in events:
-            try:
-                # Parse commence_time and get date
-                commence = datetime.fromisoformat(event["commence_time"].replace("Z", "+00:00"))
-                date_key = commence.strftime("%Y-%m-%d")
-                
-                # Use setdefault to initialize and append in one operation
-                events_by_day.setdefault(date_key, []).append(event)
-            except Exception as e:
-                print(f"⚠️ Error parsing date for event {event.get('event_id')}: {e}")
-                continue
+        legs_by_day: Dict[str, List[Dict[str, Any]]] = {}
+        for leg in legs:
+            legs_by_day.setdefault(leg["pool_day"], []).append(leg)
         
         # Log what we found
         if multi_sport:
-            total = sum(len(evts) for evts in events_by_day.values())
-            print(f"🌐 [Multi-Sport] Found {total} games across all sports in next 7 days")
+            print(f"🌐 [Multi-Sport] Found {len(legs)} scored games across all sports in next 7 days")
         else:
-            total = sum(len(evts) for evts in events_by_day.values())
-            print(f"📅 [Same-Day Filter] Found {total} {sport_key} games grouped by day")
+            print(f"📅 [Same-Day Filter] Found {len(legs)} scored {sport_key} games grouped by day")
         
-        return events_by_day
+        return legs_by_day
     
     def _get_available_sports_count(self, start_time: datetime, end_time: datetime) -> Dict[str, int]:
         """
-        Get count of available games for each sport in the time window
+        Get count of available (scored) games for each sport in the time window
         """
-        sports = [
-            "basketball_nba",
-            "basketball_ncaab", 
-            "americanfootball_nfl",
-            "americanfootball_ncaaf",
-            "baseball_mlb",
-            "icehockey_nhl"
-        ]
-        
-        sport_counts = {}
-        for sport in sports:
-            count = db.events.count_documents({
-                "sport_key": sport,
-                "commence_time": {
-                    "$gt": start_time.isoformat(),
-                    "$lt": end_time.isoformat()
-                }
-            })
-            if count > 0:
-                sport_counts[sport] = count
-        
-        return sport_counts
+        return count_pool_legs_by_sport(start_time, end_time)
     
     def _find_best_single(self, scored_legs: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """
@@ -33,11 +33,16 @@ class ParlayCalculatorService:
     
     def calculate_parlay_probability(
         self,
-        legs: List[Dict]
+        legs: List[Dict],
+        correlation_factor: Optional[float] = None
     ) -> Dict:
         """
         Calculate multi-leg parlay win probability.
         
+        When correlation_factor (joint / independent hit probability measured
+        on shared simulation samples, see services.joint_sample_store) is
+        given it replaces the simple correlation heuristics.
+        
         Args:
             legs: List of leg objects, each containing:
                 {
@@ -48,6 +53,7 @@ class ParlayCalculatorService:
                     "american_odds": int,  # e.g., -110
                     "sport": str
                 }
+            correlation_factor: Optional measured joint / independent ratio
         
         Returns:
             {
@@ -77,11 +83,19 @@ class ParlayCalculatorService:
         # Calculate independent probability (no correlation)
         independent_prob = self._calculate_independent_probability(leg_probs)
         
-        # Detect simple correlations
-        correlation_type, correlation_adjustment = self._detect_correlation(legs)
-        
-        # Apply correlation adjustment
-        combined_prob = max(0.001, min(0.999, independent_prob + correlation_adjustment))
+        if correlation_factor is not None:
+            # Measured on shared Monte Carlo samples
+            combined_prob = max(0.001, min(0.999, independent_prob * correlation_factor))
+            correlation_adjustment = combined_prob - independent_prob
+            correlation_type = self._classify_correlation_factor(correlation_factor)
+            notes = "Joint probability measured on shared Monte Carlo samples."
+        else:
+            # Detect simple correlations
+            correlation_type, correlation_adjustment = self._detect_correlation(legs)
+            
+            # Apply correlation adjustment
+            combined_prob = max(0.001, min(0.999, independent_prob + correlation_adjustment))
+            notes = "Simple correlation detection applied. Advanced correlation modeling coming soon."
         
         # Get correlation label
         correlation_label = self._get_correlation_label(correlation_type, len(legs))
@@ -93,7 +107,7 @@ class ParlayCalculatorService:
             "correlation_adjustment": round(correlation_adjustment, 4),
             "leg_probabilities": [round(p, 3) for p in leg_probs],
             "independent_probability": round(independent_prob, 4),
-            "notes": "Simple correlation detection applied. Advanced correlation modeling coming soon."
+            "notes": notes
         }
     
     def calculate_parlay_ev(
@@ -182,6 +196,14 @@ class ParlayCalculatorService:
             result *= prob
         return result
     
+    def _classify_correlation_factor(self, factor: float) -> str:
+        """Correlation type from a joint / independent ratio (±0.5% band = neutral)."""
+        if factor > 1.005:
+            return CorrelationType.POSITIVE
+        if factor < 0.995:
+            return CorrelationType.NEGATIVE
+        return CorrelationType.NEUTRAL
+    
     def _detect_correlation(self, legs: List[Dict]) -> Tuple[str, float]:
         """
         Simple correlation detection between parlay legs.
@@ -0,0 +1,157 @@
+"""
+Parlay Leg Pool
+===============
+Materialized, pre-scored parlay legs (collection: parlay_leg_pool), one row
+per event, keyed by UTC game day and sport.
+
+MonteCarloEngine.run_simulation upserts the event's row every time it stores
+a full-game simulation, so the pool always reflects the latest simulation.
+The Parlay Architect then reads a whole week of candidate legs with one
+indexed query on (pool_day, sport_key, commence_time) and selects in memory:
+no per-event simulation lookups and no simulations inside the request.
+
+Each row carries what leg selection and Truth Mode validation read: the
+scored fields (probability, ev, confidence, stability, tier, score,
+volatility, edge_state, edge_pts) plus a compact `simulation` summary with
+only the fields Truth Mode checks, not the full simulation document.
+Rows expire one day after tip-off through a TTL index on expires_at.
+"""
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+LEG_POOL_COLLECTION = "parlay_leg_pool"
+LEG_POOL_HORIZON_DAYS = 7
+
+# Simulation fields read by core.truth_mode (model validity + critical blocks)
+TRUTH_MODE_SIMULATION_FIELDS = (
+    "simulation_id",
+    "event_id",
+    "iterations",
+    "sim_count",
+    "convergence_score",
+    "stability_score",
+    "confidence_score",
+    "team_a_win_probability",
+    "home_win_probability",
+    "spread_confidence",
+    "total_confidence",
+    "injury_analysis",
+    "pitcher_confirmed",
+    "goalie_confirmed",
+    "weather",
+    "created_at",
+)
+
+
+def _pool():
+    from db.mongo import db
+    return db[LEG_POOL_COLLECTION]
+
+
+def simulation_summary(simulation: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: simulation[k] for k in TRUTH_MODE_SIMULATION_FIELDS if k in simulation}
+
+
+def upsert_pool_leg(simulation: Dict[str, Any], event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Score a freshly stored simulation and upsert its event's pool row.
+
+    Period (1H/2H) simulations are ignored - parlay legs are full-game only.
+    Returns the stored row, or None when the simulation is not poolable.
+    """
+    if simulation.get("period") or not event.get("commence_time"):
+        return None
+
+    # Deferred: services.parlay_architect imports this module
+    from services.parlay_architect import parlay_architect_service
+
+    leg = parlay_architect_service.score_leg(event, simulation)
+    commence = datetime.fromisoformat(event["commence_time"].replace("Z", "+00:00"))
+    row = {
+        **leg,
+        "simulation": simulation_summary(simulation),
+        "pool_day": commence.strftime("%Y-%m-%d"),
+        "home_team": event.get("home_team"),
+        "away_team": event.get("away_team"),
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+        "expires_at": commence + timedelta(days=1),
+    }
+    _pool().update_one({"event_id": row["event_id"]}, {"$set": row}, upsert=True)
+    return row
+
+
+def load_pool_legs(
+    sport_key: Optional[str] = None,
+    now: Optional[datetime] = None,
+    horizon_days: int = LEG_POOL_HORIZON_DAYS,
+) -> List[Dict[str, Any]]:
+    """
+    Pooled legs for games that have not started within the horizon, sorted by
+    commence_time. sport_key=None returns every sport.
+    """
+    now = now or datetime.now(timezone.utc)
+    end = now + timedelta(days=horizon_days)
+    days = [(now + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(horizon_days + 1)]
+
+    query: Dict[str, Any] = {
+        "pool_day": {"$in": days},
+        "commence_time": {"$gt": now.isoformat(), "$lt": end.isoformat()},
+    }
+    if sport_key:
+        query["sport_key"] = sport_key
+    return list(_pool().find(query, {"_id": 0, "expires_at": 0}).sort("commence_time", 1))
+
+
+def count_pool_legs_by_sport(start_time: datetime, end_time: datetime) -> Dict[str, int]:
+    """Pooled legs per sport with commence_time in (start_time, end_time), in one aggregation."""
+    days = []
+    day = start_time
+    while day.date() <= end_time.date():
+        days.append(day.strftime("%Y-%m-%d"))
+        day += timedelta(days=1)
+
+    rows = _pool().aggregate([
+        {"$match": {
+            "pool_day": {"$in": days},
+            "commence_time": {"$gt": start_time.isoformat(), "$lt": end_time.isoformat()},
+        }},
+        {"$group": {"_id": "$sport_key", "count": {"$sum": 1}}},
+    ])
+    return {row["_id"]: row["count"] for row in rows if row["_id"] and row["count"] > 0}
+
+
+def rebuild_leg_pool(horizon_days: int = LEG_POOL_HORIZON_DAYS) -> int:
+    """
+    Backfill the pool from the latest stored full-game simulation of each
+    upcoming event (e.g. after first deploy). Returns rows written.
+    """
+    from db.mongo import db
+
+    now = datetime.now(timezone.utc)
+    events = {
+        e["event_id"]: e
+        for e in db["events"].find(
+            {"commence_time": {"$gt": now.isoformat(), "$lt": (now + timedelta(days=horizon_days)).isoformat()}},
+            {"_id": 0, "event_id": 1, "sport_key": 1, "home_team": 1, "away_team": 1, "commence_time": 1},
+        )
+    }
+    if not events:
+        return 0
+
+    latest = db["monte_carlo_simulations"].aggregate([
+        {"$match": {"event_id": {"$in": list(events)}, "period": {"$exists": False}}},
+        {"$sort": {"created_at": -1}},
+        {"$group": {"_id": "$event_id", "simulation": {"$first": "$$ROOT"}}},
+    ], allowDiskUse=True)
+
+    written = 0
+    for row in latest:
+        try:
+            if upsert_pool_leg(row["simulation"], events[row["_id"]]):
+                written += 1
+        except Exception as e:
+            logger.warning(f"Leg pool backfill skipped {row['_id']}: {e}")
+    return written
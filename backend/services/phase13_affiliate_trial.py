@@ -30,6 +30,7 @@ import stripe
 
 from config.agent_config import AGENT_CONFIG
 from db.mongo import db
+from services.principal_cache import get_principal_cache
 
 logger = logging.getLogger(__name__)
 
@@ -381,6 +382,7 @@ def cancel_trial(user_id: str, stripe_subscription_id: str, trace_id: Optional[s
         },
         upsert=True,
     )
+    get_principal_cache().invalidate_user(user_id)
 
     # Zero tokens
     zero_trial_tokens(user_id, reason="TRIAL_CANCELLATION")
@@ -29,6 +29,8 @@ from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from services.phase8_metric_counters import record_write as record_metric_write
+
 logger = logging.getLogger(__name__)
 
 def _get_db():
@@ -354,6 +356,7 @@ def grade_phase4_decision(decision_id: str, force_regrade: bool = False) -> Opti
     _db["decision_settlement_metrics"].insert_one(
         {**settlement, "_inserted_at": settled_at}
     )
+    record_metric_write("decision_settlement_metrics", settlement)
     logger.info(
         f"[{GRADING_AGENT_ID}] Graded: {decision_id} → {result_code} "
         f"CLV={clv} Brier={brier_score:.4f}"
@@ -214,50 +214,56 @@ def _run_sim_for_game(
 # Phase 4 decision record writer
 # ============================================================================
 
-def _write_phase4_decision_record(result: Dict[str, Any], run_id: str) -> Optional[str]:
+def _build_phase4_decision_doc(result: Dict[str, Any], run_id: str) -> Dict[str, Any]:
+    """Build the immutable phase4_decision_record document for one game."""
+    return {
+        "decision_id":               str(uuid.uuid4()),
+        "run_id":                    run_id,
+        "agent_id":                  AGENT_ID,
+        "event_id":                  result["event_id"],
+        "league":                    result["league"],
+        "sport_key":                 result["sport_key"],
+        "home_team":                 result["home_team"],
+        "away_team":                 result["away_team"],
+        "start_time_utc":            result["start_time_utc"],
+        "market_implied_probability": result["market_implied_probability"],
+        "model_probability":         result["model_probability"],
+        "edge_points":               result["edge_points"],
+        "market_line":               result["market_line"],
+        "phase4_decision_class":     result["phase4_decision_class"],
+        "block_reasons":             result["block_reasons"],
+        "created_at":                datetime.now(timezone.utc).isoformat(),
+        "graded":                    False,
+    }
+
+
+def _write_phase4_decision_records(results: List[Dict[str, Any]], run_id: str) -> int:
     """
-    Write (or skip if duplicate) a phase4_decision_record.
-    Returns inserted decision_id or None on duplicate/error.
+    Write (or skip duplicates of) the run's phase4_decision_records in one
+    bulk_write.  Returns the number of newly inserted records.
     """
+    if not results:
+        return 0
     try:
-        _db = _get_db()
+        from pymongo import UpdateOne
 
-        decision_id = str(uuid.uuid4())
-        doc = {
-            "decision_id":               decision_id,
-            "run_id":                    run_id,
-            "agent_id":                  AGENT_ID,
-            "event_id":                  result["event_id"],
-            "league":                    result["league"],
-            "sport_key":                 result["sport_key"],
-            "home_team":                 result["home_team"],
-            "away_team":                 result["away_team"],
-            "start_time_utc":            result["start_time_utc"],
-            "market_implied_probability": result["market_implied_probability"],
-            "model_probability":         result["model_probability"],
-            "edge_points":               result["edge_points"],
-            "market_line":               result["market_line"],
-            "phase4_decision_class":     result["phase4_decision_class"],
-            "block_reasons":             result["block_reasons"],
-            "created_at":                datetime.now(timezone.utc).isoformat(),
-            "graded":                    False,
-        }
+        _db = _get_db()
 
         # Atomic idempotency: one record per (event_id, run_id)
-        existing = _db["phase4_decision_records"].find_one_and_update(
-            {"event_id": result["event_id"], "run_id": run_id},
-            {"$setOnInsert": doc},
-            upsert=True,
-            return_document=False,
-        )
-        if existing is not None:
-            # Duplicate – already written
-            return None
-        return decision_id
+        operations = [
+            UpdateOne(
+                {"event_id": result["event_id"], "run_id": run_id},
+                {"$setOnInsert": _build_phase4_decision_doc(result, run_id)},
+                upsert=True,
+            )
+            for result in results
+        ]
+        write_result = _db["phase4_decision_records"].bulk_write(operations, ordered=False)
+        return int(write_result.upserted_count)
 
     except Exception as exc:
-        logger.error(f"[{AGENT_ID}] Failed to write decision record: {exc}")
-        return None
+        logger.error(f"[{AGENT_ID}] Failed to write decision records: {exc}")
+        return 0
 
 
 # ============================================================================
@@ -302,6 +308,9 @@ def run_daily_simulation() -> Dict[str, Any]:
     import services.phase4_simulation_scheduler as _self_sched
     _fetch_odds = _self_sched.fetch_odds or fetch_odds
 
+    # Decision records are persisted with one bulk write after the slate
+    sim_results: List[Dict[str, Any]] = []
+
     for league_cfg in LEAGUES:
         sport_key = league_cfg["sport_key"]
         league    = league_cfg["league"]
@@ -349,7 +358,7 @@ def run_daily_simulation() -> Dict[str, Any]:
 
             try:
                 sim_result = _run_sim_for_game(game, league, sport_key)
-                decision_id = _write_phase4_decision_record(sim_result, run_id)
+                sim_results.append(sim_result)
 
                 cls = sim_result["phase4_decision_class"]
                 league_summary["decisions"][cls] = league_summary["decisions"].get(cls, 0) + 1
@@ -371,6 +380,10 @@ def run_daily_simulation() -> Dict[str, Any]:
 
         summary["leagues"][league] = league_summary
 
+    summary["totals"]["decision_records_written"] = _write_phase4_decision_records(
+        sim_results, run_id
+    )
+
     # ── Finalise and persist log ────────────────────────────────────────────
     finished_at = datetime.now(timezone.utc)
     summary["finished_at"] = finished_at.isoformat()
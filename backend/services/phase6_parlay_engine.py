@@ -10,7 +10,7 @@ TOKEN MODEL (LOCKED — no deviation):
 EXECUTION PIPELINE (6 steps, sequential, no shortcuts):
   1. validate  → all legs pass required field gate
   2. construct → priority-ordered leg list
-  3. simulate  → combined probability
+  3. simulate  → combined probability (joint over shared simulation samples)
   4. score     → correlation controls
   5. log       → write parlay_execution_log BEFORE returning
   6. return    → parlay or NO_PARLAY with reason codes
@@ -36,6 +36,7 @@ from uuid import uuid4
 
 from db.mongo import db
 from config.agent_config import AGENT_CONFIG
+from services.joint_sample_store import correlation_factor
 
 logger = logging.getLogger(__name__)
 
@@ -185,7 +186,12 @@ def _construct_legs(
 # ─────────────────────────────────────────────────────────────────────────────
 
 def _simulate_combined(legs: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Compute combined probability as product of individual probabilities (independence assumption)."""
+    """
+    Compute combined probability from the legs' own probabilities, scaled by
+    the joint/independent ratio measured on each game's stored Monte Carlo
+    samples (services.joint_sample_store). Legs without a side/line or a
+    stored sample matrix are treated as independent (factor 1.0).
+    """
     probs = []
     for leg in legs:
         p = float(leg.get("probability", 0) or 0)
@@ -193,13 +199,18 @@ def _simulate_combined(legs: List[Dict[str, Any]]) -> Dict[str, Any]:
             p = float(leg.get("probability", 0) or 0) / 100.0 if float(leg.get("probability", 0) or 0) > 1 else p
         probs.append(max(0.01, min(0.99, p)))
 
-    combined = 1.0
+    independent = 1.0
     for p in probs:
-        combined *= p
+        independent *= p
+
+    factor = correlation_factor(legs)
+    combined = min(0.99, independent * factor)
 
     return {
         "combined_probability": combined,
         "combined_probability_pct": round(combined * 100, 4),
+        "independent_probability": independent,
+        "correlation_factor": round(factor, 4),
         "leg_probabilities": probs,
         "leg_count": len(probs),
     }
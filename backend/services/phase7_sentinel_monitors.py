@@ -20,6 +20,7 @@ from uuid import uuid4
 
 from db.mongo import db
 from config.agent_config import AGENT_CONFIG
+from services.phase8_metric_counters import record_write as record_metric_write
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +54,7 @@ def _fire(
         "timestamp": _now_iso(),
     }
     _sentinel_log.insert_one({k: v for k, v in event.items() if k != "_id"})
+    record_metric_write("sentinel_event_log", event)
     logger.warning("[phase7-sentinel] %s | severity=%s | subject=%s", event_type, severity, subject)
     return event
 
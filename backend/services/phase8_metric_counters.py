@@ -0,0 +1,291 @@
+"""
+Phase 8A — In-process counters and gauges behind the Prometheus exporter.
+
+The exporter used to answer every scrape by counting and then re-reading
+every matching row of sentinel_event_log / distribution_audit_log (once per
+candidate timestamp field), so scrape cost grew with total history. Now:
+
+- Writers (sentinel monitors, distribution agent, billing ledger, grading
+  engine, response/recovery agents) call record_write(collection, doc) right
+  after their insert. Each series bumps an all-time total and a per-minute
+  bucket; each agent heartbeat gauge advances to the row's timestamp.
+- reconcile() re-reads the truth from Mongo with indexed, time-bounded
+  queries: one count_documents per series, the rows of the last
+  RATE_WINDOW_MINUTES only, and one sorted find_one per heartbeat source.
+  It corrects for writes made by other processes (or writers that are not
+  hooked) and runs every METRICS_RECONCILE_SECONDS on the API event loop.
+- snapshot() only reads memory, so scrape latency is constant however large
+  the audit collections grow.
+
+A write that lands while a reconcile pass is reading can be counted twice
+or not at all until the next pass; the window is one reconcile interval.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+METRICS_RECONCILE_SECONDS = float(os.getenv("METRICS_RECONCILE_SECONDS", "60"))
+RATE_WINDOW_MINUTES = 60
+
+_NEVER_MINUTES = 99999.0
+
+
+@dataclass(frozen=True)
+class CounterSeries:
+    """One counted slice of an append-only audit collection."""
+
+    name: str
+    collection: str
+    match: Dict[str, Any]
+    ts_field: str
+
+    def matches(self, doc: Dict[str, Any]) -> bool:
+        return all(doc.get(k) == v for k, v in self.match.items())
+
+
+SERIES = (
+    CounterSeries("integrity_violation", "sentinel_event_log",
+                  {"event_type": "INTEGRITY_VIOLATION"}, "timestamp"),
+    CounterSeries("decision_write_fail", "sentinel_event_log",
+                  {"event_type": "DECISION_WRITE_FAIL"}, "timestamp"),
+    CounterSeries("billing_write_fail", "sentinel_event_log",
+                  {"event_type": "BILLING_WRITE_FAIL"}, "timestamp"),
+    CounterSeries("snapshot_mismatch", "distribution_audit_log",
+                  {"validation_check": "snapshot_hash_consistent", "validation_result": "FAIL"},
+                  "sent_at_utc"),
+    CounterSeries("publish_failure", "distribution_audit_log",
+                  {"delivered": False}, "sent_at_utc"),
+)
+
+# agent_id -> (collection, agent field, timestamp field)
+HEARTBEAT_SOURCES = {
+    "agent.sentinel.v1": ("sentinel_event_log", "agent_id", "timestamp"),
+    "agent.response.v1": ("response_action_log", "agent_id", "timestamp_utc"),
+    "agent.recovery.v1": ("recovery_action_log", "agent_id", "created_at_utc"),
+    "agent.grading.v1": ("decision_settlement_metrics", "graded_by", "graded_at"),
+    "agent.calibration.v1": ("calibration_audit_log", "agent_id", "created_at"),
+    "agent.distribution.v1": ("distribution_audit_log", "agent_id", "sent_at_utc"),
+    "agent.growth.v1": ("outbound_communication_log", "agent_id", "sent_at_utc"),
+}
+
+
+def parse_iso(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _minute(ts: float) -> int:
+    return int(ts // 60)
+
+
+@dataclass
+class _SeriesState:
+    total: int = 0
+    # epoch minute -> rows written in that minute (last RATE_WINDOW_MINUTES only)
+    buckets: Dict[int, int] = field(default_factory=dict)
+
+    def add(self, ts: float, now: float) -> None:
+        self.total += 1
+        minute = _minute(ts)
+        if minute > _minute(now) - RATE_WINDOW_MINUTES:
+            self.buckets[minute] = self.buckets.get(minute, 0) + 1
+
+    def recent(self, now: float) -> int:
+        floor = _minute(now) - RATE_WINDOW_MINUTES
+        for minute in [m for m in self.buckets if m <= floor]:
+            del self.buckets[minute]
+        return sum(self.buckets.values())
+
+
+class MetricCounters:
+    """Per-process counters/gauges for the Phase 8 Prometheus exporter."""
+
+    def __init__(self, reconcile_seconds: float = METRICS_RECONCILE_SECONDS):
+        self.reconcile_seconds = reconcile_seconds
+        self._lock = threading.Lock()
+        self._series: Dict[str, _SeriesState] = {s.name: _SeriesState() for s in SERIES}
+        self._heartbeats: Dict[str, float] = {}
+        self._feed_refreshed_at: Optional[float] = None
+        self._reconciled_at: Optional[float] = None
+        self._stats = {"writes_recorded": 0, "reconciles": 0, "reconcile_errors": 0,
+                       "last_reconcile_ms": 0.0}
+        self._task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # Writer hooks
+    # ------------------------------------------------------------------
+
+    def record_write(self, collection: str, doc: Dict[str, Any]) -> None:
+        """Account one row just inserted into `collection`. Never raises."""
+        try:
+            now = time.time()
+            with self._lock:
+                for series in SERIES:
+                    if series.collection == collection and series.matches(doc):
+                        written = parse_iso(doc.get(series.ts_field))
+                        self._series[series.name].add(written.timestamp() if written else now, now)
+                for agent_id, (source, agent_field, ts_field) in HEARTBEAT_SOURCES.items():
+                    if source == collection and doc.get(agent_field) == agent_id:
+                        seen = parse_iso(doc.get(ts_field))
+                        self._advance_heartbeat(agent_id, seen.timestamp() if seen else now)
+                self._stats["writes_recorded"] += 1
+        except Exception as exc:
+            logger.debug("metric counter update skipped: %s", exc)
+
+    def record_feed_refresh(self, fetched_at: Any = None) -> None:
+        refreshed = parse_iso(fetched_at)
+        ts = refreshed.timestamp() if refreshed else time.time()
+        with self._lock:
+            if self._feed_refreshed_at is None or ts > self._feed_refreshed_at:
+                self._feed_refreshed_at = ts
+
+    def _advance_heartbeat(self, agent_id: str, ts: float) -> None:
+        if ts > self._heartbeats.get(agent_id, 0.0):
+            self._heartbeats[agent_id] = ts
+
+    # ------------------------------------------------------------------
+    # Reconciliation against Mongo
+    # ------------------------------------------------------------------
+
+    def reconcile(self, database=None) -> None:
+        """Reset every counter/gauge from indexed, time-bounded Mongo reads."""
+        if database is None:
+            from db.mongo import db as database
+        started = time.time()
+        since = (datetime.fromtimestamp(started, timezone.utc)
+                 - timedelta(minutes=RATE_WINDOW_MINUTES)).isoformat()
+
+        fresh: Dict[str, _SeriesState] = {}
+        for series in SERIES:
+            col = database[series.collection]
+            state = _SeriesState(total=int(col.count_documents(series.match)))
+            cursor = col.find({**series.match, series.ts_field: {"$gte": since}},
+                              {series.ts_field: 1, "_id": 0})
+            for row in cursor:
+                written = parse_iso(row.get(series.ts_field))
+                if written:
+                    minute = _minute(written.timestamp())
+                    state.buckets[minute] = state.buckets.get(minute, 0) + 1
+            fresh[series.name] = state
+
+        heartbeats: Dict[str, float] = {}
+        for agent_id, (source, agent_field, ts_field) in HEARTBEAT_SOURCES.items():
+            row = database[source].find_one({agent_field: agent_id}, {ts_field: 1, "_id": 0},
+                                            sort=[(ts_field, -1)])
+            seen = parse_iso((row or {}).get(ts_field))
+            if seen:
+                heartbeats[agent_id] = seen.timestamp()
+
+        latest_odds = database["odds_cache"].find_one({}, {"fetched_at": 1, "timestamp": 1},
+                                                      sort=[("fetched_at", -1)])
+        feed = parse_iso((latest_odds or {}).get("fetched_at") or (latest_odds or {}).get("timestamp"))
+
+        with self._lock:
+            self._series = fresh
+            for agent_id, ts in heartbeats.items():
+                self._advance_heartbeat(agent_id, ts)
+            if feed and (self._feed_refreshed_at is None or feed.timestamp() > self._feed_refreshed_at):
+                self._feed_refreshed_at = feed.timestamp()
+            self._reconciled_at = time.time()
+            self._stats["reconciles"] += 1
+            self._stats["last_reconcile_ms"] = round((self._reconciled_at - started) * 1000.0, 3)
+
+    def is_stale(self) -> bool:
+        """True when no reconcile pass has run recently (e.g. no loop in this process)."""
+        reconciled_at = self._reconciled_at
+        return reconciled_at is None or time.time() - reconciled_at > 2 * self.reconcile_seconds
+
+    # ------------------------------------------------------------------
+    # Scrape-time reads (memory only)
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            series = {}
+            for name, state in self._series.items():
+                recent = state.recent(now)
+                rate = (recent / state.total) * 100.0 if state.total > 0 else 0.0
+                series[name] = {"total": state.total, "recent": recent, "rate": rate}
+            heartbeats = {
+                agent_id: ((now - self._heartbeats[agent_id]) / 60.0
+                           if agent_id in self._heartbeats else _NEVER_MINUTES)
+                for agent_id in HEARTBEAT_SOURCES
+            }
+            feed_staleness = ((now - self._feed_refreshed_at) / 60.0
+                              if self._feed_refreshed_at is not None else _NEVER_MINUTES)
+        return {"series": series, "heartbeat_silence_minutes": heartbeats,
+                "feed_staleness_minutes": feed_staleness}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "reconciled_at": self._reconciled_at,
+                    "reconciler_running": self._task is not None and not self._task.done()}
+
+    # ------------------------------------------------------------------
+    # Background reconciler (API event loop)
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._reconcile_loop())
+        logger.info("🚀 Metric counter reconciler started (every %ss)", self.reconcile_seconds)
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _reconcile_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.reconcile)
+            except Exception as exc:
+                with self._lock:
+                    self._stats["reconcile_errors"] += 1
+                logger.error("❌ Metric counter reconcile failed: %s", exc)
+            await asyncio.sleep(self.reconcile_seconds)
+
+
+_metric_counters: Optional[MetricCounters] = None
+
+
+def get_metric_counters() -> MetricCounters:
+    """Get the per-process metric counters"""
+    global _metric_counters
+    if _metric_counters is None:
+        _metric_counters = MetricCounters()
+    return _metric_counters
+
+
+def record_write(collection: str, doc: Dict[str, Any]) -> None:
+    """Writer hook: account a row just inserted into an observed collection."""
+    get_metric_counters().record_write(collection, doc)
+
+
+async def start_metrics_reconciler() -> None:
+    await get_metric_counters().start()
+
+
+async def stop_metrics_reconciler() -> None:
+    if _metric_counters is not None:
+        await _metric_counters.stop()
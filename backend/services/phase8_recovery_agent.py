@@ -18,6 +18,7 @@ from uuid import uuid4
 
 from db.mongo import db
 from config.agent_config import AGENT_CONFIG
+from services.phase8_metric_counters import record_write as record_metric_write
 
 logger = logging.getLogger(__name__)
 
@@ -67,7 +68,7 @@ def evaluate_recovery(
         approved_at = None
         approval_actor = None
 
-        _sentinel_log.insert_one({
+        escalation = {
             "event_id": str(uuid4()),
             "event_type": "RECOVERY_ESCALATION_REQUIRED",
             "severity": "CRITICAL",
@@ -79,7 +80,9 @@ def evaluate_recovery(
                 "recovery_type": recovery_type,
                 "reason": "CRITICAL severity cannot be autonomously recovered",
             },
-        })
+        }
+        _sentinel_log.insert_one(escalation)
+        record_metric_write("sentinel_event_log", escalation)
 
     row = {
         "recovery_id": recovery_id,
@@ -98,6 +101,7 @@ def evaluate_recovery(
     }
 
     _recovery_log.insert_one({**row})
+    record_metric_write("recovery_action_log", row)
     logger.info("[%s] recovery evaluation logged recovery_id=%s severity=%s status=%s", AGENT_ID, recovery_id, sev, status)
     return {k: v for k, v in row.items() if k != "_id"}
 
@@ -136,6 +140,7 @@ def operator_approve_recovery(
         "created_at_utc": now,
     }
     _recovery_log.insert_one({**approval_event})
+    record_metric_write("recovery_action_log", approval_event)
     return {k: v for k, v in approval_event.items() if k != "_id"}
 
 
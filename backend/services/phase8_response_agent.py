@@ -9,6 +9,7 @@ from typing import Any, Dict, Optional
 from uuid import uuid4
 
 from db.mongo import db
+from services.phase8_metric_counters import record_write as record_metric_write
 
 AGENT_ID = "agent.response.v1"
 _response_action_col = db["response_action_log"]
@@ -37,4 +38,5 @@ def log_response_action(
         "metadata": metadata or {},
     }
     _response_action_col.insert_one({**row})
+    record_metric_write("response_action_log", row)
     return {k: v for k, v in row.items() if k != "_id"}
@@ -0,0 +1,242 @@
+"""
+Principal Cache
+===============
+Resolves the documents that describe *who is calling* — user, subscription,
+entitlement and tenant — once per request, backed by a bounded TTL cache
+across requests.
+
+An authenticated request used to repeat the same reads several times:
+get_current_user -> users, get_user_tier -> subscriptions, the simulation
+route's own tier lookup -> users + subscriptions again, the entitlement gate
+-> user_entitlements, the rate limiter -> tenants.
+
+Two layers:
+- Request scope: PrincipalScopeMiddleware opens a per-request dict (held in a
+  ContextVar, visible to sync dependencies in the threadpool). Within one
+  request every lookup is answered from it, so a request sees one snapshot.
+- Process cache: LRU bounded, TTL'd (PRINCIPAL_CACHE_TTL_SECONDS). Negative
+  results ("no subscription") are cached too.
+
+Invalidation is explicit: every writer of users / subscriptions /
+user_entitlements that affects auth or gating (Stripe and phase3 webhooks,
+trials, admin tier changes, self-exclusion, account deletion) calls
+get_principal_cache().invalidate_user(...); cycle metering, which only
+touches user_entitlements, calls invalidate_entitlement(...). An
+invalidation only affects the keys it names, including loads of those keys
+already in flight. The TTL only bounds staleness for writers that do not.
+
+Cached documents are deep-copied on the way out so callers can annotate
+them (e.g. user["token_tier"]) without leaking into other requests.
+"""
+import contextvars
+import copy
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "20000"))
+
+_MISSING = object()
+
+# Per-request memo: {(kind, key): document-or-None}
+_request_scope: contextvars.ContextVar[Optional[Dict[Tuple[str, str], Any]]] = contextvars.ContextVar(
+    "principal_request_scope", default=None
+)
+
+
+def _load_user(user_id: str) -> Optional[Dict[str, Any]]:
+    from bson import ObjectId
+    from db.mongo import db
+    return db.users.find_one({"_id": ObjectId(user_id)})
+
+
+def _load_subscription(subscriber_id: str) -> Optional[Dict[str, Any]]:
+    from db.mongo import db
+    return db.subscriptions.find_one({"user_id": subscriber_id}, sort=[("created_at", -1)])
+
+
+def _load_entitlement(user_id: str) -> Optional[Dict[str, Any]]:
+    from db.mongo import db
+    return db["user_entitlements"].find_one({"user_id": str(user_id)}, {"_id": 0})
+
+
+def _load_tenant(tenant_id: str) -> Optional[Dict[str, Any]]:
+    from db.mongo import db
+    return db["tenants"].find_one({"tenant_id": tenant_id}, {"_id": 0})
+
+
+class PrincipalCache:
+    """
+    Bounded LRU + TTL cache of principal documents with a request-scoped memo
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = PRINCIPAL_CACHE_TTL_SECONDS,
+        max_entries: int = PRINCIPAL_CACHE_MAX_ENTRIES,
+        loaders: Optional[Dict[str, Callable[[str], Optional[Dict[str, Any]]]]] = None,
+        clock=time.monotonic,
+    ):
+        self.ttl = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._clock = clock
+        self._loaders = {
+            "user": _load_user,
+            "subscription": _load_subscription,
+            "entitlement": _load_entitlement,
+            "tenant": _load_tenant,
+            **(loaders or {}),
+        }
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # In-flight loads: key -> token; invalidating a key revokes its token
+        self._loading: Dict[Tuple[str, str], object] = {}
+        self._stats = {"request_hits": 0, "hits": 0, "misses": 0, "invalidations": 0}
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """users document by _id (string ObjectId). Loader errors propagate."""
+        return self._get("user", str(user_id))
+
+    def get_subscription(self, subscriber_id: str) -> Optional[Dict[str, Any]]:
+        """Latest subscriptions document whose user_id field equals `subscriber_id`"""
+        return self._get("subscription", str(subscriber_id))
+
+    def get_entitlement(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """user_entitlements document (without _id)"""
+        return self._get("entitlement", str(user_id))
+
+    def get_tenant(self, tenant_id: str) -> Optional[Dict[str, Any]]:
+        """tenants document (without _id)"""
+        return self._get("tenant", str(tenant_id))
+
+    def _get(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        cache_key = (kind, key)
+        scope = _request_scope.get()
+        if scope is not None:
+            found = scope.get(cache_key, _MISSING)
+            if found is not _MISSING:
+                self._stats["request_hits"] += 1
+                return copy.deepcopy(found)
+
+        now = self._clock()
+        token = object()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(cache_key)
+                self._stats["hits"] += 1
+                doc = entry[1]
+            else:
+                doc = _MISSING
+                self._loading[cache_key] = token
+
+        if doc is _MISSING:
+            self._stats["misses"] += 1
+            try:
+                doc = self._loaders[kind](key)
+            except Exception:
+                with self._lock:
+                    if self._loading.get(cache_key) is token:
+                        del self._loading[cache_key]
+                raise
+            with self._lock:
+                # An invalidation of this key raced with the load: serve it, don't cache it
+                if self._loading.get(cache_key) is token:
+                    del self._loading[cache_key]
+                    self._entries[cache_key] = (self._clock() + self.ttl, doc)
+                    self._entries.move_to_end(cache_key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+
+        if scope is not None:
+            scope[cache_key] = doc
+        return copy.deepcopy(doc)
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    def invalidate_user(self, user_id: Optional[str] = None, email: Optional[str] = None) -> None:
+        """
+        Drop everything cached for a user: the user document, entitlement,
+        and subscriptions keyed by either the user id or the email.
+        """
+        keys = []
+        for ident in (user_id, email):
+            if ident:
+                ident = str(ident)
+                keys.extend([("user", ident), ("subscription", ident), ("entitlement", ident)])
+        self._drop(keys)
+
+    def invalidate_entitlement(self, user_id: str) -> None:
+        """Drop only the user_entitlements document (e.g. after cycle metering)"""
+        self._drop([("entitlement", str(user_id))])
+
+    def invalidate_tenant(self, tenant_id: str) -> None:
+        self._drop([("tenant", str(tenant_id))])
+        try:
+            from middleware.rate_limiter import invalidate_tenant_cache
+            invalidate_tenant_cache(str(tenant_id))
+        except Exception:
+            pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _drop(self, keys) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+                self._loading.pop(key, None)
+            self._stats["invalidations"] += 1
+        # The current request must see its own writes too
+        scope = _request_scope.get()
+        if scope is not None:
+            for key in keys:
+                scope.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            size = len(self._entries)
+        return {**self._stats, "entries": size, "ttl_seconds": self.ttl}
+
+
+class PrincipalScopeMiddleware:
+    """
+    Pure ASGI middleware that opens a fresh principal memo per HTTP request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _request_scope.set({})
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_scope.reset(token)
+
+
+_principal_cache: Optional[PrincipalCache] = None
+
+
+def get_principal_cache() -> PrincipalCache:
+    """Get the per-process principal cache"""
+    global _principal_cache
+    if _principal_cache is None:
+        _principal_cache = PrincipalCache()
+    return _principal_cache
@@ -0,0 +1,545 @@
+"""
+Re-Simulation Scheduler
+=======================
+Re-runs a game's simulation only when its inputs actually change.
+
+Inputs per game (RunSnapshotManager.generate_inputs_hash):
+- market spread / total from the latest odds upsert
+- injury snapshots for either team
+- minutes projections (when a source provides them)
+
+Flow:
+1. The odds poller (services.scheduler._poll_sport) hands every polled event
+   to observe_events(); capture_injury_snapshot() hands each injury snapshot
+   to observe_injuries(). Both only hash and compare - no I/O beyond a
+   one-time baseline lookup per game (the stored simulation's market lines
+   and both teams' injury snapshots, as of the simulation and now) - and are
+   thread-safe (the poller runs on APScheduler threads). Games are forgotten
+   once they tip off.
+2. A game whose inputs hash differs from the inputs its current simulation
+   used is (re)queued with priority = change magnitude / hours to tip-off
+   (RunSnapshotManager.detect_changes supplies the magnitude). Games that
+   already started or tip off beyond the horizon are never queued, so idle
+   games cost nothing.
+3. The worker task (event loop of the API process) waits a short debounce so
+   multi-region ticks collapse into one run, then re-simulates the most
+   urgent games with bounded concurrency. A simulation the user path is
+   already running for the same game/tier is shared (executor.coalesce).
+
+Configuration:
+- RESIM_HORIZON_HOURS: only games tipping off within this window (default 36)
+- RESIM_DEBOUNCE_SECONDS: settle time before a run (default 2)
+- RESIM_CONCURRENCY: concurrent re-simulations (default 2)
+- RESIM_ITERATIONS: iterations per scheduled run (default SIM_TIER_FREE)
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from core.run_snapshot import ChangeType, RunSnapshot, RunSnapshotManager, get_snapshot_manager
+
+logger = logging.getLogger(__name__)
+
+RESIM_HORIZON_HOURS = float(os.getenv("RESIM_HORIZON_HOURS", "36"))
+RESIM_DEBOUNCE_SECONDS = float(os.getenv("RESIM_DEBOUNCE_SECONDS", "2"))
+RESIM_CONCURRENCY = int(os.getenv("RESIM_CONCURRENCY", "2"))
+
+# Change magnitude weights (points of line movement are the unit)
+INJURY_CHANGE_WEIGHT = 2.0
+MINUTES_CHANGE_WEIGHT = 0.5
+MIN_CHANGE_MAGNITUDE = 0.5
+# Games inside this window all count as "about to tip"
+MIN_HOURS_TO_TIP = 0.25
+
+
+@dataclass
+class _GameState:
+    """Latest observed inputs vs the inputs the current simulation used"""
+    event_id: str
+    event: Dict[str, Any]
+    commence_time: Optional[datetime]
+    current: RunSnapshot
+    simulated: Optional[RunSnapshot] = None
+    injuries: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    minutes: Dict[str, float] = field(default_factory=dict)
+    queued_seq: Optional[int] = None
+    priority: float = 0.0
+    running: bool = False
+
+
+def _parse_commence_time(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return None
+
+
+def _lines_from_market_context(lines: Dict[str, Any]) -> Tuple[Optional[float], Optional[float]]:
+    """(spread, total) from an extract_market_lines dict; None where the book has no market"""
+    spread = lines.get("current_spread") if lines.get("has_spread_market") else None
+    total = lines.get("total_line") if lines.get("has_total_market") else None
+    return spread, total
+
+
+def _market_lines(event: Dict[str, Any]) -> Tuple[Optional[float], Optional[float]]:
+    from integrations.odds_api import extract_market_lines
+    return _lines_from_market_context(extract_market_lines(event))
+
+
+def _event_teams(event: Dict[str, Any]) -> List[str]:
+    return [team for team in (event.get("home_team"), event.get("away_team")) if team]
+
+
+def _team_injuries(database, teams: List[str], as_of: Optional[datetime] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Each team's latest injury snapshot (at or before as_of), as observe_injuries records it"""
+    from services.snapshot_capture import injury_signature
+
+    injuries = {}
+    for team in teams:
+        query: Dict[str, Any] = {"team": team}
+        if as_of is not None:
+            query["timestamp_utc"] = {"$lte": as_of}
+        snapshot = database["injury_snapshots"].find_one(query, {"_id": 0}, sort=[("timestamp_utc", -1)])
+        if snapshot:
+            injuries[team] = [injury_signature(snapshot)]
+    return injuries
+
+
+def _load_simulated_inputs(event_id: str, event: Dict[str, Any], database=None) -> Optional[Dict[str, Any]]:
+    """
+    Inputs the latest full-game simulation was run at: the market lines in its
+    stored market_context (the extract_market_lines dict the engine received)
+    and each team's injury snapshot as of its created_at.
+    """
+    if database is None:
+        from db.mongo import db as database
+    doc = database["monte_carlo_simulations"].find_one(
+        {"event_id": event_id, "period": {"$exists": False}},
+        {"market_context": 1, "created_at": 1},
+        sort=[("created_at", -1)]
+    )
+    if not doc:
+        return None
+    spread, total = _lines_from_market_context(doc.get("market_context") or {})
+    created_at = _parse_commence_time(doc.get("created_at"))
+    return {
+        "spread": spread,
+        "total": total,
+        "injuries": _team_injuries(database, _event_teams(event), as_of=created_at) if created_at else {}
+    }
+
+
+def _load_current_injuries(teams: List[str], database=None) -> Dict[str, List[Dict[str, Any]]]:
+    """Each team's latest injury snapshot (seeds a newly tracked game)"""
+    if database is None:
+        from db.mongo import db as database
+    return _team_injuries(database, teams)
+
+
+async def _resimulate(event_id: str, event: Dict[str, Any], iterations: int) -> Dict[str, Any]:
+    """Same cold path (and single-flight key) as GET /api/simulations/{event_id}"""
+    from routes.simulation_routes import _generate_simulation
+    from services.simulation_executor import get_simulation_executor
+
+    simulation, _, _ = await get_simulation_executor().coalesce(
+        f"{event_id}:full:{iterations}",
+        lambda: _generate_simulation(event, event_id, "full", iterations)
+    )
+    return simulation
+
+
+class ResimulationScheduler:
+    """
+    Input-change-driven re-simulation queue
+    """
+
+    def __init__(
+        self,
+        snapshot_manager: Optional[RunSnapshotManager] = None,
+        resimulate: Optional[Callable[[str, Dict[str, Any], int], Awaitable[Dict[str, Any]]]] = None,
+        load_simulated_inputs: Optional[Callable[[str, Dict[str, Any]], Optional[Dict[str, Any]]]] = None,
+        load_current_injuries: Optional[Callable[[List[str]], Dict[str, List[Dict[str, Any]]]]] = None,
+        market_lines: Callable[[Dict[str, Any]], Tuple[Optional[float], Optional[float]]] = _market_lines,
+        iterations: Optional[int] = None,
+        horizon_hours: float = RESIM_HORIZON_HOURS,
+        debounce_seconds: float = RESIM_DEBOUNCE_SECONDS,
+        concurrency: int = RESIM_CONCURRENCY,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc)
+    ):
+        if iterations is None:
+            from legacy_config import SIM_TIER_FREE
+            iterations = int(os.getenv("RESIM_ITERATIONS", str(SIM_TIER_FREE)))
+        self.snapshots = snapshot_manager or get_snapshot_manager()
+        self._resimulate = resimulate or _resimulate
+        self._load_simulated_inputs = load_simulated_inputs or _load_simulated_inputs
+        self._load_current_injuries = load_current_injuries or _load_current_injuries
+        self._market_lines = market_lines
+        self.iterations = iterations
+        self.horizon_hours = horizon_hours
+        self.debounce_seconds = debounce_seconds
+        self.concurrency = max(1, concurrency)
+        self._clock = clock
+
+        self._games: Dict[str, _GameState] = {}
+        self._queue: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.running = False
+        self._stats = {
+            "observed": 0,
+            "unchanged": 0,
+            "outside_horizon": 0,
+            "pruned": 0,
+            "enqueued": 0,
+            "requeued": 0,
+            "simulated": 0,
+            "failed": 0,
+            "last_latency_ms": None
+        }
+
+    # ------------------------------------------------------------------
+    # Observation (any thread)
+    # ------------------------------------------------------------------
+
+    def observe_events(self, events: List[Dict[str, Any]]) -> int:
+        """
+        Record the latest odds for each event; queue those whose inputs changed.
+
+        Returns:
+            Number of games (re)queued
+        """
+        latest: Dict[str, Dict[str, Any]] = {}
+        for event in events:
+            event_id = event.get("event_id") or event.get("id")
+            if event_id:
+                latest[event_id] = event  # one entry per game across regions
+
+        queued = 0
+        for event_id, event in latest.items():
+            try:
+                spread, total = self._market_lines(event)
+            except Exception as e:
+                logger.debug(f"Re-sim scheduler: no lines for {event_id}: {e}")
+                continue
+            with self._lock:
+                known = event_id in self._games
+            # Baseline lookup (first sighting only) runs outside the lock
+            baseline = None if known else self._safe_load_baseline(event_id, event)
+            with self._lock:
+                self._stats["observed"] += 1
+                state = self._games.get(event_id) or self._track(event_id, event, spread, total, *baseline)
+                state.event = event
+                state.commence_time = _parse_commence_time(event.get("commence_time")) or state.commence_time
+                state.current = self._inputs(event_id, spread, total, state)
+                queued += self._evaluate(state)
+        with self._lock:
+            self._prune()
+        if queued:
+            self._wake()
+        return queued
+
+    def observe_injuries(self, team: str, injuries: List[Dict[str, Any]]) -> int:
+        """
+        Record a team's latest injury snapshot for every tracked game it plays in.
+
+        Returns:
+            Number of games (re)queued
+        """
+        queued = 0
+        with self._lock:
+            for state in self._games.values():
+                if team not in (state.event.get("home_team"), state.event.get("away_team")):
+                    continue
+                state.injuries[team] = list(injuries)
+                state.current = self._inputs(
+                    state.event_id, state.current.market_line_spread, state.current.market_line_total, state
+                )
+                queued += self._evaluate(state)
+        if queued:
+            self._wake()
+        return queued
+
+    def _safe_load_baseline(
+        self, event_id: str, event: Dict[str, Any]
+    ) -> Tuple[Optional[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]:
+        """(inputs the stored simulation used, current injury snapshots per team)"""
+        try:
+            return (
+                self._load_simulated_inputs(event_id, event),
+                self._load_current_injuries(_event_teams(event))
+            )
+        except Exception as e:
+            logger.warning(f"Re-sim scheduler: baseline lookup failed for {event_id}: {e}")
+            return None, {}
+
+    def _track(self, event_id: str, event: Dict[str, Any], spread, total, used, injuries) -> _GameState:
+        """First sighting: the baseline is what the stored simulation used"""
+        state = _GameState(
+            event_id=event_id,
+            event=event,
+            commence_time=_parse_commence_time(event.get("commence_time")),
+            current=RunSnapshot(run_id="", event_id=event_id, created_at=""),
+            injuries=dict(injuries)
+        )
+        if used is not None:
+            state.simulated = self._inputs(
+                event_id, used.get("spread"), used.get("total"), state, used.get("injuries") or {}
+            )
+        else:
+            # Never simulated: on-demand/slate runs create it; track changes from now
+            state.simulated = self._inputs(event_id, spread, total, state)
+        self._games[event_id] = state
+        return state
+
+    def _prune(self) -> None:
+        """Forget games that tipped off and drop stale heap entries. Caller holds the lock."""
+        now = self._clock()
+        finished = [
+            event_id for event_id, state in self._games.items()
+            if state.commence_time is not None and state.commence_time <= now and not state.running
+        ]
+        for event_id in finished:
+            del self._games[event_id]
+        self._stats["pruned"] += len(finished)
+
+        live = [
+            entry for entry in self._queue
+            if entry[2] in self._games and self._games[entry[2]].queued_seq == entry[1]
+        ]
+        if len(live) != len(self._queue):
+            heapq.heapify(live)
+            self._queue = live
+
+    def _inputs(
+        self,
+        event_id: str,
+        spread,
+        total,
+        state: _GameState,
+        team_injuries: Optional[Dict[str, List[Dict[str, Any]]]] = None
+    ) -> RunSnapshot:
+        team_injuries = state.injuries if team_injuries is None else team_injuries
+        injuries = [entry for team in sorted(team_injuries) for entry in team_injuries[team]]
+        return RunSnapshot(
+            run_id="",
+            event_id=event_id,
+            created_at=self._clock().isoformat(),
+            market_line_spread=spread,
+            market_line_total=total,
+            inputs_hash=self.snapshots.generate_inputs_hash(spread, total, injuries, state.minutes),
+            injuries_used=injuries,
+            minutes_projections=dict(state.minutes)
+        )
+
+    def _evaluate(self, state: _GameState) -> int:
+        """Queue (or re-prioritize) a game whose inputs moved. Caller holds the lock."""
+        if state.simulated is not None and state.current.inputs_hash == state.simulated.inputs_hash:
+            # Includes a line that moved back before its run: drop the queued run
+            state.queued_seq = None
+            self._stats["unchanged"] += 1
+            return 0
+
+        hours_to_tip = self._hours_to_tip(state)
+        if hours_to_tip is None:
+            self._stats["outside_horizon"] += 1
+            return 0
+
+        magnitude = self._change_magnitude(state)
+        state.priority = magnitude / max(hours_to_tip, MIN_HOURS_TO_TIP)
+        self._stats["requeued" if state.queued_seq is not None else "enqueued"] += 1
+        state.queued_seq = next(self._seq)
+        heapq.heappush(self._queue, (-state.priority, state.queued_seq, state.event_id))
+        return 1
+
+    def _hours_to_tip(self, state: _GameState) -> Optional[float]:
+        """Hours until tip-off, or None when started / beyond the horizon"""
+        if state.commence_time is None:
+            return None
+        hours = (state.commence_time - self._clock()).total_seconds() / 3600
+        if hours <= 0 or hours > self.horizon_hours:
+            return None
+        return hours
+
+    def _change_magnitude(self, state: _GameState) -> float:
+        """Line points moved + weighted injury / minutes changes"""
+        if state.simulated is None:
+            return MIN_CHANGE_MAGNITUDE
+        detected = self.snapshots.detect_changes(
+            state.simulated,
+            new_market_spread=state.current.market_line_spread,
+            new_market_total=state.current.market_line_total,
+            new_injuries=state.current.injuries_used,
+            new_minutes=state.current.minutes_projections
+        )
+        magnitude = 0.0
+        for change in detected.changes:
+            if change["type"] in ("spread_line", "total_line"):
+                magnitude += abs(change["diff"])
+            elif change["type"] == "injuries":
+                magnitude += INJURY_CHANGE_WEIGHT * (len(change["added"]) + len(change["removed"]))
+            elif change["type"] == "minutes":
+                magnitude += MINUTES_CHANGE_WEIGHT * len(change["players"])
+        if ChangeType.NEW_SIMULATION in detected.change_types or magnitude == 0.0:
+            # Hash moved below the reporting thresholds (e.g. a line appeared)
+            magnitude = max(magnitude, MIN_CHANGE_MAGNITUDE)
+        return magnitude
+
+    # ------------------------------------------------------------------
+    # Queue
+    # ------------------------------------------------------------------
+
+    def pop_ready(self, limit: int) -> List[Tuple[str, Dict[str, Any], RunSnapshot]]:
+        """Most urgent queued games (stale heap entries are skipped)"""
+        ready = []
+        with self._lock:
+            while self._queue and len(ready) < limit:
+                _, seq, event_id = heapq.heappop(self._queue)
+                state = self._games.get(event_id)
+                if state is None or state.queued_seq != seq or state.running:
+                    continue
+                if self._hours_to_tip(state) is None:
+                    state.queued_seq = None
+                    self._stats["outside_horizon"] += 1
+                    continue
+                state.queued_seq = None
+                state.running = True
+                ready.append((event_id, state.event, state.current))
+        return ready
+
+    async def run_once(self) -> int:
+        """Re-simulate every queued game (most urgent first); returns runs made"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        runs = 0
+        while True:
+            batch = self.pop_ready(self.concurrency)
+            if not batch:
+                return runs
+
+            async def process(event_id, event, inputs):
+                async with semaphore:
+                    await self._process(event_id, event, inputs)
+
+            await asyncio.gather(*(process(*item) for item in batch))
+            runs += len(batch)
+
+    async def _process(self, event_id: str, event: Dict[str, Any], inputs: RunSnapshot):
+        started = time.perf_counter()
+        try:
+            await self._resimulate(event_id, event, self.iterations)
+            success = True
+        except Exception as e:
+            logger.error(f"❌ Re-simulation failed for {event_id}: {e}")
+            success = False
+
+        with self._lock:
+            state = self._games[event_id]
+            state.running = False
+            if success:
+                self._stats["simulated"] += 1
+                self._stats["last_latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                state.simulated = inputs
+                logger.info(f"🔁 Re-simulated {event_id} (priority {state.priority:.2f})")
+            else:
+                self._stats["failed"] += 1
+            # Inputs that moved again mid-run go straight back on the queue
+            if success and state.current.inputs_hash != inputs.inputs_hash and state.queued_seq is None:
+                self._evaluate(state)
+
+    # ------------------------------------------------------------------
+    # Worker lifecycle (API event loop)
+    # ------------------------------------------------------------------
+
+    def _wake(self):
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def start(self):
+        if self.running:
+            return
+        self.running = True
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._worker())
+        logger.info("🚀 Re-simulation scheduler started")
+
+    async def stop(self):
+        self.running = False
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        self._loop = None
+        logger.info("🛑 Re-simulation scheduler stopped")
+
+    async def _worker(self):
+        while self.running:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            # Let multi-region ticks for the same games settle into one run
+            await asyncio.sleep(self.debounce_seconds)
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"❌ Re-simulation scheduler error: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "tracked_games": len(self._games),
+                "queued": sum(1 for s in self._games.values() if s.queued_seq is not None),
+                "running": sum(1 for s in self._games.values() if s.running)
+            }
+
+
+_resimulation_scheduler: Optional[ResimulationScheduler] = None
+
+
+def get_resimulation_scheduler() -> ResimulationScheduler:
+    """Get the per-process re-simulation scheduler"""
+    global _resimulation_scheduler
+    if _resimulation_scheduler is None:
+        _resimulation_scheduler = ResimulationScheduler()
+    return _resimulation_scheduler
+
+
+def notify_odds_upserted(events: List[Dict[str, Any]]) -> int:
+    """Odds poller hook; no-op unless the scheduler runs in this process"""
+    scheduler = _resimulation_scheduler
+    if scheduler is None or not scheduler.running:
+        return 0
+    return scheduler.observe_events(events)
+
+
+def notify_injury_snapshot(team: str, injuries: List[Dict[str, Any]]) -> int:
+    """Injury snapshot hook; no-op unless the scheduler runs in this process"""
+    scheduler = _resimulation_scheduler
+    if scheduler is None or not scheduler.running:
+        return 0
+    return scheduler.observe_injuries(team, injuries)
+
+
+async def start_resimulation_scheduler():
+    await get_resimulation_scheduler().start()
+
+
+async def stop_resimulation_scheduler():
+    global _resimulation_scheduler
+    if _resimulation_scheduler:
+        await _resimulation_scheduler.stop()
+        _resimulation_scheduler = None
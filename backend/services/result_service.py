@@ -14,7 +14,9 @@ Core Functions:
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from db.mongo import db
+from services.scoreboard_ingestion import ScoreboardIngestor
 from utils.timezone import now_utc, now_est
+import asyncio
 import requests
 import os
 import logging
@@ -39,15 +41,25 @@ class ResultService:
         self.odds_api_key = os.getenv("ODDS_API_KEY")
         self.odds_base_url = os.getenv("ODDS_BASE_URL", "https://api.the-odds-api.com/v4/")
     
-    async def fetch_scores_by_oddsapi_id(self, oddsapi_event_id: str) -> Optional[Dict]:
+    async def fetch_scores_by_oddsapi_id(
+        self,
+        oddsapi_event_id: str,
+        sport_key: Optional[str] = None
+    ) -> Optional[Dict]:
         """
         Fetch final score using exact OddsAPI event ID.
         
         ⚠️ CRITICAL: This is the ONLY way to fetch scores in production.
         No fuzzy team matching allowed.
         
+        Single-event convenience over services.scoreboard_ingestion: answered
+        from the persisted scoreboard when already ingested, otherwise by one
+        scoreboard request for the event's sport. Batch grading should build
+        one ScoreboardIndex per cycle instead of calling this per pick.
+        
         Args:
             oddsapi_event_id: Exact OddsAPI event ID from provider_event_map
+            sport_key: OddsAPI sport key (looked up from events when omitted)
             
         Returns:
             {
@@ -57,7 +69,9 @@ class ResultService:
                 "home_score": 115,
                 "away_score": 110,
                 "completed": true,
-                "commence_time": "2024-01-15T19:00:00Z"
+                "commence_time": "2024-01-15T19:00:00Z",
+                "last_update": "2024-01-15T22:01:00Z",
+                "sport_key": "basketball_nba"
             }
             None if not found or not completed
         """
@@ -66,67 +80,31 @@ class ResultService:
             return None
         
         try:
-            # Call OddsAPI /sports/{sport}/scores endpoint
-            # We need to determine sport first
-            url = f"{self.odds_base_url}sports/basketball_nba/scores"
-            params = {
-                "apiKey": self.odds_api_key,
-                "eventIds": oddsapi_event_id  # Filter by exact ID
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            events = response.json()
-            
-            # Find matching event
-            for event in events:
-                if event.get("id") == oddsapi_event_id:
-                    # Check if completed
-                    if not event.get("completed"):
-                        logger.info(f"Event {oddsapi_event_id} not yet completed")
-                        return None
-                    
-                    # Extract scores
-                    scores = event.get("scores")
-                    if not scores or len(scores) < 2:
-                        logger.warning(f"Event {oddsapi_event_id} missing scores")
-                        return None
-                    
-                    # Parse scores (home/away detection)
-                    home_score = None
-                    away_score = None
-                    
-                    for score_obj in scores:
-                        team_name = score_obj.get("name")
-                        team_score = score_obj.get("score")
-                        
-                        if team_name == event.get("home_team"):
-                            home_score = int(team_score) if team_score else None
-                        elif team_name == event.get("away_team"):
-                            away_score = int(team_score) if team_score else None
-                    
-                    if home_score is None or away_score is None:
-                        logger.warning(f"Event {oddsapi_event_id} incomplete score data")
-                        return None
-                    
-                    return {
-                        "event_id": oddsapi_event_id,
-                        "home_team": event.get("home_team"),
-                        "away_team": event.get("away_team"),
-                        "home_score": home_score,
-                        "away_score": away_score,
-                        "completed": True,
-                        "commence_time": event.get("commence_time")
-                    }
+            sport_key = sport_key or await asyncio.to_thread(self._sport_for_oddsapi_id, oddsapi_event_id)
+            if not sport_key:
+                logger.warning(f"Event {oddsapi_event_id} has no sport_key - cannot pick a scoreboard")
+                return None
             
-            logger.warning(f"Event {oddsapi_event_id} not found in OddsAPI response")
-            return None
+            index = await ScoreboardIngestor(self.db).build_index({sport_key: {oddsapi_event_id}})
+            score = index.get(oddsapi_event_id)
+            if not score:
+                logger.info(f"Event {oddsapi_event_id} not final on the {sport_key} scoreboard")
+            return score
         
         except Exception as e:
             logger.error(f"Failed to fetch scores for {oddsapi_event_id}: {e}")
             return None
     
+    def _sport_for_oddsapi_id(self, oddsapi_event_id: str) -> Optional[str]:
+        event = self.db['events'].find_one(  # type: ignore
+            {'$or': [
+                {'provider_event_map.oddsapi.event_id': oddsapi_event_id},
+                {'oddsapi_event_id': oddsapi_event_id},
+            ]},
+            {'_id': 0, 'sport_key': 1}
+        )
+        return event.get('sport_key') if event else None
+    
     async def grade_completed_games(self, hours_back: int = 24) -> Dict:
         """
         Grade all predictions from games that completed in the last N hours.
@@ -4,14 +4,17 @@ Runs scheduled jobs for odds polling and reflection loop
 """
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+import asyncio
 import requests
 import os
 import sys
+import time
 import logging
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.timezone import now_utc
-from db.mongo import db, upsert_events
+from db.mongo import db, upsert_events, upsert_events_diff
 from core.reflection_loop import reflection_loop
 from services.logger import log_stage
 
@@ -194,15 +197,17 @@ def grade_completed_games():
     """
     Grade completed game predictions against real results
     Runs every 2 hours to populate trust metrics with real data
+    
+    One scoreboard request per sport per run (UnifiedGradingService
+    .grade_pending_picks), not one score request per pick.
     """
     try:
-        import asyncio
-        from services.result_grading import result_grading_service
+        from services.unified_grading_service_v2 import UnifiedGradingService
         
         print("⏱️  Running result grading for completed games...")
         
-        # Grade games from last 48 hours
-        result = asyncio.run(result_grading_service.grade_completed_games(hours_back=48))
+        # Grade picks from last 48 hours
+        result = asyncio.run(UnifiedGradingService(db).grade_pending_picks(hours_back=48))
         
         log_stage(
             "result_grading",
@@ -212,10 +217,10 @@ def grade_completed_games():
         )
         
         if result.get('graded_count', 0) > 0:
-            print(f"✓ Graded {result['graded_count']} predictions:")
-            print(f"  - Wins: {result['wins']}, Losses: {result['losses']}")
-            print(f"  - Win Rate: {result['win_rate']}%")
-            print(f"  - Units Won: {result['units_won']:+.2f}")
+            results = result['results']
+            print(f"✓ Graded {result['graded_count']} picks from {result['scoreboard_requests']} scoreboard request(s):")
+            print(f"  - Wins: {results['WIN']}, Losses: {results['LOSS']}, Pushes: {results['PUSH']}")
+            print(f"  - Still pending (not final): {result['not_final']}")
     
     except Exception as e:
         print(f"✗ Exception in result grading: {e}")
@@ -381,69 +386,144 @@ def grade_picks():
         print(f"✗ Exception in auto-grading: {e}")
 
 
+POLL_SPORTS = [
+    "basketball_nba",
+    "basketball_ncaab",
+    "americanfootball_nfl",
+    "americanfootball_ncaaf",
+    "baseball_mlb",
+    "icehockey_nhl",
+]
+
+# Fetch from multiple regions for comprehensive coverage
+POLL_REGIONS = ["us", "us2", "uk", "eu"]
+
+
+async def _poll_sport(session, semaphore, sport: str, regions: list, fetch=None) -> dict:
+    """Fetch every region for one sport concurrently, then upsert that sport straight away"""
+    from integrations.odds_api import fetch_odds_async, normalize_event
+    fetch = fetch or fetch_odds_async
+    
+    async def fetch_region(region):
+        async with semaphore:
+            return await fetch(
+                session,
+                sport=sport,
+                region=region,
+                markets="h2h,spreads,totals",
+                odds_format="decimal"
+            )
+    
+    region_results = await asyncio.gather(*[fetch_region(r) for r in regions], return_exceptions=True)
+    
+    all_events = []
+    for raw_events in region_results:
+        # Silently skip individual region failures
+        if not isinstance(raw_events, BaseException):
+            all_events.extend(raw_events)
+    
+    # Normalize and upsert changed events only (pymongo is blocking → worker thread)
+    if not all_events:
+        return {}
+    normalized = [normalize_event(ev) for ev in all_events]
+    stats = await asyncio.to_thread(upsert_events_diff, "events", normalized)
+    print(f"  ✅ {sport}: {stats['changed'] + stats['unchanged']} events ({stats['changed']} changed)")
+    
+    # Lines moved → queue re-simulation for games whose inputs changed
+    if stats.get("changed"):
+        from services.resimulation_scheduler import notify_odds_upserted
+        try:
+            stats["resim_queued"] = await asyncio.to_thread(notify_odds_upserted, normalized)
+        except Exception as e:
+            logger.error(f"Re-simulation scheduling failed for {sport}: {e}")
+    return stats
+
+
+async def poll_all_sports_async(sports: list, regions: list = POLL_REGIONS,
+                                concurrency: int | None = None, session=None, fetch=None) -> dict:
+    """
+    Fan out every sport × region request concurrently over one pooled session.
+    
+    At most `concurrency` requests are in flight (ODDS_POLL_CONCURRENCY by
+    default); each sport is upserted as soon as all of its regions return.
+    
+    Returns per-poll counts: events, changed, unchanged, written.
+    """
+    from integrations.odds_api import ODDS_POLL_CONCURRENCY, create_odds_session
+    
+    semaphore = asyncio.Semaphore(concurrency or ODDS_POLL_CONCURRENCY)
+    owns_session = session is None
+    if owns_session:
+        session = create_odds_session(limit=concurrency or ODDS_POLL_CONCURRENCY)
+    
+    try:
+        results = await asyncio.gather(
+            *[_poll_sport(session, semaphore, sport, regions, fetch=fetch) for sport in sports],
+            return_exceptions=True
+        )
+    finally:
+        if owns_session:
+            await session.close()
+    
+    totals = {"events": 0, "changed": 0, "unchanged": 0, "written": 0}
+    for sport, result in zip(sports, results):
+        if isinstance(result, BaseException):
+            print(f"  ⚠️ {sport}: {str(result)}")
+            continue
+        totals["events"] += result.get("changed", 0) + result.get("unchanged", 0)
+        for key in ("changed", "unchanged", "written"):
+            totals[key] += result.get(key, 0)
+    return totals
+
+
+def _run_coroutine_blocking(coro):
+    """asyncio.run, also when called from a thread that already runs an event loop (startup)"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
 def poll_all_sports():
     """
     Poll all sports at once using the consolidated repoll logic.
-    More efficient than individual sport calls.
+    All sport/region requests run concurrently (see poll_all_sports_async).
     """
     try:
-        from integrations.odds_api import fetch_odds, normalize_event
-        from utils.timezone import now_est, get_est_date_today
+        from utils.timezone import now_est
         
         print(f"🔄 Polling all sports at {now_est().strftime('%Y-%m-%d %H:%M:%S EST')}")
-        
-        sports = [
-            "basketball_nba",
-            "basketball_ncaab",
-            "americanfootball_nfl",
-            "americanfootball_ncaaf",
-            "baseball_mlb",
-            "icehockey_nhl",
-        ]
-        
-        total_events = 0
-        
-        for sport in sports:
-            try:
-                if should_skip_poll_for_offseason(sport):
-                    logger.debug("%s off-season - skipping poll", sport)
-                    print(f"  ℹ️  {sport}: off-season - skipped")
-                    continue
-
-                # Fetch from multiple regions for comprehensive coverage
-                regions = ["us", "us2", "uk", "eu"]
-                all_events = []
-                
-                for region in regions:
-                    try:
-                        raw_events = fetch_odds(
-                            sport=sport,
-                            region=region,
-                            markets="h2h,spreads,totals",
-                            odds_format="decimal"
-                        )
-                        all_events.extend(raw_events)
-                    except Exception as e:
-                        # Silently skip individual region failures
-                        pass
-                
-                # Normalize and upsert
-                if all_events:
-                    normalized = [normalize_event(ev) for ev in all_events]
-                    count = upsert_events("events", normalized)
-                    total_events += count
-                    print(f"  ✅ {sport}: {count} events")
-                    
-            except Exception as e:
-                print(f"  ⚠️ {sport}: {str(e)}")
-        
-        print(f"✓ Polled {total_events} total events across all sports")
+        started = time.perf_counter()
+        
+        sports = []
+        for sport in POLL_SPORTS:
+            if should_skip_poll_for_offseason(sport):
+                logger.debug("%s off-season - skipping poll", sport)
+                print(f"  ℹ️  {sport}: off-season - skipped")
+                continue
+            sports.append(sport)
+        
+        totals = _run_coroutine_blocking(poll_all_sports_async(sports))
+        duration_ms = (time.perf_counter() - started) * 1000
+        
+        print(
+            f"✓ Polled {totals['events']} total events across all sports in {duration_ms:.0f}ms "
+            f"({totals['changed']} changed, {totals['unchanged']} unchanged)"
+        )
         
         log_stage(
             "multi_sport_polling",
             "success",
-            input_payload={"sports": sports},
-            output_payload={"total_events": total_events}
+            input_payload={"sports": POLL_SPORTS},
+            output_payload={
+                "total_events": totals["events"],
+                "changed_events": totals["changed"],
+                "unchanged_events": totals["unchanged"],
+                "written": totals["written"],
+                "latency_ms": duration_ms,
+            }
         )
         
     except Exception as e:
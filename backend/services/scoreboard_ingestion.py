@@ -0,0 +1,190 @@
+"""
+Scoreboard Ingestion
+====================
+Pulls each sport's OddsAPI scoreboard ONCE per grading cycle and indexes the
+final scores by OddsAPI event id, so grading settles every pick from the
+index instead of making one scores request per pick.
+
+    ingestor = ScoreboardIngestor(db)
+    index = await ingestor.build_index({"basketball_nba": {"id1", "id2"}, "icehockey_nhl": {"id3"}})
+    index.get("id1")   # normalized final score or None (not final yet)
+
+Stages:
+1. Persisted finals (`scoreboard_scores`, keyed by oddsapi_event_id) answer
+   any event already ingested - final scores never change, so a re-run of the
+   same slate costs zero HTTP calls.
+2. Every sport that still has unresolved events is fetched concurrently over
+   one pooled aiohttp session: one request per sport (daysFrom covers the
+   post-slate window).
+3. New finals are written back with one unordered bulk_write of UpdateOne
+   upserts.
+
+Index entries use the ResultService.fetch_scores_by_oddsapi_id shape:
+    {event_id, home_team, away_team, home_score, away_score, completed,
+     commence_time, last_update, sport_key}
+
+Exact OddsAPI id lookup only - no team-name matching (grading rule).
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional
+
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+SCOREBOARD_COLLECTION = "scoreboard_scores"
+SCOREBOARD_DAYS_FROM = int(os.getenv("SCOREBOARD_DAYS_FROM", "3"))  # OddsAPI max is 3
+
+
+def parse_final_score(event: Dict[str, Any], sport_key: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Normalize one OddsAPI scores entry. None unless the game is completed and
+    both team scores are present.
+    """
+    if not event.get("completed"):
+        return None
+    scores = event.get("scores") or []
+    home_team, away_team = event.get("home_team"), event.get("away_team")
+    home_score = away_score = None
+    for score_obj in scores:
+        team_score = score_obj.get("score")
+        if team_score in (None, ""):
+            continue
+        if score_obj.get("name") == home_team:
+            home_score = int(team_score)
+        elif score_obj.get("name") == away_team:
+            away_score = int(team_score)
+    if home_score is None or away_score is None:
+        return None
+    return {
+        "event_id": event.get("id"),
+        "home_team": home_team,
+        "away_team": away_team,
+        "home_score": home_score,
+        "away_score": away_score,
+        "completed": True,
+        "commence_time": event.get("commence_time"),
+        "last_update": event.get("last_update"),
+        "sport_key": sport_key or event.get("sport_key"),
+    }
+
+
+class ScoreboardIndex:
+    """
+    Final scores for one grading cycle, keyed by OddsAPI event id.
+    """
+
+    def __init__(self, scores: Optional[Mapping[str, Dict[str, Any]]] = None):
+        self._scores: Dict[str, Dict[str, Any]] = dict(scores or {})
+        self.requests_made = 0
+        self.failed_sports: List[str] = []
+
+    def get(self, oddsapi_event_id: str) -> Optional[Dict[str, Any]]:
+        score = self._scores.get(oddsapi_event_id)
+        return dict(score) if score else None
+
+    def add(self, score: Dict[str, Any]) -> None:
+        self._scores[score["event_id"]] = score
+
+    def __contains__(self, oddsapi_event_id: str) -> bool:
+        return oddsapi_event_id in self._scores
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+
+async def _fetch_scoreboards(sports: List[str], days_from: int) -> Dict[str, Any]:
+    """One scores request per sport, concurrently over a pooled session"""
+    from integrations.odds_api import create_odds_session, fetch_scores_async
+
+    async with create_odds_session() as session:
+        results = await asyncio.gather(
+            *(fetch_scores_async(session, sport, days_from=days_from) for sport in sports),
+            return_exceptions=True,
+        )
+    return dict(zip(sports, results))
+
+
+class ScoreboardIngestor:
+    """
+    Builds a ScoreboardIndex with at most one HTTP call per sport.
+    """
+
+    def __init__(
+        self,
+        db,
+        fetch_scoreboards: Optional[Callable[[List[str], int], Awaitable[Dict[str, Any]]]] = None,
+        days_from: int = SCOREBOARD_DAYS_FROM,
+    ):
+        self.db = db
+        self.collection = db[SCOREBOARD_COLLECTION]
+        self._fetch_scoreboards = fetch_scoreboards or _fetch_scoreboards
+        self.days_from = days_from
+
+    async def build_index(self, wanted: Mapping[str, Iterable[str]]) -> ScoreboardIndex:
+        """
+        Args:
+            wanted: {sport_key: OddsAPI event ids that need a final score}
+        """
+        wanted = {sport: set(ids) for sport, ids in wanted.items() if sport and ids}
+        all_ids = set().union(*wanted.values()) if wanted else set()
+        index = ScoreboardIndex(await asyncio.to_thread(self._load_persisted, all_ids))
+
+        sports = sorted(sport for sport, ids in wanted.items() if ids - set(index._scores))
+        if not sports:
+            return index
+
+        payloads = await self._fetch_scoreboards(sports, self.days_from)
+        index.requests_made += len(sports)
+        fresh: List[Dict[str, Any]] = []
+        for sport in sports:
+            payload = payloads.get(sport)
+            if isinstance(payload, BaseException) or not isinstance(payload, list):
+                logger.error(f"Scoreboard fetch failed for {sport}: {payload}")
+                index.failed_sports.append(sport)
+                continue
+            for event in payload:
+                score = parse_final_score(event, sport)
+                if score and score["event_id"] not in index:
+                    index.add(score)
+                    fresh.append(score)
+
+        if fresh:
+            await asyncio.to_thread(self._persist, fresh)
+        logger.info(
+            f"Scoreboard ingested: {len(sports)} sport(s), {len(fresh)} new final(s), "
+            f"{len(index)} indexed"
+        )
+        return index
+
+    def _load_persisted(self, oddsapi_event_ids) -> Dict[str, Dict[str, Any]]:
+        if not oddsapi_event_ids:
+            return {}
+        try:
+            docs = self.collection.find(
+                {"oddsapi_event_id": {"$in": list(oddsapi_event_ids)}},
+                {"_id": 0, "oddsapi_event_id": 0, "ingested_at": 0},
+            )
+            return {doc["event_id"]: doc for doc in docs}
+        except Exception as e:
+            logger.error(f"Failed to load persisted scoreboard: {e}")
+            return {}
+
+    def _persist(self, scores: List[Dict[str, Any]]) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        ops = [
+            UpdateOne(
+                {"oddsapi_event_id": score["event_id"]},
+                {"$set": {**score, "oddsapi_event_id": score["event_id"], "ingested_at": now}},
+                upsert=True,
+            )
+            for score in scores
+        ]
+        try:
+            self.collection.bulk_write(ops, ordered=False)
+        except Exception as e:
+            # The in-memory index still grades this cycle
+            logger.error(f"Failed to persist scoreboard ({len(ops)} finals): {e}")
@@ -0,0 +1,182 @@
+"""
+Simulation Executor Service
+===========================
+Keeps simulation work off the asyncio event loop.
+
+- CPU-bound work (MonteCarloEngine.run_simulation) runs in a process pool with
+  one warm engine per worker (see services.slate_simulation_runner)
+- Blocking I/O (pymongo calls, ESPN roster HTTP) runs in a bounded thread pool
+- Concurrent requests for the same key share ONE in-flight future
+  (single-flight), so a burst of users opening the same game triggers exactly
+  one simulation
+
+Configuration:
+- SIM_EXECUTOR_PROCESS_WORKERS: simulation processes (default 2; 0 = run CPU
+  work on the thread pool instead, e.g. for local dev)
+- SIM_EXECUTOR_IO_WORKERS: blocking I/O threads (default 16)
+"""
+import asyncio
+import copy
+import functools
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from services.latency_histograms import observe_stage_timings
+from services.slate_simulation_runner import get_worker_engine, init_worker_engine
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SIM_EXECUTOR_PROCESS_WORKERS = int(os.getenv("SIM_EXECUTOR_PROCESS_WORKERS", "2"))
+SIM_EXECUTOR_IO_WORKERS = int(os.getenv("SIM_EXECUTOR_IO_WORKERS", "16"))
+
+
+def run_engine_simulation(**kwargs) -> Dict[str, Any]:
+    """Process-pool entry point: MonteCarloEngine.run_simulation on the warm engine"""
+    return get_worker_engine().run_simulation(**kwargs)
+
+
+class SimulationExecutor:
+    """
+    Process pool for CPU work, thread pool for blocking I/O, and single-flight
+    coalescing of identical in-flight requests
+    """
+
+    def __init__(
+        self,
+        process_workers: int = SIM_EXECUTOR_PROCESS_WORKERS,
+        io_workers: int = SIM_EXECUTOR_IO_WORKERS,
+        process_pool_factory: Optional[Callable[[int], Executor]] = None,
+    ):
+        self.process_workers = max(0, process_workers)
+        self.io_workers = max(1, io_workers)
+        self._process_pool_factory = process_pool_factory or self._default_process_pool
+        self._process_pool: Optional[Executor] = None
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._stats = {"cpu_submitted": 0, "io_submitted": 0, "coalesced": 0, "leaders": 0}
+
+    @staticmethod
+    def _default_process_pool(max_workers: int) -> Executor:
+        # spawn: workers must not inherit the parent's MongoClient / scheduler threads
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker_engine,
+        )
+
+    # ------------------------------------------------------------------
+    # Pools (created lazily so importing routes never spawns processes)
+    # ------------------------------------------------------------------
+
+    def _get_io_pool(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._io_pool is None:
+                self._io_pool = ThreadPoolExecutor(
+                    max_workers=self.io_workers, thread_name_prefix="sim-io"
+                )
+            return self._io_pool
+
+    def _get_cpu_pool(self) -> Executor:
+        if self.process_workers == 0:
+            return self._get_io_pool()
+        with self._pool_lock:
+            if self._process_pool is None:
+                self._process_pool = self._process_pool_factory(self.process_workers)
+            return self._process_pool
+
+    async def run_io(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """Run a blocking I/O callable on the thread pool"""
+        self._stats["io_submitted"] += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_io_pool(), functools.partial(fn, *args, **kwargs))
+
+    async def run_cpu(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """Run a CPU-bound, picklable callable on the process pool"""
+        self._stats["cpu_submitted"] += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_cpu_pool(), functools.partial(fn, *args, **kwargs))
+
+    async def run_simulation(self, **kwargs) -> Dict[str, Any]:
+        """MonteCarloEngine.run_simulation(**kwargs) on a simulation worker"""
+        result = await self.run_cpu(run_engine_simulation, **kwargs)
+        # Stage latency histograms live in this (API) process, not the worker's
+        observe_stage_timings(result)
+        return result
+
+    # ------------------------------------------------------------------
+    # Single-flight coalescing
+    # ------------------------------------------------------------------
+
+    async def coalesce(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await factory() once per key across concurrent callers.
+
+        The first caller starts the factory as its own task; callers arriving
+        while it is in flight await the same task. A caller disconnecting
+        never cancels the shared work. Each caller receives its own deep copy
+        of the result so per-request mutation never leaks between users, and
+        exceptions propagate to every waiter. The key is released as soon as
+        the task finishes (this is not a cache).
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._release, key))
+            self._stats["leaders"] += 1
+        else:
+            self._stats["coalesced"] += 1
+
+        result = await asyncio.shield(task)
+        return copy.deepcopy(result)
+
+    def _release(self, key: str, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Coalesced simulation {key} failed: {task.exception()!r}")
+
+    # ------------------------------------------------------------------
+    # Lifecycle / observability
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "inflight": len(self._inflight),
+            "process_workers": self.process_workers,
+            "io_workers": self.io_workers,
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._pool_lock:
+            for pool in (self._process_pool, self._io_pool):
+                if pool is not None:
+                    pool.shutdown(wait=wait, cancel_futures=True)
+            self._process_pool = None
+            self._io_pool = None
+
+
+_simulation_executor: Optional[SimulationExecutor] = None
+
+
+def get_simulation_executor() -> SimulationExecutor:
+    """Get the per-process simulation executor"""
+    global _simulation_executor
+    if _simulation_executor is None:
+        _simulation_executor = SimulationExecutor()
+    return _simulation_executor
+
+
+def shutdown_simulation_executor() -> None:
+    global _simulation_executor
+    if _simulation_executor is not None:
+        _simulation_executor.shutdown()
+        _simulation_executor = None
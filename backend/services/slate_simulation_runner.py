@@ -0,0 +1,263 @@
+"""
+Slate Simulation Runner
+=======================
+Runs a whole slate of MonteCarloEngine simulations across a process pool.
+
+Purpose:
+- Fan games out over a ProcessPoolExecutor so a slate finishes in roughly the
+  time of its slowest game instead of the sum of all games
+- Keep ONE warm MonteCarloEngine per worker process (CalibrationEngine,
+  MarketLineIntegrityVerifier, DecompositionLogger, ... built once, not per game)
+- Derive a reproducible per-game seed from (run_seed, event_id)
+- Persist every simulation with a single bulk_write at the end of the run,
+  keeping the fail-closed orphan guard (no event record → not persisted),
+  then refresh the per-event parlay leg pool and joint sample sketch exactly
+  as a persisting MonteCarloEngine.run_simulation does
+
+Configuration:
+- SLATE_SIM_WORKERS: worker processes (default: min(6, cpu_count))
+"""
+import hashlib
+import logging
+import multiprocessing
+import os
+import secrets
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from services.joint_sample_store import JOINT_SKETCH_RESULT_KEY, store_joint_sketch_doc
+from services.latency_histograms import observe_stage_timings
+from services.parlay_leg_pool import upsert_pool_leg
+
+logger = logging.getLogger(__name__)
+
+SLATE_SIM_WORKERS = int(os.getenv("SLATE_SIM_WORKERS", str(min(6, os.cpu_count() or 1))))
+
+# BSON integers are signed 64-bit; rng_seed is stored on the simulation document
+_SEED_MASK = (1 << 63) - 1
+
+_EVENT_PROJECTION = {"_id": 0, "event_id": 1, "sport_key": 1, "home_team": 1, "away_team": 1, "commence_time": 1}
+
+
+@dataclass
+class SlateGame:
+    """One game to simulate (arguments for MonteCarloEngine.run_simulation)"""
+    event_id: str
+    team_a: Dict[str, Any]
+    team_b: Dict[str, Any]
+    market_context: Dict[str, Any]
+    iterations: Optional[int] = None
+    mode: str = "full"
+
+
+@dataclass
+class SlateRunResult:
+    """Outcome of a slate run"""
+    run_seed: int
+    simulations: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    persisted: int = 0
+    orphans: List[str] = field(default_factory=list)
+    duration_seconds: float = 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "run_seed": self.run_seed,
+            "simulated": len(self.simulations),
+            "failed": len(self.errors),
+            "persisted": self.persisted,
+            "orphans": len(self.orphans),
+            "duration_seconds": round(self.duration_seconds, 3),
+        }
+
+
+def derive_game_seed(run_seed: int, event_id: str) -> int:
+    """Stable 63-bit seed for one game within a run (same inputs → same draws)"""
+    digest = hashlib.sha256(f"{run_seed}:{event_id}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") & _SEED_MASK
+
+
+# ----------------------------------------------------------------------------
+# Worker side
+# ----------------------------------------------------------------------------
+
+_worker_engine = None
+
+
+def init_worker_engine() -> None:
+    """ProcessPoolExecutor initializer: build the worker's engine once"""
+    global _worker_engine
+    from core.monte_carlo_engine import MonteCarloEngine
+    _worker_engine = MonteCarloEngine()
+    # Stage timings travel back with each result; the parent observes them
+    _worker_engine.defer_stage_timings = True
+
+
+def get_worker_engine():
+    if _worker_engine is None:
+        init_worker_engine()
+    return _worker_engine
+
+
+def _simulate_game(game: SlateGame, seed: int) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+    """Run one game on the warm engine; never raises (errors are returned)"""
+    try:
+        result = get_worker_engine().run_simulation(
+            event_id=game.event_id,
+            team_a=game.team_a,
+            team_b=game.team_b,
+            market_context=game.market_context,
+            iterations=game.iterations,
+            mode=game.mode,
+            seed=seed,
+            persist=False,
+        )
+        return game.event_id, result, None
+    except Exception as e:
+        return game.event_id, None, f"{type(e).__name__}: {e}"
+
+
+# ----------------------------------------------------------------------------
+# Persistence
+# ----------------------------------------------------------------------------
+
+def persist_simulations(
+    simulations: Dict[str, Dict[str, Any]],
+    simulations_collection=None,
+    events_collection=None,
+) -> Tuple[int, List[str]]:
+    """
+    Bulk-upsert simulation documents keyed on simulation_id, then update each
+    written event's parlay leg pool row and joint sample sketch (a failure
+    there is logged per event and does not fail the slate).
+
+    Returns:
+        (documents written, event_ids skipped as orphans)
+    """
+    if not simulations:
+        return 0, []
+
+    if simulations_collection is None or events_collection is None:
+        from db.mongo import db
+        simulations_collection = simulations_collection if simulations_collection is not None else db["monte_carlo_simulations"]
+        events_collection = events_collection if events_collection is not None else db["events"]
+
+    # TASK 2 INTEGRITY GUARD (fail-closed), one round trip for the whole slate
+    known_events = {
+        doc["event_id"]: doc
+        for doc in events_collection.find({"event_id": {"$in": list(simulations.keys())}}, _EVENT_PROJECTION)
+    }
+    orphans = sorted(set(simulations) - set(known_events))
+    for event_id in orphans:
+        logger.error(f"SIMULATION_ORPHAN_BLOCKED: missing event record for event_id={event_id}")
+
+    # The engine returns the sketch beside the document; it is stored separately
+    documents = {
+        event_id: {k: v for k, v in doc.items() if k != JOINT_SKETCH_RESULT_KEY}
+        for event_id, doc in simulations.items()
+        if event_id in known_events
+    }
+    if not documents:
+        return 0, orphans
+
+    result = simulations_collection.bulk_write([
+        UpdateOne({"simulation_id": doc["simulation_id"]}, {"$set": doc}, upsert=True)
+        for doc in documents.values()
+    ], ordered=False)
+
+    for event_id, doc in documents.items():
+        event = known_events[event_id]
+        try:
+            upsert_pool_leg(doc, event)
+        except Exception as e:
+            logger.warning(f"Parlay leg pool upsert failed for {event_id}: {e}")
+        sketch_doc = simulations[event_id].get(JOINT_SKETCH_RESULT_KEY)
+        if sketch_doc:
+            try:
+                store_joint_sketch_doc(doc["simulation_id"], event, sketch_doc)
+            except Exception as e:
+                logger.warning(f"Joint sample store failed for {event_id}: {e}")
+
+    return result.upserted_count + result.matched_count, orphans
+
+
+# ----------------------------------------------------------------------------
+# Runner
+# ----------------------------------------------------------------------------
+
+class SlateSimulationRunner:
+    """
+    Simulates a slate of games in parallel and bulk-persists the results
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        executor_factory: Optional[Callable[[int], Executor]] = None,
+        persist: bool = True,
+    ):
+        """
+        Args:
+            max_workers: Worker processes (default SLATE_SIM_WORKERS); 1 runs inline
+            executor_factory: Override pool construction (tests / thread pools)
+            persist: Bulk-write simulations to monte_carlo_simulations at the end
+        """
+        self.max_workers = max(1, max_workers or SLATE_SIM_WORKERS)
+        self.executor_factory = executor_factory or self._default_executor
+        self.persist = persist
+
+    @staticmethod
+    def _default_executor(max_workers: int) -> Executor:
+        # spawn: workers must not inherit the parent's MongoClient / scheduler threads
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker_engine,
+        )
+
+    def run(self, games: List[SlateGame], run_seed: Optional[int] = None) -> SlateRunResult:
+        """
+        Simulate every game and (optionally) persist with one bulk write.
+
+        Args:
+            games: Games to simulate (duplicate event_ids are simulated once)
+            run_seed: Seed for the whole run; per-game seeds derive from it.
+                      Pass the same value to reproduce a run exactly.
+        """
+        started = time.perf_counter()
+        run = SlateRunResult(run_seed=run_seed if run_seed is not None else secrets.randbits(63))
+
+        unique_games = list({game.event_id: game for game in games}.values())
+        jobs = [(game, derive_game_seed(run.run_seed, game.event_id)) for game in unique_games]
+
+        if self.max_workers == 1 or len(jobs) <= 1:
+            outcomes = [_simulate_game(game, seed) for game, seed in jobs]
+        else:
+            outcomes = []
+            with self.executor_factory(min(self.max_workers, len(jobs))) as executor:
+                futures = [executor.submit(_simulate_game, game, seed) for game, seed in jobs]
+                for future in as_completed(futures):
+                    outcomes.append(future.result())
+
+        for event_id, result, error in outcomes:
+            if error is not None:
+                logger.error(f"Slate simulation failed for {event_id}: {error}")
+                run.errors[event_id] = error
+            else:
+                observe_stage_timings(result)
+                run.simulations[event_id] = result
+
+        if self.persist:
+            try:
+                run.persisted, run.orphans = persist_simulations(run.simulations)
+            except Exception as e:
+                logger.error(f"Slate bulk persist failed: {e}")
+                run.errors["__persist__"] = f"{type(e).__name__}: {e}"
+
+        run.duration_seconds = time.perf_counter() - started
+        logger.info(f"🎯 Slate run complete: {run.summary()}")
+        return run
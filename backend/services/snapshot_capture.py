@@ -8,10 +8,27 @@ Purpose:
 - Enable CLV computation
 - Support reproducibility
 - Retain closing lines forever (compression for historical)
+
+Storage layout (odds):
+- odds_snapshots: one compact row per outcome (price/line + identity), no
+  embedded raw data. Served by the (event_id, market_key, book, timestamp_utc)
+  index; timestamp_utc is the capture time of the poll tick.
+- odds_snapshot_payloads: the raw bookmaker payload, stored once and addressed
+  by the sha256 of its canonical JSON. A bookmaker blob feeds every outcome row
+  of that book (raw_payload_ref + raw_payload_path), and an unchanged blob
+  polled again is the same document.
+A poll tick is written with one payload bulk_write and one insert_many.
+
+Retention: cleanup_old_snapshots flags the payload behind each closing line
+(closing_line=True) once, and marks the closing row payload_pinned, so the
+payload sweep filters on that flag instead of listing every kept ref.
 """
+import hashlib
+import json
 import uuid
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterable, Optional
 from datetime import datetime, timezone, timedelta
+from pymongo import UpdateOne
 from db.mongo import db
 from db.schemas.logging_calibration_schemas import (
     OddsSnapshot,
@@ -23,14 +40,28 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def injury_signature(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """The fields of an injury snapshot that count as a re-simulation input"""
+    raw_payload = snapshot.get("raw_payload") or {}
+    return {
+        "net_impact_pts": snapshot.get("net_impact_pts"),
+        "off_delta": snapshot.get("off_delta"),
+        "def_delta": snapshot.get("def_delta"),
+        "pace_delta": snapshot.get("pace_delta"),
+        "players": raw_payload.get("injuries", raw_payload.get("players"))
+    }
+
+
 class SnapshotCaptureService:
     """
     Captures odds and injury snapshots with proper lineage tracking
     """
     
-    def __init__(self):
-        self.odds_collection = db.odds_snapshots
-        self.injury_collection = db.injury_snapshots
+    def __init__(self, database=None):
+        database = db if database is None else database
+        self.odds_collection = database.odds_snapshots
+        self.payload_collection = database.odds_snapshot_payloads
+        self.injury_collection = database.injury_snapshots
     
     def capture_odds_snapshot(
         self,
@@ -54,45 +85,36 @@ class SnapshotCaptureService:
         Returns:
             snapshot_id
         """
-        snapshot_id = str(uuid.uuid4())
-        
-        # Convert American odds to decimal
-        price_decimal = None
-        if price_american is not None:
-            if price_american > 0:
-                price_decimal = (price_american / 100.0) + 1.0
-            else:
-                price_decimal = (100.0 / abs(price_american)) + 1.0
+        now = datetime.now(timezone.utc)
+        payload_hash = self._payload_hash(raw_payload)
+        self._store_payloads({payload_hash: raw_payload}, now)
         
-        snapshot = OddsSnapshot(
-            snapshot_id=snapshot_id,
+        row = self._snapshot_row(
             event_id=event_id,
-            timestamp_utc=datetime.now(timezone.utc),
+            timestamp_utc=now,
             provider=provider,
             book=book,
-            raw_market_id=raw_market_id,
-            raw_selection_id=raw_selection_id,
             market_key=market_key,
             selection=selection,
             line=line,
             price_american=price_american,
-            price_decimal=price_decimal,
+            payload_hash=payload_hash,
+            raw_payload=raw_payload,
+            raw_payload_path=None,
             is_live=is_live,
             period=period,
             is_close_candidate=is_close_candidate,
-            raw_payload=raw_payload,
-            integrity_flags=self._check_integrity(raw_payload)
+            raw_market_id=raw_market_id,
+            raw_selection_id=raw_selection_id
         )
-        
-        # Insert into database
-        self.odds_collection.insert_one(snapshot.model_dump())
+        self.odds_collection.insert_one(row)
         
         logger.info(
-            f"📸 Captured odds snapshot: {snapshot_id} for {event_id} "
+            f"📸 Captured odds snapshot: {row['snapshot_id']} for {event_id} "
             f"({market_key}, {book})"
         )
         
-        return snapshot_id
+        return row["snapshot_id"]
     
     def capture_bulk_odds_snapshots(
         self,
@@ -111,59 +133,194 @@ class SnapshotCaptureService:
         Returns:
             List of snapshot_ids created
         """
-        snapshot_ids = []
+        snapshot_ids = self.capture_poll_snapshots(
+            [{"id": event_id, "bookmakers": bookmaker_data}],
+            provider=provider
+        )
         
-        for bookmaker in bookmaker_data:
-            book = bookmaker.get("key", bookmaker.get("title", "unknown"))
-            
-            for market in bookmaker.get("markets", []):
-                market_key_raw = market.get("key", "")
-                
-                # Map to canonical market key
-                market_key = self._map_to_canonical_market_key(market_key_raw)
-                
-                if not market_key:
-                    continue
+        logger.info(f"📸 Captured {len(snapshot_ids)} odds snapshots for {event_id}")
+        
+        return snapshot_ids
+    
+    def capture_poll_snapshots(
+        self,
+        events: Iterable[Dict[str, Any]],
+        provider: str = "OddsAPI",
+        captured_at: Optional[datetime] = None
+    ) -> List[str]:
+        """
+        Capture one poll tick: every outcome of every bookmaker of every event.
+        
+        Args:
+            events: OddsAPI event objects ({"id", "bookmakers": [...]})
+            provider: Data provider name
+            captured_at: Tick timestamp shared by all rows (default: now)
+        
+        Returns:
+            List of snapshot_ids created
+        """
+        captured_at = captured_at or datetime.now(timezone.utc)
+        payloads: Dict[str, Dict[str, Any]] = {}
+        rows: List[Dict[str, Any]] = []
+        
+        for event in events:
+            event_id = event.get("id") or event.get("event_id")
+            for bookmaker in event.get("bookmakers") or []:
+                book = bookmaker.get("key", bookmaker.get("title", "unknown"))
+                payload_hash = self._payload_hash(bookmaker)
+                payloads[payload_hash] = bookmaker
                 
-                for outcome in market.get("outcomes", []):
-                    selection = outcome.get("name", "")
-                    line = outcome.get("point")
-                    price = outcome.get("price")
+                for market in bookmaker.get("markets", []):
+                    market_key_raw = market.get("key", "")
                     
-                    # Convert decimal odds to American
-                    price_american = None
-                    if price is not None:
-                        if price >= 2.0:
-                            price_american = int((price - 1.0) * 100)
-                        elif price > 1.0:
-                            price_american = int(-100 / (price - 1.0))
-                        else:
-                            # Decimal odds of 1.0 are invalid for conversion and appear in some feeds.
-                            # Keep None so the snapshot is still captured without breaking lineage writes.
-                            price_american = None
+                    # Map to canonical market key
+                    market_key = self._map_to_canonical_market_key(market_key_raw)
                     
-                    snapshot_id = self.capture_odds_snapshot(
-                        event_id=event_id,
-                        provider=provider,
-                        book=book,
-                        market_key=market_key,
-                        selection=selection,
-                        line=line,
-                        price_american=price_american,
-                        raw_payload={
-                            "bookmaker": bookmaker,
-                            "market": market,
-                            "outcome": outcome
-                        },
-                        raw_market_id=market.get("id"),
-                        raw_selection_id=outcome.get("id")
-                    )
+                    if not market_key:
+                        continue
                     
-                    snapshot_ids.append(snapshot_id)
-        
-        logger.info(f"📸 Captured {len(snapshot_ids)} odds snapshots for {event_id}")
+                    for outcome_index, outcome in enumerate(market.get("outcomes", [])):
+                        rows.append(self._snapshot_row(
+                            event_id=event_id,
+                            timestamp_utc=captured_at,
+                            provider=provider,
+                            book=book,
+                            market_key=market_key,
+                            selection=outcome.get("name", ""),
+                            line=outcome.get("point"),
+                            price_american=self._decimal_to_american(outcome.get("price")),
+                            payload_hash=payload_hash,
+                            raw_payload=bookmaker,
+                            raw_payload_path={"market": market_key_raw, "outcome": outcome_index},
+                            raw_market_id=market.get("id"),
+                            raw_selection_id=outcome.get("id")
+                        ))
+        
+        if not rows:
+            return []
+        
+        self._store_payloads(payloads, captured_at)
+        self.odds_collection.insert_many(rows, ordered=False)
+        
+        return [row["snapshot_id"] for row in rows]
+    
+    def get_raw_payload(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Raw provider payload behind a snapshot row.
         
-        return snapshot_ids
+        Bookmaker-backed rows return {"bookmaker", "market", "outcome"} (the
+        shape rows used to embed); legacy rows return their inline payload.
+        """
+        if snapshot.get("raw_payload"):
+            return snapshot["raw_payload"]
+        payload_hash = snapshot.get("raw_payload_ref")
+        if not payload_hash:
+            return {}
+        doc = self.payload_collection.find_one({"_id": payload_hash}, {"payload": 1})
+        if not doc:
+            return {}
+        payload = doc["payload"]
+        path = snapshot.get("raw_payload_path")
+        if not path:
+            return payload
+        market = next(
+            (m for m in payload.get("markets", []) if m.get("key") == path.get("market")),
+            {}
+        )
+        outcomes = market.get("outcomes", [])
+        index = path.get("outcome", 0)
+        return {
+            "bookmaker": payload,
+            "market": market,
+            "outcome": outcomes[index] if index < len(outcomes) else {}
+        }
+    
+    def _snapshot_row(
+        self,
+        event_id: str,
+        timestamp_utc: datetime,
+        provider: str,
+        book: str,
+        market_key: str,
+        selection: str,
+        line: Optional[float],
+        price_american: Optional[int],
+        payload_hash: str,
+        raw_payload: Dict[str, Any],
+        raw_payload_path: Optional[Dict[str, Any]],
+        is_live: bool = False,
+        period: str = "FG",
+        is_close_candidate: bool = False,
+        raw_market_id: Optional[str] = None,
+        raw_selection_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Compact odds_snapshots row (raw data lives in odds_snapshot_payloads)"""
+        snapshot = OddsSnapshot(
+            snapshot_id=str(uuid.uuid4()),
+            event_id=event_id,
+            timestamp_utc=timestamp_utc,
+            provider=provider,
+            book=book,
+            raw_market_id=raw_market_id,
+            raw_selection_id=raw_selection_id,
+            market_key=market_key,
+            selection=selection,
+            line=line,
+            price_american=price_american,
+            price_decimal=self._american_to_decimal(price_american),
+            is_live=is_live,
+            period=period,
+            is_close_candidate=is_close_candidate,
+            raw_payload_ref=payload_hash,
+            raw_payload_path=raw_payload_path,
+            integrity_flags=self._check_integrity(raw_payload)
+        )
+        return snapshot.model_dump(exclude={"raw_payload"}, exclude_none=True)
+    
+    def _store_payloads(self, payloads: Dict[str, Dict[str, Any]], seen_at: datetime):
+        """Upsert raw payloads by content hash (insert once, then only bump last_seen_utc)"""
+        ops = [
+            UpdateOne(
+                {"_id": payload_hash},
+                {
+                    "$setOnInsert": {
+                        "payload_hash": payload_hash,
+                        "payload": payload,
+                        "first_seen_utc": seen_at
+                    },
+                    "$max": {"last_seen_utc": seen_at}
+                },
+                upsert=True
+            )
+            for payload_hash, payload in payloads.items()
+        ]
+        if ops:
+            self.payload_collection.bulk_write(ops, ordered=False)
+    
+    @staticmethod
+    def _payload_hash(payload: Dict[str, Any]) -> str:
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+    
+    @staticmethod
+    def _american_to_decimal(price_american: Optional[int]) -> Optional[float]:
+        if price_american is None:
+            return None
+        if price_american > 0:
+            return (price_american / 100.0) + 1.0
+        return (100.0 / abs(price_american)) + 1.0
+    
+    @staticmethod
+    def _decimal_to_american(price: Optional[float]) -> Optional[int]:
+        if price is None:
+            return None
+        if price >= 2.0:
+            return int((price - 1.0) * 100)
+        if price > 1.0:
+            return int(-100 / (price - 1.0))
+        # Decimal odds of 1.0 are invalid for conversion and appear in some feeds.
+        # Keep None so the snapshot is still captured without breaking lineage writes.
+        return None
     
     def capture_injury_snapshot(
         self,
@@ -197,6 +354,13 @@ class SnapshotCaptureService:
         
         self.injury_collection.insert_one(snapshot.model_dump())
         
+        # Injury news → queue re-simulation for this team's upcoming games
+        from services.resimulation_scheduler import notify_injury_snapshot
+        try:
+            notify_injury_snapshot(team, [injury_signature(snapshot.model_dump())])
+        except Exception as e:
+            logger.error(f"Re-simulation scheduling failed for {team}: {e}")
+        
         logger.info(
             f"📸 Captured injury snapshot: {injury_snapshot_id} for {team} ({league})"
         )
@@ -208,10 +372,13 @@ class SnapshotCaptureService:
         event_id: str,
         market_key: str,
         book: Optional[str] = None,
-        before_timestamp: Optional[datetime] = None
+        before_timestamp: Optional[datetime] = None,
+        with_raw_payload: bool = False
     ) -> Optional[Dict[str, Any]]:
         """
         Get the latest odds snapshot for an event/market/book
+        
+        Served by the (event_id, market_key, book, timestamp_utc) index.
         """
         query: Dict[str, Any] = {
             "event_id": event_id,
@@ -229,24 +396,36 @@ class SnapshotCaptureService:
             sort=[("timestamp_utc", -1)]
         )
         
-        return snapshot
+        return self._hydrate(snapshot) if with_raw_payload else snapshot
     
     def get_closing_line_snapshot(
         self,
         event_id: str,
         market_key: str,
-        book: str
+        book: str,
+        with_raw_payload: bool = False
     ) -> Optional[Dict[str, Any]]:
         """
         Get the closing line snapshot (is_close_candidate=True)
+        
+        Latest marked candidate, walked newest-first on the
+        (event_id, market_key, book, timestamp_utc) index.
         """
-        snapshot = self.odds_collection.find_one({
-            "event_id": event_id,
-            "market_key": market_key,
-            "book": book,
-            "is_close_candidate": True
-        })
+        snapshot = self.odds_collection.find_one(
+            {
+                "event_id": event_id,
+                "market_key": market_key,
+                "book": book,
+                "is_close_candidate": True
+            },
+            sort=[("timestamp_utc", -1)]
+        )
         
+        return self._hydrate(snapshot) if with_raw_payload else snapshot
+    
+    def _hydrate(self, snapshot: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if snapshot and not snapshot.get("raw_payload"):
+            snapshot["raw_payload"] = self.get_raw_payload(snapshot)
         return snapshot
     
     def mark_as_closing_line(
@@ -318,12 +497,50 @@ class SnapshotCaptureService:
         
         result = self.odds_collection.delete_many(query)
         
+        # Raw payloads not referenced since the cutoff, except those behind kept closing lines
+        payload_query: Dict[str, Any] = {"last_seen_utc": {"$lt": cutoff_date}}
+        if keep_closing_lines:
+            self._pin_closing_line_payloads()
+            payload_query["closing_line"] = {"$ne": True}
+        payloads = self.payload_collection.delete_many(payload_query)
+        
         logger.info(
             f"🗑️ Cleaned up {result.deleted_count} old odds snapshots "
+            f"and {payloads.deleted_count} raw payloads "
             f"(older than {retention_days} days)"
         )
         
         return result.deleted_count
+    
+    def _pin_closing_line_payloads(self, batch_size: int = 1000) -> int:
+        """
+        Flag the raw payloads behind closing lines not yet pinned
+        
+        Only closing rows marked since the previous pass are read, so the
+        work is bounded by new closing lines, not by all of history.
+        
+        Returns:
+            Number of closing rows processed
+        """
+        processed = 0
+        while True:
+            rows = list(self.odds_collection.find(
+                {"is_close_candidate": True, "payload_pinned": {"$ne": True}},
+                {"_id": 1, "raw_payload_ref": 1}
+            ).limit(batch_size))
+            if not rows:
+                return processed
+            refs = sorted({row["raw_payload_ref"] for row in rows if row.get("raw_payload_ref")})
+            if refs:
+                self.payload_collection.update_many(
+                    {"_id": {"$in": refs}},
+                    {"$set": {"closing_line": True}}
+                )
+            self.odds_collection.update_many(
+                {"_id": {"$in": [row["_id"] for row in rows]}},
+                {"$set": {"payload_pinned": True}}
+            )
+            processed += len(rows)
 
 
 # Singleton instance
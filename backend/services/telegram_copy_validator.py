@@ -23,6 +23,7 @@ from db.telegram_schemas import (
     TelegramQueueItem,
     ValidatorReport,
 )
+from utils.phrase_matcher import compiled_matcher
 
 
 class NumericToken(BaseModel):
@@ -365,10 +366,10 @@ class TelegramCopyValidator:
         if queue_item.constraints.mode != "constrained":
             return detected
         
-        text_lower = text.lower()
+        matched = compiled_matcher(self.FORBIDDEN_PHRASES_CONSTRAINED).find(text)
         
         for phrase in self.FORBIDDEN_PHRASES_CONSTRAINED:
-            if phrase in text_lower:
+            if phrase in matched:
                 detected.append(phrase)
         
         return detected
@@ -24,25 +24,21 @@ from datetime import datetime, timedelta, timezone
 from collections import defaultdict
 from db.mongo import db
 from utils.timezone import now_utc
+from services.trust_metrics_store import (
+    CONFIDENCE_BUCKETS,
+    SPORT_ORDER,
+    TrustMetricsStore,
+    day_key,
+    get_trust_metrics_store,
+    load_sports_and_confidences,
+    settlement_confidence_key,
+    summarize,
+)
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-def _normalize_confidence(raw_confidence: Any) -> float:
-    """Normalize confidence values into [0, 1] for calibration-safe metrics."""
-    try:
-        confidence = float(raw_confidence)
-    except (TypeError, ValueError):
-        return 0.5
-
-    # Some legacy records store confidence in percentage points (e.g., 62.5)
-    if confidence > 1.0 and confidence <= 100.0:
-        confidence = confidence / 100.0
-
-    return max(0.0, min(1.0, confidence))
-
-
 # ============================================================================
 # ENHANCED TRUST METRICS WITH CALIBRATION & REGIME TRACKING
 # ============================================================================
@@ -58,36 +54,21 @@ class TrustMetricsService:
     - Confidence calibration
     """
     
-    def __init__(self):
+    def __init__(self, store: Optional[TrustMetricsStore] = None):
         self.db = db
+        self._store = store
 
-    def _load_prediction_confidence(self, prediction_id: Optional[str]) -> float:
-        if not prediction_id:
-            return 0.5
-        pred = self.db["predictions"].find_one(
-            {"prediction_id": prediction_id},
-            {"_id": 0, "p_win": 1, "p_cover": 1, "p_over": 1, "predicted_win_probability": 1, "confidence": 1},
-        )
-        if not pred:
-            return 0.5
-        raw = (
-            pred.get("p_win")
-            or pred.get("p_cover")
-            or pred.get("p_over")
-            or pred.get("predicted_win_probability")
-            or pred.get("confidence")
-            or 0.5
-        )
-        return _normalize_confidence(raw)
+    @property
+    def store(self) -> TrustMetricsStore:
+        if self._store is None:
+            self._store = get_trust_metrics_store()
+        return self._store
 
-    def _load_sport(self, event_id: Optional[str]) -> str:
-        if not event_id:
-            return "UNKNOWN"
-        event = self.db["events"].find_one({"event_id": event_id}, {"_id": 0, "sport_key": 1})
-        sport_key = (event or {}).get("sport_key")
-        if not sport_key:
-            return "UNKNOWN"
-        return str(sport_key).split("_")[-1].upper()
+    def _load_window(self, days: int) -> List[Dict]:
+        """Counter documents for the last `days` UTC days (+ today); builds the store once if needed."""
+        if not self.store.is_built():
+            self.store.rebuild(self.db)
+        return self.store.load_counters(day_key(now_utc() - timedelta(days=days)))
     
     async def calculate_all_metrics(self) -> Dict:
         """
@@ -134,7 +115,9 @@ class TrustMetricsService:
     
     async def _calculate_overall_metrics(self) -> Dict:
         """
-        Calculate overall model performance.
+        Calculate overall model performance from materialized counters.
+        
+        Windows are whole UTC days: "7 days" = the last 7 days plus today.
         
         Returns:
             {
@@ -146,47 +129,35 @@ class TrustMetricsService:
                 "total_predictions": 127
             }
         """
-        # 7-day metrics (use ISO string for comparison)
-        seven_days_ago = now_utc() - timedelta(days=7)
-        seven_day_preds = list(self.db['grading'].find({
-            'bet_status': 'SETTLED',
-            'graded_at': {'$gte': seven_days_ago},
-            'result_code': {'$in': ['WIN', 'LOSS', 'PUSH']}
-        }))
+        thirty_day_rows = self._load_window(30)
+        seven_day_cutoff = day_key(now_utc() - timedelta(days=7))
         
-        seven_day_wins = len([p for p in seven_day_preds if p.get('result_code') == 'WIN'])
-        seven_day_total = len([p for p in seven_day_preds if p.get('result_code') in ['WIN', 'LOSS']])
-        seven_day_accuracy = (seven_day_wins / seven_day_total * 100) if seven_day_total > 0 else 0
+        seven = summarize(r for r in thirty_day_rows if r['day'] >= seven_day_cutoff)
+        thirty = summarize(thirty_day_rows)
         
-        # 30-day metrics (use ISO string for comparison)
-        thirty_days_ago = now_utc() - timedelta(days=30)
-        thirty_day_preds = list(self.db['grading'].find({
-            'bet_status': 'SETTLED',
-            'graded_at': {'$gte': thirty_days_ago},
-            'result_code': {'$in': ['WIN', 'LOSS', 'PUSH']}
-        }))
+        seven_day_total = seven['wins'] + seven['losses']
+        seven_day_accuracy = (seven['wins'] / seven_day_total * 100) if seven_day_total > 0 else 0
         
-        thirty_day_units = sum([p.get('unit_return', 0) for p in thirty_day_preds])
-        thirty_day_total = len([p for p in thirty_day_preds if p.get('result_code') in ['WIN', 'LOSS']])
-        thirty_day_roi = (thirty_day_units / thirty_day_total * 100) if thirty_day_total > 0 else 0
+        thirty_day_total = thirty['wins'] + thirty['losses']
+        thirty_day_roi = (thirty['units'] / thirty_day_total * 100) if thirty_day_total > 0 else 0
         
         # Brier score (lower is better, measures calibration)
-        brier_score = await self._calculate_brier_score(thirty_day_preds)
+        brier_score = (thirty['brier_sum'] / thirty['settled']) if thirty['settled'] > 0 else 0.0
         
         return {
             '7day_accuracy': round(seven_day_accuracy, 1),
-            '7day_record': f"{seven_day_wins}-{seven_day_total - seven_day_wins}",
-            '7day_units': round(sum([p.get('unit_return', 0) for p in seven_day_preds]), 2),
+            '7day_record': f"{seven['wins']}-{seven['losses']}",
+            '7day_units': round(seven['units'], 2),
             '30day_roi': round(thirty_day_roi, 1),
-            '30day_units': round(thirty_day_units, 2),
-            '30day_record': f"{len([p for p in thirty_day_preds if p.get('result_code') == 'WIN'])}-{len([p for p in thirty_day_preds if p.get('result_code') == 'LOSS'])}",
+            '30day_units': round(thirty['units'], 2),
+            '30day_record': f"{thirty['wins']}-{thirty['losses']}",
             'brier_score': round(brier_score, 3),
             'total_predictions': thirty_day_total
         }
     
     async def _calculate_sport_metrics(self) -> Dict:
         """
-        Calculate accuracy by sport.
+        Calculate accuracy by sport (30 days).
         
         Returns:
             {
@@ -195,34 +166,27 @@ class TrustMetricsService:
                 ...
             }
         """
-        thirty_days_ago = now_utc() - timedelta(days=30)
-        sports = ['NBA', 'NFL', 'MLB', 'NHL', 'NCAAB', 'NCAAF', 'UNKNOWN']
+        by_sport = defaultdict(list)
+        for row in self._load_window(30):
+            by_sport[row['sport']].append(row)
         
         sport_metrics = {}
         
-        for sport in sports:
-            all_settled = list(self.db['grading'].find({
-                'bet_status': 'SETTLED',
-                'graded_at': {'$gte': thirty_days_ago},
-                'result_code': {'$in': ['WIN', 'LOSS', 'PUSH']}
-            }))
-            sport_preds = [g for g in all_settled if self._load_sport(g.get('event_id')) == sport]
-            
-            if len(sport_preds) == 0:
+        for sport in SPORT_ORDER + sorted(set(by_sport) - set(SPORT_ORDER)):
+            totals = summarize(by_sport.get(sport, []))
+            if totals['settled'] == 0:
                 continue
             
-            wins = len([p for p in sport_preds if p.get('result_code') == 'WIN'])
-            losses = len([p for p in sport_preds if p.get('result_code') == 'LOSS'])
+            wins, losses = totals['wins'], totals['losses']
             total = wins + losses
             
             accuracy = (wins / total * 100) if total > 0 else 0
-            units = sum([p.get('unit_return', 0) for p in sport_preds])
-            roi = (units / total * 100) if total > 0 else 0
+            roi = (totals['units'] / total * 100) if total > 0 else 0
             
             sport_metrics[sport] = {
                 'accuracy': round(accuracy, 1),
                 'roi': round(roi, 1),
-                'units': round(units, 2),
+                'units': round(totals['units'], 2),
                 'record': f"{wins}-{losses}",
                 'total_predictions': total
             }
@@ -231,7 +195,7 @@ class TrustMetricsService:
     
     async def _calculate_confidence_calibration(self) -> Dict:
         """
-        Measure how well confidence scores match actual outcomes.
+        Measure how well confidence scores match actual outcomes (30 days, WIN/LOSS only).
         
         Ideal: 75% confidence predictions should win 75% of the time.
         
@@ -242,38 +206,23 @@ class TrustMetricsService:
                 "low_confidence": {"predicted": 0.52, "actual": 0.51, "count": 30}
             }
         """
-        thirty_days_ago = now_utc() - timedelta(days=30)
-
-        all_preds = list(self.db['grading'].find({
-            'bet_status': 'SETTLED',
-            'graded_at': {'$gte': thirty_days_ago},
-            'result_code': {'$in': ['WIN', 'LOSS']}
-        }))
-        
-        # Bucket by confidence level
-        high_conf = [p for p in all_preds if self._load_prediction_confidence(p.get('prediction_id')) >= 0.75]
-        medium_conf = [p for p in all_preds if 0.60 <= self._load_prediction_confidence(p.get('prediction_id')) < 0.75]
-        low_conf = [p for p in all_preds if self._load_prediction_confidence(p.get('prediction_id')) < 0.60]
-        
-        def calc_calibration(preds):
-            if len(preds) == 0:
+        by_bucket = defaultdict(list)
+        for row in self._load_window(30):
+            by_bucket[row['bucket']].append(row)
+        
+        def calc_calibration(rows):
+            totals = summarize(rows)
+            count = totals['wins'] + totals['losses']
+            if count == 0:
                 return {"predicted": 0, "actual": 0, "count": 0}
             
-            avg_predicted = sum([self._load_prediction_confidence(p.get('prediction_id')) for p in preds]) / len(preds)
-            wins = len([p for p in preds if p.get('result_code') == 'WIN'])
-            actual_accuracy = wins / len(preds)
-            
             return {
-                "predicted": round(avg_predicted, 2),
-                "actual": round(actual_accuracy, 2),
-                "count": len(preds)
+                "predicted": round(totals['confidence_sum'] / count, 2),
+                "actual": round(totals['wins'] / count, 2),
+                "count": count
             }
         
-        return {
-            "high_confidence": calc_calibration(high_conf),
-            "medium_confidence": calc_calibration(medium_conf),
-            "low_confidence": calc_calibration(low_conf)
-        }
+        return {bucket: calc_calibration(by_bucket.get(bucket, [])) for bucket in CONFIDENCE_BUCKETS}
     
     async def _calculate_recent_performance(self) -> List[Dict]:
         """
@@ -290,9 +239,19 @@ class TrustMetricsService:
             'result_code': {'$in': ['WIN', 'LOSS', 'PUSH']}
         }).sort('graded_at', -1).limit(10))
         
+        # Batched joins (one query per collection, not per row)
+        events = {
+            e['event_id']: e
+            for e in self.db['events'].find(
+                {'event_id': {'$in': [p.get('event_id') for p in recent]}},
+                {'_id': 0, 'event_id': 1, 'home_team': 1, 'away_team': 1}
+            )
+        }
+        sports, confidences = load_sports_and_confidences(self.db, recent)
+        
         results = []
         for pred in recent:
-            event = self.db['events'].find_one({'event_id': pred.get('event_id')})
+            event = events.get(pred.get('event_id'))
             if not event:
                 continue
             
@@ -306,9 +265,9 @@ class TrustMetricsService:
             
             results.append({
                 'game': f"{event.get('away_team')} vs {event.get('home_team')}",
-                'sport': self._load_sport(pred.get('event_id')),
+                'sport': sports.get(pred.get('event_id'), 'UNKNOWN'),
                 'result': pred.get('result_code'),
-                'confidence': round(self._load_prediction_confidence(pred.get('prediction_id')), 2),
+                'confidence': round(confidences.get(settlement_confidence_key(pred), 0.5), 2),
                 'units_won': pred.get('unit_return', 0),
                 'graded_at': graded_at_str
             })
@@ -327,17 +286,11 @@ class TrustMetricsService:
                 "message": "🎯 4-1 (+3.2 Units)"
             }
         """
-        yesterday = now_utc() - timedelta(days=1)
-        yesterday_start = yesterday.replace(hour=0, minute=0, second=0, microsecond=0)
-        yesterday_end = yesterday_start + timedelta(days=1)
-        
-        yesterday_preds = list(self.db['grading'].find({
-            'bet_status': 'SETTLED',
-            'graded_at': {'$gte': yesterday_start, '$lt': yesterday_end},
-            'result_code': {'$in': ['WIN', 'LOSS']}
-        }))
+        yesterday = day_key(now_utc() - timedelta(days=1))
+        totals = summarize(r for r in self._load_window(1) if r['day'] == yesterday)
         
-        if len(yesterday_preds) == 0:
+        wins, losses = totals['wins'], totals['losses']
+        if wins + losses == 0:
             return {
                 'record': '0-0',
                 'units': 0.0,
@@ -345,10 +298,8 @@ class TrustMetricsService:
                 'message': 'No games graded yesterday'
             }
         
-        wins = len([p for p in yesterday_preds if p.get('result_code') == 'WIN'])
-        losses = len(yesterday_preds) - wins
-        units = sum([p.get('unit_return', 0) for p in yesterday_preds])
-        accuracy = (wins / len(yesterday_preds) * 100)
+        units = totals['units']
+        accuracy = (wins / (wins + losses) * 100)
         
         return {
             'record': f"{wins}-{losses}",
@@ -357,30 +308,6 @@ class TrustMetricsService:
             'message': f"🎯 {wins}-{losses} ({units:+.1f} Units)"
         }
     
-    async def _calculate_brier_score(self, predictions: List[Dict]) -> float:
-        """
-        Calculate Brier Score (0-1, lower is better).
-        
-        Formula: (1/N) * Σ(predicted_prob - actual_outcome)^2
-        
-        Measures how well calibrated probabilities are.
-        """
-        if len(predictions) == 0:
-            return 0.0
-        
-        total_error = 0.0
-        count = 0
-        
-        for pred in predictions:
-            confidence = self._load_prediction_confidence(pred.get('prediction_id'))
-            actual_outcome = 1.0 if pred.get('result_code') == 'WIN' else 0.0
-            
-            error = (confidence - actual_outcome) ** 2
-            total_error += error
-            count += 1
-        
-        return total_error / count if count > 0 else 0.0
-    
     async def get_cached_metrics(self) -> Dict:
         """
         Retrieve most recent calculated metrics from cache.
@@ -411,7 +338,7 @@ class TrustMetricsService:
     
     async def get_accuracy_trend(self, days: int = 7) -> List[Dict]:
         """
-        Daily accuracy trend for sparkline chart.
+        Daily accuracy trend for sparkline chart (one counter read for the whole window).
         
         Returns:
             [
@@ -420,29 +347,24 @@ class TrustMetricsService:
                 ...
             ]
         """
+        by_day = defaultdict(list)
+        for row in self._load_window(days):
+            by_day[row['day']].append(row)
+        
         trend = []
         
         for i in range(days, 0, -1):
-            day_start = (now_utc() - timedelta(days=i)).replace(hour=0, minute=0, second=0)
-            day_end = day_start + timedelta(days=1)
+            day = day_key(now_utc() - timedelta(days=i))
+            totals = summarize(by_day.get(day, []))
+            decided = totals['wins'] + totals['losses']
             
-            day_preds = list(self.db['grading'].find({
-                'bet_status': 'SETTLED',
-                'graded_at': {'$gte': day_start, '$lt': day_end},
-                'result_code': {'$in': ['WIN', 'LOSS']}
-            }))
-            
-            if len(day_preds) > 0:
-                wins = len([p for p in day_preds if p.get('result_code') == 'WIN'])
-                accuracy = (wins / len(day_preds) * 100)
-                units = sum([p.get('unit_return', 0) for p in day_preds])
-                
+            if decided > 0:
                 trend.append({
-                    'date': day_start.strftime('%Y-%m-%d'),
-                    'accuracy': round(accuracy, 1),
-                    'units': round(units, 2),
-                    'wins': wins,
-                    'losses': len(day_preds) - wins
+                    'date': day,
+                    'accuracy': round(totals['wins'] / decided * 100, 1),
+                    'units': round(totals['units'], 2),
+                    'wins': totals['wins'],
+                    'losses': totals['losses']
                 })
         
         return trend
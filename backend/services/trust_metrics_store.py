@@ -0,0 +1,423 @@
+"""
+Trust Metrics Store
+===================
+Materialized, incrementally maintained counters behind the Trust Loop.
+
+TrustMetricsService used to rescan raw `grading` rows (plus a find_one per
+row for sport and confidence) on every calculation. Instead, each settlement
+now $inc's one counter document:
+
+    trust_metrics_counters
+        _id:    "<day>|<sport>|<confidence bucket>"   (day = UTC YYYY-MM-DD)
+        wins, losses, pushes, settled, units, brier_sum, confidence_sum
+
+so 7/30-day accuracy, ROI, Brier, per-sport and per-bucket calibration and
+the daily trend are sums over at most days × sports × 3 small documents.
+
+Idempotency / regrades:
+- `trust_metrics_contributions` remembers exactly what each settlement
+  (keyed by graded_id / idempotency key) added; re-recording the same
+  settlement is a no-op, and a regrade first reverses the old contribution
+- writers that store grading rows themselves (grading_service, the v1
+  unified grading service) apply them with record_grading_row()
+- rebuild() replays existing grading rows with batched lookups; it runs once
+  automatically when the store has never been built, and can be re-run to
+  repair drift (e.g. a crash between the contribution and counter writes)
+"""
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pymongo import ReturnDocument
+
+from utils.timezone import now_utc
+
+logger = logging.getLogger(__name__)
+
+TRUST_METRICS_REBUILD_DAYS = int(os.getenv("TRUST_METRICS_REBUILD_DAYS", "90"))
+
+SCORED_RESULTS = ("WIN", "LOSS", "PUSH")
+SPORT_ORDER = ['NBA', 'NFL', 'MLB', 'NHL', 'NCAAB', 'NCAAF', 'UNKNOWN']
+CONFIDENCE_BUCKETS = ("high_confidence", "medium_confidence", "low_confidence")
+
+COUNTER_FIELDS = ("wins", "losses", "pushes", "settled", "units", "brier_sum", "confidence_sum")
+META_ID = "__meta__"
+
+
+def _normalize_confidence(raw_confidence: Any) -> float:
+    """Normalize confidence values into [0, 1] for calibration-safe metrics."""
+    try:
+        confidence = float(raw_confidence)
+    except (TypeError, ValueError):
+        return 0.5
+
+    # Some legacy records store confidence in percentage points (e.g., 62.5)
+    if confidence > 1.0 and confidence <= 100.0:
+        confidence = confidence / 100.0
+
+    return max(0.0, min(1.0, confidence))
+
+
+def prediction_confidence(pred: Optional[Dict[str, Any]]) -> float:
+    """Confidence of a prediction/pick document (0.5 when unknown)."""
+    if not pred:
+        return 0.5
+    raw = (
+        pred.get("p_win")
+        or pred.get("p_cover")
+        or pred.get("p_over")
+        or pred.get("predicted_win_probability")
+        or pred.get("confidence")
+        or 0.5
+    )
+    return _normalize_confidence(raw)
+
+
+def sport_label(sport_key: Optional[str]) -> str:
+    """basketball_nba -> NBA"""
+    if not sport_key:
+        return "UNKNOWN"
+    return str(sport_key).split("_")[-1].upper()
+
+
+def confidence_bucket(confidence: float) -> str:
+    if confidence >= 0.75:
+        return "high_confidence"
+    if confidence >= 0.60:
+        return "medium_confidence"
+    return "low_confidence"
+
+
+def day_key(moment: datetime) -> str:
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%d")
+
+
+def _parse_graded_at(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if isinstance(value, str) and value:
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    return None
+
+
+def settlement_increments(result_code: str, confidence: float, unit_return: float) -> Dict[str, float]:
+    """Counter deltas for one settled WIN/LOSS/PUSH."""
+    actual_outcome = 1.0 if result_code == "WIN" else 0.0
+    decided = result_code in ("WIN", "LOSS")
+    return {
+        "wins": 1 if result_code == "WIN" else 0,
+        "losses": 1 if result_code == "LOSS" else 0,
+        "pushes": 1 if result_code == "PUSH" else 0,
+        "settled": 1,
+        "units": float(unit_return or 0.0),
+        # Brier covers every scored row (push = 0 outcome); calibration only decided rows
+        "brier_sum": (confidence - actual_outcome) ** 2,
+        "confidence_sum": confidence if decided else 0.0,
+    }
+
+
+def summarize(rows: Iterable[Dict[str, Any]]) -> Dict[str, float]:
+    """Sum counter documents."""
+    totals = {field: 0 for field in COUNTER_FIELDS}
+    for row in rows:
+        for field in COUNTER_FIELDS:
+            totals[field] += row.get(field, 0) or 0
+    return totals
+
+
+class TrustMetricsStore:
+    """
+    Per-day / per-sport / per-confidence-bucket settlement counters
+    """
+
+    def __init__(self, counters=None, contributions=None):
+        if counters is None or contributions is None:
+            from db.mongo import db
+            counters = counters if counters is not None else db["trust_metrics_counters"]
+            contributions = contributions if contributions is not None else db["trust_metrics_contributions"]
+        self.counters = counters
+        self.contributions = contributions
+
+    @staticmethod
+    def counter_id(day: str, sport: str, bucket: str) -> str:
+        return f"{day}|{sport}|{bucket}"
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def record_settlement(
+        self,
+        settlement_id: str,
+        result_code: str,
+        graded_at: Any,
+        sport: str,
+        confidence: float,
+        unit_return: float = 0.0,
+    ) -> bool:
+        """
+        Apply one settlement to the counters (idempotent per settlement_id).
+
+        VOID / unknown results contribute nothing, but still reverse a
+        previous contribution when a pick is regraded to VOID.
+
+        Returns:
+            True if any counter changed
+        """
+        graded_dt = _parse_graded_at(graded_at) or now_utc()
+        contribution = None
+        if result_code in SCORED_RESULTS:
+            day = day_key(graded_dt)
+            bucket = confidence_bucket(confidence)
+            contribution = {
+                "counter_id": self.counter_id(day, sport, bucket),
+                "day": day,
+                "sport": sport,
+                "bucket": bucket,
+                "inc": settlement_increments(result_code, confidence, unit_return),
+            }
+
+        if contribution is None:
+            previous = self.contributions.find_one_and_delete({"_id": settlement_id})
+        else:
+            previous = self.contributions.find_one_and_replace(
+                {"_id": settlement_id},
+                contribution,
+                upsert=True,
+                return_document=ReturnDocument.BEFORE,
+            )
+
+        if previous:
+            previous.pop("_id", None)
+        if previous == contribution:
+            return False
+
+        if previous:
+            self.counters.update_one(
+                {"_id": previous["counter_id"]},
+                {"$inc": {k: -v for k, v in previous["inc"].items()}},
+            )
+        if contribution:
+            self.counters.update_one(
+                {"_id": contribution["counter_id"]},
+                {
+                    "$inc": contribution["inc"],
+                    "$setOnInsert": {
+                        "day": contribution["day"],
+                        "sport": contribution["sport"],
+                        "bucket": contribution["bucket"],
+                    },
+                },
+                upsert=True,
+            )
+        return True
+
+    def record_grading_row(self, row: Dict[str, Any], source_db=None) -> bool:
+        """
+        Apply one stored grading row, resolved the way rebuild() replays it.
+
+        For writers that store grading rows themselves (grading_service and
+        the v1 unified grading service). Rows that are not a scored
+        settlement (VOID, PENDING) reverse any earlier contribution.
+
+        Returns:
+            True if any counter changed
+        """
+        if source_db is None:
+            from db.mongo import db as source_db
+
+        bet_status = getattr(row.get("bet_status"), "value", row.get("bet_status"))
+        result_code = getattr(row.get("result_code"), "value", row.get("result_code"))
+        settlement_status = getattr(row.get("settlement_status"), "value", row.get("settlement_status"))
+        if bet_status == "SETTLED" and result_code in SCORED_RESULTS:
+            scored = result_code
+        elif settlement_status in SCORED_RESULTS:
+            scored = settlement_status
+        else:
+            scored = "VOID"
+
+        pick_odds: Dict[str, float] = {}
+        sports, confidences = load_sports_and_confidences(source_db, [row], pick_odds) if scored != "VOID" else ({}, {})
+        return self.record_settlement(
+            settlement_id=settlement_id_for(row),
+            result_code=scored,
+            graded_at=row.get("graded_at"),
+            sport=sports.get(row.get("event_id"), "UNKNOWN"),
+            confidence=confidences.get(settlement_confidence_key(row), 0.5),
+            unit_return=settlement_unit_return(
+                {**row, "result_code": scored}, pick_odds.get(row.get("pick_id"))
+            ),
+        )
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def load_counters(self, since_day: str, until_day: Optional[str] = None) -> List[Dict[str, Any]]:
+        """All counter documents with since_day <= day (< until_day), one query."""
+        day_filter: Dict[str, Any] = {"$gte": since_day}
+        if until_day:
+            day_filter["$lt"] = until_day
+        return list(self.counters.find({"day": day_filter}, {"_id": 0}))
+
+    def is_built(self) -> bool:
+        return self.counters.find_one({"_id": META_ID}) is not None
+
+    # ------------------------------------------------------------------
+    # Rebuild (backfill / repair)
+    # ------------------------------------------------------------------
+
+    def rebuild(self, source_db=None, days: int = TRUST_METRICS_REBUILD_DAYS) -> int:
+        """
+        Recompute every counter from grading rows graded in the last `days`.
+
+        Sport and confidence are resolved with one $in query per source
+        collection instead of a find_one per row.
+
+        Returns:
+            Number of settlements replayed
+        """
+        if source_db is None:
+            from db.mongo import db as source_db
+
+        cutoff = now_utc() - timedelta(days=days)
+        rows = list(source_db["grading"].find(
+            {"$or": [
+                {"bet_status": "SETTLED", "result_code": {"$in": list(SCORED_RESULTS)}},
+                {"settlement_status": {"$in": list(SCORED_RESULTS)}},
+            ]},
+            {
+                "_id": 1, "graded_id": 1, "grading_idempotency_key": 1, "event_id": 1,
+                "prediction_id": 1, "pick_id": 1, "result_code": 1, "settlement_status": 1,
+                "unit_return": 1, "units_returned": 1, "graded_at": 1,
+            },
+        ))
+        rows = [r for r in rows if (_parse_graded_at(r.get("graded_at")) or cutoff) > cutoff]
+
+        pick_odds: Dict[str, float] = {}
+        sports, confidences = load_sports_and_confidences(source_db, rows, pick_odds)
+
+        contributions: Dict[str, Dict[str, Any]] = {}
+        counters: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            result_code = row.get("result_code") or row.get("settlement_status")
+            graded_dt = _parse_graded_at(row.get("graded_at"))
+            sport = sports.get(row.get("event_id"), "UNKNOWN")
+            confidence = confidences.get(settlement_confidence_key(row), 0.5)
+            day = day_key(graded_dt)
+            bucket = confidence_bucket(confidence)
+            counter_id = self.counter_id(day, sport, bucket)
+            inc = settlement_increments(
+                result_code, confidence, settlement_unit_return(row, pick_odds.get(row.get("pick_id")))
+            )
+
+            contributions[settlement_id_for(row)] = {
+                "_id": settlement_id_for(row), "counter_id": counter_id,
+                "day": day, "sport": sport, "bucket": bucket, "inc": inc,
+            }
+            counter = counters.setdefault(counter_id, {
+                "_id": counter_id, "day": day, "sport": sport, "bucket": bucket,
+                **{field: 0 for field in COUNTER_FIELDS},
+            })
+            for field, value in inc.items():
+                counter[field] += value
+
+        self.counters.delete_many({})
+        self.contributions.delete_many({})
+        if counters:
+            self.counters.insert_many(list(counters.values()))
+        if contributions:
+            self.contributions.insert_many(list(contributions.values()))
+        self.counters.replace_one(
+            {"_id": META_ID},
+            {"_id": META_ID, "rebuilt_at": now_utc(), "settlements": len(contributions)},
+            upsert=True,
+        )
+        logger.info(f"Trust metrics store rebuilt from {len(contributions)} settlements")
+        return len(contributions)
+
+
+# ----------------------------------------------------------------------------
+# Grading-row helpers (shared by rebuild and TrustMetricsService)
+# ----------------------------------------------------------------------------
+
+def settlement_id_for(row: Dict[str, Any]) -> str:
+    return str(row.get("graded_id") or row.get("grading_idempotency_key") or row.get("_id"))
+
+
+def pick_unit_return(result_code: str, snapshot_odds: Optional[float]) -> float:
+    """Units for a flat 1u pick at decimal snapshot_odds (-110 when unknown)."""
+    if result_code == "WIN":
+        return (snapshot_odds - 1.0) if snapshot_odds and snapshot_odds > 1.0 else 100.0 / 110.0
+    if result_code == "LOSS":
+        return -1.0
+    return 0.0
+
+
+def settlement_unit_return(row: Dict[str, Any], snapshot_odds: Optional[float] = None) -> float:
+    """Stored unit return (legacy rows) or derived from the pick's odds (unified v2 rows)."""
+    if "unit_return" in row or "units_returned" in row:
+        return float(row.get("unit_return", row.get("units_returned", 0.0)) or 0.0)
+    return pick_unit_return(row.get("result_code") or row.get("settlement_status"), snapshot_odds)
+
+
+def settlement_confidence_key(row: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+    if row.get("prediction_id"):
+        return ("prediction", row["prediction_id"])
+    return ("pick", row.get("pick_id"))
+
+
+def load_sports_and_confidences(
+    source_db, rows: List[Dict[str, Any]], pick_odds: Optional[Dict[str, float]] = None
+) -> Tuple[Dict[str, str], Dict[Tuple[str, Optional[str]], float]]:
+    """
+    Batched sport (events) and confidence (predictions / ai_picks) lookups for grading rows.
+
+    Pass a dict as pick_odds to also collect each pick's decimal snapshot_odds.
+    """
+    event_ids = list({r.get("event_id") for r in rows if r.get("event_id")})
+    prediction_ids = list({r["prediction_id"] for r in rows if r.get("prediction_id")})
+    pick_ids = list({r["pick_id"] for r in rows if not r.get("prediction_id") and r.get("pick_id")})
+
+    sports = {}
+    if event_ids:
+        sports = {
+            doc["event_id"]: sport_label(doc.get("sport_key"))
+            for doc in source_db["events"].find(
+                {"event_id": {"$in": event_ids}}, {"_id": 0, "event_id": 1, "sport_key": 1}
+            )
+        }
+
+    confidence_fields = {
+        "_id": 0, "p_win": 1, "p_cover": 1, "p_over": 1, "predicted_win_probability": 1, "confidence": 1,
+    }
+    confidences: Dict[Tuple[str, Optional[str]], float] = {}
+    if prediction_ids:
+        for doc in source_db["predictions"].find(
+            {"prediction_id": {"$in": prediction_ids}}, {**confidence_fields, "prediction_id": 1}
+        ):
+            confidences[("prediction", doc["prediction_id"])] = prediction_confidence(doc)
+    if pick_ids:
+        for doc in source_db["ai_picks"].find(
+            {"pick_id": {"$in": pick_ids}}, {**confidence_fields, "pick_id": 1, "snapshot_odds": 1}
+        ):
+            confidences[("pick", doc["pick_id"])] = prediction_confidence(doc)
+            if pick_odds is not None:
+                pick_odds[doc["pick_id"]] = doc.get("snapshot_odds")
+
+    return sports, confidences
+
+
+_trust_metrics_store: Optional[TrustMetricsStore] = None
+
+
+def get_trust_metrics_store() -> TrustMetricsStore:
+    global _trust_metrics_store
+    if _trust_metrics_store is None:
+        _trust_metrics_store = TrustMetricsStore()
+    return _trust_metrics_store
@@ -576,16 +576,42 @@ class UnifiedGradingService:
         }
         
         # Upsert by pick_id (idempotent)
-        self.db["grading"].update_one(
+        previous = self.db["grading"].find_one_and_update(
             {"pick_id": result.pick_id},
             {"$set": grading_record},
+            projection={"_id": 0, "graded_id": 1},
             upsert=True
         )
+        self._record_trust_metrics(grading_record, previous)
         
         self.logger.info(
             f"Graded pick {result.pick_id}: {result.result_code.value if result.result_code else 'PENDING'}"
         )
     
+    def _record_trust_metrics(
+        self,
+        grading_record: Dict[str, Any],
+        previous: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Apply this grading row to the Trust Loop counters (trust_metrics_store).
+        
+        graded_id changes on every regrade, so the previous row's
+        contribution is reversed first. Failures never block grading.
+        """
+        from services.trust_metrics_store import TrustMetricsStore
+        
+        try:
+            store = TrustMetricsStore(
+                self.db["trust_metrics_counters"],
+                self.db["trust_metrics_contributions"]
+            )
+            if previous and previous.get("graded_id") not in (None, grading_record["graded_id"]):
+                store.record_settlement(previous["graded_id"], "VOID", grading_record["graded_at"], "UNKNOWN", 0.5)
+            store.record_grading_row(grading_record, source_db=self.db)
+        except Exception as e:
+            self.logger.error(f"Failed to update trust metrics for {grading_record.get('pick_id')}: {e}")
+    
     def _mirror_to_ai_picks(self, result: GradingResult) -> None:
         """
         Mirror grading to ai_picks (denormalized convenience)
@@ -18,7 +18,8 @@ NEW IN V2.0:
 CANONICAL GRADING PIPELINE:
 1. Read pick from ai_picks
 2. Load event with provider_event_map.oddsapi.event_id
-3. Fetch score by EXACT OddsAPI ID (no fuzzy matching allowed)
+3. Fetch score by EXACT OddsAPI ID (no fuzzy matching allowed) - batch runs
+   read it from one scoreboard pull per sport (services.scoreboard_ingestion)
 4. Validate provider mapping (detect drift)
 5. Determine settlement (WIN/LOSS/PUSH/VOID) using versioned rules
 6. Compute CLV using closing snapshot (non-blocking)
@@ -29,14 +30,18 @@ CANONICAL GRADING PIPELINE:
 🔒 LOCKED: All other grading paths must be disabled/retired
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List, Tuple
+from collections import defaultdict
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from enum import Enum
+import asyncio
 import logging
 import hashlib
 import json
 
+from pymongo import UpdateOne
+
 logger = logging.getLogger(__name__)
 
 # Rules Versioning Constants
@@ -135,17 +140,20 @@ class UnifiedGradingService:
         self,
         pick_id: str,
         admin_override: Optional[str] = None,
-        admin_note: Optional[str] = None
+        admin_note: Optional[str] = None,
+        score_index=None
     ) -> GradingResult:
         """
         Grade a single pick using canonical grading pipeline.
         
         This is the ONLY way to grade picks. All other systems must call this.
+        For a whole slate use grade_pending_picks (one scoreboard call per sport).
         
         Args:
             pick_id: Unique pick identifier
             admin_override: Optional admin settlement override (WIN|LOSS|PUSH|VOID)
             admin_note: Required if admin_override is provided
+            score_index: Optional ScoreboardIndex already built for this cycle
             
         Returns:
             GradingResult with settlement status, CLV, idempotency key, rules versions
@@ -189,7 +197,9 @@ class UnifiedGradingService:
             )
         
         # Fetch score (exact ID lookup only)
-        score_data = await self._fetch_score_by_oddsapi_id(oddsapi_event_id)
+        score_data = await self._fetch_score_by_oddsapi_id(
+            oddsapi_event_id, event.get("sport_key"), score_index
+        )
         if not score_data:
             raise GameNotCompletedError(f"Game {event_id} not completed yet")
         
@@ -237,6 +247,9 @@ class UnifiedGradingService:
             oddsapi_event_id=oddsapi_event_id
         )
         
+        # Trust Loop: incrementally update materialized metrics (non-blocking)
+        self._record_trust_metrics(pick, event, settlement_status, graded_at, idempotency_key)
+        
         # Optional: Mirror to ai_picks (denormalized convenience)
         if self.mirror_to_ai_picks:
             await self._mirror_to_ai_picks(pick_id, settlement_status, clv, graded_at)
@@ -358,7 +371,9 @@ class UnifiedGradingService:
     
     async def _fetch_score_by_oddsapi_id(
         self,
-        oddsapi_event_id: str
+        oddsapi_event_id: str,
+        sport_key: Optional[str] = None,
+        score_index=None
     ) -> Optional[Dict[str, Any]]:
         """
         Fetch final score using exact OddsAPI event ID.
@@ -367,18 +382,227 @@ class UnifiedGradingService:
         
         Args:
             oddsapi_event_id: Exact OddsAPI event ID
+            sport_key: Event sport (selects the scoreboard)
+            score_index: ScoreboardIndex for this cycle; no HTTP when given
             
         Returns:
             Score data dict or None if not completed
         """
+        if score_index is not None:
+            return score_index.get(oddsapi_event_id)
+        
         # Import here to avoid circular dependency
         from services.result_service import ResultService
         
         result_service = ResultService()
-        score = await result_service.fetch_scores_by_oddsapi_id(oddsapi_event_id)
+        score = await result_service.fetch_scores_by_oddsapi_id(oddsapi_event_id, sport_key)
         
         return score
     
+    async def grade_pending_picks(
+        self,
+        pick_ids: Optional[Iterable[str]] = None,
+        hours_back: int = 48,
+        ingestor=None
+    ) -> Dict[str, Any]:
+        """
+        Grade a whole slate from one scoreboard pull per sport.
+        
+        Pipeline per run:
+        1. Load pending picks (or `pick_ids`) and their events in two queries
+        2. Build a ScoreboardIndex: persisted finals first, then one OddsAPI
+           scores request per sport that still has unresolved events
+        3. Settle every pick from the index (same rules, drift checks, CLV and
+           idempotency keys as grade_pick)
+        4. Write all grading rows with one unordered bulk_write of UpdateOne
+           upserts (idempotent on grading_idempotency_key)
+        
+        Picks whose game is not final stay pending for the next run. Picks
+        already graded under the current rules versions are skipped.
+        
+        Args:
+            pick_ids: Grade exactly these picks (default: ungraded picks
+                      created in the last `hours_back` hours)
+            ingestor: ScoreboardIngestor to use (default: one on self.db)
+        
+        Returns:
+            Run summary (counts per outcome and number of scoreboard requests)
+        """
+        from services.scoreboard_ingestion import ScoreboardIngestor
+        
+        picks = await asyncio.to_thread(self._load_pending_picks, pick_ids, hours_back)
+        events = await asyncio.to_thread(
+            self._load_events, {pick.get("event_id") for pick in picks}
+        )
+        
+        summary: Dict[str, Any] = {
+            "picks": len(picks),
+            "graded_count": 0,
+            "not_final": 0,
+            "missing_provider_id": 0,
+            "event_missing": 0,
+            "mapping_drift": 0,
+            "failed": 0,
+            "results": {code.value: 0 for code in ResultCode},
+            "scoreboard_requests": 0,
+        }
+        
+        wanted: Dict[str, set] = defaultdict(set)
+        targets: List[Tuple[Dict[str, Any], Dict[str, Any], str]] = []
+        for pick in picks:
+            event = events.get(pick.get("event_id"))
+            if not event:
+                summary["event_missing"] += 1
+                continue
+            oddsapi_event_id = self._get_oddsapi_event_id(event)
+            if not oddsapi_event_id:
+                summary["missing_provider_id"] += 1
+                self._emit_ops_alert(
+                    alert_type="PROVIDER_ID_MISSING",
+                    event_id=event.get("event_id"),
+                    details=f"Event missing provider_event_map.oddsapi.event_id"
+                )
+                continue
+            wanted[event.get("sport_key")].add(oddsapi_event_id)
+            targets.append((pick, event, oddsapi_event_id))
+        
+        score_index = await (ingestor or ScoreboardIngestor(self.db)).build_index(wanted)
+        summary["scoreboard_requests"] = score_index.requests_made
+        
+        await asyncio.to_thread(self._settle_from_index, targets, score_index, summary)
+        
+        self.logger.info(
+            f"Batch grading: {summary['graded_count']}/{summary['picks']} settled, "
+            f"{summary['not_final']} not final, "
+            f"{summary['failed']} failed, "
+            f"{summary['scoreboard_requests']} scoreboard request(s)"
+        )
+        return summary
+    
+    def _load_pending_picks(
+        self,
+        pick_ids: Optional[Iterable[str]],
+        hours_back: int
+    ) -> List[Dict[str, Any]]:
+        """Picks to grade, minus those already graded under the current rules versions"""
+        if pick_ids is not None:
+            query: Dict[str, Any] = {"pick_id": {"$in": list(pick_ids)}}
+        else:
+            since = (datetime.now(timezone.utc) - timedelta(hours=hours_back)).isoformat()
+            query = {"created_at": {"$gte": since}, "outcome": None}
+        picks = [pick for pick in self.db["ai_picks"].find(query) if pick.get("pick_id")]
+        
+        keys = {
+            self._generate_idempotency_key(
+                pick_id=pick["pick_id"],
+                grade_source=self.grade_source,
+                settlement_rules_version=self.settlement_rules_version,
+                clv_rules_version=self.clv_rules_version
+            ): pick
+            for pick in picks
+        }
+        graded = {
+            doc["grading_idempotency_key"]
+            for doc in self.db["grading"].find(
+                {"grading_idempotency_key": {"$in": list(keys)}},
+                {"_id": 0, "grading_idempotency_key": 1}
+            )
+        }
+        return [pick for key, pick in keys.items() if key not in graded]
+    
+    def _load_events(self, event_ids: Iterable[Optional[str]]) -> Dict[str, Dict[str, Any]]:
+        event_ids = [event_id for event_id in event_ids if event_id]
+        if not event_ids:
+            return {}
+        return {
+            event["event_id"]: event
+            for event in self.db["events"].find({"event_id": {"$in": event_ids}})
+        }
+    
+    def _settle_from_index(
+        self,
+        targets: List[Tuple[Dict[str, Any], Dict[str, Any], str]],
+        score_index,
+        summary: Dict[str, Any]
+    ):
+        """Settle picks against the index and bulk-write grading rows"""
+        graded_at = datetime.now(timezone.utc).isoformat()
+        grading_ops: List[UpdateOne] = []
+        mirror_ops: List[UpdateOne] = []
+        settled = []
+        
+        for pick, event, oddsapi_event_id in targets:
+            pick_id = pick["pick_id"]
+            score_data = score_index.get(oddsapi_event_id)
+            if not score_data:
+                summary["not_final"] += 1
+                continue
+            try:
+                self._validate_provider_mapping(event, score_data, oddsapi_event_id)
+            except ProviderMappingDriftError as e:
+                summary["mapping_drift"] += 1
+                self.logger.error(str(e))
+                continue
+            
+            # One malformed pick (e.g. market_line=None) must not sink the slate
+            try:
+                settlement_status = self._determine_settlement(pick, score_data)
+                clv = self._compute_clv(pick)
+                if clv is None:
+                    self._emit_ops_alert(
+                        alert_type="CLOSE_SNAPSHOT_MISSING",
+                        pick_id=pick_id,
+                        event_id=event["event_id"],
+                        details="Cannot compute CLV - closing snapshot not found"
+                    )
+                idempotency_key = self._generate_idempotency_key(
+                    pick_id=pick_id,
+                    grade_source=self.grade_source,
+                    settlement_rules_version=self.settlement_rules_version,
+                    clv_rules_version=self.clv_rules_version
+                )
+                record = self._build_grading_record(
+                    pick_id=pick_id,
+                    event_id=event["event_id"],
+                    settlement_status=settlement_status,
+                    score_data=score_data,
+                    clv=clv,
+                    graded_at=graded_at,
+                    idempotency_key=idempotency_key,
+                    oddsapi_event_id=oddsapi_event_id
+                )
+            except Exception as e:
+                summary["failed"] += 1
+                self.logger.error(f"Failed to settle pick {pick_id}: {type(e).__name__}: {e}")
+                continue
+            grading_ops.append(UpdateOne(
+                {"grading_idempotency_key": idempotency_key},
+                {"$set": record},
+                upsert=True
+            ))
+            if self.mirror_to_ai_picks:
+                mirror_ops.append(UpdateOne(
+                    {"pick_id": pick_id},
+                    {"$set": self._mirror_fields(settlement_status, clv, graded_at)}
+                ))
+            settled.append((pick, event, settlement_status, idempotency_key))
+        
+        if not grading_ops:
+            return
+        
+        self.db["grading"].bulk_write(grading_ops, ordered=False)
+        summary["graded_count"] = len(settled)
+        
+        for pick, event, settlement_status, idempotency_key in settled:
+            summary["results"][settlement_status] = summary["results"].get(settlement_status, 0) + 1
+            self._record_trust_metrics(pick, event, settlement_status, graded_at, idempotency_key)
+        
+        if mirror_ops:
+            try:
+                self.db["ai_picks"].bulk_write(mirror_ops, ordered=False)
+            except Exception as e:
+                self.logger.error(f"Failed to mirror batch to ai_picks: {e}")
+    
     def _determine_settlement(
         self,
         pick: Dict[str, Any],
@@ -519,6 +743,48 @@ class UnifiedGradingService:
         
         Idempotent via grading_idempotency_key unique constraint.
         """
+        grading_record = self._build_grading_record(
+            pick_id=pick_id,
+            event_id=event_id,
+            settlement_status=settlement_status,
+            score_data=score_data,
+            clv=clv,
+            graded_at=graded_at,
+            idempotency_key=idempotency_key,
+            oddsapi_event_id=oddsapi_event_id,
+            admin_override=admin_override,
+            admin_note=admin_note
+        )
+        
+        # Write to grading collection (idempotent via grading_idempotency_key)
+        try:
+            self.db["grading"].update_one(
+                {"grading_idempotency_key": idempotency_key},
+                {"$set": grading_record},
+                upsert=True
+            )
+            self.logger.info(
+                f"Grading record written for {pick_id} "
+                f"(idempotency_key: {idempotency_key})"
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to write grading record: {e}")
+            raise
+    
+    def _build_grading_record(
+        self,
+        pick_id: str,
+        event_id: str,
+        settlement_status: str,
+        score_data: Dict[str, Any],
+        clv: Optional[Dict[str, Any]],
+        graded_at: str,
+        idempotency_key: str,
+        oddsapi_event_id: str,
+        admin_override: Optional[str] = None,
+        admin_note: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Canonical grading row (shared by single and batch grading)"""
         # Store score payload reference (for audit/replay)
         score_payload_hash = hashlib.sha256(
             json.dumps(score_data, sort_keys=True).encode()
@@ -558,21 +824,44 @@ class UnifiedGradingService:
             "admin_override": admin_override,
             "admin_note": admin_note if admin_override else None
         }
+        return grading_record
+    
+    def _record_trust_metrics(
+        self,
+        pick: Dict[str, Any],
+        event: Dict[str, Any],
+        settlement_status: str,
+        graded_at: str,
+        idempotency_key: str
+    ):
+        """
+        Apply this settlement to the Trust Loop counters (trust_metrics_store).
+        
+        Idempotent per grading_idempotency_key; failures never block grading
+        (TrustMetricsStore.rebuild repairs any drift).
+        """
+        from services.trust_metrics_store import (
+            TrustMetricsStore,
+            pick_unit_return,
+            prediction_confidence,
+            sport_label,
+        )
         
-        # Write to grading collection (idempotent via grading_idempotency_key)
         try:
-            self.db["grading"].update_one(
-                {"grading_idempotency_key": idempotency_key},
-                {"$set": grading_record},
-                upsert=True
+            store = TrustMetricsStore(
+                self.db["trust_metrics_counters"],
+                self.db["trust_metrics_contributions"]
             )
-            self.logger.info(
-                f"Grading record written for {pick_id} "
-                f"(idempotency_key: {idempotency_key})"
+            store.record_settlement(
+                settlement_id=idempotency_key,
+                result_code=settlement_status,
+                graded_at=graded_at,
+                sport=sport_label(event.get("sport_key")),
+                confidence=prediction_confidence(pick),
+                unit_return=pick_unit_return(settlement_status, pick.get("snapshot_odds"))
             )
         except Exception as e:
-            self.logger.error(f"Failed to write grading record: {e}")
-            raise
+            self.logger.error(f"Failed to update trust metrics for {pick.get('pick_id')}: {e}")
     
     async def _mirror_to_ai_picks(
         self,
@@ -590,15 +879,21 @@ class UnifiedGradingService:
         try:
             self.db["ai_picks"].update_one(
                 {"pick_id": pick_id},
-                {
-                    "$set": {
-                        "outcome": settlement_status.lower(),
-                        "clv_pct": clv["clv_percentage"] if clv else None,
-                        "settled_at": graded_at
-                    }
-                }
+                {"$set": self._mirror_fields(settlement_status, clv, graded_at)}
             )
             self.logger.info(f"Mirrored grading to ai_picks for {pick_id}")
         except Exception as e:
             self.logger.error(f"Failed to mirror to ai_picks: {e}")
             # Don't raise - mirror is optional
+    
+    @staticmethod
+    def _mirror_fields(
+        settlement_status: str,
+        clv: Optional[Dict[str, Any]],
+        graded_at: str
+    ) -> Dict[str, Any]:
+        return {
+            "outcome": settlement_status.lower(),
+            "clv_pct": clv["clv_percentage"] if clv else None,
+            "settled_at": graded_at
+        }
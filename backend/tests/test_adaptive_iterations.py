@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from core.monte_carlo_engine import CONVERGENCE_BATCH_SIZE, precision_target_for_budget, simulate_to_precision
+from core.sport_strategies import HighScoringStrategy
+
+NBA = {"sport_key": "basketball_nba", "has_spread_market": True}
+
+
+def _run(rating_a, rating_b, spread, total, budget=100000, **kwargs):
+    context = {**NBA, "current_spread": spread, "total_line": total}
+    return simulate_to_precision(
+        HighScoringStrategy(), rating_a, rating_b, budget, context, np.random.default_rng(11), **kwargs
+    )
+
+
+def test_lopsided_game_stops_early_at_the_budget_precision():
+    # Lines far from the model: every published probability is far from 50%
+    results, precision = _run(118.0, 100.0, spread=-2.5, total=190.5)
+
+    assert precision["converged"]
+    assert precision["iterations_used"] < 100000
+    assert len(results["margins"]) == precision["iterations_used"]
+    assert results["team_a_wins"] + results["team_b_wins"] + results["pushes"] == precision["iterations_used"]
+    assert set(precision["half_widths"]) == {"p_win_home", "p_cover_home", "p_over"}
+    assert max(precision["half_widths"].values()) <= precision["target_half_width"]
+
+
+def test_lines_near_the_model_keep_the_full_budget_precision():
+    # Equal ratings: the model makes the home side ~3.5 points, total ~219.5,
+    # so every published probability is a coin flip and may not stop early
+    for budget in (10000, 25000, 100000):
+        results, precision = _run(108.0, 108.0, spread=-3.5, total=219.5, budget=budget)
+
+        assert precision["target_half_width"] == round(precision_target_for_budget(budget), 5)
+        assert precision["iterations_used"] == budget
+        assert len(results["margins"]) == budget
+
+
+def test_lopsided_lines_stop_early_in_small_batches():
+    _, precision = _run(118.0, 100.0, spread=-2.5, total=190.5, budget=50000)
+
+    assert precision["converged"]
+    assert precision["iterations_used"] < 50000
+    assert precision["iterations_used"] % CONVERGENCE_BATCH_SIZE == 0
+
+
+def test_precision_target_for_budget():
+    assert precision_target_for_budget(10000) == pytest.approx(0.0098)
+    assert precision_target_for_budget(100000) == pytest.approx(0.0031, abs=1e-4)
+
+
+def test_fixed_mode_is_single_batch():
+    calls = []
+
+    class CountingStrategy(HighScoringStrategy):
+        def simulate_game(self, *args, **kwargs):
+            calls.append(args[2])
+            return super().simulate_game(*args, **kwargs)
+
+    context = {**NBA, "current_spread": -2.5, "total_line": 190.5}
+    _, fixed = simulate_to_precision(
+        CountingStrategy(), 118.0, 100.0, 50000, context, np.random.default_rng(11), adaptive=False
+    )
+    assert calls == [50000]
+    assert fixed["iterations_used"] == 50000 and not fixed["adaptive"]
@@ -0,0 +1,241 @@
+import asyncio
+import copy
+import threading
+import time
+
+from pymongo.errors import DuplicateKeyError
+
+from services.ai_analyzer_cache import ExplanationCache
+from services.ai_analyzer_schemas import AnalyzerOutput, AnalyzerRequest, BottomLine, MarketState
+from services.ai_analyzer_service import AnalyzerService, prewarm_slate_explanations
+
+
+class FakeCollection:
+    """Just enough of a pymongo collection for the analyzer cache"""
+
+    def __init__(self, docs=None):
+        self.docs = {d.get("_id", i): copy.deepcopy(d) for i, d in enumerate(docs or [])}
+        self.lock = threading.Lock()
+
+    def _matches(self, doc, query):
+        for key, cond in query.items():
+            value = doc.get(key)
+            if isinstance(cond, dict):
+                if "$gt" in cond and not (value is not None and value > cond["$gt"]):
+                    return False
+                if "$lte" in cond and not (value is not None and value <= cond["$lte"]):
+                    return False
+                if "$in" in cond and value not in cond["$in"]:
+                    return False
+            elif value != cond:
+                return False
+        return True
+
+    def find_one(self, query, projection=None):
+        with self.lock:
+            found = [d for d in self.docs.values() if self._matches(d, query)]
+            return copy.deepcopy(found[0]) if found else None
+
+    def find(self, query, projection=None):
+        with self.lock:
+            return [copy.deepcopy(d) for d in self.docs.values() if self._matches(d, query)]
+
+    def insert_one(self, doc):
+        with self.lock:
+            if doc["_id"] in self.docs:
+                raise DuplicateKeyError("duplicate")
+            self.docs[doc["_id"]] = copy.deepcopy(doc)
+
+    def update_one(self, query, update, upsert=False):
+        with self.lock:
+            doc = self.docs.setdefault(query["_id"], {"_id": query["_id"]})
+            doc.update(copy.deepcopy(update["$set"]))
+
+    def delete_one(self, query):
+        with self.lock:
+            doc = self.docs.get(query["_id"])
+            if doc is not None and self._matches(doc, query):
+                del self.docs[query["_id"]]
+
+    def create_index(self, *args, **kwargs):
+        pass
+
+
+class FakeDB:
+    def __init__(self, games):
+        self.autonomous_edge_waves = FakeCollection(games)
+        self.analyzer_audit = FakeCollection()
+
+
+class FakeAuditLogger:
+    def __init__(self):
+        self.entries = []
+
+    def log(self, **kwargs):
+        self.entries.append(kwargs)
+        return f"audit-{len(self.entries)}"
+
+
+class StubLLMClient:
+    """Counts calls; blocks briefly like a real OpenAI round trip"""
+
+    model = "stub-llm"
+
+    def __init__(self, delay=0.05, succeed=True):
+        self.delay = delay
+        self.succeed = succeed
+        self.calls = []
+
+    def explain(self, analyzer_input):
+        self.calls.append(analyzer_input.game.home)
+        time.sleep(self.delay)
+        output = AnalyzerOutput(
+            headline=f"{analyzer_input.game.away} at {analyzer_input.game.home} explained",
+            what_model_sees=["The model sees a gap."],
+            key_risks=["Variance is real."],
+            sharp_interpretation=["Sharps agree."],
+            bottom_line=BottomLine(
+                state_alignment=analyzer_input.state,
+                recommended_behavior="Follow the model state.",
+                do_not_do=["Do not chase."],
+            ),
+        )
+        return {"output": output, "success": self.succeed, "tokens_used": 42,
+                "fallback_triggered": not self.succeed}
+
+    def get_stats(self):
+        return {"calls": len(self.calls)}
+
+
+def _game(game_id, home):
+    return {"game_id": game_id, "sport": "NBA", "home_team": home, "away_team": "Celtics",
+            "start_time_utc": "2026-10-16T23:00:00Z", "state": "EDGE",
+            "metrics": {"edge_pts": 3.1, "volatility": "LOW", "confidence_flag": "STABLE"}}
+
+
+def _service(db, llm, cache=None):
+    return AnalyzerService(db=db, llm_client=llm, audit_logger=FakeAuditLogger(), explanation_cache=cache)
+
+
+def test_concurrent_misses_share_one_llm_call():
+    db = FakeDB([_game("g1", "Lakers")])
+    llm = StubLLMClient()
+    service = _service(db, llm)
+
+    async def burst():
+        request = AnalyzerRequest(game_id="g1", sport="NBA")
+        return await asyncio.gather(*(service.explain(request) for _ in range(8)))
+
+    responses = asyncio.run(burst())
+    assert len(llm.calls) == 1
+    assert all(r.success for r in responses)
+    assert sum(not r.cached for r in responses) == 1 and len(service.audit_logger.entries) == 1
+    assert responses[0].explanation.headline == "Celtics at Lakers explained"
+    assert service.get_stats()["cache"]["coalesced"] == 7
+
+    # Fallbacks are not cached: the next request tries the LLM again
+    failing = _service(db, StubLLMClient(delay=0, succeed=False))
+    for _ in range(2):
+        response = asyncio.run(failing.explain(AnalyzerRequest(game_id="g1", sport="NBA")))
+        assert not response.success and not response.cached
+    assert len(failing.llm_client.calls) == 2
+
+
+def test_local_layer_is_bounded_lru_with_ttl():
+    now = [0.0]
+    cache = ExplanationCache(ttl_seconds=60, max_entries=2, clock=lambda: now[0])
+    cache.put("a", {"v": 1})
+    cache.put("b", {"v": 2})
+    assert cache.get("a") == {"v": 1}  # a is now most recently used
+    cache.put("c", {"v": 3})
+    assert cache.get("b") is None and cache.get("a") == {"v": 1}
+    assert cache.stats()["evictions"] == 1 and cache.stats()["local_size"] == 2
+
+    now[0] += 61
+    assert cache.get("a") is None and cache.get("c") is None
+    assert cache.stats()["local_size"] == 0
+
+
+def test_shared_layer_serves_other_workers_and_prewarm():
+    db = FakeDB([_game("g1", "Lakers"), _game("g2", "Knicks"), _game("g3", "Suns")])
+    shared = FakeCollection()
+    warm_llm, cold_llm = StubLLMClient(delay=0), StubLLMClient(delay=0)
+    worker_a = _service(db, warm_llm, ExplanationCache(collection=shared))
+    worker_b = _service(db, cold_llm, ExplanationCache(collection=shared))
+
+    summary = asyncio.run(prewarm_slate_explanations(["g1", "g2", "g3"], service=worker_a, concurrency=2))
+    assert summary == {"requested": 3, "generated": 3, "cached": 0, "failed": 0}
+    assert sorted(warm_llm.calls) == ["Knicks", "Lakers", "Suns"]
+    assert not any(key.startswith("lease:") for key in shared.docs)
+
+    response = asyncio.run(worker_b.explain(AnalyzerRequest(game_id="g2", sport="NBA")))
+    assert response.success and response.cached
+    assert response.explanation.bottom_line.state_alignment == MarketState.EDGE
+    assert cold_llm.calls == [] and worker_b.get_stats()["cache"]["shared_hits"] == 1
+
+
+def test_worker_waits_for_another_workers_lease():
+    shared = FakeCollection()
+    cache = ExplanationCache(collection=shared, lease_seconds=5, poll_interval_seconds=0.01)
+    other_worker = ExplanationCache(collection=shared)
+    assert other_worker._acquire_lease("h1")
+
+    async def scenario():
+        async def finish_elsewhere():
+            await asyncio.sleep(0.05)
+            other_worker.put("h1", {"v": "from-other-worker"})
+
+        async def compute():
+            raise AssertionError("should reuse the other worker's result")
+
+        result, _ = await asyncio.gather(cache.get_or_compute("h1", compute), finish_elsewhere())
+        return result
+
+    assert asyncio.run(scenario()) == ({"v": "from-other-worker"}, True, False)
+    assert cache.stats()["lease_waits"] == 1
+
+
+def test_prewarmed_explanations_outlive_the_request_ttl():
+    now = [1_000_000.0]
+    shared = FakeCollection()
+    db = FakeDB([_game("g1", "Lakers"), _game("g2", "Knicks")])
+    llm = StubLLMClient(delay=0)
+    cache = ExplanationCache(collection=shared, ttl_seconds=300, clock=lambda: now[0])
+    service = AnalyzerService(db=db, llm_client=llm, audit_logger=FakeAuditLogger(),
+                              explanation_cache=cache, prewarm_ttl_seconds=3600)
+
+    # g2 was already explained for a user (request TTL); pre-warm extends it
+    asyncio.run(service.explain(AnalyzerRequest(game_id="g2", sport="NBA")))
+    summary = asyncio.run(service.prewarm([{"game_id": "g1", "sport": "NBA"}, {"game_id": "g2", "sport": "NBA"}]))
+    assert summary["generated"] == 1 and summary["cached"] == 1
+
+    now[0] += 1800
+    responses = [asyncio.run(service.explain(AnalyzerRequest(game_id=g, sport="NBA"))) for g in ("g1", "g2")]
+    assert all(r.cached for r in responses)
+    assert len(llm.calls) == 2
+
+    other_worker = ExplanationCache(collection=shared, clock=lambda: now[0])
+    assert len([k for k in shared.docs if other_worker.get(k) is not None]) == 2
+
+
+def test_local_layer_is_safe_across_threads():
+    cache = ExplanationCache(max_entries=50)
+    errors = []
+
+    def hammer(offset):
+        try:
+            for i in range(2000):
+                key = f"h{(i + offset) % 120}"
+                cache.put(key, {"v": i})
+                cache.get(key)
+        except Exception as e:  # OrderedDict mutated during iteration / KeyError
+            errors.append(e)
+
+    threads = [threading.Thread(target=hammer, args=(n * 7,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert cache.stats()["local_size"] <= 50
@@ -1,4 +1,14 @@
-from services.canonical_parlay_service import CanonicalParlayService
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from core.compute_market_decision import MarketDecisionComputer
+from core.joint_parlay_pricing import JointSampleSketch, leg_spec_from_pick, price_joint
+from core.market_decision import GameDecisions
+from core.parlay_architect import ParlayRequest, build_parlay
+from services import joint_sample_store
+from services.canonical_parlay_service import CanonicalParlayService, candidates_to_core_legs
 
 
 class FakeCursor:
@@ -89,3 +99,86 @@ def test_resolve_decision_ids_fails_fast_on_invalid_id():
         assert False, "Expected KeyError"
     except KeyError as exc:
         assert "invalid decision_id" in str(exc)
+
+
+def _computed_record(game_id: str, home_cover_probability: float, model_spread_home: float):
+    """decision_records row as DecisionRecordStore persists a computed GameDecisions bundle"""
+    home_id, away_id = f"{game_id}_home", f"{game_id}_away"
+    now = datetime.now(timezone.utc).isoformat()
+    odds_snapshot = {
+        "timestamp": now,
+        "spread_lines": {home_id: {"line": -3.5, "odds": -110}, away_id: {"line": 3.5, "odds": -110}},
+        "total_lines": {"line": 221.5, "odds": -110},
+    }
+    sim_result = {
+        "simulation_id": f"sim_{game_id}",
+        "model_spread_home_perspective": model_spread_home,
+        "simulation_market_spread_home": -3.5,
+        "home_cover_probability": home_cover_probability,
+        "rcl_total": 226.0,
+        "simulation_market_total": 221.5,
+        "over_probability": 0.6,
+        "volatility": "LOW",
+        "total_injury_impact": 0,
+        "computed_at": now,
+    }
+    config = {"profile": "balanced", "edge_threshold": 2.0, "lean_threshold": 0.5,
+              "prob_threshold": 0.55, "min_prob_gap_for_lean": 0.01}
+    competitors = {home_id: "Home Team", away_id: "Away Team"}
+
+    computer = MarketDecisionComputer("NBA", game_id, f"odds_{game_id}")
+    spread = computer.compute_spread(odds_snapshot, sim_result, config, competitors)
+    total = computer.compute_total(odds_snapshot, sim_result, config, competitors)
+    decisions = GameDecisions(
+        spread=spread,
+        total=total,
+        home_team_name="Home Team",
+        away_team_name="Away Team",
+        inputs_hash=spread.debug.inputs_hash,
+        decision_version="1.0.0",
+        computed_at=now,
+    )
+    return {"event_id": game_id, "game_id": game_id, "league": "NBA", "payload": decisions.model_dump(mode="json")}
+
+
+def _candidates(records):
+    service = CanonicalParlayService(decision_records_collection=FakeCollection(records))
+    return [
+        service._to_candidate(record, market_item["market_key"], market_item["decision"])
+        for record in records
+        for market_item in service._iter_market_decisions(record)
+    ]
+
+
+def test_computed_spread_picks_get_home_away_side_for_joint_pricing():
+    home_pick, away_pick = _computed_record("g1", 0.62, -7.0), _computed_record("g2", 0.38, 2.0)
+    assert home_pick["payload"]["spread"]["pick"]["side"] is None
+
+    legs = {(c["event_id"], c["pick_type"]): c for c in _candidates([home_pick, away_pick])}
+
+    assert (legs["g1", "spread"]["side"], legs["g1", "spread"]["line"]) == ("HOME", -3.5)
+    assert (legs["g2", "spread"]["side"], legs["g2", "spread"]["line"]) == ("AWAY", 3.5)
+    assert (legs["g1", "total"]["side"], legs["g1", "total"]["line"]) == ("OVER", 221.5)
+    assert all(leg_spec_from_pick(leg) is not None for leg in legs.values())
+
+
+def test_build_parlay_prices_same_game_legs_on_stored_samples(monkeypatch):
+    rng = np.random.default_rng(11)
+    sketches = {}
+    for game_id in ("g1", "g2"):
+        home, away = rng.normal(112, 11, 20000), rng.normal(107, 11, 20000)
+        sketches[game_id] = JointSampleSketch.from_samples(home - away, home + away)
+    monkeypatch.setattr(joint_sample_store, "load_joint_sketches", lambda event_ids: sketches)
+
+    candidates = _candidates([_computed_record("g1", 0.62, -7.0), _computed_record("g2", 0.38, 2.0)])
+    result = build_parlay(
+        candidates_to_core_legs(candidates),
+        ParlayRequest(profile="speculative", legs=4, allow_same_event=True, seed=7),
+        correlation_fn=joint_sample_store.leg_correlation_factor,
+    )
+
+    expected = price_joint([leg_spec_from_pick(c) for c in candidates], sketches)
+    assert result.status == "PARLAY"
+    assert sorted(expected.same_game_events) == ["g1", "g2"]
+    assert result.correlation_factor == pytest.approx(expected.correlation_factor)
+    assert result.correlation_factor != pytest.approx(1.0, abs=1e-3)
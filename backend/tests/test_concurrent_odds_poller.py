@@ -0,0 +1,91 @@
+import asyncio
+
+import integrations.odds_api as odds_api
+import services.scheduler as scheduler
+from integrations.odds_api import OddsApiError, fetch_odds_async
+
+
+class FakeResponse:
+    def __init__(self, status, body):
+        self.status = status
+        self._body = body
+
+    async def text(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    """aiohttp.ClientSession stand-in: first response per key can be a quota error"""
+
+    def __init__(self, exhausted_keys=()):
+        self.exhausted_keys = set(exhausted_keys)
+        self.keys_used = []
+
+    def get(self, url, params=None):
+        self.keys_used.append(params["apiKey"])
+        if params["apiKey"] in self.exhausted_keys:
+            return FakeResponse(401, '{"error_code": "OUT_OF_USAGE_CREDITS"}')
+        return FakeResponse(200, '[{"id": "evt"}]')
+
+
+def _raw_event(sport, region):
+    return {
+        "id": f"{sport}-{region}",
+        "sport_key": sport,
+        "commence_time": "2026-01-01T00:00:00Z",
+        "home_team": "H",
+        "away_team": "A",
+        "bookmakers": [],
+    }
+
+
+def test_sports_and_regions_fan_out_under_concurrency_cap(monkeypatch):
+    in_flight = {"now": 0, "peak": 0}
+    upserts = []
+
+    async def fake_fetch(session, sport, region, markets, odds_format):
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        if region == "eu":
+            raise OddsApiError("region down")
+        return [_raw_event(sport, region)]
+
+    def fake_upsert(coll, events):
+        upserts.append(events)
+        return {"changed": len(events), "unchanged": 0, "written": len(events)}
+
+    monkeypatch.setattr(scheduler, "upsert_events_diff", fake_upsert)
+
+    totals = asyncio.run(scheduler.poll_all_sports_async(
+        ["basketball_nba", "icehockey_nhl"], regions=["us", "uk", "eu"],
+        concurrency=2, session=object(), fetch=fake_fetch,
+    ))
+
+    assert totals["events"] == 4  # eu failures are skipped, other regions still land
+    assert len(upserts) == 2  # one upsert per sport
+    assert in_flight["peak"] == 2
+
+
+def test_concurrent_quota_failures_rotate_key_once(monkeypatch):
+    keys = ["key-a", "key-b", "key-c"]
+    monkeypatch.setattr(odds_api, "ALL_API_KEYS", keys)
+    monkeypatch.setattr(odds_api, "_current_key_index", 0)
+    monkeypatch.setattr(odds_api, "_last_working_key", "key-a")
+    session = FakeSession(exhausted_keys={"key-a"})
+
+    async def scenario():
+        return await asyncio.gather(*[fetch_odds_async(session, sport="basketball_nba") for _ in range(4)])
+
+    results = asyncio.run(scenario())
+
+    assert all(r == [{"id": "evt"}] for r in results)
+    assert odds_api._get_current_api_key() == "key-b"
+    assert "key-c" not in session.keys_used
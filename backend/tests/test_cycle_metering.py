@@ -0,0 +1,128 @@
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from services.cycle_metering import build_metering_pipeline, charge_from_pre_image, meter_cycle
+
+_MISSING = object()
+
+
+def _eval(expr, doc):
+    """Just the aggregation operators the metering pipeline uses"""
+    if isinstance(expr, str) and expr.startswith("$"):
+        return doc.get(expr[1:], _MISSING)
+    if not isinstance(expr, dict):
+        return expr
+    (op, args), = expr.items()
+    values = [_eval(a, doc) for a in args] if op != "$cond" else None
+    if op == "$ifNull":
+        return values[1] if values[0] in (_MISSING, None) else values[0]
+    if op == "$cond":
+        return _eval(args[1] if _eval(args[0], doc) else args[2], doc)
+    if op == "$gt":
+        return values[0] > values[1]
+    if op == "$lt":
+        return values[0] < values[1]
+    if op == "$add":
+        return sum(values)
+    if op == "$multiply":
+        return values[0] * values[1]
+    raise NotImplementedError(op)
+
+
+class FakeEntitlements:
+    """find_one_and_update with an update pipeline, applied atomically"""
+
+    def __init__(self, docs=None):
+        self.docs = {d["user_id"]: copy.deepcopy(d) for d in docs or []}
+        self.round_trips = 0
+        self._lock = threading.Lock()
+
+    def find_one_and_update(self, query, pipeline, projection=None, upsert=False, return_document=None):
+        with self._lock:
+            self.round_trips += 1
+            before = self.docs.get(query["user_id"])
+            if before is None and not upsert:
+                return None
+            doc = copy.deepcopy(before) if before is not None else dict(query)
+            for stage in pipeline:
+                (op, spec), = stage.items()
+                if op == "$set":
+                    doc.update({k: _eval(v, doc) for k, v in spec.items()})
+                elif op == "$unset":
+                    for field in spec:
+                        doc.pop(field, None)
+            self.docs[query["user_id"]] = doc
+            if before is None:
+                return None
+            return {k: v for k, v in before.items() if k in projection}
+
+
+def test_fresh_user_is_bootstrapped_and_charged_in_one_round_trip():
+    col = FakeEntitlements()
+    charge = meter_cycle("u1", "intelligence_preview", 5000, 1000, collection=col)
+
+    assert col.round_trips == 1
+    assert charge.charged and charge.used == 1000 and charge.allocated == 5000
+    assert charge.remaining == 4000
+    row = col.docs["u1"]
+    assert row["tokens_used_current_period"] == 1000
+    assert row["tokens_allocated_current_period"] == 5000
+    assert row["preview_cycles_used_lifetime"] == 1000
+    assert row["active"] is True and row["tier"] == "intelligence_preview"
+    assert not {"_alloc", "_used", "_ok"} & set(row)
+
+
+def test_missing_allocation_is_seeded_and_existing_fields_kept():
+    col = FakeEntitlements([{"user_id": "u1", "tier": "syndicate", "active": False,
+                             "tokens_allocated_current_period": 0, "tokens_used_current_period": 2000}])
+    charge = meter_cycle("u1", "syndicate", 10000, 1000, collection=col)
+
+    assert charge.charged and charge.used == 3000 and charge.allocated == 10000
+    row = col.docs["u1"]
+    assert row["tokens_allocated_current_period"] == 10000
+    assert row["active"] is False
+    assert "preview_cycles_used_lifetime" not in row
+
+
+def test_exhausted_budget_is_not_charged():
+    col = FakeEntitlements([{"user_id": "u1", "tokens_allocated_current_period": 3000,
+                             "tokens_used_current_period": 3000}])
+    charge = meter_cycle("u1", "preview", 3000, 1000, collection=col)
+
+    assert not charge.charged
+    assert charge.used == 3000 and charge.remaining == 0
+    assert col.docs["u1"]["tokens_used_current_period"] == 3000
+    assert col.docs["u1"].get("preview_cycles_used_lifetime", 0) == 0
+
+
+def test_concurrent_views_never_overspend():
+    col = FakeEntitlements()
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        charges = list(pool.map(
+            lambda _: meter_cycle("u1", "intelligence_preview", 5000, 1000, collection=col),
+            range(40),
+        ))
+
+    assert sum(c.charged for c in charges) == 5
+    assert col.docs["u1"]["tokens_used_current_period"] == 5000
+    assert col.docs["u1"]["preview_cycles_used_lifetime"] == 5000
+    assert col.round_trips == 40
+    # Every charged call saw a distinct post-update balance
+    assert sorted(c.used for c in charges if c.charged) == [1000, 2000, 3000, 4000, 5000]
+
+
+@pytest.mark.parametrize("used, charged", [(0, True), (7999, True), (8000, False)])
+def test_pre_image_replay_matches_pipeline(used, charged):
+    before = {"tokens_allocated_current_period": 10000, "tokens_used_current_period": used}
+    doc = {"user_id": "u1", **before}
+    for stage in build_metering_pipeline("u1", "syndicate", 10000, 500, 80, "now"):
+        (op, spec), = stage.items()
+        if op == "$set":
+            doc.update({k: _eval(v, doc) for k, v in spec.items()})
+
+    charge = charge_from_pre_image(before, 10000, 500, 80)
+    assert charge.charged is charged
+    assert charge.used == doc["tokens_used_current_period"]
@@ -0,0 +1,74 @@
+from services.decision_classification_cache import (
+    DecisionClassificationCache,
+    fetch_latest_classifications,
+    latest_classifications_pipeline,
+)
+
+
+class FakeDecisionRecords:
+    """Evaluates the latest-per-event pipeline in Python and counts round trips"""
+
+    def __init__(self, records):
+        self.records = records
+        self.aggregate_calls = 0
+
+    def aggregate(self, pipeline):
+        self.aggregate_calls += 1
+        ids = pipeline[0]["$match"]["$or"][0]["event_id"]["$in"]
+        latest = {}
+        for rec in sorted(self.records, key=lambda r: r["created_at"], reverse=True):
+            key = rec.get("event_id") if rec.get("event_id") in ids else rec.get("game_id")
+            if key not in ids or key in latest:
+                continue
+            payload = rec.get("payload") or {}
+            latest[key] = {
+                "_id": key,
+                "record_id": rec["record_id"],
+                "spread_classification": (payload.get("spread") or {}).get("classification"),
+                "total_classification": (payload.get("total") or {}).get("classification"),
+            }
+        return list(latest.values())
+
+
+def _record(record_id, created_at, spread=None, total=None, event_id=None, game_id=None):
+    payload = {"spread": {"classification": spread} if spread else {}, "total": {"classification": total} if total else {}}
+    return {"record_id": record_id, "event_id": event_id, "game_id": game_id, "created_at": created_at, "payload": payload}
+
+
+def test_latest_record_per_event_with_fail_closed_default():
+    records = FakeDecisionRecords([
+        _record("r1", "2026-01-01T00:00:00", spread="LEAN", event_id="e1", game_id="e1"),
+        _record("r2", "2026-01-01T01:00:00", spread="EDGE", event_id="e1", game_id="e1"),
+        _record("r3", "2026-01-01T00:00:00", total="MARKET_ALIGNED", game_id="e2"),
+        _record("r4", "2026-01-01T00:00:00", event_id="e3"),
+    ])
+
+    result = fetch_latest_classifications(["e1", "e2", "e3", "e4"], collection=records)
+
+    assert result == {"e1": "EDGE", "e2": "MARKET_ALIGNED", "e3": "BLOCKED", "e4": "BLOCKED"}
+    assert records.aggregate_calls == 1
+
+
+def test_pipeline_groups_on_requested_id():
+    group = latest_classifications_pipeline(["e1"])[2]["$group"]
+    assert group["_id"] == {"$cond": [{"$in": ["$event_id", ["e1"]]}, "$event_id", "$game_id"]}
+
+
+def test_cache_serves_hits_and_invalidates_on_version_bump():
+    now = [0.0]
+    records = FakeDecisionRecords([_record("r1", "2026-01-01T00:00:00", spread="LEAN", event_id="e1")])
+    cache = DecisionClassificationCache(ttl_seconds=15, clock=lambda: now[0])
+
+    assert cache.get_many(["e1", "e2"], collection=records) == {"e1": "LEAN", "e2": "BLOCKED"}
+    assert cache.get_many(["e1", "e2"], collection=records) == {"e1": "LEAN", "e2": "BLOCKED"}
+    assert records.aggregate_calls == 1
+
+    records.records.append(_record("r2", "2026-01-01T02:00:00", spread="EDGE", event_id="e2"))
+    cache.bump_version("e2")
+    assert cache.get_many(["e1", "e2"], collection=records) == {"e1": "LEAN", "e2": "EDGE"}
+    assert records.aggregate_calls == 2
+
+    now[0] = 16.0
+    cache.get_many(["e1"], collection=records)
+    assert records.aggregate_calls == 3
+    assert cache.stats()["hits"] == 3
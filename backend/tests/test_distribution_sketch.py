@@ -0,0 +1,95 @@
+import json
+
+import numpy as np
+import pytest
+
+from core.distribution_sketch import DistributionSketch, reprice_simulation
+from core.numerical_accuracy import OverUnderAnalysis
+import services.odds_refresh_service as odds_refresh_service
+
+
+def _samples(discrete):
+    rng = np.random.default_rng(7)
+    home = rng.normal(112, 12, 20000)
+    away = rng.normal(109, 12, 20000)
+    if discrete:
+        home, away = np.round(home), np.round(away)
+    return home - away, home + away
+
+
+@pytest.mark.parametrize("discrete", [True, False])
+def test_sketch_matches_raw_samples_at_any_line(discrete):
+    margins, totals = _samples(discrete)
+    doc = DistributionSketch.from_samples(margins, totals).to_doc()
+    assert len(json.dumps(doc)) < 3000  # vs ~400KB of raw samples
+    sketch = DistributionSketch.from_simulation({"distribution_sketch": json.loads(json.dumps(doc))})
+    assert sketch.margin.discrete is discrete
+
+    for spread_home in (-7.5, -3.0, -2.5, 0.0, 4.5):
+        priced = sketch.price_spread(spread_home)
+        assert priced["p_cover_home"] == round(float(np.mean(margins + spread_home > 0)), 4)
+        assert priced["p_push"] == round(float(np.mean(margins + spread_home == 0)), 4)
+
+    for line in (215.5, 221.0, 224.5):
+        ou = OverUnderAnalysis.from_simulation(totals, line)
+        assert sketch.price_total(line)["p_over"] == round(ou.over_probability, 4)
+
+    wins = np.mean(margins > 0) + np.mean(margins == 0) / 2
+    assert sketch.price_moneyline()["p_win_home"] == round(float(wins), 4)
+
+    # Off-grid alt line is interpolated, not far off
+    assert abs(sketch.price_total(221.25)["p_over"] - float(np.mean(totals > 221.25))) < 0.01
+
+
+def test_reprice_reports_edges_and_skips_legacy_docs():
+    margins, totals = _samples(discrete=True)
+    simulation = {"distribution_sketch": DistributionSketch.from_samples(margins, totals).to_doc()}
+
+    priced = reprice_simulation(simulation, spread_home=-2.5, total_line=220.5,
+                                spread_odds=(-105, -115), moneyline_odds=(-150, 130))
+    assert priced["sims"] == 20000
+    spread = priced["spread"]
+    assert spread["p_cover_home"] + spread["p_cover_away"] == pytest.approx(1.0)
+    assert spread["home"]["implied_probability"] == round(105 / 205, 4)
+    assert spread["home"]["edge"] == pytest.approx(spread["p_cover_home"] - 105 / 205, abs=1e-4)
+    assert priced["total"]["over"]["implied_probability"] == round(110 / 210, 4)
+    assert set(priced["moneyline"]) == {"p_win_home", "p_win_away", "home", "away"}
+
+    assert reprice_simulation({"spread_distribution": []}, spread_home=-2.5) is None
+
+
+class FakeCollection:
+    def __init__(self, docs=None):
+        self.docs = docs or []
+        self.updates = []
+
+    def find_one(self, query, projection=None, sort=None):
+        return self.docs[0] if self.docs else None
+
+    def update_one(self, query, update):
+        self.updates.append((query, update))
+
+
+def test_odds_refresh_reprices_latest_simulation(monkeypatch):
+    margins, totals = _samples(discrete=True)
+    sims = FakeCollection([{"_id": "sim1", "distribution_sketch":
+                            DistributionSketch.from_samples(margins, totals).to_doc()}])
+    monkeypatch.setattr(odds_refresh_service, "db", {"monte_carlo_simulations": sims})
+    event = {
+        "event_id": "e1", "home_team": "Lakers", "away_team": "Celtics", "odds_timestamp": "2026-10-16T18:00:00Z",
+        "bookmakers": [{"title": "DK", "markets": [
+            {"key": "spreads", "outcomes": [{"name": "Lakers", "point": -4.5}, {"name": "Celtics", "point": 4.5}]},
+            {"key": "totals", "outcomes": [{"name": "Over", "point": 223.5}, {"name": "Under", "point": 223.5}]},
+        ]}],
+    }
+
+    repriced = odds_refresh_service.reprice_latest_simulation("e1", event)
+
+    assert repriced["spread"]["line_home"] == -4.5 and repriced["total"]["line"] == 223.5
+    assert repriced["spread"]["p_cover_home"] == round(float(np.mean(margins - 4.5 > 0)), 4)
+    assert sims.updates == [({"_id": "sim1"}, {"$set": {"repriced": repriced}})]
+
+    legacy = FakeCollection([{"_id": "sim0"}])
+    monkeypatch.setattr(odds_refresh_service, "db", {"monte_carlo_simulations": legacy})
+    assert odds_refresh_service.reprice_latest_simulation("e1", event) is None
+    assert legacy.updates == []
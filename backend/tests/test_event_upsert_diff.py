@@ -0,0 +1,134 @@
+import copy
+from datetime import datetime, timedelta, timezone
+
+import db.mongo as mongo
+from db.mongo import event_market_hashes, upsert_events_diff
+
+
+class FakeEvents:
+    """Minimal events collection: find by $in, bulk UpdateOne($set, upsert), update_many($set)"""
+
+    def __init__(self):
+        self.docs = {}
+        self.written_ops = 0
+        self.update_many_calls = []
+
+    def find(self, query, projection=None):
+        ids = query["event_id"]["$in"]
+        return [copy.deepcopy(self.docs[e]) for e in ids if e in self.docs]
+
+    def bulk_write(self, operations, ordered=True):
+        inserted = modified = 0
+        for op in operations:
+            event_id = op._filter["event_id"]
+            if event_id in self.docs:
+                modified += 1
+            else:
+                inserted += 1
+            self.docs.setdefault(event_id, {}).update(copy.deepcopy(op._doc["$set"]))
+        self.written_ops += len(operations)
+        return type("BulkResult", (), {"upserted_count": inserted, "modified_count": modified})
+
+    def update_many(self, query, update):
+        ids = query["event_id"]["$in"]
+        self.update_many_calls.append(list(ids))
+        for event_id in ids:
+            if event_id in self.docs:
+                self.docs[event_id].update(update["$set"])
+
+
+def _event(event_id, home_price, last_update="2026-01-01T00:00:00Z"):
+    return {
+        "event_id": event_id,
+        "sport_key": "basketball_nba",
+        "home_team": "H",
+        "away_team": "A",
+        "commence_time": "2026-01-02T00:00:00Z",
+        "bookmakers": [
+            {
+                "key": "draftkings",
+                "last_update": last_update,
+                "markets": [
+                    {"key": "h2h", "outcomes": [{"name": "H", "price": home_price}, {"name": "A", "price": 2.0}]},
+                    {"key": "spreads", "outcomes": [{"name": "H", "price": 1.91, "point": -3.5}]},
+                ],
+            },
+            {
+                "key": "fanduel",
+                "last_update": last_update,
+                "markets": [{"key": "h2h", "outcomes": [{"name": "H", "price": 1.8}]}],
+            },
+        ],
+    }
+
+
+def _collection(monkeypatch):
+    events = FakeEvents()
+    monkeypatch.setattr(mongo, "db", {"events": events})
+    return events
+
+
+def test_hash_ignores_last_update_and_outcome_order():
+    first = _event("e1", 1.9)
+    second = _event("e1", 1.9, last_update="2026-01-01T00:05:00Z")
+    second["bookmakers"][0]["markets"][0]["outcomes"].reverse()
+
+    assert event_market_hashes(first)[0] == event_market_hashes(second)[0]
+    assert event_market_hashes(first)[0] != event_market_hashes(_event("e1", 1.95))[0]
+
+
+def test_only_changed_events_are_written(monkeypatch):
+    events = _collection(monkeypatch)
+
+    first = upsert_events_diff("events", [_event("e1", 1.9), _event("e2", 1.7)])
+    assert first["changed"] == 2 and first["inserted"] == 2
+
+    repoll = upsert_events_diff("events", [
+        _event("e1", 1.9, last_update="2026-01-01T00:05:00Z"),
+        _event("e2", 1.75),
+    ])
+
+    assert repoll["unchanged"] == 1
+    assert repoll["changed"] == 1
+    assert repoll["changed_bookmakers"] == 1  # only draftkings moved
+    assert repoll["modified"] == 1
+    assert events.written_ops == 3
+    assert events.docs["e2"]["bookmakers"][0]["markets"][0]["outcomes"][0]["price"] == 1.75
+
+
+def test_unchanged_poll_only_bumps_last_seen(monkeypatch):
+    events = _collection(monkeypatch)
+    monkeypatch.setattr(mongo, "now_utc", lambda: datetime(2026, 1, 1, 0, 0, tzinfo=timezone.utc))
+    upsert_events_diff("events", [_event("e1", 1.9)])
+    assert events.docs["e1"]["odds_last_seen_at"] == "2026-01-01T00:00:00+00:00"
+
+    monkeypatch.setattr(mongo, "now_utc", lambda: datetime(2026, 1, 1, 0, 5, tzinfo=timezone.utc))
+    stats = upsert_events_diff("events", [_event("e1", 1.9), _event("e1", 1.9)])
+
+    assert stats == {**stats, "changed": 0, "unchanged": 1, "written": 0}
+    assert events.written_ops == 1
+    assert events.update_many_calls == [["e1"]]
+    assert events.docs["e1"]["odds_last_seen_at"] == "2026-01-01T00:05:00+00:00"
+    assert events.docs["e1"]["bookmakers"][0]["last_update"] == "2026-01-01T00:00:00Z"
+
+
+def test_last_seen_keeps_unchanged_lines_fresh_for_integrity_checks():
+    from core.market_line_integrity import IntegrityStatus, MarketLineIntegrityVerifier
+    from integrations.odds_api import extract_market_lines
+
+    now = datetime.now(timezone.utc)
+    event = _event("e1", 1.9, last_update=(now - timedelta(days=2)).isoformat())
+    event["bookmakers"][0]["markets"].append(
+        {"key": "totals", "outcomes": [{"name": "Over", "price": 1.91, "point": 220.5}]}
+    )
+    stale = MarketLineIntegrityVerifier.verify_market_context(
+        "e1", "basketball_nba", {**extract_market_lines(event), "event_id": "e1"}
+    )
+    assert stale.status == IntegrityStatus.STALE_LINE
+
+    event["odds_last_seen_at"] = now.isoformat()
+    fresh = MarketLineIntegrityVerifier.verify_market_context(
+        "e1", "basketball_nba", {**extract_market_lines(event), "event_id": "e1"}
+    )
+    assert fresh.status == IntegrityStatus.OK
+    assert fresh.should_refresh is False
@@ -165,3 +165,24 @@ def test_grade_published_prediction_writes_grading_and_observability(monkeypatch
     assert fake_obs.truth_calls == 1
     assert fake_obs.clv_calls == 1
     assert fake_obs.lifecycle_calls == 1
+
+
+def test_void_regrade_reverses_the_earlier_trust_metrics_contribution(monkeypatch):
+    import services.trust_metrics_store as trust_store
+
+    recorded = []
+
+    class RecordingStore:
+        def record_grading_row(self, row):
+            recorded.append((row["graded_id"], getattr(row["bet_status"], "value", row["bet_status"])))
+
+    monkeypatch.setattr(trust_store, "get_trust_metrics_store", lambda: RecordingStore())
+    monkeypatch.setattr(grading_module, "observability_service", FakeObservability())
+    svc = make_service()
+    existing = {"graded_id": "g_old", "publish_id": "pub_1", "bet_status": "SETTLED", "result_code": "WIN"}
+
+    graded_id = svc._grade_as_void(
+        "pub_1", {"prediction_id": "pred_1", "event_id": "event_1"}, {}, "POSTPONED", existing
+    )
+
+    assert recorded == [(graded_id, "VOID"), ("g_old", "VOID")]
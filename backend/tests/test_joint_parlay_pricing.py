@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+
+from core.joint_parlay_pricing import (
+    JointSampleSketch,
+    ParlayLegSpec,
+    leg_spec_from_pick,
+    price_joint,
+)
+from services import joint_sample_store
+
+
+def _game(seed, n=20000, discrete=False):
+    rng = np.random.default_rng(seed)
+    home = rng.normal(110, 11, n)
+    away = rng.normal(106, 11, n)
+    if discrete:
+        home, away = np.round(home), np.round(away)
+    return home - away, home + away
+
+
+def test_same_game_legs_match_raw_samples():
+    margins, totals = _game(1)
+    sketch = JointSampleSketch.from_samples(margins, totals)
+    legs = [
+        ParlayLegSpec("g1", "SPREAD", "HOME", -3.5),
+        ParlayLegSpec("g1", "TOTAL", "OVER", 215.5),
+    ]
+
+    price = price_joint(legs, {"g1": sketch})
+
+    cover = margins - 3.5 > 0
+    over = totals > 215.5
+    assert sketch.n == margins.size
+    assert sketch.counts.size < margins.size
+    assert price.leg_probabilities == pytest.approx([cover.mean(), over.mean()])
+    assert price.joint_probability == pytest.approx((cover & over).mean())
+    assert price.independent_probability == pytest.approx(cover.mean() * over.mean())
+    assert price.same_game_events == ["g1"]
+
+
+def test_opposing_same_game_legs_are_negatively_correlated():
+    margins, totals = _game(2)
+    sketch = JointSampleSketch.from_samples(margins, totals)
+    legs = [
+        ParlayLegSpec("g1", "MONEYLINE", "HOME"),
+        ParlayLegSpec("g1", "SPREAD", "AWAY", 6.5),
+    ]
+
+    price = price_joint(legs, {"g1": sketch})
+
+    assert price.joint_probability == pytest.approx(((margins > 0) & (margins < 6.5)).mean())
+    assert price.correlation_factor < 1.0
+
+
+def test_cross_game_legs_multiply():
+    sketches = {
+        "g1": JointSampleSketch.from_samples(*_game(3)),
+        "g2": JointSampleSketch.from_samples(*_game(4)),
+    }
+    legs = [
+        ParlayLegSpec("g1", "TOTAL", "UNDER", 216.5),
+        ParlayLegSpec("g2", "SPREAD", "HOME", -2.5),
+    ]
+
+    price = price_joint(legs, sketches)
+
+    assert price.joint_probability == pytest.approx(price.independent_probability)
+    assert price.correlation_factor == pytest.approx(1.0)
+    assert price.same_game_events == []
+
+
+def test_discrete_lines_push():
+    margins, totals = _game(5, discrete=True)
+    sketch = JointSampleSketch.from_samples(margins, totals)
+    assert sketch.discrete
+
+    price = price_joint([ParlayLegSpec("g1", "SPREAD", "HOME", -4.0)], {"g1": sketch})
+
+    assert price.joint_probability == pytest.approx((margins > 4).mean())
+    assert price.push_probability == pytest.approx((margins == 4).mean())
+
+
+def test_doc_round_trip():
+    sketch = JointSampleSketch.from_samples(*_game(6))
+    restored = JointSampleSketch.from_doc(sketch.to_doc())
+
+    assert np.array_equal(restored.margin_index, sketch.margin_index)
+    assert np.array_equal(restored.total_index, sketch.total_index)
+    assert np.array_equal(restored.counts, sketch.counts)
+    assert restored.discrete == sketch.discrete
+    assert JointSampleSketch.from_doc({**sketch.to_doc(), "version": 0}) is None
+
+
+def test_leg_spec_from_pick():
+    assert leg_spec_from_pick({"event_id": "g1", "market_type": "spread", "side": "home", "line": "-3.5"}) == \
+        ParlayLegSpec("g1", "SPREAD", "HOME", -3.5)
+    assert leg_spec_from_pick({"event_id": "g1", "pick_type": "h2h", "side": "AWAY"}) == \
+        ParlayLegSpec("g1", "MONEYLINE", "AWAY", 0.0)
+    assert leg_spec_from_pick({"event_id": "g1", "market": "TOTAL", "side": "OVER"}) is None
+    assert leg_spec_from_pick({"event_id": "g1", "market": "TOTAL", "side": "HOME", "line": 210}) is None
+
+
+def test_unpriceable_picks_fall_back_to_independence(monkeypatch):
+    sketches = {"g1": JointSampleSketch.from_samples(*_game(7))}
+    monkeypatch.setattr(joint_sample_store, "load_joint_sketches", lambda ids: sketches)
+    picks = [
+        {"event_id": "g1", "market_type": "SPREAD", "side": "HOME", "line": -3.5},
+        {"event_id": "g1", "market_type": "TOTAL", "side": "OVER", "line": 215.5},
+        {"event_id": "g2", "market_type": "TOTAL", "side": "OVER", "line": 220.5},
+        {"event_id": "g3", "market_type": "SPREAD"},
+    ]
+
+    price = joint_sample_store.price_picks(picks)
+
+    assert price.priced_legs == 2
+    assert joint_sample_store.correlation_factor(picks) == pytest.approx(price.correlation_factor)
+    assert joint_sample_store.correlation_factor(picks[2:]) == 1.0
+    assert joint_sample_store.correlation_factor(picks[2:], default=None) is None
@@ -0,0 +1,105 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from services import latency_histograms
+from services.latency_histograms import (
+    HistogramFamily,
+    RouteLatencyMiddleware,
+    StageTimings,
+    quantile_from_counts,
+)
+
+
+@pytest.fixture
+def route_family(monkeypatch):
+    family = HistogramFamily("api_request_latency_ms", "test", ("method", "route", "status"))
+    monkeypatch.setattr(latency_histograms, "ROUTE_LATENCY", family)
+    return family
+
+
+def test_quantile_interpolates_inside_bucket():
+    bounds = (10, 100, 1000)
+    # 100 observations, all in (10, 100]
+    assert quantile_from_counts(bounds, [0, 100, 0, 0], 0.5) == pytest.approx(55.0)
+    assert quantile_from_counts(bounds, [0, 0, 0, 5], 0.95) == 1000.0
+    assert quantile_from_counts(bounds, [0, 0, 0, 0], 0.95) == 0.0
+
+
+def test_render_is_cumulative_prometheus_histogram():
+    family = HistogramFamily("x_ms", "help", ("stage",), buckets=(10, 100))
+    for value in (5, 50, 50, 500):
+        family.observe(value, "persist")
+
+    lines = family.render()
+
+    assert lines[:2] == ["# HELP x_ms help", "# TYPE x_ms histogram"]
+    assert 'x_ms_bucket{stage="persist",le="10"} 1' in lines
+    assert 'x_ms_bucket{stage="persist",le="100"} 3' in lines
+    assert 'x_ms_bucket{stage="persist",le="+Inf"} 4' in lines
+    assert 'x_ms_sum{stage="persist"} 605.000' in lines
+    assert 'x_ms_count{stage="persist"} 4' in lines
+
+
+def test_stage_timings_accumulate_repeated_spans(monkeypatch):
+    family = HistogramFamily("simulation_stage_latency_ms", "test", ("sport", "stage"))
+    monkeypatch.setattr(latency_histograms, "SIMULATION_STAGE_LATENCY", family)
+
+    timings = StageTimings("basketball_nba")
+    with timings.span("market_decision"):
+        pass
+    with timings.span("market_decision"):
+        pass
+    with timings.span("strategy_simulate"):
+        pass
+    elapsed = timings.record()
+
+    assert set(elapsed) == {"market_decision", "strategy_simulate", "total"}
+    assert sum(family.merged_counts(stage="market_decision")) == 1
+    assert sum(family.merged_counts(sport="basketball_nba")) == 3
+
+
+def _run(app, scope):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(RouteLatencyMiddleware(app)(scope, receive, send))
+    return sent
+
+
+def test_middleware_labels_by_route_template(route_family):
+    async def app(scope, receive, send):
+        # What the router does once a route matches
+        scope["route"] = SimpleNamespace(path_format="/api/simulations/{event_id}")
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    for event_id in ("a", "b", "c"):
+        sent = _run(app, {"type": "http", "method": "GET", "path": f"/api/simulations/{event_id}"})
+        assert sent[0]["status"] == 200
+
+    assert sum(route_family.merged_counts(route="/api/simulations/{event_id}", status="2xx")) == 3
+    assert len(route_family.render()) == 2 + len(route_family.bounds) + 3
+
+
+def test_middleware_records_unmatched_and_failed_requests(route_family):
+    async def not_found(scope, receive, send):
+        await send({"type": "http.response.start", "status": 404, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def boom(scope, receive, send):
+        scope["route"] = SimpleNamespace(path_format="/api/boom")
+        raise RuntimeError("boom")
+
+    _run(not_found, {"type": "http", "method": "GET", "path": "/nope"})
+    with pytest.raises(RuntimeError):
+        _run(boom, {"type": "http", "method": "POST", "path": "/api/boom"})
+
+    assert sum(route_family.merged_counts(route=latency_histograms.UNMATCHED_ROUTE, status="4xx")) == 1
+    assert sum(route_family.merged_counts(route="/api/boom", status="5xx")) == 1
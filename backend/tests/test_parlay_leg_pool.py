@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from services import parlay_leg_pool
+from services.parlay_architect import parlay_architect_service
+
+
+class FakeCursor(list):
+    def sort(self, key, direction):
+        return FakeCursor(sorted(self, key=lambda d: d[key], reverse=direction < 0))
+
+
+class FakePool:
+    def __init__(self):
+        self.rows = {}
+        self.queries = []
+
+    def update_one(self, query, update, upsert=False):
+        self.rows.setdefault(query["event_id"], {}).update(update["$set"])
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+        window = query["commence_time"]
+        return FakeCursor(
+            {k: v for k, v in row.items() if k not in ("_id", "expires_at")}
+            for row in self.rows.values()
+            if row["pool_day"] in query["pool_day"]["$in"]
+            and window["$gt"] < row["commence_time"] < window["$lt"]
+            and query.get("sport_key", row["sport_key"]) == row["sport_key"]
+        )
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    fake = FakePool()
+    monkeypatch.setattr(parlay_leg_pool, "_pool", lambda: fake)
+    return fake
+
+
+def _event(event_id, sport_key, commence):
+    return {
+        "event_id": event_id,
+        "sport_key": sport_key,
+        "home_team": f"{event_id} Home",
+        "away_team": f"{event_id} Away",
+        "commence_time": commence.isoformat(),
+    }
+
+
+def _simulation(event_id, **fields):
+    return {
+        "simulation_id": f"sim_{event_id}",
+        "event_id": event_id,
+        "iterations": 10000,
+        "team_a_win_probability": 0.64,
+        "over_probability": 0.52,
+        "confidence_score": 70,
+        "pick_state": "EDGE",
+        "sharp_analysis": {"spread": {"edge_points": 3.5}, "total": {"edge_points": 1.0}},
+        "volatility_index": "LOW",
+        "distribution_sketch": {"large": "payload"},
+        **fields,
+    }
+
+
+def test_upsert_stores_scored_leg_with_compact_simulation(pool):
+    commence = datetime.now(timezone.utc) + timedelta(hours=6)
+    row = parlay_leg_pool.upsert_pool_leg(_simulation("g1"), _event("g1", "basketball_nba", commence))
+
+    assert "g1" in pool.rows and row["pool_day"] == commence.strftime("%Y-%m-%d")
+    assert row["bet_type"] == "spread" and row["probability"] == 0.64
+    assert row["confidence"] == pytest.approx(0.70) and row["edge_state"] == "EDGE"
+    assert row["tier"] == parlay_architect_service._classify_leg_tier(row["confidence"], row["ev"], row["stability"])
+    assert row["simulation"]["iterations"] == 10000
+    assert "distribution_sketch" not in row["simulation"]
+    assert row["expires_at"] == commence + timedelta(days=1)
+
+
+def test_period_simulations_are_not_pooled(pool):
+    commence = datetime.now(timezone.utc) + timedelta(hours=6)
+    assert parlay_leg_pool.upsert_pool_leg(_simulation("g1", period="1H"), _event("g1", "basketball_nba", commence)) is None
+    assert pool.rows == {}
+
+
+def test_resimulation_replaces_the_pool_row(pool):
+    event = _event("g1", "basketball_nba", datetime.now(timezone.utc) + timedelta(hours=6))
+    parlay_leg_pool.upsert_pool_leg(_simulation("g1"), event)
+    parlay_leg_pool.upsert_pool_leg(_simulation("g1", team_a_win_probability=0.30), event)
+
+    assert len(pool.rows) == 1
+    assert pool.rows["g1"]["probability"] == 0.30
+
+
+def test_pool_legs_grouped_by_day_in_one_read(pool):
+    now = datetime.now(timezone.utc)
+    for i, (sport, hours) in enumerate([
+        ("basketball_nba", 2), ("basketball_nba", 3), ("icehockey_nhl", 4), ("basketball_nba", 50),
+    ]):
+        parlay_leg_pool.upsert_pool_leg(_simulation(f"g{i}"), _event(f"g{i}", sport, now + timedelta(hours=hours)))
+    parlay_leg_pool.upsert_pool_leg(_simulation("started"), _event("started", "basketball_nba", now - timedelta(hours=1)))
+
+    nba = parlay_architect_service._get_pool_legs_by_day("basketball_nba")
+    everything = parlay_architect_service._get_pool_legs_by_day("basketball_nba", multi_sport=True)
+
+    assert len(pool.queries) == 2
+    assert "sport_key" not in pool.queries[1]
+    assert sum(len(legs) for legs in nba.values()) == 3
+    assert sum(len(legs) for legs in everything.values()) == 4
+    assert all(leg["event_id"] != "started" for legs in everything.values() for leg in legs)
+    for day, legs in everything.items():
+        assert {leg["pool_day"] for leg in legs} == {day}
+        assert [leg["commence_time"] for leg in legs] == sorted(leg["commence_time"] for leg in legs)
@@ -0,0 +1,154 @@
+import copy
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from services import phase8_observability_metrics
+from services.phase8_metric_counters import HEARTBEAT_SOURCES, MetricCounters
+
+
+def _iso(minutes_ago: float) -> str:
+    return (datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)).isoformat()
+
+
+class FakeCollection:
+    """count_documents / find / find_one with equality, $gte and single-key sort"""
+
+    def __init__(self, docs=None):
+        self.docs = [copy.deepcopy(d) for d in docs or []]
+        self.calls = 0
+
+    def _matches(self, doc, query):
+        for key, cond in query.items():
+            value = doc.get(key)
+            if isinstance(cond, dict):
+                if "$gte" in cond and (value is None or value < cond["$gte"]):
+                    return False
+            elif value != cond:
+                return False
+        return True
+
+    def count_documents(self, query):
+        self.calls += 1
+        return sum(1 for d in self.docs if self._matches(d, query))
+
+    def find(self, query=None, projection=None):
+        self.calls += 1
+        return [copy.deepcopy(d) for d in self.docs if self._matches(d, query or {})]
+
+    def find_one(self, query=None, projection=None, sort=None):
+        self.calls += 1
+        rows = [d for d in self.docs if self._matches(d, query or {})]
+        if sort:
+            key, direction = sort[0]
+            rows.sort(key=lambda d: d.get(key) or "", reverse=direction < 0)
+        return copy.deepcopy(rows[0]) if rows else None
+
+
+class FakeDatabase(dict):
+    def __missing__(self, name):
+        self[name] = FakeCollection()
+        return self[name]
+
+    @property
+    def calls(self):
+        return sum(c.calls for c in self.values())
+
+
+@pytest.fixture
+def database():
+    database = FakeDatabase()
+    database["sentinel_event_log"] = FakeCollection(
+        [{"event_type": "INTEGRITY_VIOLATION", "agent_id": "agent.sentinel.v1", "timestamp": _iso(600)}] * 3
+        + [{"event_type": "INTEGRITY_VIOLATION", "agent_id": "agent.sentinel.v1", "timestamp": _iso(5)}]
+        + [{"event_type": "BILLING_WRITE_FAIL", "timestamp": _iso(90)}]
+    )
+    database["distribution_audit_log"] = FakeCollection(
+        [{"delivered": True, "validation_result": "PASS", "agent_id": "agent.distribution.v1",
+          "sent_at_utc": _iso(30)}]
+        + [{"delivered": False, "validation_result": "FAIL", "validation_check": "snapshot_hash_consistent",
+            "agent_id": "agent.distribution.v1", "sent_at_utc": _iso(10)}]
+    )
+    database["odds_cache"] = FakeCollection([{"fetched_at": _iso(3)}])
+    return database
+
+
+def test_reconcile_counts_totals_and_recent_window(database):
+    counters = MetricCounters()
+    counters.reconcile(database)
+    series = counters.snapshot()["series"]
+
+    assert series["integrity_violation"] == {"total": 4, "recent": 1, "rate": 25.0}
+    assert series["billing_write_fail"]["total"] == 1
+    assert series["billing_write_fail"]["recent"] == 0
+    # distribution rows are dated by sent_at_utc, so they now count as recent
+    assert series["snapshot_mismatch"]["recent"] == 1
+    assert series["publish_failure"]["rate"] == 100.0
+    assert not counters.is_stale()
+
+
+def test_snapshot_does_no_database_work(database):
+    counters = MetricCounters()
+    counters.reconcile(database)
+    calls = database.calls
+
+    for _ in range(5):
+        counters.snapshot()
+    assert database.calls == calls
+
+
+def test_record_write_updates_counters_and_heartbeats(database):
+    counters = MetricCounters()
+    counters.reconcile(database)
+
+    counters.record_write("sentinel_event_log", {
+        "event_type": "INTEGRITY_VIOLATION", "agent_id": "agent.sentinel.v1", "timestamp": _iso(0),
+    })
+    counters.record_write("decision_settlement_metrics", {
+        "graded_by": "agent.grading.v1", "graded_at": _iso(0),
+    })
+    counters.record_write("distribution_audit_log", {"delivered": True, "sent_at_utc": _iso(0)})
+    snap = counters.snapshot()
+
+    assert snap["series"]["integrity_violation"]["total"] == 5
+    assert snap["series"]["integrity_violation"]["recent"] == 2
+    assert snap["series"]["publish_failure"]["total"] == 1
+    assert snap["heartbeat_silence_minutes"]["agent.grading.v1"] < 1.0
+    assert snap["heartbeat_silence_minutes"]["agent.growth.v1"] == 99999.0
+    assert 2.5 < snap["feed_staleness_minutes"] < 3.5
+
+
+def test_record_write_never_raises():
+    counters = MetricCounters()
+    counters.record_write("sentinel_event_log", None)
+    assert counters.snapshot()["series"]["integrity_violation"]["total"] == 0
+
+
+def test_prometheus_text_reads_counters(database, monkeypatch):
+    counters = MetricCounters()
+    counters.reconcile(database)
+    monkeypatch.setattr(phase8_observability_metrics, "get_metric_counters", lambda: counters)
+    calls = database.calls
+
+    text = phase8_observability_metrics.prometheus_metrics_text()
+
+    assert database.calls == calls
+    assert "integrity_violation_rate 25.000000" in text
+    assert "decision_write_failures 0" in text
+    for agent_id in HEARTBEAT_SOURCES:
+        assert f'agent_heartbeat_silence_minutes{{agent_id="{agent_id}"}}' in text
+
+
+def test_metrics_route_runs_against_the_real_agent_config(database, monkeypatch):
+    from config.agent_config import AGENT_CONFIG
+    from routes import phase8_routes
+
+    counters = MetricCounters()
+    counters.reconcile(database)
+    monkeypatch.setattr(phase8_observability_metrics, "get_metric_counters", lambda: counters)
+
+    response = phase8_routes.phase8_metrics()
+
+    assert "phase8" not in AGENT_CONFIG  # the exporter must not depend on it
+    assert response.media_type.startswith("text/plain")
+    assert b"integrity_violation_rate 25.000000" in response.body
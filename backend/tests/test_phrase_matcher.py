@@ -0,0 +1,111 @@
+import asyncio
+import random
+import re
+
+import middleware.api_response_language_guard as guard
+from services.explanation_forbidden_phrases import ForbiddenPhrasesChecker
+from services.telegram_copy_validator import TelegramCopyValidator
+from utils.phrase_matcher import PhraseMatcher, alnum_word_boundary
+
+
+PHRASES = ["guaranteed", "guarantee", "lock", "mortal lock", "locksmith", "100%", "🔥", "go with", "sportsbook", "not a sportsbook"]
+WORDS = ["lock", "locks", "mortal", "smith", "locksmith", "guarantee", "guaranteed", "100%", "🔥", "go", "with", "not", "a", "sportsbook", ",", " "]
+
+
+def _reference(text, bounded):
+    lower = text.lower()
+    found = set()
+    for phrase in PHRASES:
+        if bounded and alnum_word_boundary(phrase):
+            if re.search(r"\b" + re.escape(phrase) + r"\b", lower):
+                found.add(phrase)
+        elif phrase in lower:
+            found.add(phrase)
+    return found
+
+
+def test_containment_graph_and_streaming_match_brute_force():
+    rng = random.Random(7)
+    for bounded in (False, alnum_word_boundary):
+        matcher = PhraseMatcher(PHRASES, word_boundary=bounded)
+        assert "mortal lock" in matcher.children("lock")
+        assert "lock" in matcher.roots and "mortal lock" not in matcher.roots
+
+        for _ in range(500):
+            text = "".join(rng.choice(WORDS) + rng.choice(["", " "]) for _ in range(rng.randint(0, 25)))
+            expected = _reference(text, bool(bounded))
+            assert matcher.find(text) == expected
+
+            # Arbitrary byte splits, including inside multi-byte characters
+            scanner, data, i = matcher.scanner(), text.encode("utf-8"), 0
+            while i < len(data):
+                step = rng.randint(1, 6)
+                scanner.feed_bytes(data[i:i + step])
+                i += step
+            assert scanner.finish() == expected, text
+
+
+def test_checkers_keep_their_phrase_semantics():
+    checker = ForbiddenPhrasesChecker()
+    ok, violations = checker.check_text("A mortal lock, guaranteed. 🔥", "NO_ACTION")
+    assert not ok
+    assert [v["phrase"] for v in violations] == ["guaranteed", "lock", "mortal lock", "🔥"]
+
+    # Word boundaries: "blocked" and "fireside" are not "lock"/"fire"
+    assert checker.check_text("Market blocked by fireside rules", "EDGE") == (True, [])
+    ok, violations = checker.check_text("You should bet this", "NO_ACTION")
+    assert [v["phrase"] for v in violations] == ["should bet"]
+    assert checker.check_text("You should bet this", "EDGE")[0]
+
+    class Constraints:
+        mode = "constrained"
+
+    class Item:
+        constraints = Constraints()
+
+    detected = TelegramCopyValidator()._check_forbidden_phrases("Sharp money says LOCK it", Item())
+    assert detected == ["sharp", "sharp money", "lock"]
+
+
+class FakeURL:
+    path = "/api/odds/list"
+
+
+class FakeRequest:
+    url = FakeURL()
+    method = "GET"
+
+
+class FakeStreamingResponse:
+    def __init__(self, chunks):
+        self.headers = {"content-type": "application/json", "content-length": str(sum(map(len, chunks)))}
+        self.chunks_pulled = 0
+
+        async def body():
+            for chunk in chunks:
+                self.chunks_pulled += 1
+                yield chunk
+
+        self.body_iterator = body()
+
+
+def test_guard_scans_stream_without_buffering(monkeypatch):
+    logged = []
+    monkeypatch.setattr(guard, "AGENT_CONFIG", {"phase7": {"prohibited_phrases": ["Bet Now", "sportsbook"]}})
+    monkeypatch.setattr(guard, "_log_violations", lambda request, violations: logged.append(violations))
+    middleware = guard.APIResponseLanguageGuardMiddleware(app=None)
+
+    chunks = [b'{"events": [{"note": "we are not a sports', b'book"}, {"cta": "BET N', b'OW"}]}']
+    response = FakeStreamingResponse(chunks)
+
+    async def run():
+        async def call_next(request):
+            return response
+
+        returned = await middleware.dispatch(FakeRequest(), call_next)
+        assert returned is response and response.chunks_pulled == 0  # nothing buffered
+        return [chunk async for chunk in returned.body_iterator]
+
+    assert asyncio.run(run()) == chunks
+    assert response.headers["content-length"] == str(sum(map(len, chunks)))
+    assert logged == [["bet now"]]  # negated sportsbook reference is allowed
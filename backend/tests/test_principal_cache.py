@@ -0,0 +1,164 @@
+import asyncio
+
+from services.principal_cache import PrincipalCache, PrincipalScopeMiddleware, _request_scope
+
+
+class FakeLoader:
+    def __init__(self, docs):
+        self.docs = docs
+        self.calls = []
+
+    def __call__(self, key):
+        self.calls.append(key)
+        doc = self.docs.get(key)
+        return dict(doc) if doc is not None else None
+
+
+def _cache(clock=None, **docs):
+    loaders = {kind: FakeLoader(docs.get(kind, {})) for kind in ("user", "subscription", "entitlement", "tenant")}
+    kwargs = {"clock": clock} if clock else {}
+    return PrincipalCache(ttl_seconds=30, max_entries=3, loaders=loaders, **kwargs), loaders
+
+
+def test_request_scope_resolves_each_principal_once():
+    cache, loaders = _cache(user={"u1": {"_id": "u1", "email": "a@x.io"}}, subscription={})
+    seen = []
+
+    async def app(scope, receive, send):
+        for _ in range(3):
+            user = cache.get_user("u1")
+            user["token_tier"] = "pro"  # callers annotate their copy
+            seen.append(cache.get_subscription("a@x.io"))
+        cache.clear()  # the process cache is gone, the request snapshot is not
+        seen.append(cache.get_user("u1"))
+
+    asyncio.run(PrincipalScopeMiddleware(app)({"type": "http"}, None, None))
+    assert loaders["user"].calls == ["u1"]
+    assert loaders["subscription"].calls == ["a@x.io"]  # negative result memoized
+    assert seen == [None, None, None, {"_id": "u1", "email": "a@x.io"}]
+    assert _request_scope.get() is None
+    assert cache.stats()["request_hits"] == 5
+
+
+def test_ttl_lru_and_invalidation():
+    now = [0.0]
+    cache, loaders = _cache(
+        clock=lambda: now[0],
+        user={"u1": {"tier": "free"}},
+        entitlement={"u1": {"tier": "platform"}},
+        tenant={"t1": {"tenant_id": "t1"}},
+    )
+    assert cache.get_user("u1") == {"tier": "free"}
+    assert cache.get_user("u1") == {"tier": "free"}
+    assert loaders["user"].calls == ["u1"]
+
+    loaders["user"].docs["u1"] = {"tier": "elite"}
+    cache.invalidate_user("u1")
+    assert cache.get_user("u1") == {"tier": "elite"}
+
+    now[0] += 31
+    cache.get_user("u1")
+    assert loaders["user"].calls == ["u1", "u1", "u1"]
+
+    for key in ("u2", "u3", "u4"):
+        cache.get_entitlement(key)
+    assert cache.stats()["entries"] == 3
+    cache.get_user("u1")
+    assert len(loaders["user"].calls) == 4  # evicted as least recently used
+
+
+def test_invalidation_during_load_is_not_cached():
+    cache, loaders = _cache(entitlement={"u1": {"tier": "platform"}})
+
+    def racing_loader(key):
+        doc = {"tier": "platform"}
+        cache.invalidate_user(key)  # a webhook revokes while we read
+        return doc
+
+    cache._loaders["entitlement"] = racing_loader
+    assert cache.get_entitlement("u1") == {"tier": "platform"}
+    assert cache.stats()["entries"] == 0
+
+    cache._loaders["entitlement"] = loaders["entitlement"]
+    loaders["entitlement"].docs["u1"] = {"tier": "intelligence_preview"}
+    assert cache.get_entitlement("u1") == {"tier": "intelligence_preview"}
+
+
+def test_entitlement_invalidation_leaves_other_keys_cacheable():
+    cache, loaders = _cache(
+        user={"u1": {"tier": "free"}, "u2": {"tier": "pro"}},
+        entitlement={"u1": {"tokens_used_current_period": 0}},
+    )
+    cache.get_user("u1")
+    cache.get_entitlement("u1")
+
+    def racing_loader(key):
+        cache.invalidate_entitlement("u1")  # another user's simulation view is metered
+        return {"tier": "pro"}
+
+    cache._loaders["user"] = racing_loader
+    cache.get_user("u2")
+    cache._loaders["user"] = loaders["user"]
+
+    loaders["entitlement"].docs["u1"] = {"tokens_used_current_period": 1000}
+    assert cache.get_entitlement("u1") == {"tokens_used_current_period": 1000}
+    cache.get_user("u1")
+    cache.get_user("u2")
+    assert loaders["user"].calls == ["u1"]  # u1 kept, u2 cached despite the concurrent invalidation
+    assert loaders["entitlement"].calls == ["u1", "u1"]
+
+
+class FakeAccountDB(dict):
+    """users.find_one by _id; every delete is recorded"""
+
+    def __init__(self, user):
+        super().__init__()
+        self.user = user
+        self.deleted = []
+
+    def __missing__(self, name):
+        database = self
+
+        class Collection:
+            def find_one(self, query):
+                return dict(database.user) if query.get("_id") == database.user["_id"] else None
+
+            def delete_one(self, query):
+                database.deleted.append(name)
+
+            def delete_many(self, query):
+                database.deleted.append(name)
+
+        self[name] = Collection()
+        return self[name]
+
+
+def test_delete_account_drops_cached_principals(monkeypatch):
+    import bcrypt
+    from bson import ObjectId
+
+    import routes.account_routes as account_routes
+    from services import principal_cache
+
+    oid = ObjectId()
+    hashed = bcrypt.hashpw(b"pw", bcrypt.gensalt(4)).decode()
+    database = FakeAccountDB({"_id": oid, "email": "a@x.io", "hashed_password": hashed})
+    cache, loaders = _cache(
+        user={str(oid): {"email": "a@x.io"}},
+        subscription={"a@x.io": {"tier": "pro"}},
+    )
+    monkeypatch.setattr(account_routes, "db", database)
+    monkeypatch.setattr(principal_cache, "_principal_cache", cache)
+    cache.get_user(str(oid))
+    cache.get_subscription("a@x.io")
+
+    loaders["user"].docs.clear()
+    loaders["subscription"].docs.clear()
+    account_routes.delete_account(
+        account_routes.DeleteAccountRequest(password="pw", confirmation="DELETE"),
+        Authorization=f"Bearer user:{oid}",
+    )
+
+    assert "users" in database.deleted
+    assert cache.get_user(str(oid)) is None
+    assert cache.get_subscription("a@x.io") is None
@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+
+from middleware.rate_limiter import _InMemoryStore, _RedisStore, _TenantCache, _resolve_tenant
+
+
+class FakeRequest:
+    def __init__(self, headers=None):
+        self.headers = headers or {}
+
+
+class FakeScript:
+    """Evaluates the sliding-window script against a dict of sorted sets"""
+
+    def __init__(self):
+        self.calls = 0
+        self.zsets = {}
+
+    async def __call__(self, keys, args):
+        self.calls += 1
+        now, window, limit, member = float(args[0]), float(args[1]), int(args[2]), args[3]
+        zset = {m: s for m, s in self.zsets.get(keys[0], {}).items() if s > now - window}
+        self.zsets[keys[0]] = zset
+        if len(zset) >= limit:
+            return [0, len(zset)]
+        zset[member] = now
+        return [1, len(zset)]
+
+
+class FakeRedis:
+    def __init__(self, script):
+        self.script = script
+
+    def register_script(self, source):
+        assert "ZREMRANGEBYSCORE" in source and "ZADD" in source
+        return self.script
+
+
+def test_in_memory_window_slides_and_evicts_idle_keys():
+    now = [1000.0]
+    store = _InMemoryStore(max_keys=2, clock=lambda: now[0])
+
+    results = [asyncio.run(store.check_and_record("k", 3, 60)) for _ in range(4)]
+    assert results == [(True, 1), (True, 2), (True, 3), (False, 3)]
+
+    now[0] += 61
+    assert asyncio.run(store.check_and_record("k", 3, 60)) == (True, 1)
+
+    store.check_and_record_sync("a", 3, 60)
+    store.check_and_record_sync("b", 3, 60)
+    assert "k" not in store._windows  # least recently used key evicted
+
+
+def test_tenant_cache_coalesces_misses_and_caches_unknown_tenants():
+    calls = []
+    gate = threading.Event()
+
+    def loader(tenant_id):
+        calls.append(tenant_id)
+        gate.wait(1)
+        return {"tenant_id": "t1", "custom_thresholds": {"rate_limit_per_minute": 5}} if tenant_id == "t1" else None
+
+    cache = _TenantCache(ttl_seconds=30, loader=loader)
+
+    async def burst():
+        tasks = [asyncio.create_task(cache.get("t1")) for _ in range(20)]
+        await asyncio.sleep(0.05)
+        gate.set()
+        docs = await asyncio.gather(*tasks)
+        unknown = [await _resolve_tenant(FakeRequest({"X-Tenant-ID": "nope"}), None, cache) for _ in range(3)]
+        return docs, unknown
+
+    docs, unknown = asyncio.run(burst())
+    assert all(d["tenant_id"] == "t1" for d in docs)
+    assert unknown == [("nope", None)] * 3
+    assert calls == ["t1", "nope"]
+    assert cache.stats()["hits"] == 2
+
+
+def test_redis_store_is_one_script_call_and_falls_back_on_error():
+    script = FakeScript()
+    store = _RedisStore(FakeRedis(script))
+
+    async def run():
+        return [await store.check_and_record("rl:ip:1", 2, 60) for _ in range(3)]
+
+    assert asyncio.run(run()) == [(True, 1), (True, 2), (False, 2)]
+    assert script.calls == 3
+
+    async def broken(keys, args):
+        raise ConnectionError("redis down")
+
+    store._script = broken
+    assert asyncio.run(store.check_and_record("rl:ip:2", 2, 60)) == (True, 1)
+    assert store.errors == 1
+
+
+def test_cached_check_is_microseconds():
+    cache = _TenantCache(loader=lambda tenant_id: None)
+    store = _InMemoryStore()
+    request = FakeRequest({"X-Tenant-ID": "t1"})
+
+    async def hot_path(n):
+        await _resolve_tenant(request, None, cache)
+        started = time.perf_counter()
+        for i in range(n):
+            await _resolve_tenant(request, None, cache)
+            await store.check_and_record(f"rl:ip:{i % 50}", 10_000, 60)
+        return (time.perf_counter() - started) / n
+
+    per_request = asyncio.run(hot_path(2000))
+    assert per_request < 0.0005  # well under a DB round trip
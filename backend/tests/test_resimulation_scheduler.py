@@ -0,0 +1,249 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+
+from core.run_snapshot import RunSnapshotManager
+from integrations.odds_api import extract_market_lines
+from services.resimulation_scheduler import (
+    ResimulationScheduler,
+    _load_current_injuries,
+    _load_simulated_inputs,
+)
+
+NOW = datetime(2026, 10, 16, 18, tzinfo=timezone.utc)
+
+
+def _event(event_id, spread, total, hours_to_tip, home="Lakers", away="Celtics"):
+    return {"event_id": event_id, "home_team": home, "away_team": away, "spread": spread, "total": total,
+            "commence_time": (NOW + timedelta(hours=hours_to_tip)).isoformat()}
+
+
+def _scheduler(simulated_lines, runs, **kwargs):
+    async def resimulate(event_id, event, iterations):
+        runs.append((event_id, event["spread"], event["total"]))
+        return {"event_id": event_id}
+
+    return ResimulationScheduler(
+        snapshot_manager=RunSnapshotManager(),
+        resimulate=resimulate,
+        load_simulated_inputs=lambda event_id, event: simulated_lines.get(event_id),
+        load_current_injuries=lambda teams: {},
+        market_lines=lambda event: (event["spread"], event["total"]),
+        iterations=10000,
+        clock=lambda: NOW,
+        **kwargs,
+    )
+
+
+def test_only_changed_games_are_queued_most_urgent_first():
+    simulated = {
+        "soon": {"spread": -3.5, "total": 221.5},
+        "later": {"spread": -1.5, "total": 210.5},
+        "idle": {"spread": 2.5, "total": 230.5},
+        "started": {"spread": -4.5, "total": 219.5},
+        "next_week": {"spread": -6.5, "total": 225.5},
+    }
+    runs = []
+    scheduler = _scheduler(simulated, runs)
+    queued = scheduler.observe_events([
+        _event("soon", -4.5, 221.5, hours_to_tip=1),        # 1 pt / 1h
+        _event("later", -1.5, 213.5, hours_to_tip=10),      # 3 pts / 10h
+        _event("idle", 2.5, 230.5, hours_to_tip=2),         # unchanged
+        _event("started", -6.5, 219.5, hours_to_tip=-0.5),  # already tipped off
+        _event("next_week", -9.5, 225.5, hours_to_tip=150), # beyond horizon
+        _event("soon", -4.5, 221.5, hours_to_tip=1),        # same game from another region
+    ])
+    assert queued == 2
+    stats = scheduler.stats()
+    assert (stats["unchanged"], stats["outside_horizon"], stats["queued"]) == (1, 2, 2)
+
+    assert asyncio.run(scheduler.run_once()) == 2
+    assert runs == [("soon", -4.5, 221.5), ("later", -1.5, 213.5)]
+
+    # The simulation now matches the market: identical ticks cost nothing
+    assert scheduler.observe_events([_event("soon", -4.5, 221.5, 1), _event("later", -1.5, 213.5, 10)]) == 0
+    assert asyncio.run(scheduler.run_once()) == 0
+
+
+def test_injury_snapshot_requeues_and_reverted_line_is_dropped():
+    runs = []
+    scheduler = _scheduler({"g1": {"spread": -3.5, "total": 221.5}}, runs)
+    assert scheduler.observe_events([_event("g1", -3.5, 221.5, hours_to_tip=3)]) == 0
+
+    assert scheduler.observe_injuries("Knicks", [{"player": "Brunson", "status": "OUT"}]) == 0
+    assert scheduler.observe_injuries("Celtics", [{"player": "Tatum", "status": "OUT"}]) == 1
+    asyncio.run(scheduler.run_once())
+    assert runs == [("g1", -3.5, 221.5)]
+
+    # A line that moves and comes back before the worker runs is not simulated
+    scheduler.observe_events([_event("g1", -5.5, 221.5, hours_to_tip=3)])
+    scheduler.observe_events([_event("g1", -3.5, 221.5, hours_to_tip=3)])
+    assert asyncio.run(scheduler.run_once()) == 0
+    assert len(runs) == 1
+
+
+def test_worker_picks_up_changes_from_poller_thread():
+    runs = []
+    scheduler = _scheduler({"g1": {"spread": -3.5, "total": 221.5}}, runs, debounce_seconds=0.01)
+
+    async def scenario():
+        await scheduler.start()
+        poller = threading.Thread(
+            target=scheduler.observe_events, args=([_event("g1", -2.5, 221.5, hours_to_tip=1)],)
+        )
+        poller.start()
+        poller.join()
+        for _ in range(100):
+            if runs:
+                break
+            await asyncio.sleep(0.01)
+        await scheduler.stop()
+
+    asyncio.run(scenario())
+    assert runs == [("g1", -2.5, 221.5)]
+    assert scheduler.stats()["simulated"] == 1
+
+
+def test_finished_games_are_pruned_with_their_heap_entries():
+    runs = []
+    clock = [NOW]
+    scheduler = _scheduler({"g1": {"spread": -3.5, "total": 221.5}, "g2": {"spread": 1.5, "total": 210.5}}, runs)
+    scheduler._clock = lambda: clock[0]
+    scheduler.observe_events([_event("g1", -4.5, 221.5, hours_to_tip=1), _event("g2", 1.5, 210.5, hours_to_tip=5)])
+    assert scheduler.stats()["queued"] == 1
+
+    clock[0] = NOW + timedelta(hours=2)
+    scheduler.observe_events([_event("g2", 1.5, 210.5, hours_to_tip=3)])
+
+    assert scheduler.stats()["tracked_games"] == 1
+    assert scheduler.stats()["pruned"] == 1
+    assert scheduler._queue == []
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def find_one(self, query, projection=None, sort=None):
+        def matches(doc):
+            for key, cond in query.items():
+                if isinstance(cond, dict) and "$exists" in cond:
+                    if (key in doc) != cond["$exists"]:
+                        return False
+                elif isinstance(cond, dict) and "$lte" in cond:
+                    if not doc[key] <= cond["$lte"]:
+                        return False
+                elif doc.get(key) != cond:
+                    return False
+            return True
+
+        found = [doc for doc in self.docs if matches(doc)]
+        for key, direction in reversed(sort or []):
+            found.sort(key=lambda doc: doc[key], reverse=direction < 0)
+        return found[0] if found else None
+
+
+def _odds_event(event_id, spread_home, total, hours_to_tip):
+    markets = [{"key": "spreads", "outcomes": [
+        {"name": "Boston Celtics", "point": spread_home, "price": -110},
+        {"name": "Los Angeles Lakers", "point": -spread_home, "price": -110},
+    ]}]
+    if total is not None:
+        markets.append({"key": "totals", "outcomes": [
+            {"name": "Over", "point": total, "price": -110},
+            {"name": "Under", "point": total, "price": -110},
+        ]})
+    return {
+        "event_id": event_id,
+        "sport_key": "basketball_nba",
+        "home_team": "Boston Celtics",
+        "away_team": "Los Angeles Lakers",
+        "commence_time": (NOW + timedelta(hours=hours_to_tip)).isoformat(),
+        "bookmakers": [{"title": "DraftKings", "markets": markets}],
+    }
+
+
+def _injury_snapshot(team, hours_ago, players):
+    return {
+        "injury_snapshot_id": f"{team}-{hours_ago}",
+        "timestamp_utc": NOW - timedelta(hours=hours_ago),
+        "league": "NBA",
+        "team": team,
+        "net_impact_pts": -1.5,
+        "raw_payload": {"injuries": players},
+    }
+
+
+def test_baseline_comes_from_the_stored_simulation_and_injury_snapshots():
+    with_total = _odds_event("g1", -4.5, 223.5, hours_to_tip=4)
+    no_total = _odds_event("g2", 2.5, None, hours_to_tip=4)
+    database = {
+        # market_context is stored exactly as the engine received it (extract_market_lines)
+        "monte_carlo_simulations": FakeCollection([
+            {"simulation_id": "s1", "event_id": "g1", "created_at": (NOW - timedelta(hours=1)).isoformat(),
+             "market_context": extract_market_lines(with_total)},
+            {"simulation_id": "s2", "event_id": "g2", "created_at": (NOW - timedelta(hours=1)).isoformat(),
+             "market_context": extract_market_lines(no_total)},
+            {"simulation_id": "s1h", "event_id": "g1", "period": "1H", "created_at": NOW.isoformat(),
+             "market_context": {"current_spread": 0.0, "has_spread_market": True}},
+        ]),
+        "injury_snapshots": FakeCollection([
+            _injury_snapshot("Boston Celtics", 3, ["Tatum"]),
+            _injury_snapshot("Los Angeles Lakers", 2, ["Davis"]),
+        ]),
+    }
+    used = _load_simulated_inputs("g1", with_total, database=database)
+    assert (used["spread"], used["total"]) == (-4.5, 223.5)
+    assert sorted(used["injuries"]) == ["Boston Celtics", "Los Angeles Lakers"]
+
+    runs = []
+
+    async def resimulate(event_id, event, iterations):
+        runs.append(event_id)
+
+    scheduler = ResimulationScheduler(
+        snapshot_manager=RunSnapshotManager(),
+        resimulate=resimulate,
+        load_simulated_inputs=lambda event_id, event: _load_simulated_inputs(event_id, event, database=database),
+        load_current_injuries=lambda teams: _load_current_injuries(teams, database=database),
+        iterations=10000,
+        clock=lambda: NOW,
+    )
+
+    # Unchanged lines (and no total market on g2) against the stored simulations
+    assert scheduler.observe_events([with_total, no_total]) == 0
+    # The snapshot the simulation already saw is not news; a new one is
+    assert scheduler.observe_injuries(
+        "Boston Celtics", [{"net_impact_pts": -1.5, "off_delta": None, "def_delta": None,
+                            "pace_delta": None, "players": ["Tatum"]}]
+    ) == 0
+    assert scheduler.observe_injuries(
+        "Boston Celtics", [{"net_impact_pts": -4.0, "off_delta": None, "def_delta": None,
+                            "pace_delta": None, "players": ["Tatum", "Brown"]}]
+    ) == 2
+    assert asyncio.run(scheduler.run_once()) == 2
+    assert sorted(runs) == ["g1", "g2"]
+
+
+def test_injury_snapshot_newer_than_the_simulation_requeues_on_first_sighting():
+    event = _odds_event("g1", -4.5, 223.5, hours_to_tip=4)
+    database = {
+        "monte_carlo_simulations": FakeCollection([
+            {"simulation_id": "s1", "event_id": "g1", "created_at": (NOW - timedelta(hours=2)).isoformat(),
+             "market_context": extract_market_lines(event)},
+        ]),
+        "injury_snapshots": FakeCollection([
+            _injury_snapshot("Boston Celtics", 3, ["Tatum"]),
+            _injury_snapshot("Boston Celtics", 1, []),
+        ]),
+    }
+    scheduler = ResimulationScheduler(
+        snapshot_manager=RunSnapshotManager(),
+        resimulate=lambda *args: None,
+        load_simulated_inputs=lambda event_id, ev: _load_simulated_inputs(event_id, ev, database=database),
+        load_current_injuries=lambda teams: _load_current_injuries(teams, database=database),
+        iterations=10000,
+        clock=lambda: NOW,
+    )
+
+    assert scheduler.observe_events([event]) == 1
@@ -0,0 +1,167 @@
+import asyncio
+import copy
+
+from services.scoreboard_ingestion import ScoreboardIngestor, parse_final_score
+from services.unified_grading_service_v2 import UnifiedGradingService
+
+
+class FakeCollection:
+    """Just enough of a pymongo collection for batch grading"""
+
+    def __init__(self, docs=None):
+        self.docs = [copy.deepcopy(d) for d in docs or []]
+        self.bulk_writes = []
+
+    def _matches(self, doc, query):
+        for key, cond in query.items():
+            value = doc.get(key)
+            if isinstance(cond, dict):
+                if "$in" in cond and value not in cond["$in"]:
+                    return False
+                if "$gte" in cond and (value is None or value < cond["$gte"]):
+                    return False
+            elif value != cond:
+                return False
+        return True
+
+    def find(self, query=None, projection=None):
+        found = [copy.deepcopy(d) for d in self.docs if self._matches(d, query or {})]
+        for doc in found:
+            for field, include in (projection or {}).items():
+                if not include:
+                    doc.pop(field, None)
+        return found
+
+    def insert_one(self, doc):
+        self.docs.append(copy.deepcopy(doc))
+
+    def bulk_write(self, ops, ordered=True):
+        self.bulk_writes.append(ops)
+        for op in ops:
+            matched = [d for d in self.docs if self._matches(d, op._filter)]
+            if matched:
+                matched[0].update(copy.deepcopy(op._doc["$set"]))
+            elif op._upsert:
+                self.docs.append({**op._filter, **copy.deepcopy(op._doc["$set"])})
+
+
+def _scoreboard_event(event_id, home, away, home_score, away_score, completed=True):
+    return {
+        "id": event_id,
+        "completed": completed,
+        "home_team": home,
+        "away_team": away,
+        "commence_time": "2026-10-15T23:00:00Z",
+        "scores": [{"name": home, "score": str(home_score)}, {"name": away, "score": str(away_score)}]
+        if completed else None,
+    }
+
+
+SCOREBOARDS = {
+    "basketball_nba": [
+        _scoreboard_event("oa-nba-1", "Lakers", "Celtics", 112, 108),
+        _scoreboard_event("oa-nba-2", "Knicks", "Heat", 99, 101),
+    ],
+    "icehockey_nhl": [_scoreboard_event("oa-nhl-1", "Rangers", "Bruins", 0, 0, completed=False)],
+}
+
+
+def _db():
+    events = [
+        {"event_id": "e1", "sport_key": "basketball_nba", "home_team": "Lakers", "away_team": "Celtics",
+         "provider_event_map": {"oddsapi": {"event_id": "oa-nba-1"}}},
+        {"event_id": "e2", "sport_key": "basketball_nba", "home_team": "Knicks", "away_team": "Heat",
+         "oddsapi_event_id": "oa-nba-2"},
+        {"event_id": "e3", "sport_key": "icehockey_nhl", "home_team": "Rangers", "away_team": "Bruins",
+         "provider_event_map": {"oddsapi": {"event_id": "oa-nhl-1"}}},
+    ]
+    picks = [
+        {"pick_id": "p1", "event_id": "e1", "market_type": "spread", "market_selection": "Lakers",
+         "market_line": -3.5, "snapshot_odds": 1.91, "closing_line_decimal": 1.87, "outcome": None},
+        {"pick_id": "p2", "event_id": "e2", "market_type": "totals", "market_selection": "Over",
+         "market_line": 205.5, "snapshot_odds": 1.91, "closing_line_decimal": 1.95, "outcome": None},
+        {"pick_id": "p3", "event_id": "e3", "market_type": "h2h", "market_selection": "Rangers",
+         "snapshot_odds": 2.1, "closing_line_decimal": 2.0, "outcome": None},
+    ]
+    return {
+        "events": FakeCollection(events),
+        "ai_picks": FakeCollection(picks),
+        "grading": FakeCollection(),
+        "scoreboard_scores": FakeCollection(),
+        "ops_alerts": FakeCollection(),
+    }
+
+
+def test_parse_final_score_requires_completed_game_with_both_scores():
+    score = parse_final_score(SCOREBOARDS["basketball_nba"][0], "basketball_nba")
+    assert (score["event_id"], score["home_score"], score["away_score"]) == ("oa-nba-1", 112, 108)
+    assert parse_final_score(SCOREBOARDS["icehockey_nhl"][0]) is None
+    partial = dict(SCOREBOARDS["basketball_nba"][1], scores=[{"name": "Knicks", "score": "99"}])
+    assert parse_final_score(partial) is None
+
+
+def test_slate_is_graded_from_one_scoreboard_request_per_sport(monkeypatch):
+    db = _db()
+    fetched = []
+
+    async def fake_fetch(sports, days_from):
+        fetched.append(list(sports))
+        return {sport: copy.deepcopy(SCOREBOARDS[sport]) for sport in sports}
+
+    ingestor = ScoreboardIngestor(db, fetch_scoreboards=fake_fetch)
+    trust = []
+    service = UnifiedGradingService(db, mirror_to_ai_picks=True)
+    monkeypatch.setattr(service, "_record_trust_metrics", lambda *args: trust.append(args[2]))
+
+    summary = asyncio.run(service.grade_pending_picks(pick_ids=["p1", "p2", "p3"], ingestor=ingestor))
+
+    assert fetched == [["basketball_nba", "icehockey_nhl"]]
+    assert summary["scoreboard_requests"] == 2
+    assert (summary["graded_count"], summary["not_final"]) == (2, 1)
+    assert (summary["results"]["WIN"], summary["results"]["LOSS"]) == (1, 1)  # 200 < 205.5
+    assert sorted(trust) == ["LOSS", "WIN"]
+    assert len(db["grading"].bulk_writes) == 1 and len(db["grading"].bulk_writes[0]) == 2
+    rows = {row["pick_id"]: row for row in db["grading"].docs}
+    assert rows["p1"]["actual_score"] == {"home": 112, "away": 108}
+    assert rows["p2"]["score_payload_ref"]["oddsapi_event_id"] == "oa-nba-2"
+    assert {d["oddsapi_event_id"] for d in db["scoreboard_scores"].docs} == {"oa-nba-1", "oa-nba-2"}
+    assert [p["outcome"] for p in db["ai_picks"].docs] == ["win", "loss", None]
+
+    # Next cycle: graded picks are skipped, only the unfinished sport is fetched
+    summary = asyncio.run(service.grade_pending_picks(pick_ids=["p1", "p2", "p3"], ingestor=ingestor))
+    assert summary["picks"] == 1 and summary["not_final"] == 1
+    assert fetched[-1] == ["icehockey_nhl"]
+
+
+def test_persisted_finals_need_no_http():
+    db = _db()
+    db["scoreboard_scores"].docs.append({
+        **parse_final_score(SCOREBOARDS["basketball_nba"][0], "basketball_nba"),
+        "oddsapi_event_id": "oa-nba-1", "ingested_at": "2026-10-16T00:00:00Z",
+    })
+
+    async def no_fetch(sports, days_from):
+        raise AssertionError(f"unexpected scoreboard fetch: {sports}")
+
+    ingestor = ScoreboardIngestor(db, fetch_scoreboards=no_fetch)
+    index = asyncio.run(ingestor.build_index({"basketball_nba": {"oa-nba-1"}}))
+    assert index.requests_made == 0
+    assert index.get("oa-nba-1")["home_score"] == 112
+
+
+def test_malformed_pick_is_counted_and_does_not_block_the_slate(monkeypatch):
+    db = _db()
+    db["ai_picks"].docs[1]["market_line"] = None  # totals pick without a line
+
+    async def fake_fetch(sports, days_from):
+        return {sport: copy.deepcopy(SCOREBOARDS[sport]) for sport in sports}
+
+    service = UnifiedGradingService(db)
+    monkeypatch.setattr(service, "_record_trust_metrics", lambda *args: None)
+
+    summary = asyncio.run(service.grade_pending_picks(
+        pick_ids=["p1", "p2", "p3"], ingestor=ScoreboardIngestor(db, fetch_scoreboards=fake_fetch)
+    ))
+
+    assert (summary["graded_count"], summary["failed"], summary["not_final"]) == (1, 1, 1)
+    assert [row["pick_id"] for row in db["grading"].docs] == ["p1"]
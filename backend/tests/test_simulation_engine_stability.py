@@ -0,0 +1,80 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from core.simulation_context import InjurySnapshot, MarketSnapshot, SimulationContext
+from core.simulation_engine import SimulationEngine
+
+
+def _context(line=-3.5, n_simulations=20000):
+    market = MarketSnapshot(
+        market_type="SPREAD", selection=f"home {line}", line=line, american_odds=-110, decimal_odds=1.909,
+        implied_prob=0.5238, devig_prob=0.5, book_id="dk", timestamp_utc=datetime(2026, 10, 16, tzinfo=timezone.utc),
+    )
+    return SimulationContext(
+        game_id="g1", sport="NBA", league="NBA", home_team="Lakers", away_team="Celtics",
+        game_time_utc=datetime(2026, 10, 17, tzinfo=timezone.utc), model_version="m1", engine_version="e1",
+        data_feed_version="d1", market=market, pace_projection=100.0, n_simulations=n_simulations,
+        injuries=[InjurySnapshot("p1", "Star", "QUESTIONABLE", 30.0, 0.8)],
+    )
+
+
+def _cover(margin_mean, line, z):
+    return (margin_mean + 12.0 * z + line > 0).astype(float)
+
+
+def _batched(line, calls):
+    def simulate(rng, n, batch):
+        calls.append(n)
+        z = rng.standard_normal(n)  # one set of base draws shared by every row
+        margin_mean = 6.0 * batch.pace_projection / 100.0 + 0.05 * (batch.minutes_projections[:, 0] - 30.0)
+        return _cover(margin_mean[:, None], line, z[None, :])
+    return simulate
+
+
+def test_incremental_ci_matches_full_array_ci():
+    engine = SimulationEngine()
+    outcomes = (np.random.default_rng(3).random(12345) < 0.57).astype(float)
+    assert engine._wilson_interval(outcomes.sum(), outcomes.size) == engine._calculate_confidence_interval(outcomes)
+
+
+@pytest.mark.parametrize("line, expected", [(-2.5, 1.0), (-5.5, 0.0)])
+def test_batched_stability_costs_one_simulation(line, expected):
+    engine = SimulationEngine()
+    context = _context(line)
+    calls = []
+
+    stability = engine.run_batched_perturbation_test(context, _batched(line, calls), n_perturbations=100)
+
+    # Base row is seeded and drawn exactly like a plain run_simulation
+    base = engine.run_simulation(context, lambda rng, n: _cover(6.0, line, rng.standard_normal(n)))
+    assert stability["base_edge_percent"] == pytest.approx(base.edge_percent)
+    assert sum(calls) <= context.n_simulations
+    assert stability["stability_score"] == expected
+
+
+def test_marginal_edge_is_partially_stable_and_deterministic():
+    engine = SimulationEngine(ci_target_half_width=0.005)
+    context = _context(-5.25, n_simulations=40000)
+
+    first = engine.run_batched_perturbation_test(context, _batched(-5.25, []), n_perturbations=100)
+    second = engine.run_batched_perturbation_test(context, _batched(-5.25, []), n_perturbations=100)
+
+    assert 0.0 < first["stability_score"] < 1.0
+    assert first == second
+
+
+def test_base_row_stops_at_its_own_convergence():
+    # Wide perturbations push some rows to ~50% cover, which converge after the base row
+    engine = SimulationEngine(ci_target_half_width=0.0125, convergence_check_interval=250)
+    context = _context(-2.5, n_simulations=20000)
+    calls = []
+
+    stability = engine.run_batched_perturbation_test(
+        context, _batched(-2.5, calls), n_perturbations=100, perturbation_magnitude=0.5
+    )
+
+    base = engine.run_simulation(context, lambda rng, n: _cover(6.0, -2.5, rng.standard_normal(n)))
+    assert base.convergence_achieved and base.n_simulations_run < sum(calls)
+    assert stability["base_edge_percent"] == pytest.approx(base.edge_percent)
@@ -0,0 +1,117 @@
+import asyncio
+import threading
+
+import services.slate_simulation_runner as runner_mod
+from services import latency_histograms
+from services.latency_histograms import STAGE_TIMINGS_RESULT_KEY, HistogramFamily, StageTimings
+from services.simulation_executor import SimulationExecutor
+
+
+def _executor():
+    # process_workers=0 keeps CPU work on the thread pool (no spawned processes in tests)
+    return SimulationExecutor(process_workers=0, io_workers=4)
+
+
+def test_concurrent_callers_share_one_simulation():
+    executor = _executor()
+    calls = []
+
+    async def generate():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"simulation_id": "sim_1", "metadata": {}}
+
+    async def scenario():
+        return await asyncio.gather(*[executor.coalesce("evt_1:full:10000", generate) for _ in range(8)])
+
+    results = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert all(r["simulation_id"] == "sim_1" for r in results)
+    # Every caller gets its own copy
+    results[0]["metadata"]["user"] = "a"
+    assert "user" not in results[1]["metadata"]
+    assert executor.stats()["coalesced"] == 7
+    assert executor.stats()["inflight"] == 0
+    executor.shutdown()
+
+
+def test_coalesced_failure_reaches_every_waiter_and_releases_key():
+    executor = _executor()
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise ValueError("bad market context")
+
+    async def ok():
+        return {"ok": True}
+
+    async def scenario():
+        outcomes = await asyncio.gather(
+            *[executor.coalesce("evt_2", boom) for _ in range(3)], return_exceptions=True
+        )
+        retry = await executor.coalesce("evt_2", ok)
+        return outcomes, retry
+
+    outcomes, retry = asyncio.run(scenario())
+
+    assert all(isinstance(o, ValueError) for o in outcomes)
+    assert retry == {"ok": True}
+    executor.shutdown()
+
+
+def test_blocking_calls_run_off_the_event_loop():
+    executor = _executor()
+    loop_thread = threading.get_ident()
+
+    async def scenario():
+        io_thread = await executor.run_io(threading.get_ident)
+        cpu_value = await executor.run_cpu(sum, [1, 2, 3])
+        return io_thread, cpu_value
+
+    io_thread, cpu_value = asyncio.run(scenario())
+
+    assert io_thread != loop_thread
+    assert cpu_value == 6
+    executor.shutdown()
+
+
+def test_worker_stage_timings_are_observed_in_the_calling_process(monkeypatch):
+    family = HistogramFamily("simulation_stage_latency_ms", "test", ("sport", "stage"))
+    monkeypatch.setattr(latency_histograms, "SIMULATION_STAGE_LATENCY", family)
+
+    class WorkerEngine:
+        defer_stage_timings = True
+
+        def run_simulation(self, **kwargs):
+            timings = StageTimings("icehockey_nhl")
+            with timings.span("strategy_simulate"):
+                pass
+            return {"simulation_id": "sim_1", STAGE_TIMINGS_RESULT_KEY: timings.finish()}
+
+    monkeypatch.setattr(runner_mod, "_worker_engine", WorkerEngine())
+    executor = _executor()
+
+    result = asyncio.run(executor.run_simulation(event_id="evt_1"))
+
+    assert STAGE_TIMINGS_RESULT_KEY not in result
+    assert sum(family.merged_counts(sport="icehockey_nhl", stage="strategy_simulate")) == 1
+    assert sum(family.merged_counts(stage="total")) == 1
+    executor.shutdown()
+
+
+def test_spawned_worker_engine_defers_stage_timings(monkeypatch):
+    monkeypatch.setattr(runner_mod, "_worker_engine", None)
+    created = []
+
+    class Engine:
+        def __init__(self):
+            self.defer_stage_timings = False
+            created.append(self)
+
+    import core.monte_carlo_engine as engine_mod
+    monkeypatch.setattr(engine_mod, "MonteCarloEngine", Engine)
+
+    runner_mod.init_worker_engine()
+
+    assert created[0].defer_stage_timings is True
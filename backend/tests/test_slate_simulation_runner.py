@@ -0,0 +1,143 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import services.slate_simulation_runner as runner_mod
+from services.slate_simulation_runner import (
+    SlateGame,
+    SlateSimulationRunner,
+    derive_game_seed,
+    persist_simulations,
+)
+from services.joint_sample_store import JOINT_SKETCH_RESULT_KEY
+
+
+class FakeEngine:
+    """Stands in for MonteCarloEngine: draws from the seeded generator it is handed."""
+
+    def __init__(self):
+        self.calls = []
+
+    def run_simulation(self, event_id, team_a, team_b, market_context, iterations=None,
+                       mode="full", seed=None, persist=True):
+        self.calls.append({"event_id": event_id, "seed": seed, "persist": persist})
+        if event_id == "boom":
+            raise ValueError("bad market context")
+        draw = float(np.random.default_rng(seed).normal())
+        return {"simulation_id": f"sim_{event_id}", "event_id": event_id, "draw": draw, "rng_seed": seed}
+
+
+class FakeEvents:
+    def __init__(self, event_ids):
+        self.event_ids = set(event_ids)
+
+    def find(self, query, projection=None):
+        return [
+            {"event_id": e, "sport_key": "basketball_nba", "commence_time": "2026-01-01T00:00:00Z"}
+            for e in query["event_id"]["$in"]
+            if e in self.event_ids
+        ]
+
+
+class FakeSimulations:
+    def __init__(self):
+        self.ops = []
+
+    def bulk_write(self, operations, ordered=True):
+        self.ops.extend(operations)
+        return type("BulkResult", (), {"upserted_count": len(operations), "matched_count": 0})
+
+
+def _games(*event_ids):
+    return [SlateGame(event_id=e, team_a={"name": "A"}, team_b={"name": "B"}, market_context={}) for e in event_ids]
+
+
+def _runner(monkeypatch, workers=3):
+    engine = FakeEngine()
+    monkeypatch.setattr(runner_mod, "_worker_engine", engine)
+    runner = SlateSimulationRunner(
+        max_workers=workers,
+        executor_factory=lambda n: ThreadPoolExecutor(max_workers=n),
+        persist=False,
+    )
+    return runner, engine
+
+
+@pytest.fixture
+def derived_writes(monkeypatch):
+    writes = {"pool": [], "sketch": []}
+    monkeypatch.setattr(runner_mod, "upsert_pool_leg", lambda doc, event: writes["pool"].append((doc, event)))
+    monkeypatch.setattr(
+        runner_mod,
+        "store_joint_sketch_doc",
+        lambda simulation_id, event, sketch_doc: writes["sketch"].append((simulation_id, event, sketch_doc)),
+    )
+    return writes
+
+
+def test_derive_game_seed_is_stable_and_game_specific():
+    assert derive_game_seed(123, "evt_1") == derive_game_seed(123, "evt_1")
+    assert derive_game_seed(123, "evt_1") != derive_game_seed(123, "evt_2")
+    assert derive_game_seed(123, "evt_1") != derive_game_seed(124, "evt_1")
+
+
+def test_derived_game_seeds_fit_bson_int64():
+    seeds = [derive_game_seed(run_seed, f"evt_{i}") for run_seed in (1, 2**62, 2**63 - 1) for i in range(200)]
+    assert all(0 <= seed < 2**63 for seed in seeds)
+    assert max(seeds) >= 2**62
+
+
+def test_same_run_seed_reproduces_every_game(monkeypatch):
+    runner, engine = _runner(monkeypatch)
+
+    first = runner.run(_games("g1", "g2", "g3"), run_seed=99)
+    second = runner.run(_games("g3", "g1", "g2"), run_seed=99)
+
+    assert {k: v["draw"] for k, v in first.simulations.items()} == {
+        k: v["draw"] for k, v in second.simulations.items()
+    }
+    assert all(call["persist"] is False for call in engine.calls)
+
+
+def test_failures_are_isolated_per_game(monkeypatch):
+    runner, _ = _runner(monkeypatch)
+
+    run = runner.run(_games("g1", "boom", "g2", "g1"), run_seed=1)
+
+    assert set(run.simulations) == {"g1", "g2"}
+    assert "ValueError" in run.errors["boom"]
+    assert run.summary()["simulated"] == 2
+
+
+def test_persist_bulk_writes_once_and_blocks_orphans(derived_writes):
+    simulations = {
+        "g1": {"simulation_id": "sim_g1", "event_id": "g1"},
+        "g2": {"simulation_id": "sim_g2", "event_id": "g2"},
+    }
+    sims = FakeSimulations()
+
+    written, orphans = persist_simulations(simulations, sims, FakeEvents({"g1"}))
+
+    assert written == 1
+    assert orphans == ["g2"]
+    assert len(sims.ops) == 1
+
+
+def test_persist_updates_leg_pool_and_joint_sketch_without_storing_the_sketch_inline(derived_writes):
+    sketch_doc = {"version": 1, "n": 10}
+    simulations = {
+        "g1": {"simulation_id": "sim_g1", "event_id": "g1", JOINT_SKETCH_RESULT_KEY: sketch_doc},
+        "g2": {"simulation_id": "sim_g2", "event_id": "g2", JOINT_SKETCH_RESULT_KEY: sketch_doc},
+    }
+    sims = FakeSimulations()
+
+    persist_simulations(simulations, sims, FakeEvents({"g1"}))
+
+    assert JOINT_SKETCH_RESULT_KEY not in sims.ops[0]._doc["$set"]
+    assert [(doc["simulation_id"], event["sport_key"]) for doc, event in derived_writes["pool"]] == [
+        ("sim_g1", "basketball_nba")
+    ]
+    assert [(sim_id, event["event_id"], doc) for sim_id, event, doc in derived_writes["sketch"]] == [
+        ("sim_g1", "g1", sketch_doc)
+    ]
@@ -0,0 +1,183 @@
+import copy
+from datetime import datetime, timedelta, timezone
+
+import bson
+
+from services.snapshot_capture import SnapshotCaptureService
+
+
+class FakeCollection:
+    """Just enough of a pymongo collection for the snapshot store"""
+
+    def __init__(self):
+        self.docs = []
+        self.calls = []
+
+    def _matches(self, doc, query):
+        for key, cond in query.items():
+            value = doc.get(key)
+            if isinstance(cond, dict):
+                if "$lte" in cond and (value is None or value > cond["$lte"]):
+                    return False
+                if "$lt" in cond and (value is None or value >= cond["$lt"]):
+                    return False
+                if "$ne" in cond and value == cond["$ne"]:
+                    return False
+                if "$in" in cond and value not in cond["$in"]:
+                    return False
+            elif value != cond:
+                return False
+        return True
+
+    def insert_one(self, doc):
+        self.calls.append("insert_one")
+        self.docs.append(copy.deepcopy(doc))
+
+    def insert_many(self, docs, ordered=True):
+        self.calls.append("insert_many")
+        self.docs.extend(copy.deepcopy(docs))
+
+    def bulk_write(self, ops, ordered=True):
+        self.calls.append("bulk_write")
+        for op in ops:
+            existing = [d for d in self.docs if d["_id"] == op._filter["_id"]]
+            if existing:
+                existing[0]["last_seen_utc"] = max(existing[0]["last_seen_utc"], op._doc["$max"]["last_seen_utc"])
+            else:
+                self.docs.append({"_id": op._filter["_id"], **copy.deepcopy(op._doc["$setOnInsert"]), **op._doc["$max"]})
+
+    def find_one(self, query, projection=None, sort=None):
+        found = [d for d in self.docs if self._matches(d, query)]
+        for key, direction in sort or []:
+            found.sort(key=lambda d: d[key], reverse=direction < 0)
+        return copy.deepcopy(found[0]) if found else None
+
+    def find(self, query, projection=None):
+        self.calls.append("find")
+        return FakeCursor([copy.deepcopy(d) for d in self.docs if self._matches(d, query)])
+
+    def update_many(self, query, update):
+        self.calls.append("update_many")
+        for doc in self.docs:
+            if self._matches(doc, query):
+                doc.update(update["$set"])
+
+    def delete_many(self, query):
+        self.calls.append("delete_many")
+        kept = [d for d in self.docs if not self._matches(d, query)]
+        deleted, self.docs = len(self.docs) - len(kept), kept
+        return type("DeleteResult", (), {"deleted_count": deleted})()
+
+
+class FakeCursor(list):
+    def limit(self, n):
+        return FakeCursor(self[:n])
+
+
+class FakeDB:
+    def __init__(self):
+        self.odds_snapshots = FakeCollection()
+        self.odds_snapshot_payloads = FakeCollection()
+        self.injury_snapshots = FakeCollection()
+
+
+def _bookmaker(key, shift=0.0):
+    return {
+        "key": key,
+        "title": key.title(),
+        "last_update": "2026-10-16T18:00:00Z",
+        "markets": [
+            {"key": "h2h", "outcomes": [{"name": "Lakers", "price": 1.8 + shift}, {"name": "Celtics", "price": 2.1}]},
+            {"key": "spreads", "outcomes": [{"name": "Lakers", "price": 1.91, "point": -3.5},
+                                            {"name": "Celtics", "price": 1.91, "point": 3.5}]},
+            {"key": "totals", "outcomes": [{"name": "Over", "price": 1.9, "point": 221.5},
+                                           {"name": "Under", "price": 1.92, "point": 221.5}]},
+        ] + [
+            {"key": f"{market}_h1", "outcomes": [{"name": "Lakers", "price": 1.87, "point": -1.5},
+                                                 {"name": "Celtics", "price": 1.95, "point": 1.5}]}
+            for market in ("h2h", "spreads", "totals")
+        ],
+    }
+
+
+def test_poll_tick_is_one_insert_many_with_payloads_stored_once():
+    database = FakeDB()
+    service = SnapshotCaptureService(database)
+    books = [_bookmaker(f"book{i}") for i in range(10)]
+    tick = datetime(2026, 10, 16, 18, tzinfo=timezone.utc)
+
+    ids = service.capture_poll_snapshots([{"id": "evt1", "bookmakers": books}], captured_at=tick)
+
+    assert len(ids) == 120  # 10 books x 6 markets x 2 outcomes
+    assert database.odds_snapshots.calls == ["insert_many"]
+    assert database.odds_snapshot_payloads.calls == ["bulk_write"]
+    assert len(database.odds_snapshot_payloads.docs) == 10
+    rows = database.odds_snapshots.docs
+    assert all("raw_payload" not in row for row in rows)
+
+    legacy_bytes = 0
+    for row in rows:
+        legacy = dict(row, raw_payload=service.get_raw_payload(row))
+        legacy_bytes += len(bson.encode(legacy))
+    compact_bytes = sum(len(bson.encode(d)) for d in rows + database.odds_snapshot_payloads.docs)
+    assert compact_bytes * 2.5 < legacy_bytes  # grows with blob size and with unchanged books across ticks
+
+    # Next tick: unchanged books reuse their payload, one changed book adds one
+    books[0] = _bookmaker("book0", shift=0.05)
+    service.capture_poll_snapshots([{"id": "evt1", "bookmakers": books}], captured_at=tick + timedelta(minutes=1))
+    assert len(database.odds_snapshot_payloads.docs) == 11
+    assert database.odds_snapshot_payloads.docs[1]["last_seen_utc"] == tick + timedelta(minutes=1)
+
+
+def test_readers_get_latest_and_closing_rows_and_raw_payload():
+    database = FakeDB()
+    service = SnapshotCaptureService(database)
+    tick = datetime(2026, 10, 16, 18, tzinfo=timezone.utc)
+    for minutes, shift in ((0, 0.0), (5, 0.1)):
+        service.capture_poll_snapshots(
+            [{"id": "evt1", "bookmakers": [_bookmaker("draftkings", shift)]}],
+            captured_at=tick + timedelta(minutes=minutes),
+        )
+
+    latest = service.get_latest_odds_snapshot("evt1", "MONEYLINE:FULL_GAME", "draftkings", with_raw_payload=True)
+    assert latest is not None and latest["timestamp_utc"] == tick + timedelta(minutes=5)
+    assert latest["raw_payload"]["market"]["key"] == "h2h"
+    assert latest["raw_payload"]["outcome"] == {"name": "Lakers", "price": 1.9000000000000001}
+
+    earlier = service.get_latest_odds_snapshot("evt1", "MONEYLINE:FULL_GAME", "draftkings", before_timestamp=tick)
+    assert earlier["price_decimal"] is not None and earlier["timestamp_utc"] == tick
+
+    for row in database.odds_snapshots.docs:
+        if row["snapshot_id"] == earlier["snapshot_id"]:
+            row["is_close_candidate"] = True
+    closing = service.get_closing_line_snapshot("evt1", "MONEYLINE:FULL_GAME", "draftkings")
+    assert closing["snapshot_id"] == earlier["snapshot_id"]
+
+    single_id = service.capture_odds_snapshot(
+        "evt2", "Parlay", "internal", "SPREAD:FULL_GAME", "HOME", -2.5, -110, {"leg": 1}
+    )
+    single = service.get_latest_odds_snapshot("evt2", "SPREAD:FULL_GAME")
+    assert single["snapshot_id"] == single_id and service.get_raw_payload(single) == {"leg": 1}
+
+
+def test_cleanup_keeps_closing_line_payloads_without_listing_every_ref():
+    database = FakeDB()
+    service = SnapshotCaptureService(database)
+    now = datetime.now(timezone.utc)
+    old = now - timedelta(days=200)
+    service.capture_poll_snapshots([{"id": "evt1", "bookmakers": [_bookmaker("draftkings")]}], captured_at=old)
+    service.capture_poll_snapshots([{"id": "evt2", "bookmakers": [_bookmaker("fanduel", 0.2)]}], captured_at=old)
+    for i, row in enumerate(database.odds_snapshots.docs):
+        row["_id"] = i
+        row["is_close_candidate"] = row["event_id"] == "evt1" and row["market_key"] == "MONEYLINE:FULL_GAME"
+    closing_refs = {r["raw_payload_ref"] for r in database.odds_snapshots.docs if r["is_close_candidate"]}
+
+    assert service.cleanup_old_snapshots(retention_days=180) == 22
+    assert {d["_id"] for d in database.odds_snapshot_payloads.docs} == closing_refs
+    assert all(r["payload_pinned"] for r in database.odds_snapshots.docs)
+
+    # Already pinned closing rows are not read again
+    database.odds_snapshots.calls.clear()
+    service.cleanup_old_snapshots(retention_days=180)
+    assert database.odds_snapshots.calls == ["delete_many", "find"]
+    assert {d["_id"] for d in database.odds_snapshot_payloads.docs} == closing_refs
@@ -0,0 +1,125 @@
+"""
+Vectorized SportStrategy kernels — statistical parity with the scalar loop.
+
+Each strategy draws all iterations in one batch from a numpy Generator and
+must return ndarray margins/totals whose moments match the per-iteration
+model they replaced.
+"""
+import numpy as np
+import pytest
+
+from core.nfl_drive_strategy import NFLDriveBasedStrategy
+from core.sport_strategies import (
+    HighScoringStrategy,
+    LowScoringStrategy,
+    MediumScoringStrategy,
+)
+
+
+ITERATIONS = 50_000
+
+
+def _assert_result_contract(result, iterations):
+    assert isinstance(result["margins"], np.ndarray)
+    assert isinstance(result["totals"], np.ndarray)
+    assert result["margins"].shape == (iterations,)
+    assert result["totals"].shape == (iterations,)
+    assert result["team_a_wins"] + result["team_b_wins"] + result["pushes"] == iterations
+    assert result["team_a_total"] - result["team_b_total"] == pytest.approx(
+        float(result["margins"].sum()), rel=1e-9, abs=1e-6
+    )
+
+
+@pytest.mark.parametrize(
+    "strategy,sport_key,sigma,home_adv",
+    [
+        (HighScoringStrategy(), "basketball_nba", 10.0, 3.5),
+        (MediumScoringStrategy(), "basketball_ncaab", 14.5, 2.5),
+    ],
+)
+def test_normal_strategies_match_scalar_model(strategy, sport_key, sigma, home_adv):
+    rng = np.random.default_rng(7)
+    result = strategy.simulate_game(112.0, 108.0, ITERATIONS, {"sport_key": sport_key}, rng=rng)
+
+    _assert_result_contract(result, ITERATIONS)
+    expected_margin = 112.0 + home_adv - 108.0
+    margin_sd = sigma * np.sqrt(2)
+    assert result["margins"].mean() == pytest.approx(expected_margin, abs=4 * margin_sd / np.sqrt(ITERATIONS))
+    assert result["margins"].std() == pytest.approx(margin_sd, rel=0.02)
+    assert result["totals"].mean() == pytest.approx(112.0 + home_adv + 108.0, abs=0.5)
+
+
+def test_low_scoring_strategy_is_poisson_with_exact_ties():
+    rng = np.random.default_rng(11)
+    result = LowScoringStrategy().simulate_game(4.5, 4.0, ITERATIONS, {"sport_key": "baseball_mlb"}, rng=rng)
+
+    _assert_result_contract(result, ITERATIONS)
+    lam_a, lam_b = 4.5 + 0.3, 4.0
+    assert result["totals"].mean() == pytest.approx(lam_a + lam_b, rel=0.02)
+    assert result["totals"].var() == pytest.approx(lam_a + lam_b, rel=0.05)
+    assert result["pushes"] == int(np.count_nonzero(result["margins"] == 0))
+
+
+def test_seeded_generator_is_reproducible():
+    context = {"sport_key": "icehockey_nhl", "is_team_a_home": False}
+    first = LowScoringStrategy().simulate_game(3.1, 2.8, 10_000, context, rng=np.random.default_rng(42))
+    second = LowScoringStrategy().simulate_game(3.1, 2.8, 10_000, context, rng=np.random.default_rng(42))
+
+    np.testing.assert_array_equal(first["margins"], second["margins"])
+    assert first["team_a_wins"] == second["team_a_wins"]
+
+
+def test_scores_are_clamped_non_negative():
+    result = HighScoringStrategy().simulate_game(
+        2.0, 1.0, ITERATIONS, {"sport_key": "basketball_nba"}, rng=np.random.default_rng(3)
+    )
+    assert result["totals"].min() >= 0.0
+    assert np.all(np.abs(result["margins"]) <= result["totals"] + 1e-9)
+
+
+def _scalar_drive_game(rng, ppd_a, ppd_b):
+    """Reference per-game loop the batched NFL drive engine replaced."""
+    num_drives = max(8, min(14, int(rng.normal(11.5, 1.2))))
+    scores = []
+    for ppd in (ppd_a, ppd_b):
+        eff = ppd / 1.85
+        td, fg = 0.22 * min(1.5, eff), 0.17 * min(1.3, eff)
+        draws = rng.random(num_drives)
+        raw = 7.0 * np.sum(draws < td) + 3.0 * np.sum((draws >= td) & (draws < td + fg))
+        avg = 1.85 * num_drives
+        strength = min(0.25, abs(raw - avg) / 20.0)
+        scores.append(raw * (1.0 - strength) + avg * strength)
+    if abs(scores[0] - scores[1]) > 14:
+        reduction = rng.uniform(0.05, 0.15)
+        scores = [x * (1.0 - reduction) for x in scores]
+    return round(scores[0]), round(scores[1])
+
+
+def test_batched_nfl_drive_engine_matches_scalar_loop():
+    context = {"sport_key": "americanfootball_nfl", "total_line": 44.5}
+    result = HighScoringStrategy().simulate_game(2.2, 1.7, ITERATIONS, context, rng=np.random.default_rng(5))
+    _assert_result_contract(result, ITERATIONS)
+
+    # Replicate the strategy's anchor + home-field adjustments for the reference loop
+    implied_ppd = (44.5 / 2) / 11.5
+    ppd_a = 2.2 * 0.85 + implied_ppd * 0.15 + 0.25
+    ppd_b = 1.7 * 0.85 + implied_ppd * 0.15
+    ref_rng = np.random.default_rng(6)
+    reference = np.array([_scalar_drive_game(ref_rng, ppd_a, ppd_b) for _ in range(10_000)], dtype=float)
+    ref_margins = reference[:, 0] - reference[:, 1]
+    ref_totals = reference.sum(axis=1)
+
+    assert result["margins"].mean() == pytest.approx(ref_margins.mean(), abs=0.4)
+    assert result["margins"].std() == pytest.approx(ref_margins.std(), rel=0.05)
+    assert result["totals"].mean() == pytest.approx(ref_totals.mean(), abs=0.4)
+    assert result["totals"].std() == pytest.approx(ref_totals.std(), rel=0.05)
+    assert result["market_anchor_applied"] is True
+
+
+def test_nfl_drive_scores_are_whole_points():
+    result = NFLDriveBasedStrategy().simulate_game(
+        1.9, 1.8, 20_000, {"total_line": 41.0}, rng=np.random.default_rng(9)
+    )
+    _assert_result_contract(result, 20_000)
+    np.testing.assert_array_equal(result["totals"], np.round(result["totals"]))
+    assert 30.0 < float(np.median(result["totals"])) < 55.0
@@ -0,0 +1,222 @@
+import asyncio
+import copy
+from datetime import timedelta
+
+import pytest
+
+from services.trust_metrics import TrustMetricsService
+from services.trust_metrics_store import TrustMetricsStore, day_key
+from utils.timezone import now_utc
+
+
+class FakeCollection:
+    """Just enough of a pymongo collection for the counter store"""
+
+    def __init__(self, docs=None):
+        self.docs = {d.get("_id", i): copy.deepcopy(d) for i, d in enumerate(docs or [])}
+        self.finds = 0
+
+    def _matches(self, doc, query):
+        for key, cond in query.items():
+            if key == "$or":
+                continue  # source filters are applied by the store's own row checks
+            value = doc.get(key)
+            if isinstance(cond, dict):
+                if "$in" in cond and value not in cond["$in"]:
+                    return False
+                if "$gte" in cond and (value is None or value < cond["$gte"]):
+                    return False
+                if "$lt" in cond and (value is None or value >= cond["$lt"]):
+                    return False
+            elif value != cond:
+                return False
+        return True
+
+    def find(self, query=None, projection=None):
+        self.finds += 1
+        return [copy.deepcopy(d) for d in self.docs.values() if self._matches(d, query or {})]
+
+    def find_one(self, query):
+        found = self.find(query)
+        return found[0] if found else None
+
+    def find_one_and_replace(self, query, replacement, upsert=False, return_document=None):
+        previous = copy.deepcopy(self.docs.get(query["_id"]))
+        self.docs[query["_id"]] = {"_id": query["_id"], **copy.deepcopy(replacement)}
+        return previous
+
+    def find_one_and_delete(self, query):
+        return self.docs.pop(query["_id"], None)
+
+    def update_one(self, query, update, upsert=False):
+        doc = self.docs.get(query["_id"])
+        if doc is None:
+            if not upsert:
+                return
+            doc = self.docs[query["_id"]] = {"_id": query["_id"], **update.get("$setOnInsert", {})}
+        for field, delta in update.get("$inc", {}).items():
+            doc[field] = doc.get(field, 0) + delta
+
+    def replace_one(self, query, doc, upsert=False):
+        self.docs[query["_id"]] = copy.deepcopy(doc)
+
+    def delete_many(self, query):
+        self.docs.clear()
+
+    def insert_many(self, docs):
+        for d in docs:
+            self.docs[d["_id"]] = copy.deepcopy(d)
+
+
+def _store():
+    return TrustMetricsStore(FakeCollection(), FakeCollection())
+
+
+def test_settlement_is_idempotent_and_regrade_reverses():
+    store = _store()
+    today = now_utc()
+
+    assert store.record_settlement("s1", "WIN", today, "NBA", 0.8, unit_return=0.91)
+    assert not store.record_settlement("s1", "WIN", today, "NBA", 0.8, unit_return=0.91)
+    store.record_settlement("s2", "LOSS", today, "NBA", 0.8, unit_return=-1.0)
+
+    rows = store.load_counters(day_key(today))
+    assert len(rows) == 1
+    assert rows[0]["wins"] == 1 and rows[0]["losses"] == 1
+    assert rows[0]["units"] == pytest.approx(-0.09)
+
+    # Regrade s1 to VOID: its WIN is removed
+    store.record_settlement("s1", "VOID", today, "NBA", 0.8)
+    row = store.load_counters(day_key(today))[0]
+    assert row["wins"] == 0 and row["settled"] == 1
+    assert row["brier_sum"] == pytest.approx(0.64)
+
+
+def test_service_reads_counters_for_metrics_and_trend():
+    store = _store()
+    now = now_utc()
+    yesterday = now - timedelta(days=1)
+    store.counters.replace_one({"_id": "__meta__"}, {"_id": "__meta__"})
+
+    store.record_settlement("a", "WIN", yesterday, "NBA", 0.8, unit_return=1.0)
+    store.record_settlement("b", "WIN", yesterday, "NFL", 0.65, unit_return=1.0)
+    store.record_settlement("c", "LOSS", now - timedelta(days=10), "NBA", 0.55, unit_return=-1.0)
+    store.record_settlement("d", "PUSH", now, "NBA", 0.55)
+
+    service = TrustMetricsService(store=store)
+    overall = asyncio.run(service._calculate_overall_metrics())
+    by_sport = asyncio.run(service._calculate_sport_metrics())
+    calibration = asyncio.run(service._calculate_confidence_calibration())
+    trend = asyncio.run(service.get_accuracy_trend(days=7))
+    yesterday_perf = asyncio.run(service._calculate_yesterday_performance())
+
+    assert overall["7day_record"] == "2-0"
+    assert overall["30day_record"] == "2-1"
+    assert overall["30day_units"] == 1.0
+    assert overall["brier_score"] == pytest.approx(
+        round(((0.8 - 1) ** 2 + (0.65 - 1) ** 2 + 0.55 ** 2 + 0.55 ** 2) / 4, 3)
+    )
+    assert by_sport["NBA"]["record"] == "1-1"
+    assert by_sport["NFL"]["record"] == "1-0"
+    assert calibration["high_confidence"] == {"predicted": 0.8, "actual": 1.0, "count": 1}
+    assert calibration["low_confidence"]["count"] == 1  # push excluded
+    assert trend == [{"date": day_key(yesterday), "accuracy": 100.0, "units": 2.0, "wins": 2, "losses": 0}]
+    assert yesterday_perf["record"] == "2-0"
+
+
+def test_rebuild_replays_grading_rows_with_batched_lookups():
+    now = now_utc()
+    source = {
+        "grading": FakeCollection([
+            {"_id": 1, "graded_id": "g1", "bet_status": "SETTLED", "result_code": "WIN",
+             "event_id": "e1", "prediction_id": "p1", "unit_return": 0.9, "graded_at": now},
+            {"_id": 2, "grading_idempotency_key": "k2", "settlement_status": "LOSS",
+             "event_id": "e2", "pick_id": "pk2", "graded_at": now.isoformat()},
+            {"_id": 3, "graded_id": "old", "bet_status": "SETTLED", "result_code": "WIN",
+             "event_id": "e1", "graded_at": now - timedelta(days=400)},
+        ]),
+        "events": FakeCollection([
+            {"event_id": "e1", "sport_key": "basketball_nba"},
+            {"event_id": "e2", "sport_key": "icehockey_nhl"},
+        ]),
+        "predictions": FakeCollection([{"prediction_id": "p1", "p_win": 0.7}]),
+        "ai_picks": FakeCollection([{"pick_id": "pk2", "confidence": 80, "snapshot_odds": 2.1}]),
+    }
+    store = _store()
+
+    assert store.rebuild(source) == 2
+    assert store.is_built()
+    rows = {(r["sport"], r["bucket"]): r for r in store.load_counters(day_key(now))}
+    assert rows[("NBA", "medium_confidence")]["units"] == 0.9
+    assert rows[("NHL", "high_confidence")]["losses"] == 1
+    assert rows[("NHL", "high_confidence")]["units"] == -1.0
+    assert source["events"].finds == 1 and source["predictions"].finds == 1
+
+
+def _source(grading_docs=()):
+    return {
+        "grading": GradingFake(grading_docs),
+        "events": FakeCollection([{"event_id": "e1", "sport_key": "basketball_nba"}]),
+        "predictions": FakeCollection([{"prediction_id": "p1", "p_win": 0.7}]),
+        "ai_picks": FakeCollection([{"pick_id": "pk1", "confidence": 80, "snapshot_odds": 2.0}]),
+        "trust_metrics_counters": FakeCollection(),
+        "trust_metrics_contributions": FakeCollection(),
+    }
+
+
+class GradingFake(FakeCollection):
+    """grading rows keyed by pick_id, as the v1 unified service upserts them"""
+
+    def find_one_and_update(self, query, update, projection=None, upsert=False):
+        previous = next((d for d in self.docs.values() if d.get("pick_id") == query["pick_id"]), None)
+        if previous is None:
+            self.docs[query["pick_id"]] = copy.deepcopy(update["$set"])
+            return None
+        before = copy.deepcopy(previous)
+        previous.update(copy.deepcopy(update["$set"]))
+        return before
+
+
+def test_legacy_grading_rows_are_applied_like_rebuild():
+    from db.schemas.logging_calibration_schemas import BetStatus, ResultCode
+
+    now = now_utc()
+    source = _source()
+    store = TrustMetricsStore(source["trust_metrics_counters"], source["trust_metrics_contributions"])
+    row = {"graded_id": "g1", "bet_status": BetStatus.SETTLED, "result_code": ResultCode.WIN,
+           "event_id": "e1", "prediction_id": "p1", "unit_return": 0.91, "graded_at": now}
+
+    assert store.record_grading_row(row, source_db=source)
+    assert not store.record_grading_row(row, source_db=source)
+    counter = store.load_counters(day_key(now))[0]
+    assert (counter["sport"], counter["bucket"], counter["wins"]) == ("NBA", "medium_confidence", 1)
+    assert counter["units"] == pytest.approx(0.91)
+
+    # Regraded to VOID under the same graded_id: the WIN is reversed
+    store.record_grading_row({**row, "bet_status": "VOID", "result_code": "VOID"}, source_db=source)
+    assert store.load_counters(day_key(now))[0]["settled"] == 0
+
+
+def test_v1_unified_grading_writes_update_trust_metrics(monkeypatch):
+    from services.unified_grading_service import (
+        BetStatus, GradingResult, GradingSource, ResultCode, UnifiedGradingService,
+    )
+
+    now = now_utc()
+    source = _source()
+    service = UnifiedGradingService(source)
+
+    def grade(result_code, graded_at):
+        service._write_grading_record(GradingResult(
+            pick_id="pk1", event_id="e1", oddsapi_event_id="oa1", bet_status=BetStatus.SETTLED,
+            result_code=result_code, units_returned=None, closing_line_decimal=None, clv_pct=None,
+            roi=None, grading_source=list(GradingSource)[0], graded_at=graded_at, score_data=None,
+            warnings=[],
+        ))
+
+    grade(ResultCode.WIN, now)
+    grade(ResultCode.LOSS, now + timedelta(seconds=5))  # regrade: new graded_id
+
+    store = TrustMetricsStore(source["trust_metrics_counters"], source["trust_metrics_contributions"])
+    counter = store.load_counters(day_key(now))[0]
+    assert (counter["bucket"], counter["wins"], counter["losses"], counter["settled"]) == ("high_confidence", 0, 1, 1)
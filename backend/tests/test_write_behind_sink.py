@@ -0,0 +1,119 @@
+import threading
+import time
+
+import pytest
+
+from db.write_behind import WriteBehindSink
+
+
+class FakeCollection:
+    def __init__(self, name, fail=False):
+        self.name = name
+        self.full_name = f"beatvegas.{name}"
+        self.fail = fail
+        self.inserted = []
+        self.insert_many_calls = 0
+        self.insert_one_calls = 0
+        self.lock = threading.Lock()
+
+    def insert_one(self, document):
+        if self.fail:
+            raise RuntimeError("primary unavailable")
+        with self.lock:
+            self.insert_one_calls += 1
+            self.inserted.append(document)
+
+    def insert_many(self, documents, ordered=True):
+        assert ordered is False
+        if self.fail:
+            raise RuntimeError("primary unavailable")
+        with self.lock:
+            self.insert_many_calls += 1
+            self.inserted.extend(documents)
+
+
+def test_batches_by_size_and_flushes_on_shutdown():
+    logs = FakeCollection("logs_core_ai")
+    sink = WriteBehindSink(max_queue=1000, batch_size=50, flush_interval_ms=60_000, fail_closed_collections=())
+
+    for i in range(120):
+        sink.submit(logs, {"i": i})
+
+    deadline = time.time() + 2
+    while len(logs.inserted) < 100 and time.time() < deadline:
+        time.sleep(0.01)
+    assert len(logs.inserted) >= 100  # two size-triggered batches, no timer needed
+
+    sink.shutdown()
+    assert sorted(d["i"] for d in logs.inserted) == list(range(120))
+    assert logs.insert_one_calls == 0
+    assert sink.stats()["queue_depth"] == 0
+
+
+def test_time_threshold_flushes_partial_batch():
+    logs = FakeCollection("decomposition_logs")
+    sink = WriteBehindSink(batch_size=500, flush_interval_ms=20, fail_closed_collections=())
+
+    sink.submit(logs, {"i": 1})
+    deadline = time.time() + 2
+    while not logs.inserted and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert logs.inserted == [{"i": 1}]
+    sink.shutdown()
+
+
+def test_full_queue_applies_backpressure_without_losing_writes():
+    logs = FakeCollection("sim_audit")
+    sink = WriteBehindSink(max_queue=2, batch_size=100, flush_interval_ms=60_000, fail_closed_collections=())
+
+    for i in range(5):
+        sink.submit(logs, {"i": i})
+
+    stats = sink.stats()
+    assert stats["backpressure_events"] == 3
+    assert logs.insert_one_calls == 3
+    sink.shutdown()
+    assert len(logs.inserted) == 5
+
+
+def test_fail_closed_collections_write_synchronously_and_raise():
+    audit = FakeCollection("decision_audit_logs")
+    sink = WriteBehindSink(fail_closed_collections={"decision_audit_logs"})
+
+    assert sink.submit(audit, {"event_id": "e1"}) is True
+    assert audit.insert_one_calls == 1
+
+    with pytest.raises(RuntimeError):
+        sink.submit(FakeCollection("decision_audit_logs", fail=True), {"event_id": "e2"})
+    with pytest.raises(RuntimeError):
+        sink.submit(FakeCollection("rcl_log", fail=True), {"event_id": "e3"}, fail_closed=True)
+    assert sink.stats()["queue_depth"] == 0
+
+
+def test_failed_batch_is_counted_not_raised():
+    broken = FakeCollection("logs_core_ai", fail=True)
+    sink = WriteBehindSink(batch_size=10, flush_interval_ms=60_000, fail_closed_collections=())
+    sink._queue.extend([(broken, {"i": i}) for i in range(3)])
+
+    assert sink.flush() == 0
+    assert sink.stats()["dropped"] == 3
+
+
+def test_audit_logger_writes_sim_audit_and_rcl_log_synchronously(monkeypatch):
+    from db import audit_logger as audit_logger_module
+
+    db = {name: FakeCollection(name) for name in ("sim_audit", "bet_history", "rcl_log", "calibration_weekly")}
+    sink = WriteBehindSink(flush_interval_ms=60_000, fail_closed_collections=())
+    monkeypatch.setattr(audit_logger_module, "get_write_behind_sink", lambda: sink)
+    audit = audit_logger_module.AuditLogger(db)
+
+    assert audit.log_rcl("g1", True, "ok", sport="NBA") is True
+    assert audit.log_simulation("g1", "NBA", 10000, 220.5, 223.0, 11.0, True, False) is True
+    assert db["rcl_log"].insert_one_calls == 1
+    assert db["sim_audit"].insert_one_calls == 1
+    assert sink.stats()["queue_depth"] == 0
+
+    db["rcl_log"].fail = True
+    assert audit.log_rcl("g2", False, "primary down") is False
+    sink.shutdown()
@@ -4,9 +4,10 @@ Calibration Logger - Track predictions vs actual results for model validation
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
-from pymongo import MongoClient
 import os
 
+from db.connection_registry import get_mongo_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,9 +21,10 @@ class CalibrationLogger:
     
     def __init__(self):
         mongo_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017/")
-        self.client = MongoClient(mongo_uri)
+        registry = get_mongo_registry()
+        self.client = registry.sync_client(mongo_uri)
         self.db = self.client.beatvegas
-        self.predictions_collection = self.db.prediction_tracking
+        self.predictions_collection = registry.collection("prediction_tracking", database="beatvegas", uri=mongo_uri)
         
         # Create indexes for fast lookups
         try:
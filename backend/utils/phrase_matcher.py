@@ -0,0 +1,187 @@
+"""
+Compiled Multi-Phrase Matcher
+=============================
+
+One matcher for every "does this text contain a forbidden phrase" gate:
+- middleware/api_response_language_guard (streamed JSON responses)
+- services/explanation_forbidden_phrases (explanation boxes, word-bounded)
+- services/telegram_copy_validator (constrained Telegram copy)
+
+Build once, scan many times:
+
+    matcher = PhraseMatcher(["lock", "mortal lock", "sure thing"])
+    matcher.find("This is a MORTAL LOCK")      # {"lock", "mortal lock"}
+
+    scanner = matcher.scanner()                # streaming, chunk by chunk
+    for chunk in chunks:
+        scanner.feed_bytes(chunk)
+    scanner.finish()                           # -> matched phrase set
+
+How it scans:
+- Phrases are compiled into a containment graph, the dictionary-link idea
+  from Aho-Corasick: a phrase that contains another phrase ("mortal lock"
+  contains "lock", "guaranteed profit" contains "guaranteed") is only
+  searched for once the phrase it contains has been seen. Most texts match
+  nothing, so each scan is one C-level substring search per *root* phrase.
+  (A per-character automaton in pure Python is slower than CPython's
+  substring search, so the searches themselves stay in C.)
+- Streaming keeps the last `max_len + 1` characters of the previous chunk
+  as overlap, so phrases split across chunk boundaries are found without
+  ever holding the whole body. Bytes are decoded incrementally (UTF-8).
+- Matching is case-insensitive. Word-bounded phrases (explanation checker
+  semantics: `\\bphrase\\b` for alphanumeric phrases) are confirmed with a
+  per-phrase regex only after the substring pre-check hits.
+"""
+import codecs
+import re
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Union
+
+
+def alnum_word_boundary(phrase: str) -> bool:
+    """Word boundaries apply to alphanumeric phrases (spaces allowed)"""
+    return phrase.replace(" ", "").isalnum()
+
+
+class PhraseMatcher:
+    """
+    Immutable compiled phrase set. Thread-safe; scanners hold all state.
+    """
+
+    def __init__(
+        self,
+        phrases: Iterable[str],
+        word_boundary: Union[bool, Callable[[str], bool]] = False,
+    ):
+        seen: Dict[str, None] = {}
+        for p in phrases:
+            if isinstance(p, str) and p:
+                seen.setdefault(p.lower(), None)
+        self.phrases: List[str] = list(seen)
+        self.max_len = max((len(p) for p in self.phrases), default=0)
+
+        bounded = word_boundary if callable(word_boundary) else (lambda _p: bool(word_boundary))
+        self._bounded: Dict[str, "re.Pattern[str]"] = {
+            p: re.compile(r"(?<!\w)" + re.escape(p) + r"(?!\w)") for p in self.phrases if bounded(p)
+        }
+
+        # Containment graph: each phrase hangs off the longest other phrase it
+        # contains (its "parent"); roots are phrases containing no other phrase.
+        self._children: Dict[Optional[str], List[str]] = {None: []}
+        by_length = sorted(self.phrases, key=len)
+        for phrase in self.phrases:
+            parent = None
+            for other in reversed(by_length):
+                if other != phrase and len(other) < len(phrase) and other in phrase:
+                    parent = other
+                    break
+            self._children.setdefault(parent, []).append(phrase)
+
+    @property
+    def roots(self) -> List[str]:
+        return self._children[None]
+
+    def children(self, phrase: str) -> List[str]:
+        return self._children.get(phrase, [])
+
+    def scanner(self) -> "PhraseScanner":
+        return PhraseScanner(self)
+
+    def find(self, text: str) -> Set[str]:
+        """All phrases contained in `text` (lowercased phrase strings)"""
+        if not text or not self.phrases:
+            return set()
+        scanner = PhraseScanner(self)
+        scanner.feed(text)
+        return scanner.finish()
+
+    def __bool__(self) -> bool:
+        return bool(self.phrases)
+
+
+class PhraseScanner:
+    """
+    Incremental scan state for one text/stream.
+    """
+
+    def __init__(self, matcher: PhraseMatcher):
+        self.matcher = matcher
+        self.matched: Set[str] = set()
+        self._active: List[str] = list(matcher.roots)
+        self._expanded: Set[str] = set()
+        self._tail = ""
+        self._tail_offset = 0  # absolute offset of _tail[0] in the text
+        self._decoder = None
+        self._overlap = matcher.max_len + 1
+
+    def feed_bytes(self, data: bytes) -> None:
+        if self._decoder is None:
+            self._decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        self.feed(self._decoder.decode(data))
+
+    def feed(self, text: str) -> None:
+        if not text or not self._active:
+            return
+        window = self._tail + text.lower()
+        self._scan(window, self._tail_offset, final=False)
+        keep = min(len(window), self._overlap)
+        self._tail_offset += len(window) - keep
+        self._tail = window[-keep:]
+
+    def finish(self) -> Set[str]:
+        """Flush the overlap (end of text is a word boundary) and return matches"""
+        if self._decoder is not None:
+            rest = self._decoder.decode(b"", final=True)
+            if rest:
+                self.feed(rest)
+        if self._tail and self._active:
+            self._scan(self._tail, self._tail_offset, final=True)
+        self._tail = ""
+        return self.matched
+
+    def _scan(self, window: str, offset: int, final: bool) -> None:
+        pending = self._active
+        still_active: List[str] = []
+        while pending:
+            newly: List[str] = []
+            for phrase in pending:
+                if phrase not in window:
+                    still_active.append(phrase)
+                    continue
+                # Children contain this phrase as a plain substring, so they
+                # become candidates as soon as it is seen (bounded or not)
+                if phrase not in self._expanded:
+                    self._expanded.add(phrase)
+                    newly.extend(self.matcher.children(phrase))
+                if self._confirm(phrase, window, offset, final):
+                    self.matched.add(phrase)
+                else:
+                    still_active.append(phrase)
+            pending = newly
+        self._active = still_active
+
+    def _confirm(self, phrase: str, window: str, offset: int, final: bool) -> bool:
+        pattern = self.matcher._bounded.get(phrase)
+        if pattern is None:
+            return True
+        # Unless the window starts the text, its first character's predecessor
+        # has been dropped; an occurrence there was already fully evaluated in
+        # the previous window (the overlap is longer than any phrase).
+        # (The lookbehind still sees window[0] when searching from pos 1.)
+        for m in pattern.finditer(window, 0 if offset == 0 else 1):
+            if m.end() == len(window) and not final:
+                continue  # next character unknown yet; re-seen in the overlap
+            return True
+        return False
+
+
+_matcher_cache: Dict[FrozenSet, PhraseMatcher] = {}
+
+
+def compiled_matcher(phrases: Iterable[str], word_boundary: Union[bool, Callable[[str], bool]] = False) -> PhraseMatcher:
+    """Memoized PhraseMatcher for a phrase collection (order-insensitive)"""
+    phrases = tuple(phrases)
+    key = frozenset((p, word_boundary) for p in phrases)
+    matcher = _matcher_cache.get(key)
+    if matcher is None:
+        matcher = _matcher_cache[key] = PhraseMatcher(phrases, word_boundary)
+    return matcher